@@ -0,0 +1,144 @@
+# api_client.py - 연결을 유지하는 Whisper API 클라이언트 (연결 재사용 + 단축키를 누를 때 미리 연결)
+
+import logging
+import threading
+import time
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import openai
+except ImportError:
+    openai = None
+
+
+DEFAULT_BASE_URL = "https://api.openai.com/v1"
+DEFAULT_MODEL = "whisper-1"
+# 이보다 작은 요청 본문은 소켓 버퍼에 바로 들어가 전송 시간을 잴 수 없으므로 업로드 처리량 측정에서 제외
+MIN_UPLOAD_SAMPLE_BYTES = 32 * 1024
+
+
+class WhisperClient:
+    """
+    프로그램이 실행되는 동안 유지되는 OpenAI 클라이언트 (openai 1.x).
+
+    하나의 httpx.Client 연결 풀을 계속 사용하므로 녹음마다 DNS 조회와 TCP/TLS 연결을 새로 하지 않고,
+    prewarm()으로 단축키를 누르는 순간 연결을 미리 열어 두면 녹음이 끝났을 때 바로 업로드할 수 있습니다.
+    """
+
+    def __init__(self, api_key, base_url=None, connect_timeout=5.0, read_timeout=60.0,
+                 write_timeout=30.0, pool_timeout=5.0, max_connections=8, keepalive_expiry=90.0,
+                 verify=True, max_retries=0, on_upload=None):
+        if openai is None or httpx is None:
+            raise RuntimeError("WhisperClient를 사용하려면 openai(1.x)와 httpx가 필요합니다.")
+        self.api_key = api_key
+        self.base_url = (base_url or DEFAULT_BASE_URL).rstrip("/")
+        self.keepalive_expiry = keepalive_expiry
+        self.on_upload = on_upload      # 요청 본문을 다 보낼 때마다 (바이트 수, 초)로 호출 (요청 스레드)
+        self.http = httpx.Client(
+            timeout=httpx.Timeout(connect=connect_timeout, read=read_timeout,
+                                  write=write_timeout, pool=pool_timeout),
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_connections,
+                                keepalive_expiry=keepalive_expiry),
+            verify=verify,
+            event_hooks={"request": [self._trace_upload]},
+        )
+        # 재시도는 호출하는 쪽에서 결정하므로 SDK 자체 재시도는 기본적으로 끔
+        self.client = openai.OpenAI(api_key=api_key, base_url=self.base_url,
+                                    http_client=self.http, max_retries=max_retries)
+        self._last_used = None          # 마지막으로 연결을 사용한 시각 (time.monotonic)
+        self._prewarm_lock = threading.Lock()
+        self.prewarm_count = 0
+
+    def _trace_upload(self, request):
+        """
+        요청 본문을 보내는 데 걸린 시간만 httpcore trace로 측정합니다.
+
+        응답 시간에는 서버 처리 시간, 재시도, 중복 요청 대기가 섞여 있어 업로드 처리량을 실제보다 훨씬 낮게 보므로
+        본문 전송 시작부터 끝까지만 잽니다.
+        """
+        if self.on_upload is None:
+            return
+        try:
+            nbytes = int(request.headers.get("content-length", 0))
+        except ValueError:
+            return
+        if nbytes < MIN_UPLOAD_SAMPLE_BYTES:
+            return
+        started = []
+
+        def trace(event_name, info):
+            if event_name.endswith("send_request_body.started"):
+                started.append(time.perf_counter())
+            elif event_name.endswith("send_request_body.complete") and started:
+                try:
+                    self.on_upload(nbytes, time.perf_counter() - started[0])
+                except Exception as e:
+                    logging.debug(f"업로드 처리량 기록 오류: {str(e)}")
+
+        request.extensions["trace"] = trace
+
+    def _touch(self):
+        self._last_used = time.monotonic()
+
+    @property
+    def is_warm(self):
+        """유지 중인 연결이 아직 살아 있을 가능성이 높은지 (keepalive_expiry의 절반 이내에 사용)"""
+        return self._last_used is not None and time.monotonic() - self._last_used < self.keepalive_expiry / 2
+
+    def prewarm(self, force=False):
+        """
+        API 서버와의 연결을 백그라운드에서 미리 엽니다 (즉시 반환).
+
+        인증이 필요 없는 HEAD 요청으로 DNS, TCP, TLS 연결만 맺어 풀에 넣어 두며,
+        응답 코드는 무시합니다. 이미 연결이 살아 있으면 아무것도 하지 않습니다.
+        """
+        if not force and self.is_warm:
+            return False
+        if not self._prewarm_lock.acquire(blocking=False):
+            return False  # 이미 연결 중
+        thread = threading.Thread(target=self._prewarm, name="WhisperPrewarm", daemon=True)
+        thread.start()
+        return True
+
+    def _prewarm(self):
+        try:
+            start = time.perf_counter()
+            self.http.head(self.base_url + "/models")
+            self._touch()
+            self.prewarm_count += 1
+            logging.info(f"API 연결 미리 열기 완료: {(time.perf_counter() - start) * 1000:.0f}ms")
+        except Exception as e:
+            logging.warning(f"API 연결 미리 열기 실패: {str(e)}")
+        finally:
+            self._prewarm_lock.release()
+
+    def transcribe(self, audio_bytes, filename, model=DEFAULT_MODEL, timeout=None, **params):
+        """메모리의 오디오를 전사하고 텍스트를 반환합니다 (timeout: 이번 요청의 시간 제한, 초)."""
+        if timeout is not None:
+            params["timeout"] = timeout
+        try:
+            result = self.client.audio.transcriptions.create(
+                file=(filename, audio_bytes), model=model, **params)
+        finally:
+            self._touch()
+        return result.text
+
+    def transcribe_verbose(self, audio_bytes, filename, model=DEFAULT_MODEL, timeout=None, **params):
+        """verbose_json으로 전사하고 (텍스트, 감지된 언어 이름)을 반환합니다."""
+        if timeout is not None:
+            params["timeout"] = timeout
+        params["response_format"] = "verbose_json"
+        try:
+            result = self.client.audio.transcriptions.create(
+                file=(filename, audio_bytes), model=model, **params)
+        finally:
+            self._touch()
+        return result.text, getattr(result, "language", None)
+
+    def close(self):
+        self.http.close()
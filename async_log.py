@@ -0,0 +1,329 @@
+# async_log.py - 작업 스레드는 대기열에 넣기만 하고 백그라운드 스레드 하나가 파일별로 모아서 쓰는 로그 기록
+
+import datetime
+import logging
+import os
+import queue
+import shutil
+import sys
+import threading
+import time
+
+
+_FLUSH = object()       # 대기열 표시: 여기까지 쓴 뒤 알림
+_CLOSE = object()       # 대기열 표시: 다 쓴 뒤 종료
+
+
+def console_line(created, message):
+    """콘솔 로그 한 줄 형식 ([시:분:초] 메시지)"""
+    return f"[{datetime.datetime.fromtimestamp(created).strftime('%H:%M:%S')}] {message}"
+
+
+class LogTarget:
+    """
+    로그 파일 하나 (쓰기 스레드만 핸들을 다룸).
+
+    max_bytes를 넘거나 파일을 연 지 max_age_seconds가 지나면 회전합니다. next_path가 있으면 새 경로의 파일로 넘어가고
+    (이전 파일은 그대로 남아 압축/정리 대상이 됨), 없으면 같은 경로를 유지한 채 내용을 '경로.1'로 복사하고 비웁니다.
+    같은 경로를 유지하면 콘솔 창처럼 파일을 열어 둔 채 이어 읽는 프로그램이 계속 따라올 수 있습니다.
+    """
+
+    def __init__(self, name, path, formatter=None, echo=False, header=None, max_bytes=None,
+                 max_age_seconds=None, next_path=None):
+        self.name = name
+        self.path = path
+        self.formatter = formatter      # (기록 시각, 메시지) → 줄, None이면 메시지 그대로
+        self.echo = echo                # 표준 출력에도 씀
+        self.header = header            # 처음 열 때 파일을 비우고 쓸 내용 (None이면 이어 씀)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.next_path = next_path      # 회전할 때 새 파일 경로를 만드는 함수
+        self.handle = None
+        self.opened_at = None
+        self.size = 0
+        self.rotations = 0
+        self.reopen = False
+        self.dropped = 0                # 아직 요약하지 않은 버린 줄 수
+        self.dropped_total = 0
+        self.written = 0
+
+
+class AsyncLogWriter:
+    """
+    여러 로그 파일의 줄을 대기열 하나로 받아 백그라운드 스레드 하나가 파일별로 모아서 씁니다.
+
+    write()는 대기열에 넣기만 하므로 녹음/전사 스레드가 파일 열기, 디스크 쓰기, 콘솔 출력을 기다리지 않습니다.
+    쓰기 스레드는 대기열에 쌓인 줄을 batch_size개까지 꺼내 파일마다 write() 한 번으로 쓰고 바로 flush하므로
+    콘솔 창의 실시간 보기에도 곧바로 나타납니다. 대기열이 max_queue를 넘으면 중요하지 않은 줄은 버리고,
+    버린 줄 수를 해당 파일에 한 줄로 요약해 남깁니다. 중요한 줄(경고 이상)은 block_timeout초까지 자리를 기다립니다.
+    """
+
+    def __init__(self, max_queue=10000, batch_size=512, block_timeout=0.05, on_rotate=None):
+        self.batch_size = batch_size
+        self.on_rotate = on_rotate      # 회전 뒤 (이름, 회전된 파일 경로)로 호출 (쓰기 스레드, 빨리 끝나야 함)
+        self.block_timeout = block_timeout
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._targets = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self.batch_count = 0
+
+    def add_target(self, name, path, formatter=None, echo=False, header=None, **rotation):
+        """로그 파일을 등록합니다 (같은 이름이면 경로를 바꿔 다시 엶). rotation은 LogTarget의 회전 설정입니다."""
+        with self._lock:
+            target = self._targets.get(name)
+            if target is None:
+                self._targets[name] = LogTarget(name, path, formatter, echo, header, **rotation)
+            else:
+                for key, value in rotation.items():
+                    setattr(target, key, value)
+                # 쓰기 스레드가 다음 묶음을 쓸 때 새 경로로 다시 엶
+                target.path, target.formatter, target.echo, target.header = path, formatter, echo, header
+                target.reopen = True
+        self._start()
+
+    def _start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="LogWriter", daemon=True)
+            self._thread.start()
+
+    def write(self, name, message, important=False):
+        """줄 하나를 대기열에 넣습니다 (대기열이 가득 차면 버리고 False)."""
+        item = (name, time.time(), message)
+        try:
+            if important:
+                self._queue.put(item, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            target = self._targets.get(name)
+            if target is not None:
+                with self._lock:
+                    target.dropped += 1
+                    target.dropped_total += 1
+            return False
+
+    def flush(self, timeout=5.0):
+        """지금까지 넣은 줄이 모두 쓰일 때까지 기다립니다 (시간 안에 끝나면 True)."""
+        done = threading.Event()
+        try:
+            self._queue.put((_FLUSH, None, done), timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        """남은 줄을 모두 쓰고 파일을 닫습니다."""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        try:
+            self._queue.put((_CLOSE, None, None), timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+    def active_paths(self):
+        """지금 쓰고 있는 파일 경로 (정리에서 제외)"""
+        with self._lock:
+            return {os.path.abspath(t.path) for t in self._targets.values()}
+
+    def stats(self):
+        """파일별 (쓴 줄 수, 버린 줄 수)"""
+        with self._lock:
+            return {name: (t.written, t.dropped_total) for name, t in self._targets.items()}
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            closing = self._write_batch(batch)
+            if closing:
+                self._close_handles()
+                return
+
+    def _write_batch(self, batch):
+        lines = {}
+        notify = []
+        closing = False
+        for name, created, message in batch:
+            if name is _FLUSH:
+                notify.append(message)
+                continue
+            if name is _CLOSE:
+                closing = True
+                continue
+            target = self._targets.get(name)
+            if target is None:
+                continue
+            lines.setdefault(name, []).append(target.formatter(created, message) if target.formatter else message)
+        with self._lock:
+            targets = list(self._targets.values())
+        for target in targets:
+            with self._lock:
+                dropped, target.dropped = target.dropped, 0
+            if dropped:
+                lines.setdefault(target.name, []).append(f"... 로그 {dropped}줄 생략 (기록 대기열이 가득 참)")
+            if target.name in lines:
+                self._write_target(target, lines[target.name])
+        self.batch_count += 1
+        for event in notify:
+            event.set()
+        return closing
+
+    def _write_target(self, target, lines):
+        text = "\n".join(lines) + "\n"
+        if target.echo and sys.stdout is not None:
+            try:
+                sys.stdout.write(text)
+                sys.stdout.flush()
+            except Exception:
+                pass
+        try:
+            # 회전은 쓰기 전에 (회전 직후에도 파일이 비어 있지 않도록)
+            if target.handle is not None and self._due(target):
+                self._rotate(target)
+            if target.handle is None or target.reopen:
+                self._open(target)
+            target.handle.write(text)
+            target.handle.flush()
+            target.written += len(lines)
+            target.size = target.handle.tell()
+        except Exception as e:
+            # 파일에 쓸 수 없으면 (다른 프로그램이 잠금 등) 다음 묶음에서 다시 엶
+            target.handle = None
+            if sys.stderr is not None:
+                sys.stderr.write(f"로그 기록 오류 ({target.path}): {str(e)}\n")
+
+    def _open(self, target):
+        if target.handle is not None:
+            target.handle.close()
+        target.reopen = False
+        directory = os.path.dirname(target.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        if target.header is not None:
+            target.handle = open(target.path, "w", encoding="utf-8")
+            target.handle.write(target.header)
+            target.header = None
+        else:
+            target.handle = open(target.path, "a", encoding="utf-8")
+        target.opened_at = time.time()
+        target.size = target.handle.tell()
+
+    def _due(self, target):
+        if target.max_bytes and target.size >= target.max_bytes:
+            return True
+        return bool(target.max_age_seconds) and time.time() - target.opened_at >= target.max_age_seconds
+
+    def _rotate(self, target):
+        """파일을 닫고 회전합니다."""
+        target.handle.close()
+        target.handle = None
+        if target.next_path is not None:
+            rotated = target.path
+            target.path = target.next_path()
+        else:
+            # 보기 프로그램이 열어 둔 파일은 이름을 바꿀 수 없으므로 (Windows) 복사한 뒤 비움
+            rotated = target.path + ".1"
+            shutil.copyfile(target.path, rotated)
+            open(target.path, "w", encoding="utf-8").close()
+        target.rotations += 1
+        if self.on_rotate is not None:
+            try:
+                self.on_rotate(target.name, rotated)
+            except Exception as e:
+                if sys.stderr is not None:
+                    sys.stderr.write(f"로그 회전 알림 오류: {str(e)}\n")
+
+    def _close_handles(self):
+        for target in self._targets.values():
+            if target.handle is not None:
+                try:
+                    target.handle.close()
+                except Exception:
+                    pass
+                target.handle = None
+
+
+class QueueLogHandler(logging.Handler):
+    """
+    logging 기록을 AsyncLogWriter 대기열에 넣는 핸들러 (경고 이상은 버리지 않도록 잠시 기다림).
+
+    호출한 스레드에서는 메시지 인자만 합치고, 시각과 형식을 붙이는 일은 쓰기 스레드에서 합니다.
+    대상 파일은 formatter=handler.format_record로 등록합니다.
+    """
+
+    def __init__(self, writer, target):
+        super().__init__()
+        self.writer = writer
+        self.target = target
+
+    def emit(self, record):
+        try:
+            # 인자로 넘긴 객체가 나중에 바뀌어도 기록 시점의 내용이 남도록 (logging.handlers.QueueHandler와 같음)
+            record.msg = record.getMessage()
+            record.args = None
+            if record.exc_info:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+                record.exc_info = None
+            self.writer.write(self.target, record, important=record.levelno >= logging.WARNING)
+        except Exception:
+            self.handleError(record)
+
+    def format_record(self, created, record):
+        return self.format(record)
+
+
+class CallbackProblemLog:
+    """
+    실시간 콜백(PortAudio 녹음 콜백)에서 생긴 문제를 세기만 하고, 로그는 보고 스레드에서 남깁니다.
+
+    QueueLogHandler는 대기열이 가득 차면 경고를 block_timeout초까지 기다리므로 콜백에서 바로 기록하면
+    오디오 스레드가 멈춰 다음 블록을 놓칠 수 있습니다. note()는 (수준, 메시지)별 횟수만 올리고,
+    보고 스레드가 interval초마다 그 사이 쌓인 문제를 한 줄씩 기록합니다.
+    """
+
+    def __init__(self, interval=1.0, logger=None):
+        self.interval = interval
+        self.logger = logger or logging.getLogger()
+        self._counts = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.noted_count = 0
+
+    def note(self, message, level=logging.WARNING):
+        """콜백에서 호출: 횟수만 올립니다 (파일, 대기열을 기다리지 않음)."""
+        with self._lock:
+            key = (level, message)
+            self._counts[key] = self._counts.get(key, 0) + 1
+            self.noted_count += 1
+
+    def report(self):
+        """지난 보고 뒤 쌓인 문제를 기록하고 {(수준, 메시지): 횟수}를 반환합니다."""
+        with self._lock:
+            counts, self._counts = self._counts, {}
+        for (level, message), count in counts.items():
+            self.logger.log(level, message if count == 1 else f"{message} ({count}회)")
+        return counts
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="CallbackProblemLog", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.report()
+
+    def stop(self):
+        """보고 스레드를 멈추고 남은 문제를 기록합니다."""
+        self._stop.set()
+        self.report()
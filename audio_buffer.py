@@ -0,0 +1,128 @@
+# audio_buffer.py - 녹음 데이터 버퍼
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class CaptureBuffer:
+    """
+    녹음 콜백이 블록마다 새 배열을 만들지 않고 기록하는 고정 크기 조각 버퍼.
+
+    block_seconds 길이의 조각을 미리 할당해 채우고, 다 차면 새 조각을 붙이기만 하므로
+    녹음이 길어져도 콜백이 앞서 기록한 오디오를 복사하지 않습니다.
+    콜백 스레드 하나만 write()를 호출하고, 다른 스레드는 view()로 지금까지 기록된 구간을 읽습니다.
+    구간이 조각 하나 안에 있으면 복사 없는 뷰를, 여러 조각에 걸치면 읽는 쪽에서 이어 붙인 배열을 반환합니다.
+    """
+
+    def __init__(self, samplerate=16000, channels=1, dtype="int16", block_seconds=30.0):
+        if np is None:
+            raise RuntimeError("CaptureBuffer를 사용하려면 numpy가 필요합니다.")
+        self.samplerate = samplerate
+        self.channels = channels
+        self.dtype = np.dtype(dtype)
+        self.block_frames = max(1, int(samplerate * block_seconds))
+        self._blocks = [self._new_block()]
+        self._length = 0
+        self.grow_count = 0
+
+    def __len__(self):
+        return self._length
+
+    @property
+    def capacity(self):
+        return len(self._blocks) * self.block_frames
+
+    @property
+    def duration(self):
+        """기록된 길이(초)"""
+        return self._length / float(self.samplerate)
+
+    def _new_block(self):
+        return np.empty((self.block_frames, self.channels), dtype=self.dtype)
+
+    def write(self, block):
+        """블록(frames x channels)을 버퍼 끝에 복사합니다 (조각이 다 차면 새 조각을 붙임)."""
+        frames = block.shape[0]
+        written = 0
+        length = self._length
+        while written < frames:
+            index, offset = divmod(length + written, self.block_frames)
+            if index == len(self._blocks):
+                # 조각 목록에 먼저 추가한 뒤 길이를 갱신해야 읽는 쪽이 항상 유효한 구간을 봅니다
+                self._blocks.append(self._new_block())
+                self.grow_count += 1
+            count = min(frames - written, self.block_frames - offset)
+            self._blocks[index][offset:offset + count] = block[written:written + count]  # dtype이 다르면 여기서 변환
+            written += count
+        self._length = length + frames
+
+    def view(self, start=0, end=None):
+        """
+        기록된 구간 [start, end)를 반환합니다.
+
+        조각 하나 안의 구간은 복사 없는 뷰이고, 조각 경계를 넘으면 이어 붙인 새 배열입니다 (읽는 스레드에서 복사).
+        """
+        length = self._length
+        if end is None or end > length:
+            end = length
+        start = min(max(0, start), end)
+        first, offset = divmod(start, self.block_frames)
+        last = (end - 1) // self.block_frames if end > start else first
+        blocks = self._blocks[first:last + 1]
+        if len(blocks) <= 1:
+            if not blocks:
+                return np.empty((0, self.channels), dtype=self.dtype)
+            return blocks[0][offset:offset + end - start]
+        parts = [blocks[0][offset:]] + blocks[1:-1] + [blocks[-1][:end - last * self.block_frames]]
+        return np.concatenate(parts, axis=0)
+
+    def reset(self):
+        """할당된 조각은 유지한 채 길이만 0으로 되돌립니다."""
+        self._length = 0
+
+
+class PreRollRing:
+    """항상 대기 모드에서 최근 오디오(프리롤)를 보관하는 고정 크기 링 버퍼"""
+
+    def __init__(self, frames, channels=1, dtype="int16"):
+        if np is None:
+            raise RuntimeError("PreRollRing을 사용하려면 numpy가 필요합니다.")
+        self._data = np.zeros((max(1, int(frames)), channels), dtype=np.dtype(dtype))
+        self._pos = 0
+        self._filled = 0
+
+    def __len__(self):
+        return self._filled
+
+    def write(self, block):
+        """블록을 링에 기록합니다. 오래된 데이터는 덮어씁니다."""
+        capacity = self._data.shape[0]
+        frames = block.shape[0]
+        if frames >= capacity:
+            self._data[:] = block[-capacity:]
+            self._pos = 0
+            self._filled = capacity
+            return
+        end = self._pos + frames
+        if end <= capacity:
+            self._data[self._pos:end] = block
+        else:
+            first = capacity - self._pos
+            self._data[self._pos:] = block[:first]
+            self._data[:frames - first] = block[first:]
+        self._pos = end % capacity
+        self._filled = min(capacity, self._filled + frames)
+
+    def drain_to(self, buffer):
+        """링 내용을 오래된 순서로 buffer에 기록하고 링을 비웁니다. 기록한 프레임 수를 반환합니다."""
+        filled = self._filled
+        if filled < self._data.shape[0]:
+            buffer.write(self._data[:filled])
+        else:
+            buffer.write(self._data[self._pos:])
+            buffer.write(self._data[:self._pos])
+        self._pos = 0
+        self._filled = 0
+        return filled
@@ -0,0 +1,212 @@
+# audio_chunker.py - 업로드 크기 제한을 넘는 긴 녹음을 쉼에서 나눠 동시에 전사하고 결과를 합침
+
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from audio_codecs import CODECS, DEFAULT_CODEC
+from segmented_transcriber import encode_bytes
+from vad import frame_features
+
+
+MAX_UPLOAD_BYTES = 25 * 1024 * 1024     # Whisper API 파일 크기 제한
+SIZE_MARGIN = 0.9                       # 컨테이너 헤더와 압축되지 않는 잡음 구간을 위한 여유
+QUIET_WINDOW_MS = 300                   # 자를 위치를 찾을 때 레벨을 평균하는 길이 (쉼 한가운데를 찾음)
+SEARCH_MS = 30000                       # 나누는 위치 앞뒤로 쉼을 찾는 범위
+QUIET_MARGIN_DB = 3.0                   # 가장 조용한 곳과 이 차이 이내면 나누는 위치에 가까운 쪽을 고름
+
+
+def max_chunk_seconds(max_bytes, samplerate, channels=1, sample_bytes=2):
+    """
+    인코딩 결과가 max_bytes를 넘지 않는 구간 길이 (초).
+
+    무손실 코덱도 PCM보다 커지지는 않으므로 PCM 크기 기준으로 정하면 인코딩 전에 크기를 보장할 수 있습니다.
+    """
+    return max_bytes * SIZE_MARGIN / float(samplerate * channels * sample_bytes)
+
+
+def plan_chunks(audio, samplerate, target_seconds, max_seconds, overlap_ms=1000, search_ms=SEARCH_MS):
+    """
+    녹음을 나눌 구간 목록 [(시작, 끝), ...] (샘플 단위, 끝 미포함).
+
+    남은 길이를 target_seconds에 가까운 같은 길이로 나누는 위치 앞뒤 search_ms 안에서 가장 조용한 곳(쉼 한가운데)을 골라 자르고,
+    다음 구간은 자른 곳보다 overlap_ms 앞에서 시작합니다. 겹친 부분을 포함해도 구간 길이는 max_seconds를 넘지 않습니다.
+    """
+    total = len(audio)
+    max_frames = int(max_seconds * samplerate)
+    overlap = int(overlap_ms / 1000.0 * samplerate)
+    target = max(overlap * 2, min(int(target_seconds * samplerate), max_frames - overlap))
+
+    def pieces(remaining):
+        return max(-(-remaining // max_frames), int(round(remaining / float(target))))
+
+    if pieces(total) <= 1:
+        return [(0, total)]
+    level_db, _, frame_len = frame_features(audio, samplerate)
+    window = max(1, int(QUIET_WINDOW_MS / 1000.0 * samplerate / frame_len))
+    smoothed = np.convolve(level_db, np.ones(window) / window, mode="same") if len(level_db) >= window else level_db
+
+    chunks = []
+    start = 0
+    while pieces(total - start) > 1:
+        length = (total - start) // pieces(total - start)
+        search = min(length // 4, int(search_ms / 1000.0 * samplerate))
+        ideal = start + length
+        low = max(start + overlap + 1, ideal - search)
+        high = min(start + max_frames, ideal + search)
+        first, last = low // frame_len + 1, max(low // frame_len + 2, high // frame_len)
+        candidates = smoothed[first:last]
+        if len(candidates):
+            quiet = np.flatnonzero(candidates <= candidates.min() + QUIET_MARGIN_DB) + first
+            cut = int(quiet[np.argmin(np.abs(quiet * frame_len - ideal))]) * frame_len
+        else:
+            cut = ideal
+        cut = min(max(cut, start + overlap + 1), start + max_frames)
+        chunks.append((start, cut))
+        start = cut - overlap
+    chunks.append((start, total))
+    return chunks
+
+
+def encode_chunk(audio, samplerate, codec=None, max_bytes=MAX_UPLOAD_BYTES):
+    """구간을 인코딩합니다. 그래도 max_bytes를 넘으면 반으로 나눠 인코딩한 목록을 반환합니다."""
+    data = encode_bytes(audio, samplerate, codec)
+    if len(data) <= max_bytes or len(audio) < samplerate:
+        return [data]
+    middle = len(audio) // 2
+    logging.warning(f"구간 인코딩 결과가 제한을 넘어 반으로 나눔: {len(data)} 바이트")
+    return encode_chunk(audio[:middle], samplerate, codec, max_bytes) + \
+        encode_chunk(audio[middle:], samplerate, codec, max_bytes)
+
+
+def encode_chunks(audio, samplerate, codec=None, max_bytes=MAX_UPLOAD_BYTES, target_seconds=None,
+                  max_seconds=600.0, overlap_ms=1000):
+    """녹음 전체를 나눠 인코딩한 목록 (batch_transcribe처럼 디코딩 프로세스에서 한 번에 준비할 때 사용)"""
+    channels = audio.shape[1] if audio.ndim > 1 else 1
+    max_seconds = min(max_seconds, max_chunk_seconds(max_bytes, samplerate, channels, audio.dtype.itemsize))
+    result = []
+    for start, end in plan_chunks(audio, samplerate, target_seconds or max_seconds, max_seconds, overlap_ms):
+        result.extend(encode_chunk(audio[start:end], samplerate, codec, max_bytes))
+    return result
+
+
+def _normalize(word):
+    return re.sub(r"[^\w]", "", word.lower())
+
+
+def _boundary_overlap(previous, words, max_words):
+    """
+    (앞 결과 끝에서 버릴 단어 수, 뒤 결과 앞에서 버릴 단어 수).
+
+    앞 결과의 끝 k단어와 뒤 결과의 첫 k단어가 (대소문자, 문장 부호를 무시하고) 같으면 가장 긴 k를 고릅니다.
+    쉼이 없어 단어 중간에서 잘렸으면 앞 결과의 마지막 단어가 잘린 조각일 수 있으므로, 그 단어를 빼고도 비교합니다.
+    겹친 부분은 1초 남짓이므로 뒤 결과 전체가 반복으로 보여도 마지막 단어는 남깁니다.
+    """
+    tail = [_normalize(w) for w in previous[-(max_words + 1):]]
+    head = [_normalize(w) for w in words[:min(max_words, len(words) - 1)]]
+    for drop in (0, 1):
+        candidate = tail[:len(tail) - drop] if drop else tail
+        for k in range(min(len(candidate), len(head)), 0 if not drop else 1, -1):
+            if candidate[-k:] == head[:k] and all(candidate[-k:]):
+                return drop, k
+    return 0, 0
+
+
+def merge_transcripts(texts, max_overlap_words=8):
+    """
+    구간 결과를 순서대로 이어 붙이고, 겹친 부분 때문에 경계에서 반복된 단어를 한 번만 남깁니다.
+
+    단어 사이의 줄바꿈과 공백은 결과에 있던 그대로 두고, 경계에는 원래 있던 구분자(겹친 단어 뒤의 구분자,
+    없으면 앞 결과의 끝과 뒤 결과의 앞 공백)를 넣습니다. 구분자가 전혀 없으면 공백 하나로 잇습니다.
+    """
+    merged = ""
+    spans = []          # merged 안의 단어 위치 (시작, 끝)
+    pending = ""        # merged의 마지막 단어 뒤에 올 구분자 (앞 결과 끝의 공백)
+    for text in texts:
+        text = text or ""
+        found = [(m.start(), m.end()) for m in re.finditer(r"\S+", text)]
+        if not found:
+            continue
+        words = [text[start:end] for start, end in found]
+        drop, skip = (0, 0)
+        if spans:
+            drop, skip = _boundary_overlap([merged[start:end] for start, end in spans], words, max_overlap_words)
+        if drop:
+            pending = merged[spans[-drop - 1][1]:spans[-drop][0]] if len(spans) > drop else ""
+            merged = merged[:spans[-drop - 1][1]] if len(spans) > drop else ""
+            del spans[-drop:]
+        if spans:
+            if skip:
+                separator = text[found[skip - 1][1]:found[skip][0]]
+            else:
+                separator = pending + text[:found[0][0]]
+            merged += separator or " "
+        offset = len(merged) - found[skip][0]
+        spans.extend((start + offset, end + offset) for start, end in found[skip:])
+        merged += text[found[skip][0]:found[-1][1]]
+        pending = text[found[-1][1]:]
+    return merged
+
+
+class ChunkedTranscriber:
+    """
+    업로드 크기 제한을 넘는 녹음을 구간으로 나눠 동시에 전사합니다.
+
+    구간 길이는 녹음 길이를 max_workers로 나눈 값(min_chunk_seconds 이상, 크기 제한 이하)이므로
+    긴 녹음도 구간이 모두 동시에 전사되어, 전체 시간은 녹음 길이보다 동시 요청 수에 따라 정해집니다.
+    transcribe(audio_bytes, name)는 워커 스레드에서 호출되며 텍스트를 반환해야 합니다.
+    구간 인코딩도 워커 스레드에서 하므로 첫 요청이 전체 인코딩을 기다리지 않습니다.
+    """
+
+    def __init__(self, transcribe, max_workers=4, max_bytes=MAX_UPLOAD_BYTES, max_chunk_seconds=600.0,
+                 min_chunk_seconds=30.0, overlap_ms=1000, codec=None):
+        if np is None:
+            raise RuntimeError("ChunkedTranscriber를 사용하려면 numpy가 필요합니다.")
+        self.transcribe = transcribe
+        self.max_workers = max(1, max_workers)
+        self.max_bytes = max_bytes
+        self.max_chunk_seconds = max_chunk_seconds
+        self.min_chunk_seconds = min_chunk_seconds
+        self.overlap_ms = overlap_ms
+        self.codec = codec or CODECS[DEFAULT_CODEC]
+        self.chunk_count = 0
+
+    def plan(self, audio, samplerate):
+        channels = audio.shape[1] if audio.ndim > 1 else 1
+        limit = min(self.max_chunk_seconds, max_chunk_seconds(self.max_bytes, samplerate, channels,
+                                                                audio.dtype.itemsize))
+        seconds = len(audio) / float(samplerate)
+        target = min(limit, max(self.min_chunk_seconds, seconds / self.max_workers))
+        return plan_chunks(audio, samplerate, target, limit, self.overlap_ms)
+
+    def _transcribe_chunk(self, audio, samplerate, name):
+        stem, extension = os.path.splitext(name)
+        parts = encode_chunk(audio, samplerate, self.codec, self.max_bytes)
+        texts = [self.transcribe(data, f"{stem}_{i}{extension}" if len(parts) > 1 else name)
+                 for i, data in enumerate(parts)]
+        return merge_transcripts(texts)
+
+    def transcribe_audio(self, audio, samplerate, name):
+        """녹음을 나눠 동시에 전사하고 녹음 순서대로 합친 텍스트를 반환합니다 (구간 하나라도 실패하면 예외)."""
+        chunks = self.plan(audio, samplerate)
+        self.chunk_count = len(chunks)
+        stem = os.path.splitext(name)[0]
+        logging.info(f"긴 녹음 분할 전사: {len(audio) / float(samplerate):.0f}초 → {len(chunks)}개 구간")
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks)),
+                                thread_name_prefix="Chunk") as pool:
+            futures = [pool.submit(self._transcribe_chunk, audio[start:end], samplerate,
+                                   f"{stem}_part{i}{self.codec.extension}")
+                       for i, (start, end) in enumerate(chunks)]
+            try:
+                texts = [future.result() for future in futures]
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
+        return merge_transcripts(texts)
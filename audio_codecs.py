@@ -0,0 +1,124 @@
+# audio_codecs.py - 업로드용 오디오 코덱과 자동 선택 정책
+
+import inspect
+import logging
+import threading
+from collections import namedtuple
+
+try:
+    import soundfile
+except ImportError:
+    soundfile = None
+
+
+# name: 설정 파일에 쓰는 이름, format/subtype: soundfile 인자, extension: 업로드/보관 파일 확장자
+# bytes_per_second: 16kHz 모노 음성 기준 예상 크기 (실제 인코딩 결과로 계속 보정됨)
+# lossless: 무손실 여부 (절약 효과가 작으면 무손실 코덱을 우선)
+Codec = namedtuple("Codec", ["name", "format", "subtype", "extension", "bytes_per_second", "lossless"])
+
+CODECS = {
+    "flac": Codec("flac", "FLAC", "PCM_16", ".flac", 16000, True),
+    "flac_low": Codec("flac_low", "FLAC", "PCM_S8", ".flac", 5000, False),   # 8비트 FLAC
+    "vorbis": Codec("vorbis", "OGG", "VORBIS", ".ogg", 4500, False),
+    "opus": Codec("opus", "OGG", "OPUS", ".ogg", 3500, False),
+}
+
+DEFAULT_CODEC = "flac"
+# 자동 선택 후보 (8비트 FLAC은 신호 대 잡음비가 약 23dB라 인식률이 떨어지므로 직접 지정할 때만 사용)
+AUTO_CODECS = ("flac", "vorbis", "opus")
+
+
+def available_codecs():
+    """현재 libsndfile로 인코딩할 수 있는 코덱 이름 목록"""
+    if soundfile is None:
+        return []
+    names = []
+    for name, codec in CODECS.items():
+        try:
+            if codec.subtype in soundfile.available_subtypes(codec.format):
+                names.append(name)
+        except Exception:
+            continue
+    return names
+
+
+def supports_compression_level():
+    """설치된 soundfile이 compression_level 인자를 지원하는지 (0.13 이상)"""
+    if soundfile is None:
+        return False
+    try:
+        return "compression_level" in inspect.signature(soundfile.SoundFile.__init__).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def open_encoder(codec, target, samplerate, channels, compression_level=None):
+    """코덱에 맞는 쓰기용 SoundFile을 엽니다."""
+    kwargs = {}
+    if compression_level is not None and supports_compression_level():
+        kwargs["compression_level"] = compression_level
+    return soundfile.SoundFile(target, mode="w", samplerate=samplerate, channels=channels,
+                               format=codec.format, subtype=codec.subtype, **kwargs)
+
+
+class CodecSelector:
+    """
+    최근 업로드 처리량을 측정해 업로드 코덱을 자동으로 고릅니다.
+
+    처리량은 요청 본문을 보내는 데 걸린 시간으로만 계산합니다 (서버 처리 시간, 재시도 대기 제외).
+    코덱마다 (녹음 길이 x 초당 바이트 / 처리량)으로 예상 업로드 시간을 계산하고,
+    무손실 FLAC보다 min_saving_ms 이상 빨라질 때만 압축 코덱을 사용합니다.
+    """
+
+    def __init__(self, preferred="auto", allowed=None, expected_seconds=10.0,
+                 min_saving_ms=150.0, smoothing=0.3):
+        self.preferred = preferred
+        available = available_codecs()
+        self.allowed = [c for c in (allowed or AUTO_CODECS) if c in available] or [DEFAULT_CODEC]
+        self.expected_seconds = expected_seconds   # 아직 길이를 모를 때 가정하는 녹음 길이
+        self.min_saving_ms = min_saving_ms
+        self.smoothing = smoothing
+        self.throughput = None                     # 바이트/초 (지수 이동 평균)
+        self._bytes_per_second = {name: CODECS[name].bytes_per_second for name in CODECS}
+        self._lock = threading.Lock()
+
+    def record_upload(self, nbytes, seconds):
+        """업로드 크기와 본문 전송에 걸린 시간으로 처리량 추정치를 갱신합니다."""
+        if nbytes <= 0 or seconds <= 0:
+            return
+        sample = nbytes / seconds
+        with self._lock:
+            if self.throughput is None:
+                self.throughput = sample
+            else:
+                self.throughput += self.smoothing * (sample - self.throughput)
+
+    def record_encoding(self, codec_name, nbytes, audio_seconds):
+        """실제 인코딩 결과로 코덱의 초당 바이트 추정치를 보정합니다."""
+        if audio_seconds <= 0 or codec_name not in self._bytes_per_second:
+            return
+        with self._lock:
+            current = self._bytes_per_second[codec_name]
+            self._bytes_per_second[codec_name] = current + self.smoothing * (nbytes / audio_seconds - current)
+
+    def estimate_upload_ms(self, codec_name, audio_seconds):
+        if self.throughput is None:
+            return None
+        return audio_seconds * self._bytes_per_second[codec_name] / self.throughput * 1000.0
+
+    def choose(self, audio_seconds=None):
+        """다음 녹음에 사용할 코덱을 반환합니다."""
+        if self.preferred != "auto":
+            name = self.preferred if self.preferred in self.allowed else DEFAULT_CODEC
+            return CODECS[name]
+        if self.throughput is None:
+            return CODECS[DEFAULT_CODEC]
+
+        seconds = audio_seconds or self.expected_seconds
+        estimates = {name: self.estimate_upload_ms(name, seconds) for name in self.allowed}
+        best = min(estimates, key=estimates.get)
+        baseline = estimates.get(DEFAULT_CODEC)
+        if baseline is not None and baseline - estimates[best] < self.min_saving_ms:
+            best = DEFAULT_CODEC
+        logging.debug(f"코덱 선택: {best} (처리량 {self.throughput / 1024:.0f}KB/s, 예상 {estimates})")
+        return CODECS[best]
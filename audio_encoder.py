@@ -0,0 +1,149 @@
+# audio_encoder.py - 녹음 중 백그라운드 점진적 인코딩
+
+import logging
+import os
+import threading
+from collections import namedtuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import soundfile
+except ImportError:
+    soundfile = None
+
+from audio_codecs import CODECS, DEFAULT_CODEC, open_encoder
+from vad import adaptive_threshold, detect_speech, frame_features, speech_tail_end
+
+
+# 인코딩 결과: start/end는 원본 녹음 기준 샘플 위치 (end 미포함)
+EncodedTake = namedtuple("EncodedTake", ["has_speech", "target", "nbytes", "start", "end", "total_frames"])
+
+
+class StreamingEncoder:
+    """
+    CaptureBuffer에 쌓이는 오디오를 녹음 중에 백그라운드 스레드에서 인코딩합니다 (기본 FLAC).
+
+    녹음 콜백은 버퍼에 쓰기만 하고, 인코더 스레드가 주기적으로 새 구간을 읽어 압축합니다.
+    끝부분(holdback_ms)은 뒤쪽 무음 제거를 위해 남겨 두므로 녹음 종료 시에는
+    이 짧은 구간만 인코딩하면 되어, 종료 후 지연이 녹음 길이와 무관해집니다.
+    뒤쪽 무음 판단에는 인코딩하면서 모은 녹음 전체의 프레임 레벨로 구한 임계값을 씁니다.
+    """
+
+    def __init__(self, buffer, target, codec=None, vad=True, holdback_ms=1000,
+                 poll_interval=0.1, name=None):
+        if soundfile is None:
+            raise RuntimeError("StreamingEncoder를 사용하려면 soundfile이 필요합니다.")
+        self.buffer = buffer
+        self.target = target            # 파일 경로 또는 쓰기 가능한 파일 객체 (io.BytesIO 등)
+        self.name = name or (target if isinstance(target, str) else None)  # 업로드/보관용 파일 이름
+        self.codec = codec or CODECS[DEFAULT_CODEC]
+        self.vad = vad
+        self.holdback = int(buffer.samplerate * holdback_ms / 1000)
+        self.poll_interval = poll_interval
+        self._file = None
+        self._start = None if vad else 0   # 음성 시작 위치 (VAD 사용 시 음성이 감지될 때까지 None)
+        self._pos = 0                      # 다음에 인코딩할 위치
+        self._levels = []                  # 지금까지 확인한 구간의 프레임 레벨(dBFS) 배열 목록
+        self._stop = threading.Event()
+        self._thread = None
+        self.error = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="StreamingEncoder", daemon=True)
+        self._thread.start()
+        return self
+
+    def _open(self):
+        if self._file is None:
+            self._file = open_encoder(self.codec, self.target, self.buffer.samplerate, self.buffer.channels)
+
+    def _find_start(self, length):
+        """앞쪽 무음을 건너뛰고 음성이 시작되는 위치를 찾습니다."""
+        region = detect_speech(self.buffer.view(0, length), self.buffer.samplerate)
+        if region.has_speech:
+            self._start = region.start
+            self._pos = region.start
+            # 앞쪽 무음은 인코딩하지 않지만 잡음 바닥을 구하는 데 필요
+            self._levels.append(frame_features(self.buffer.view(0, region.start), self.buffer.samplerate)[0])
+
+    def _encode_until(self, end):
+        if end <= self._pos:
+            return
+        self._open()
+        audio = self.buffer.view(self._pos, end)
+        self._file.write(audio)
+        if self.vad:
+            self._levels.append(frame_features(audio, self.buffer.samplerate)[0])
+        self._pos = end
+
+    def _run(self):
+        try:
+            while not self._stop.wait(self.poll_interval):
+                length = len(self.buffer)
+                if self._start is None:
+                    self._find_start(length)
+                    if self._start is None:
+                        continue
+                self._encode_until(length - self.holdback)
+        except Exception as e:
+            self.error = e
+            logging.error(f"점진적 인코딩 오류: {str(e)}")
+
+    def finish(self):
+        """녹음 종료 후 남은 구간만 인코딩하고 파일을 닫습니다."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self.error is not None:
+            self.abort()
+            raise self.error
+
+        length = len(self.buffer)
+        samplerate = self.buffer.samplerate
+        if self._start is None:
+            # 녹음 중 음성이 감지되지 않았으면 전체를 한 번 더 확인
+            if self.vad:
+                self._find_start(length)
+            if self._start is None:
+                self.abort()
+                return EncodedTake(False, self.target, 0, 0, 0, length)
+
+        end = length
+        if self.vad and length > self._pos:
+            # 아직 인코딩하지 않은 끝부분에서 뒤쪽 무음 제거 (임계값은 녹음 전체 기준)
+            tail = self.buffer.view(self._pos, length)
+            threshold = adaptive_threshold(np.concatenate(self._levels + [frame_features(tail, samplerate)[0]]))
+            end = self._pos + speech_tail_end(tail, samplerate, threshold)
+        self._encode_until(end)
+        self._open()  # 아주 짧은 녹음도 빈 파일이 아닌 유효한 오디오 파일이 되도록
+        self._file.close()
+
+        nbytes = self._size()
+        return EncodedTake(True, self.target, nbytes, self._start, end, length)
+
+    def abort(self):
+        """인코딩을 중단하고 만들어진 파일을 지웁니다."""
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        if self._file is not None:
+            try:
+                self._file.close()
+            except Exception:
+                pass
+        if isinstance(self.target, str) and os.path.exists(self.target):
+            try:
+                os.remove(self.target)
+            except OSError:
+                pass
+
+    def _size(self):
+        if isinstance(self.target, str):
+            return os.path.getsize(self.target)
+        if hasattr(self.target, "getbuffer"):
+            return self.target.getbuffer().nbytes
+        return 0
@@ -0,0 +1,488 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+recordings 폴더의 녹음을 한꺼번에 (다시) 전사하는 명령줄 도구
+
+사용법:
+    python batch_transcribe.py recordings [--language ko --concurrency 4 --output transcripts.jsonl]
+    python batch_transcribe.py "recordings/recording_202405*.flac" --language en --sidecar
+    python batch_transcribe.py recordings --base-url http://127.0.0.1:8765/v1   # 로컬 대역 서버
+
+파일 디코딩/리샘플링은 프로세스 풀에서, 업로드는 동시 요청 수를 제한한 스레드에서 진행합니다.
+429 응답을 받으면 동시 요청 수를 절반으로 줄이고 잠시 멈춘 뒤, 성공이 이어지면 다시 늘립니다.
+끝난 파일은 체크포인트 파일에 기록되므로 중단된 작업을 다시 실행하면 남은 파일만 전사합니다.
+"""
+
+import argparse
+import glob
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import soundfile
+except ImportError:
+    soundfile = None
+
+from audio_chunker import MAX_UPLOAD_BYTES, encode_chunks, merge_transcripts
+from audio_codecs import CODECS
+from request_policy import RequestPolicy, is_retryable, retry_after_of, status_code_of
+from resample import resample
+from segmented_transcriber import encode_bytes
+from transcript_cache import TranscriptCache, CachedBackend, DEFAULT_CACHE_PATH, cache_key
+from transcription_backend import OpenAIBackend
+
+
+TARGET_SAMPLERATE = 16000
+# 다시 인코딩하지 않고 그대로 올릴 수 있는 형식
+UPLOAD_EXTENSIONS = {".flac", ".mp3", ".mp4", ".mpeg", ".mpga", ".m4a", ".ogg", ".wav", ".webm"}
+AUDIO_EXTENSIONS = UPLOAD_EXTENSIONS | {".aiff", ".aif", ".au", ".caf"}
+
+
+def find_recordings(patterns):
+    """폴더(하위 폴더 포함)나 glob 패턴에서 오디오 파일을 찾아 정렬된 목록으로 반환합니다."""
+    found = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for directory, _, names in os.walk(pattern):
+                for name in names:
+                    if os.path.splitext(name)[1].lower() in AUDIO_EXTENSIONS:
+                        found.add(os.path.join(directory, name))
+        else:
+            for path in glob.glob(pattern, recursive=True):
+                if os.path.isfile(path) and os.path.splitext(path)[1].lower() in AUDIO_EXTENSIONS:
+                    found.add(path)
+    return sorted(found)
+
+
+def prepare_recording(path, codec_name="flac"):
+    """
+    업로드할 데이터를 준비합니다 (프로세스 풀에서 실행).
+
+    16kHz 모노이고 API가 받는 형식이면 파일을 그대로 올리므로, 앱에서 이미 전사한 녹음은 전사 캐시에 적중합니다.
+    그 외에는 디코딩 → 모노 → 16kHz 리샘플링 → codec_name으로 인코딩하고, 업로드 크기 제한을 넘으면
+    쉼에서 나눠 구간별로 인코딩합니다.
+    반환값: (경로, 업로드 데이터(나눴으면 구간별 데이터 목록), 업로드 파일 이름, 길이(초), 다시 인코딩했는지)
+    """
+    info = soundfile.info(path)
+    seconds = info.frames / float(info.samplerate) if info.samplerate else 0.0
+    extension = os.path.splitext(path)[1].lower()
+    if (info.samplerate == TARGET_SAMPLERATE and info.channels == 1 and extension in UPLOAD_EXTENSIONS
+            and os.path.getsize(path) <= MAX_UPLOAD_BYTES):
+        with open(path, "rb") as f:
+            return path, f.read(), os.path.basename(path), seconds, False
+
+    audio, samplerate = soundfile.read(path, dtype="int16", always_2d=True)
+    if audio.shape[1] > 1:
+        audio = np.round(audio.mean(axis=1, keepdims=True)).astype(np.int16)
+    if samplerate != TARGET_SAMPLERATE:
+        audio = resample(audio, samplerate, TARGET_SAMPLERATE)
+    codec = CODECS[codec_name]
+    data = encode_bytes(audio, TARGET_SAMPLERATE, codec)
+    if len(data) > MAX_UPLOAD_BYTES:
+        data = encode_chunks(audio, TARGET_SAMPLERATE, codec)
+    name = os.path.splitext(os.path.basename(path))[0] + codec.extension
+    return path, data, name, seconds, True
+
+
+class AdaptiveLimiter:
+    """
+    429 응답에 맞춰 동시 요청 수를 조절합니다 (AIMD).
+
+    throttle()이 호출되면 허용 동시 요청 수를 절반으로 줄이고 Retry-After(없으면 cooldown초)만큼 새 요청을 멈추며,
+    그 뒤 현재 허용 수만큼 성공이 이어질 때마다 하나씩 늘려 limit까지 회복합니다.
+    """
+
+    def __init__(self, limit, minimum=1, cooldown=1.0):
+        self.limit = max(1, limit)
+        self.minimum = max(1, min(minimum, self.limit))
+        self.cooldown = cooldown
+        self.current = self.limit
+        self._active = 0
+        self._streak = 0
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+        self.throttle_count = 0
+
+    def acquire(self):
+        with self._cond:
+            while True:
+                wait = self._paused_until - time.monotonic()
+                if wait <= 0 and self._active < self.current:
+                    self._active += 1
+                    return
+                self._cond.wait(wait if wait > 0 else None)
+
+    def release(self):
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    def success(self):
+        with self._cond:
+            self._streak += 1
+            if self.current < self.limit and self._streak >= self.current:
+                self.current += 1
+                self._streak = 0
+                self._cond.notify_all()
+
+    def throttle(self, retry_after=None):
+        with self._cond:
+            self.throttle_count += 1
+            self._streak = 0
+            now = time.monotonic()
+            # 이미 멈춘 동안 도착한 429는 같은 몰림으로 보고 한 번만 줄임
+            if now >= self._paused_until:
+                self.current = max(self.minimum, self.current // 2)
+            pause = retry_after if retry_after is not None else self.cooldown
+            self._paused_until = max(self._paused_until, now + pause)
+            logging.warning(f"요청 제한(429): 동시 요청 {self.current}개로 줄이고 {pause:.1f}초 대기")
+
+
+class Checkpoint:
+    """
+    끝난 파일 목록 (JSON).
+
+    키는 파일 경로, 크기, 수정 시각과 요청 파라미터로 만들므로 파일이 바뀌거나 언어 설정을 바꿔 다시 실행하면
+    다시 전사합니다. 임시 파일에 쓴 뒤 이름을 바꿔 중간에 끊겨도 체크포인트가 손상되지 않습니다.
+    """
+
+    def __init__(self, path, save_every=10):
+        self.path = path
+        self.save_every = save_every
+        self._lock = threading.Lock()
+        self._dirty = 0
+        self.done = {}
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.done = json.load(f).get("done", {})
+
+    @staticmethod
+    def key(path, params):
+        stat = os.stat(path)
+        return f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}|{cache_key(b'', params)[1]}"
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self.done
+
+    def mark(self, key, seconds):
+        with self._lock:
+            self.done[key] = {"seconds": seconds, "finished_at": time.time()}
+            self._dirty += 1
+            if self._dirty >= self.save_every:
+                self._save_locked()
+
+    def save(self):
+        with self._lock:
+            self._save_locked()
+
+    def _save_locked(self):
+        if not self.path:
+            return
+        temp_path = self.path + ".part"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "done": self.done}, f, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+        self._dirty = 0
+
+
+class BatchReport:
+    """배치 전사 결과 집계"""
+
+    def __init__(self):
+        self.files = 0
+        self.failed = 0
+        self.skipped = 0
+        self.cached = 0
+        self.reencoded = 0
+        self.retries = 0
+        self.audio_seconds = 0.0
+        self.started_at = time.perf_counter()
+        self.finished_at = None
+
+    @property
+    def wall_seconds(self):
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    @property
+    def files_per_minute(self):
+        return self.files / self.wall_seconds * 60.0 if self.wall_seconds else 0.0
+
+    @property
+    def audio_hours_per_minute(self):
+        return self.audio_seconds / 3600.0 / self.wall_seconds * 60.0 if self.wall_seconds else 0.0
+
+    def summary(self):
+        return (f"완료 {self.files}개 (실패 {self.failed}, 건너뜀 {self.skipped}, 캐시 {self.cached}, "
+                f"재인코딩 {self.reencoded}, 재시도 {self.retries}), 오디오 {self.audio_seconds / 3600.0:.2f}시간, "
+                f"{self.wall_seconds:.1f}초 → {self.files_per_minute:.1f} 파일/분, "
+                f"{self.audio_hours_per_minute:.3f} 오디오 시간/분")
+
+
+class BatchTranscriber:
+    """
+    녹음 파일 목록을 전사합니다.
+
+    디코딩은 decode_workers개 프로세스에서 진행하며, 디코딩이 끝났지만 아직 올리지 않은 파일은
+    동시 요청 수의 두 배까지만 메모리에 둡니다. 결과는 JSONL(output)과 파일 옆 .txt(sidecar)에 씁니다.
+    """
+
+    def __init__(self, backend, params, concurrency=4, decode_workers=None, max_attempts=6,
+                 checkpoint=None, output=None, sidecar=False, codec="flac", progress=print):
+        self.backend = backend
+        self.params = dict(params)
+        self.concurrency = max(1, concurrency)
+        self.decode_workers = decode_workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self.checkpoint = checkpoint or Checkpoint(None)
+        self.output = output
+        self.sidecar = sidecar
+        self.codec = codec
+        self.progress = progress
+        self.limiter = AdaptiveLimiter(self.concurrency)
+        # 백오프 계산(지터, Retry-After)만 사용
+        self.policy = RequestPolicy(max_attempts=max_attempts, hedge=False, max_workers=1)
+        self.report = BatchReport()
+        self._output_lock = threading.Lock()    # 결과 파일 쓰기와 집계 보호
+        self._output_file = None
+        self._handed = 0
+
+    def _transcribe(self, audio_bytes, name):
+        """동시 요청 제한 안에서 전사하고 일시적인 오류는 다시 시도합니다."""
+        attempt = 0
+        while True:
+            attempt += 1
+            self.limiter.acquire()
+            try:
+                text = self.backend.transcribe(audio_bytes, dict(self.params, filename=name))
+                self.limiter.success()
+                return text, attempt
+            except Exception as e:
+                if status_code_of(e) == 429:
+                    self.limiter.throttle(retry_after_of(e))
+                if attempt >= self.policy.max_attempts or not is_retryable(e):
+                    raise
+                delay = self.policy.backoff(attempt, e)
+                logging.warning(f"{name}: {attempt}번째 요청 실패, {delay * 1000:.0f}ms 후 재시도: {str(e)}")
+                with self._output_lock:
+                    self.report.retries += 1
+            finally:
+                self.limiter.release()
+            time.sleep(delay)
+
+    def _transcribe_chunks(self, chunks, name):
+        """크기 제한 때문에 나눈 구간을 동시에 전사해 합칩니다 (동시 요청 수는 다른 파일과 함께 제한됨)."""
+        stem, extension = os.path.splitext(name)
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(chunks)),
+                                thread_name_prefix="BatchChunk") as pool:
+            results = list(pool.map(lambda item: self._transcribe(item[1], f"{stem}_part{item[0]}{extension}"),
+                                    enumerate(chunks)))
+        return merge_transcripts([text for text, _ in results]), max(attempts for _, attempts in results)
+
+    def _write_result(self, record, path, text):
+        with self._output_lock:
+            if text is None:
+                self.report.failed += 1
+            else:
+                self.report.files += 1
+                self.report.audio_seconds += record["seconds"]
+                self.report.cached += int(record["cached"])
+                self.report.reencoded += int(record["reencoded"])
+            if self._output_file is not None:
+                self._output_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                self._output_file.flush()
+        if self.sidecar and text is not None:
+            sidecar_path = os.path.splitext(path)[0] + ".txt"
+            with open(sidecar_path + ".part", "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(sidecar_path + ".part", sidecar_path)
+
+    def _upload(self, index, total, key, prepared, slots):
+        path, audio_bytes, name, seconds, reencoded = prepared
+        start = time.perf_counter()
+        record = {"path": path, "seconds": round(seconds, 3), **self.params}
+        try:
+            if isinstance(audio_bytes, list):
+                # 업로드 크기 제한을 넘어 나눈 파일 (구간별 캐시 적중은 집계하지 않음)
+                text, attempts = self._transcribe_chunks(audio_bytes, name)
+                record["chunks"] = len(audio_bytes)
+                cached = False
+            else:
+                text, attempts = self._transcribe(audio_bytes, name)
+                cached = isinstance(self.backend, CachedBackend) and self.backend.last_hit()
+            record.update(text=text, attempts=attempts, cached=cached, reencoded=reencoded,
+                          elapsed_ms=round((time.perf_counter() - start) * 1000.0, 1))
+            self._write_result(record, path, text)
+            self.checkpoint.mark(key, seconds)
+            self.progress(f"[{index}/{total}] {os.path.basename(path)} {seconds:.1f}초"
+                          f"{' (캐시)' if cached else ''}: {(text or '')[:60]}")
+        except Exception as e:
+            # 실패한 파일은 체크포인트에 기록하지 않으므로 다시 실행하면 다시 시도함
+            record.update(error=str(e))
+            self._write_result(record, path, None)
+            logging.error(f"{path}: 전사 실패: {str(e)}")
+            self.progress(f"[{index}/{total}] {os.path.basename(path)} 실패: {str(e)}")
+        finally:
+            slots.release()
+
+    def run(self, paths):
+        """파일을 모두 전사하고 BatchReport를 반환합니다."""
+        todo = []
+        for path in paths:
+            key = Checkpoint.key(path, self.params)
+            if key in self.checkpoint:
+                self.report.skipped += 1
+            else:
+                todo.append((path, key))
+        if self.report.skipped:
+            self.progress(f"체크포인트: {self.report.skipped}개는 이미 전사되어 건너뜀")
+
+        if self.output:
+            self._output_file = open(self.output, "a", encoding="utf-8")
+        slots = threading.Semaphore(self.concurrency * 2)   # 디코딩했지만 아직 올리지 않은 파일 수 제한
+        try:
+            with ProcessPoolExecutor(max_workers=self.decode_workers) as decoders, \
+                    ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="BatchUpload") as uploads:
+                pending = []
+                for path, key in todo:
+                    # 자리가 없으면 디코딩이 끝나기를 기다려 업로드에 넘기고, 그래도 없으면 업로드가 끝나기를 기다림
+                    while not slots.acquire(blocking=False):
+                        if pending:
+                            self._hand_off(pending.pop(0), len(paths), uploads, slots)
+                        else:
+                            slots.acquire()
+                            break
+                    pending.append((path, key, decoders.submit(prepare_recording, path, self.codec)))
+                    # 앞에서부터 디코딩이 끝난 파일을 업로드에 넘김 (결과 순서는 파일 순서에 가깝게 유지)
+                    while pending and pending[0][2].done():
+                        self._hand_off(pending.pop(0), len(paths), uploads, slots)
+                for item in pending:
+                    self._hand_off(item, len(paths), uploads, slots)
+        finally:
+            self.report.finished_at = time.perf_counter()
+            self.checkpoint.save()
+            if self._output_file is not None:
+                self._output_file.close()
+                self._output_file = None
+        return self.report
+
+    def _hand_off(self, item, total, uploads, slots):
+        path, key, future = item
+        self._handed += 1
+        index = self.report.skipped + self._handed
+        try:
+            prepared = future.result()
+        except Exception as e:
+            with self._output_lock:
+                self.report.failed += 1
+            slots.release()
+            logging.error(f"{path}: 디코딩 실패: {str(e)}")
+            self.progress(f"{os.path.basename(path)} 디코딩 실패: {str(e)}")
+            return
+        uploads.submit(self._upload, index, total, key, prepared, slots)
+
+
+def read_api_key(path="openai_api_key.txt"):
+    """OPENAI_API_KEY 환경 변수나 프로그램이 저장한 키 파일에서 API 키를 읽습니다."""
+    key = os.environ.get("OPENAI_API_KEY")
+    if key:
+        return key.strip()
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            return f.read().strip() or None
+    return None
+
+
+def read_settings(path="whisperer_settings.json"):
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        logging.warning(f"설정 파일을 읽을 수 없습니다: {str(e)}")
+        return {}
+
+
+def main():
+    settings = read_settings()
+    api_settings = settings.get("api", {})
+    parser = argparse.ArgumentParser(description="녹음 파일 일괄 전사")
+    parser.add_argument("paths", nargs="*", default=["recordings"], help="폴더 또는 glob 패턴 (기본: recordings)")
+    parser.add_argument("--language", default=settings.get("language", "ko"),
+                        help="ko, en 등 언어 코드 또는 auto(자동 감지)")
+    parser.add_argument("--model", default="whisper-1")
+    parser.add_argument("--prompt", default=None)
+    parser.add_argument("--concurrency", type=int, default=4, help="최대 동시 업로드 수")
+    parser.add_argument("--decode-workers", type=int, default=None, help="디코딩 프로세스 수")
+    parser.add_argument("--max-attempts", type=int, default=6)
+    parser.add_argument("--codec", choices=sorted(CODECS), default="flac", help="다시 인코딩할 때 쓰는 코덱")
+    parser.add_argument("--output", default="transcripts.jsonl", help="결과 JSONL (이어서 씀, 빈 문자열이면 쓰지 않음)")
+    parser.add_argument("--sidecar", action="store_true", help="녹음 파일 옆에 같은 이름의 .txt 저장")
+    parser.add_argument("--checkpoint", default="batch_checkpoint.json")
+    parser.add_argument("--restart", action="store_true", help="체크포인트를 무시하고 처음부터 다시 전사")
+    parser.add_argument("--no-cache", action="store_true", help="전사 캐시를 사용하지 않음")
+    parser.add_argument("--base-url", default=api_settings.get("base_url"))
+    parser.add_argument("--api-key", default=None)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format="%(asctime)s - %(levelname)s - %(message)s")
+    if np is None or soundfile is None:
+        print("numpy와 soundfile이 필요합니다.", file=sys.stderr)
+        return 1
+    api_key = args.api_key or read_api_key()
+    if not api_key:
+        print("API 키가 없습니다. --api-key, OPENAI_API_KEY 또는 openai_api_key.txt를 사용하세요.", file=sys.stderr)
+        return 1
+
+    paths = find_recordings(args.paths)
+    if not paths:
+        print("전사할 녹음 파일이 없습니다.", file=sys.stderr)
+        return 1
+
+    params = {"model": args.model}
+    if args.language and args.language != "auto":
+        params["language"] = args.language
+    if args.prompt:
+        params["prompt"] = args.prompt
+
+    backend = OpenAIBackend(api_key, base_url=args.base_url, max_connections=args.concurrency,
+                            connect_timeout=api_settings.get("connect_timeout", 5.0),
+                            read_timeout=api_settings.get("read_timeout", 60.0))
+    if not args.no_cache:
+        backend = CachedBackend(backend, TranscriptCache(DEFAULT_CACHE_PATH))
+    if args.restart and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+
+    print(f"{len(paths)}개 파일 전사 시작 ({params}, 동시 업로드 {args.concurrency}개)")
+    transcriber = BatchTranscriber(backend, params, concurrency=args.concurrency,
+                                   decode_workers=args.decode_workers, max_attempts=args.max_attempts,
+                                   checkpoint=Checkpoint(args.checkpoint), output=args.output or None,
+                                   sidecar=args.sidecar, codec=args.codec)
+    try:
+        report = transcriber.run(paths)
+    except KeyboardInterrupt:
+        print("\n중단됨 - 다시 실행하면 남은 파일부터 이어서 전사합니다.")
+        return 130
+    finally:
+        backend.close()
+    print(report.summary())
+    if transcriber.limiter.throttle_count:
+        print(f"요청 제한(429) {transcriber.limiter.throttle_count}회, 마지막 동시 요청 수 {transcriber.limiter.current}개")
+    return 0 if not report.failed else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
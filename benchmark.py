@@ -0,0 +1,1532 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+WhisperTyper 성능 측정 스크립트
+
+사용법:
+    python benchmark.py capture
+    python benchmark.py latency [--device N] [--preroll-ms 300]
+    python benchmark.py encode [--durations 10 600]
+    python benchmark.py codecs [--corpus recordings]
+    python benchmark.py resample [--seconds 60]
+    python benchmark.py pipeline [--takes 5 --api-ms 1500]
+    python benchmark.py takes [--takes 20 --workers 3]
+    python benchmark.py client [--trials 10 --handshake-ms 120]
+    python benchmark.py policy [--requests 80 --error-rate 0.15 --slow-rate 0.04]
+    python benchmark.py backend [--requests 200 --concurrency 16]
+    python benchmark.py cache [--clips 20 --latency-ms 400]
+    python benchmark.py language [--takes 200 --detect-ms 150 --switch-rate 0.05]
+    python benchmark.py chunks [--minutes 10 30 60 --concurrency 1 4 8 --ms-per-audio-second 5]
+    python benchmark.py postprocess [--chars 10000 --rules 100 --fuzz 20000]
+    python benchmark.py inject [--lengths 10 100 1000 5000 --call-us 30 --event-us 2]
+    python benchmark.py logging [--calls 20000 --burst 100000 --max-queue 1000 --slow-ms 2]
+    python benchmark.py logrotate [--files 2000 --file-kb 64 --days 60 --console-lines 200000]
+    python benchmark.py e2e [--takes 20 --speed 4 --armed --corpus DIR --json results.json]
+"""
+
+import argparse
+import asyncio
+import datetime
+import glob
+import io
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+
+from audio_buffer import CaptureBuffer, PreRollRing
+from audio_codecs import CODECS, available_codecs
+from audio_encoder import StreamingEncoder
+from resample import StreamingResampler, resample
+from segmented_transcriber import encode_bytes
+from transcription_pipeline import TakeSession, TranscriptionPipeline
+from latency_metrics import LatencyRecorder, TakeTimeline
+from vad import detect_speech
+
+
+SAMPLERATE = 16000
+
+
+# 결과 출력 도우미
+def percentile_ms(samples, q):
+    """초 단위 측정값 목록의 백분위수를 밀리초로 반환"""
+    if not samples:
+        return 0.0
+    return float(np.percentile(np.asarray(samples), q)) * 1000.0
+
+
+def print_table(headers, rows):
+    """간단한 표 출력"""
+    widths = [max(len(str(h)), *(len(str(r[i])) for r in rows)) for i, h in enumerate(headers)]
+    print("  ".join(str(h).rjust(w) for h, w in zip(headers, widths)))
+    for row in rows:
+        print("  ".join(str(c).rjust(w) for c, w in zip(row, widths)))
+
+
+def synth_speech(seconds, samplerate=SAMPLERATE, seed=0, silence=0.5):
+    """음성과 비슷한 합성 신호 (음절 단위로 변조된 배음 + 배경 잡음), 앞뒤에 무음 포함"""
+    rng = np.random.default_rng(seed)
+    n = int(seconds * samplerate)
+    t = np.arange(n) / samplerate
+    pitch = 140 + 40 * np.sin(2 * np.pi * 0.3 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / samplerate
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 6))
+    syllables = np.clip(np.sin(2 * np.pi * 4 * t), 0, None) * (np.sin(2 * np.pi * 0.2 * t) > -0.7)
+    signal = 6000 * voiced * syllables + rng.normal(0, 40, n)
+    pad = int(silence * samplerate)
+    signal[:pad] = rng.normal(0, 40, pad)
+    signal[-pad:] = rng.normal(0, 40, pad)
+    return np.clip(signal, -32768, 32767).astype(np.int16).reshape(-1, 1)
+
+
+# ---------------------------------------------------------------------------
+# capture: 녹음 콜백 비용과 녹음 종료 시 비용 비교 (리스트+concatenate vs CaptureBuffer)
+# ---------------------------------------------------------------------------
+def _simulate_list_capture(blocks):
+    audio_data = []
+    callback_times = []
+    for block in blocks:
+        t0 = time.perf_counter()
+        audio_data.append(block.copy())
+        callback_times.append(time.perf_counter() - t0)
+    t0 = time.perf_counter()
+    audio = np.concatenate(audio_data, axis=0)
+    stop_time = time.perf_counter() - t0
+    return audio, callback_times, stop_time
+
+
+def _simulate_buffer_capture(blocks):
+    buffer = CaptureBuffer(samplerate=SAMPLERATE, channels=1, dtype="int16")
+    callback_times = []
+    for block in blocks:
+        t0 = time.perf_counter()
+        buffer.write(block)
+        callback_times.append(time.perf_counter() - t0)
+    t0 = time.perf_counter()
+    audio = buffer.view()
+    stop_time = time.perf_counter() - t0
+    return audio, callback_times, stop_time
+
+
+def bench_capture(args):
+    """5초, 60초, 15분 녹음에 대한 콜백/종료 비용 측정"""
+    rows = []
+    block = np.random.default_rng(0).integers(-2000, 2000, size=(args.blocksize, 1), dtype=np.int16)
+    for seconds in args.durations:
+        n_blocks = int(seconds * SAMPLERATE / args.blocksize)
+        blocks = [block] * n_blocks
+        for name, simulate in (("list", _simulate_list_capture), ("buffer", _simulate_buffer_capture)):
+            tracemalloc.start()
+            audio, callback_times, stop_time = simulate(blocks)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            assert audio.shape[0] == n_blocks * args.blocksize
+            rows.append((
+                f"{seconds:g}s", name,
+                f"{np.mean(callback_times) * 1e6:.2f}",
+                f"{percentile_ms(callback_times, 99) * 1000:.2f}",
+                f"{stop_time * 1000:.3f}",
+                f"{peak / 1e6:.1f}",
+            ))
+            del audio
+    print(f"블록 크기: {args.blocksize} 프레임 @ {SAMPLERATE} Hz")
+    print_table(("take", "engine", "cb_mean_us", "cb_p99_us", "stop_ms", "peak_MB"), rows)
+
+
+# ---------------------------------------------------------------------------
+# latency: 단축키→첫 샘플 지연 (매번 스트림 열기 vs 항상 대기 모드)
+# ---------------------------------------------------------------------------
+def _measure_stream_open(sd, device, trials):
+    """매 녹음마다 InputStream을 새로 여는 기존 방식"""
+    results = []
+    for _ in range(trials):
+        first = threading.Event()
+        latency = [None]
+        hotkey_at = time.perf_counter()
+
+        def callback(indata, frames, time_info, status):
+            if latency[0] is None:
+                latency[0] = time.perf_counter() - frames / SAMPLERATE - hotkey_at
+                first.set()
+
+        stream = sd.InputStream(device=device, samplerate=SAMPLERATE, channels=1,
+                                dtype="int16", callback=callback)
+        stream.start()
+        first.wait(2.0)
+        stream.stop()
+        stream.close()
+        if latency[0] is not None:
+            results.append(latency[0])
+        time.sleep(0.2)
+    return results
+
+
+def _measure_armed(sd, device, trials, preroll_ms):
+    """스트림을 열어 두고 프리롤을 유지하는 항상 대기 방식"""
+    results = []
+    lock = threading.Lock()
+    ring = PreRollRing(SAMPLERATE * preroll_ms // 1000)
+    state = {"request": None, "hotkey_at": None, "latency": None}
+    first = threading.Event()
+
+    def callback(indata, frames, time_info, status):
+        with lock:
+            buffer = state["request"]
+            if buffer is not None:
+                preroll = ring.drain_to(buffer)
+                buffer.write(indata)
+                state["latency"] = time.perf_counter() - (preroll + frames) / SAMPLERATE - state["hotkey_at"]
+                state["request"] = None
+                first.set()
+            else:
+                ring.write(indata)
+
+    stream = sd.InputStream(device=device, samplerate=SAMPLERATE, channels=1,
+                            dtype="int16", callback=callback)
+    stream.start()
+    time.sleep(preroll_ms / 1000.0 + 0.2)  # 프리롤이 채워질 때까지 대기
+    for _ in range(trials):
+        first.clear()
+        with lock:
+            state["hotkey_at"] = time.perf_counter()
+            state["request"] = CaptureBuffer(samplerate=SAMPLERATE)
+        first.wait(2.0)
+        if state["latency"] is not None:
+            results.append(state["latency"])
+        time.sleep(preroll_ms / 1000.0 + 0.1)
+    stream.stop()
+    stream.close()
+    return results
+
+
+def bench_latency(args):
+    """실제 입력 장치로 단축키→첫 샘플 지연 측정 (음수: 단축키 이전 소리까지 확보)"""
+    try:
+        import sounddevice as sd
+        sd.query_devices(args.device if args.device is not None else sd.default.device[0])
+    except Exception as e:
+        print(f"입력 장치를 사용할 수 없어 측정을 건너뜁니다: {e}")
+        return
+
+    rows = []
+    for name, results in (
+        ("stream", _measure_stream_open(sd, args.device, args.trials)),
+        ("armed", _measure_armed(sd, args.device, args.trials, args.preroll_ms)),
+    ):
+        rows.append((name, len(results), f"{percentile_ms(results, 50):.1f}",
+                     f"{percentile_ms(results, 95):.1f}", f"{percentile_ms(results, 100):.1f}"))
+    print_table(("mode", "n", "p50_ms", "p95_ms", "max_ms"), rows)
+
+
+# ---------------------------------------------------------------------------
+# encode: 녹음 종료 → 요청 시작까지 지연 (종료 후 일괄 인코딩 vs 녹음 중 점진적 인코딩)
+# ---------------------------------------------------------------------------
+def _release_batch(audio, path):
+    """기존 방식: 종료 후 전체 VAD + 전체 FLAC 인코딩"""
+    import soundfile
+    t0 = time.perf_counter()
+    region = detect_speech(audio, SAMPLERATE)
+    soundfile.write(path, audio[region.start:region.end], SAMPLERATE)
+    return time.perf_counter() - t0
+
+
+def _release_streaming(audio, path, speed, blocksize=1600):
+    """녹음 중 점진적 인코딩: 실시간의 speed배 속도로 버퍼를 채운 뒤 종료 비용만 측정"""
+    buffer = CaptureBuffer(samplerate=SAMPLERATE)
+    encoder = StreamingEncoder(buffer, path, poll_interval=0.1 / speed).start()
+    block_delay = blocksize / SAMPLERATE / speed
+    for i in range(0, len(audio), blocksize):
+        buffer.write(audio[i:i + blocksize])
+        time.sleep(block_delay)
+    time.sleep(0.1 / speed * 2)  # 녹음 종료 직전 상태: 인코더가 마지막 폴링까지 따라온 상태
+    t0 = time.perf_counter()
+    encoder.finish()
+    return time.perf_counter() - t0
+
+
+def bench_encode(args):
+    """10초, 10분 녹음의 종료→요청 시작 지연 비교"""
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for seconds in args.durations:
+            audio = synth_speech(seconds)
+            batch = _release_batch(audio, os.path.join(tmp, "batch.flac"))
+            streaming = _release_streaming(audio, os.path.join(tmp, "stream.flac"), args.speed)
+            rows.append((f"{seconds:g}s", f"{batch * 1000:.1f}", f"{streaming * 1000:.1f}",
+                         os.path.getsize(os.path.join(tmp, "batch.flac")),
+                         os.path.getsize(os.path.join(tmp, "stream.flac"))))
+    print(f"점진적 인코딩 입력 속도: 실시간의 {args.speed:g}배")
+    print_table(("take", "batch_ms", "streaming_ms", "batch_bytes", "stream_bytes"), rows)
+
+
+# ---------------------------------------------------------------------------
+# codecs: 저장된 녹음 모음으로 코덱별 크기/인코딩 시간/업로드 왕복 시간 비교
+# ---------------------------------------------------------------------------
+LINK_SPEEDS = (("hotel_1Mbps", 1e6 / 8), ("tether_5Mbps", 5e6 / 8), ("office_50Mbps", 50e6 / 8))
+
+
+def load_corpus(directory, limit):
+    """녹음 폴더의 파일을 읽습니다. 없으면 합성 음성을 사용합니다."""
+    import soundfile
+    files = sorted(glob.glob(os.path.join(directory, "*.flac")) + glob.glob(os.path.join(directory, "*.ogg")))
+    corpus = []
+    for path in files[:limit]:
+        audio, samplerate = soundfile.read(path, dtype="int16", always_2d=True)
+        corpus.append((os.path.basename(path), audio, samplerate))
+    if not corpus:
+        print(f"{directory}에 녹음 파일이 없어 합성 음성을 사용합니다.")
+        corpus = [(f"synth_{sec}s", synth_speech(sec, seed=sec), SAMPLERATE) for sec in (3, 10, 30, 120)]
+    return corpus
+
+
+def bench_codecs(args):
+    """코덱별 총 크기, 인코딩 시간, 링크 속도별 예상 업로드 시간, 디코딩 왕복 SNR"""
+    import soundfile
+    corpus = load_corpus(args.corpus, args.limit)
+    total_seconds = sum(len(audio) / sr for _, audio, sr in corpus)
+    print(f"코퍼스: {len(corpus)}개, {total_seconds:.1f}초")
+
+    rows = []
+    for name in available_codecs():
+        codec = CODECS[name]
+        total_bytes = 0
+        encode_time = 0.0
+        snrs = []
+        for _, audio, samplerate in corpus:
+            t0 = time.perf_counter()
+            data = encode_bytes(audio, samplerate, codec)
+            encode_time += time.perf_counter() - t0
+            total_bytes += len(data)
+            decoded, _ = soundfile.read(io.BytesIO(data), dtype="float32", always_2d=True)
+            reference = audio.astype(np.float32) / 32768.0
+            n = min(len(decoded), len(reference))
+            noise = np.sum((decoded[:n] - reference[:n]) ** 2) + 1e-12
+            snrs.append(10 * np.log10(np.sum(reference[:n] ** 2) / noise + 1e-12))
+        upload = [f"{total_bytes / speed / len(corpus) * 1000:.0f}" for _, speed in LINK_SPEEDS]
+        rows.append((name, total_bytes, f"{total_bytes / total_seconds / 1024:.1f}",
+                     f"{encode_time / total_seconds * 1000:.1f}", f"{np.median(snrs):.1f}", *upload))
+    headers = ("codec", "bytes", "KB_per_s", "enc_ms_per_s", "snr_db") + tuple(f"up_{n}_ms" for n, _ in LINK_SPEEDS)
+    print_table(headers, rows)
+    print("up_*_ms: 파일 하나당 평균 예상 업로드 시간 (순수 전송 시간, 서버 처리 제외)")
+
+
+# ---------------------------------------------------------------------------
+# resample: 장치 레이트(48k/44.1k/22.05k) → 16kHz 리샘플링 처리량 (정확도는 tests/test_resample.py)
+# ---------------------------------------------------------------------------
+def bench_resample(args):
+    """장치 레이트→16kHz 리샘플링 처리량과 블록 처리 시간"""
+    rows = []
+    for in_rate in args.rates:
+        audio = synth_speech(args.seconds, samplerate=in_rate, seed=1)
+        blocks = [audio[i:i + args.blocksize] for i in range(0, len(audio), args.blocksize)]
+
+        # 녹음 콜백처럼 블록 단위로 처리
+        resampler = StreamingResampler(in_rate, SAMPLERATE, channels=audio.shape[1])
+        callback_times = []
+        t0 = time.perf_counter()
+        for block in blocks:
+            t1 = time.perf_counter()
+            resampler.process(block)
+            callback_times.append(time.perf_counter() - t1)
+        resampler.flush()
+        stream_time = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        resample(audio, in_rate, SAMPLERATE)
+        batch_time = time.perf_counter() - t0
+
+        rows.append((in_rate, f"{len(audio) / stream_time / 1e6:.1f}", f"{len(audio) / batch_time / 1e6:.1f}",
+                     f"{percentile_ms(callback_times, 99):.3f}"))
+    print_table(("in_rate", "stream_Msps", "batch_Msps", "block_p99_ms"), rows)
+    print("Msps: 초당 처리한 입력 샘플 수(백만)")
+
+
+# ---------------------------------------------------------------------------
+# pipeline: 녹음 종료 처리를 Tk 스레드에서 직접 하는 경우 vs 작업 대기열에 넘기는 경우
+# (처리 중 다음 녹음 시작, 실패한 녹음 건너뛰기는 tests/test_transcription_pipeline.py)
+# ---------------------------------------------------------------------------
+def _record_take(audio):
+    """녹음 한 건을 흉내 냄: 버퍼를 채우며 점진적 인코딩"""
+    buffer = CaptureBuffer(samplerate=SAMPLERATE)
+    encoder = StreamingEncoder(buffer, io.BytesIO(), poll_interval=0.01).start()
+    buffer.write(audio)
+    return buffer, encoder
+
+
+def bench_pipeline(args):
+    """단축키를 뗀 뒤 Tk 스레드가 막히는 시간과 다음 녹음을 시작할 수 있기까지의 시간"""
+    audio = synth_speech(args.seconds)
+
+    def process(job):
+        # whisperer.process_take와 같은 순서: 인코딩 마무리 → 모의 API 왕복 → 붙여넣기 지연
+        job.encoder.finish()
+        time.sleep(args.api_ms / 1000.0)
+        time.sleep(0.2)
+        return f"take {job.id}"
+
+    rows = []
+    # 기존 방식: stop_recording이 Tk 스레드에서 끝까지 처리
+    handler_times = []
+    for _ in range(args.takes):
+        buffer, encoder = _record_take(audio)
+        t0 = time.perf_counter()
+        process(TakeSession(buffer, encoder))
+        handler_times.append(time.perf_counter() - t0)
+    rows.append(("inline", f"{percentile_ms(handler_times, 50):.1f}", f"{percentile_ms(handler_times, 99):.1f}",
+                 f"{percentile_ms(handler_times, 50):.1f}", 0, args.takes))
+
+    # 작업 대기열: 대기열에 넣고 바로 반환, 다음 녹음을 즉시 시작
+    pipeline = TranscriptionPipeline(process, name="BenchPipeline").start()
+    handler_times = []
+    start_gaps = []
+    overlapped = 0
+    jobs = []
+    buffer, encoder = _record_take(audio)
+    for i in range(args.takes):
+        t0 = time.perf_counter()
+        jobs.append(pipeline.submit(TakeSession(buffer, encoder)))
+        handler_times.append(time.perf_counter() - t0)
+        if i + 1 < args.takes:
+            # 다음 녹음 시작: 이전 작업이 아직 처리 중이어야 함
+            buffer, encoder = _record_take(audio)
+            start_gaps.append(time.perf_counter() - t0)
+            if not jobs[-1].done.is_set():
+                overlapped += 1
+    pipeline.flush()
+    pipeline.stop()
+    failed = sum(1 for job in jobs if job.error is not None or job.text is None)
+    rows.append(("pipeline", f"{percentile_ms(handler_times, 50):.1f}", f"{percentile_ms(handler_times, 99):.1f}",
+                 f"{percentile_ms(start_gaps, 50):.1f}", overlapped, args.takes - failed))
+
+    print(f"녹음 {args.seconds:g}초 x {args.takes}건, 모의 API 왕복 {args.api_ms:g}ms + 붙여넣기 200ms")
+    print_table(("mode", "stop_p50_ms", "stop_p99_ms", "next_start_ms", "overlapped", "completed"), rows)
+    print("stop_*: 단축키를 뗀 뒤 Tk 스레드가 막힌 시간, next_start: 다음 녹음을 시작할 수 있기까지의 시간")
+
+
+# ---------------------------------------------------------------------------
+# takes: 연속으로 빠르게 말한 녹음 여러 건을 모의 백엔드로 동시에 전사하고 순서대로 붙여넣기
+# ---------------------------------------------------------------------------
+def _mock_backend(rng, min_ms, max_ms):
+    """모의 Whisper 백엔드: 무작위 지연 뒤 녹음 번호를 텍스트로 반환 (뒤 녹음이 먼저 끝나는 경우가 생김)"""
+    lock = threading.Lock()
+
+    def transcribe(audio_bytes, label):
+        with lock:
+            delay = rng.uniform(min_ms, max_ms) / 1000.0
+        time.sleep(delay)
+        return f"take-{label}"
+    return transcribe
+
+
+def _run_takes(args, workers, audio):
+    rng = np.random.default_rng(args.seed)
+    transcribe = _mock_backend(rng, args.min_ms, args.max_ms)
+    pasted = []
+    recorder = LatencyRecorder()
+
+    def process(session):
+        session.mark("process_start")
+        encoded = session.encoder.finish()
+        session.mark("encode_done")
+        session.mark("upload_start")
+        text = transcribe(encoded.target.getvalue(), session.extra["label"])
+        session.mark("response")
+        session.mark("postprocess_done")
+        return text
+
+    def deliver(session):
+        pasted.append(session.text)
+        session.mark("paste_done")
+
+    pipeline = TranscriptionPipeline(process, deliver, workers=workers, name=f"Takes{workers}",
+                                     completed=lambda session: recorder.record(session.timeline)).start()
+    sessions = []
+    t0 = time.perf_counter()
+    for i in range(args.takes):
+        buffer, encoder = _record_take(audio)
+        take = TakeSession(buffer, encoder, timeline=TakeTimeline(), label=i)
+        take.mark("key_up")
+        take.mark("capture_finalized")
+        sessions.append(pipeline.submit(take))
+        time.sleep(args.gap_ms / 1000.0)   # 다음 녹음까지의 간격
+    pipeline.flush()
+    wall = time.perf_counter() - t0
+    pipeline.stop()
+
+    end_to_end = [s.delivered_at - s.queued_at for s in sessions]
+    holds = [s.hold_ms / 1000.0 for s in sessions]
+    out_of_order = sum(1 for a, b in zip(sessions, sessions[1:]) if b.finished_at < a.finished_at)
+    return (workers, f"{wall:.2f}", f"{percentile_ms(end_to_end, 50):.0f}", f"{percentile_ms(end_to_end, 99):.0f}",
+            f"{percentile_ms(holds, 99):.0f}", out_of_order, len(pasted)), recorder
+
+
+def bench_takes(args):
+    """연속 녹음 동시 전사: 작업 스레드 수에 따른 처리 시간과 붙여넣기 대기 시간 (순서 보장은 tests/test_transcription_pipeline.py)"""
+    audio = synth_speech(args.seconds)
+    rows = []
+    for workers in sorted({1, args.workers}):
+        row, recorder = _run_takes(args, workers, audio)
+        rows.append(row)
+    print(f"녹음 {args.takes}건 ({args.seconds:g}초, 간격 {args.gap_ms:g}ms), 모의 API 지연 {args.min_ms:g}~{args.max_ms:g}ms")
+    print_table(("workers", "wall_s", "e2e_p50_ms", "e2e_p99_ms", "hold_p99_ms", "finished_out_of_order",
+                 "pasted"), rows)
+    print("e2e: 대기열 추가→붙여넣기, hold: 처리 완료 후 앞선 녹음의 붙여넣기를 기다린 시간")
+    print(f"\n단계별 지연 (workers={args.workers}, 단축키 뗌 기준):")
+    for line in recorder.format_summary():
+        print(line)
+
+
+# ---------------------------------------------------------------------------
+# client: 로컬 HTTPS 대역 서버로 새 연결 vs 연결 재사용 vs 단축키를 누를 때 미리 연결 비교
+# ---------------------------------------------------------------------------
+def make_self_signed_cert(directory):
+    """openssl로 127.0.0.1용 자체 서명 인증서를 만듭니다. 실패하면 None."""
+    certfile = os.path.join(directory, "cert.pem")
+    keyfile = os.path.join(directory, "key.pem")
+    try:
+        subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+                        "-keyout", keyfile, "-out", certfile, "-subj", "/CN=127.0.0.1",
+                        "-addext", "subjectAltName=IP:127.0.0.1"],
+                       check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return certfile, keyfile
+
+
+def bench_client(args):
+    """녹음 종료(단축키 뗌)부터 전사 응답까지의 지연: 요청마다 새 연결 / 연결 재사용 / 미리 연결"""
+    from api_client import WhisperClient
+    from mock_whisper_server import MockWhisperServer
+
+    audio_bytes = encode_bytes(synth_speech(args.seconds), SAMPLERATE)
+    with tempfile.TemporaryDirectory() as tmp:
+        certfile, keyfile = make_self_signed_cert(tmp)
+        if certfile is None:
+            print("openssl을 찾을 수 없어 HTTP로 측정합니다 (TLS 핸드셰이크 비용 제외).")
+        server = MockWhisperServer(latency_ms=args.latency_ms, handshake_ms=args.handshake_ms,
+                                   certfile=certfile, keyfile=keyfile).start()
+
+        def new_client():
+            return WhisperClient("sk-test", base_url=server.base_url, verify=certfile or True)
+
+        def timed(client):
+            t0 = time.perf_counter()
+            client.transcribe(audio_bytes, "take.flac")
+            return time.perf_counter() - t0
+
+        results = {"cold": [], "pooled": [], "prewarmed": []}
+        connections = {}
+
+        # 기존 방식: 요청마다 새 연결
+        before = server.connection_count
+        for _ in range(args.trials):
+            client = new_client()
+            results["cold"].append(timed(client))
+            client.close()
+        connections["cold"] = server.connection_count - before
+
+        # 장기 클라이언트: 첫 요청 이후 연결 재사용
+        before = server.connection_count
+        client = new_client()
+        client.transcribe(audio_bytes, "take.flac")
+        for _ in range(args.trials):
+            time.sleep(args.gap_ms / 1000.0)
+            results["pooled"].append(timed(client))
+        client.close()
+        connections["pooled"] = server.connection_count - before
+
+        # 유휴 후 첫 녹음: 단축키를 누를 때 prewarm(), 녹음 시간 뒤 단축키를 떼면 요청
+        before = server.connection_count
+        for _ in range(args.trials):
+            client = new_client()
+            client.prewarm()
+            time.sleep(args.record_ms / 1000.0)
+            results["prewarmed"].append(timed(client))
+            client.close()
+        connections["prewarmed"] = server.connection_count - before
+        server.shutdown()
+
+    rows = [(name, f"{percentile_ms(samples, 50):.1f}", f"{percentile_ms(samples, 95):.1f}",
+             f"{percentile_ms(samples, 99):.1f}", connections[name])
+            for name, samples in results.items()]
+    scheme = "HTTPS" if certfile else "HTTP"
+    print(f"{scheme} 대역 서버: 처리 {args.latency_ms:g}ms, 새 연결 지연 {args.handshake_ms:g}ms, "
+          f"업로드 {len(audio_bytes)} 바이트, {args.trials}회")
+    print_table(("mode", "p50_ms", "p95_ms", "p99_ms", "connections"), rows)
+    print("cold: 요청마다 새 연결, pooled: 장기 클라이언트 연결 재사용, prewarmed: 유휴 후 단축키를 누를 때 미리 연결")
+
+
+# ---------------------------------------------------------------------------
+# policy: 오류/느린 응답을 섞는 대역 서버로 요청 정책 비교 (단일 요청 vs 재시도 vs 재시도+중복 요청)
+# ---------------------------------------------------------------------------
+def bench_policy(args):
+    """429/5xx와 긴 꼬리 지연이 있을 때 성공률, 응답 시간, 서버 요청 수, 기한 초과 수"""
+    from concurrent.futures import ThreadPoolExecutor
+    from api_client import WhisperClient
+    from mock_whisper_server import MockWhisperServer
+    from request_policy import RequestPolicy, DeadlineExceeded
+
+    audio_bytes = encode_bytes(synth_speech(3.0), SAMPLERATE)
+    policies = (
+        ("single", dict(max_attempts=1, hedge=False)),
+        ("retry", dict(max_attempts=args.attempts, hedge=False)),
+        ("retry+hedge", dict(max_attempts=args.attempts, hedge=True)),
+    )
+    rows = []
+    for name, options in policies:
+        server = MockWhisperServer(latency_ms=args.latency_ms, error_rate=args.error_rate,
+                                   slow_rate=args.slow_rate, slow_ms=args.slow_ms, seed=args.seed).start()
+        client = WhisperClient("sk-test", base_url=server.base_url)
+        policy = RequestPolicy(deadline=args.deadline, base_backoff=0.1, **options)
+
+        def one(i):
+            t0 = time.perf_counter()
+            try:
+                policy.call(lambda timeout: client.transcribe(audio_bytes, "take.flac", timeout=timeout),
+                            label=f"take {i}")
+                return "ok", time.perf_counter() - t0
+            except DeadlineExceeded:
+                return "deadline", time.perf_counter() - t0
+            except Exception:
+                return "error", time.perf_counter() - t0
+
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            results = list(pool.map(one, range(args.requests)))
+        server.shutdown()
+        client.close()
+
+        ok = [t for status, t in results if status == "ok"]
+        every = [t for _, t in results]
+        rows.append((name, f"{len(ok) / len(results) * 100:.0f}%",
+                     sum(1 for status, _ in results if status == "deadline"),
+                     f"{percentile_ms(ok, 50):.0f}", f"{percentile_ms(ok, 95):.0f}", f"{percentile_ms(ok, 99):.0f}",
+                     f"{max(every) * 1000:.0f}", server.request_count, policy.retry_count, policy.hedge_count))
+
+    print(f"요청 {args.requests}건 (동시 {args.concurrency}), 처리 {args.latency_ms:g}ms, 오류 {args.error_rate:.0%}, "
+          f"느린 응답 {args.slow_rate:.0%} x {args.slow_ms:g}ms, 기한 {args.deadline:g}초")
+    print_table(("policy", "success", "deadline", "p50_ms", "p95_ms", "p99_ms", "max_ms",
+                 "server_requests", "retries", "hedges"), rows)
+    print("max_ms: 실패 포함 가장 오래 기다린 시간 (기한으로 제한됨)")
+
+
+# ---------------------------------------------------------------------------
+# backend: 전사 백엔드 부하 테스트 (로컬 대역 서버, 동기 스레드 풀 vs asyncio)
+# ---------------------------------------------------------------------------
+def bench_backend(args):
+    """동시 요청 수에 따른 처리량과 응답 시간, 응답 내용 검증"""
+    from concurrent.futures import ThreadPoolExecutor
+    from mock_whisper_server import MockWhisperServer
+    from request_policy import RequestPolicy
+    from transcription_backend import OpenAIBackend
+
+    transcripts = [f"transcript {i}" for i in range(7)]
+    server = MockWhisperServer(latency_ms=args.latency_ms, latency_dist="lognormal", latency_spread=0.4,
+                               transcripts=transcripts, error_rate=args.error_rate, seed=args.seed).start()
+    clips = [encode_bytes(synth_speech(1.0, seed=i), SAMPLERATE) for i in range(8)]
+    expected = [server.transcript_for(clip) for clip in clips]
+
+    def make_backend():
+        policy = RequestPolicy(max_attempts=3, hedge=False, deadline=30.0, max_workers=args.concurrency)
+        return OpenAIBackend("sk-test", base_url=server.base_url, policy=policy,
+                             max_connections=args.concurrency)
+
+    def run_sync():
+        backend = make_backend()
+
+        def one(i):
+            t0 = time.perf_counter()
+            text = backend.transcribe(clips[i % len(clips)], {"filename": f"{i}.flac"})
+            return time.perf_counter() - t0, text == expected[i % len(clips)]
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            results = list(pool.map(one, range(args.requests)))
+        backend.close()
+        return results
+
+    async def run_async():
+        backend = make_backend()
+        limit = asyncio.Semaphore(args.concurrency)
+
+        async def one(i):
+            async with limit:
+                t0 = time.perf_counter()
+                text = await backend.transcribe_async(clips[i % len(clips)], {"filename": f"{i}.flac"})
+                return time.perf_counter() - t0, text == expected[i % len(clips)]
+        results = await asyncio.gather(*(one(i) for i in range(args.requests)))
+        await backend.aclose()
+        return results
+
+    rows = []
+    for name, runner in (("sync", run_sync), ("async", lambda: asyncio.run(run_async()))):
+        t0 = time.perf_counter()
+        results = runner()
+        wall = time.perf_counter() - t0
+        latencies = [t for t, _ in results]
+        correct = sum(1 for _, ok in results if ok)
+        rows.append((name, args.concurrency, f"{len(results) / wall:.1f}", f"{percentile_ms(latencies, 50):.0f}",
+                     f"{percentile_ms(latencies, 99):.0f}", f"{correct}/{len(results)}"))
+    stats = server.stats()
+    server.shutdown()
+    print(f"대역 서버: lognormal 중앙값 {args.latency_ms:g}ms, 오류 {args.error_rate:.0%}, "
+          f"요청 {stats['requests']}건 (오류 {stats['errors']}건, 연결 {stats['connections']}개)")
+    print_table(("mode", "concurrency", "req_per_s", "p50_ms", "p99_ms", "correct"), rows)
+
+
+# ---------------------------------------------------------------------------
+# cache: 같은 녹음을 다시 전사할 때 캐시 적중 vs API 호출, 크기 제한에 따른 삭제
+# ---------------------------------------------------------------------------
+def bench_cache(args):
+    """처음 전사(캐시 실패)와 다시 전사(캐시 적중)의 지연, 적중률, 언어별 키 분리, 크기 제한 확인"""
+    from mock_whisper_server import MockWhisperServer
+    from transcript_cache import TranscriptCache, CachedBackend
+    from transcription_backend import OpenAIBackend
+
+    server = MockWhisperServer(latency_ms=args.latency_ms, latency_dist="lognormal", latency_spread=0.3,
+                               transcripts=[f"transcript {i}" for i in range(5)], seed=args.seed).start()
+    clips = [encode_bytes(synth_speech(1.0, seed=i), SAMPLERATE) for i in range(args.clips)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = TranscriptCache(os.path.join(tmp, "cache.sqlite3"), max_bytes=args.max_kb * 1024)
+        backend = CachedBackend(OpenAIBackend("sk-test", base_url=server.base_url), cache)
+
+        def run(params):
+            latencies, texts = [], []
+            for i, clip in enumerate(clips):
+                t0 = time.perf_counter()
+                texts.append(backend.transcribe(clip, dict(params, filename=f"{i}.flac")))
+                latencies.append(time.perf_counter() - t0)
+            return latencies, texts
+
+        rows = []
+        for name, params in (("first (miss)", {"language": "ko"}), ("repeat (hit)", {"language": "ko"}),
+                             ("other language", {"language": "en"})):
+            before = server.request_count
+            latencies, texts = run(params)
+            rows.append((name, f"{percentile_ms(latencies, 50):.2f}", f"{percentile_ms(latencies, 99):.2f}",
+                         server.request_count - before, len(texts)))
+        print_table(("pass", "p50_ms", "p99_ms", "api_calls", "clips"), rows)
+
+        # 크기 제한: 작은 제한의 캐시에 많이 넣으면 가장 오래 쓰이지 않은 항목부터 삭제
+        small = TranscriptCache(os.path.join(tmp, "small.sqlite3"), max_bytes=4 * 1024)
+        for i in range(200):
+            small.put(f"clip {i}".encode(), {"model": "whisper-1"}, "가" * 20)
+        kept = small.stats()
+        print(f"\n캐시 통계: {cache.stats()}")
+        print(f"크기 제한 4KB에 200건 저장: {kept['entries']}건 유지 ({kept['bytes']} 바이트), {kept['evicted']}건 삭제")
+        small.close()
+        cache.close()
+        backend.close()
+    server.shutdown()
+
+
+# ---------------------------------------------------------------------------
+# language: 매번 언어 감지 vs 앱별 언어 사전 확률로 language 지정
+# ---------------------------------------------------------------------------
+LANGUAGE_TRACE_APPS = (
+    # (포커스 앱, 이 앱에서 한국어로 말할 확률, 비중)
+    ("slack.exe", 0.9, 0.4),
+    ("code.exe", 0.05, 0.35),
+    ("outlook.exe", 0.5, 0.25),
+)
+
+
+def make_language_trace(takes, switch_rate, seed):
+    """(앱, 실제 언어 코드) 목록. 한 앱에서 같은 언어가 이어지다가 switch_rate 확률로 앱의 평소 비율대로 다시 정함"""
+    rng = np.random.default_rng(seed)
+    weights = np.array([w for _, _, w in LANGUAGE_TRACE_APPS])
+    current = {}
+    trace = []
+    for _ in range(takes):
+        app, ko_rate, _ = LANGUAGE_TRACE_APPS[rng.choice(len(LANGUAGE_TRACE_APPS), p=weights / weights.sum())]
+        if app not in current or rng.random() < switch_rate:
+            current[app] = "ko" if rng.random() < ko_rate else "en"
+        trace.append((app, current[app]))
+    return trace
+
+
+def bench_language(args):
+    """같은 녹음 기록(앱, 실제 언어)으로 항상 감지하는 경우와 사전 확률로 언어를 지정하는 경우의 전사 지연/오지정 비교"""
+    from language_prior import LanguagePrior, LANGUAGE_CODES
+    from mock_whisper_server import MockWhisperServer
+    from transcription_backend import OpenAIBackend
+
+    names = {code: name for name, code in LANGUAGE_CODES.items()}
+    server = MockWhisperServer(latency_ms=args.latency_ms, latency_dist="lognormal", latency_spread=0.3,
+                               detect_ms=args.detect_ms, seed=args.seed).start()
+    backend = OpenAIBackend("sk-test", base_url=server.base_url)
+    clip = encode_bytes(synth_speech(1.0, seed=args.seed), SAMPLERATE)
+    trace = make_language_trace(args.takes, args.switch_rate, args.seed)
+
+    rows = []
+    for name, prior in (("always detect", None), ("prior", LanguagePrior(threshold=args.threshold))):
+        latencies, explicit, wrong = [], 0, 0
+        for i, (app, truth) in enumerate(trace):
+            server.language = names[truth]
+            language = prior.suggest(app) if prior else None
+            params = {"filename": f"{i}.flac", "model": "whisper-1"}
+            if language:
+                params["language"] = language
+            t0 = time.perf_counter()
+            _, detected = backend.transcribe_with_language(clip, params)
+            latencies.append(time.perf_counter() - t0)
+            if language:
+                explicit += 1
+                wrong += language != truth
+            elif prior:
+                prior.observe(app, detected)
+        rows.append((name, f"{percentile_ms(latencies, 50):.0f}", f"{percentile_ms(latencies, 95):.0f}",
+                     f"{explicit / len(trace):.0%}", wrong))
+    backend.close()
+    server.shutdown()
+    print(f"대역 서버: lognormal 중앙값 {args.latency_ms:g}ms, 언어 감지 +{args.detect_ms:g}ms, "
+          f"녹음 {len(trace)}건, 언어 전환 확률 {args.switch_rate:.0%}")
+    print_table(("mode", "p50_ms", "p95_ms", "explicit", "wrong_language"), rows)
+
+
+# ---------------------------------------------------------------------------
+# chunks: 업로드 크기 제한을 넘는 긴 녹음 분할 전사 (녹음 길이 x 동시 요청 수)
+# ---------------------------------------------------------------------------
+def bench_chunks(args):
+    """녹음 길이와 동시 요청 수에 따른 분할 전사 시간 (대역 서버 처리 시간은 오디오 길이에 비례)"""
+    from audio_chunker import ChunkedTranscriber, MAX_UPLOAD_BYTES
+    from mock_whisper_server import MockWhisperServer
+    from transcription_backend import OpenAIBackend
+
+    # 합성 음성 1분을 이어 붙여 긴 녹음을 만듦 (한 시간 = int16 약 115MB)
+    minute = synth_speech(60.0, seed=args.seed, silence=1.0)
+    bytes_per_second = len(encode_bytes(minute, SAMPLERATE)) / 60.0
+    server = MockWhisperServer(latency_ms=args.latency_ms, bytes_per_second=bytes_per_second,
+                               ms_per_audio_second=args.ms_per_audio_second, seed=args.seed).start()
+    backend = OpenAIBackend("sk-test", base_url=server.base_url, max_connections=max(args.concurrency))
+
+    rows = []
+    for minutes in args.minutes:
+        audio = np.tile(minute, (int(minutes), 1))
+        whole_mb = len(audio) / SAMPLERATE * bytes_per_second / (1024 * 1024.0)
+        for concurrency in args.concurrency:
+            chunker = ChunkedTranscriber(lambda data, name: backend.transcribe(data, {"filename": name}),
+                                         max_workers=concurrency)
+            chunks = chunker.plan(audio, SAMPLERATE)
+            t0 = time.perf_counter()
+            chunker.transcribe_audio(audio, SAMPLERATE, "long.flac")
+            wall = time.perf_counter() - t0
+            lengths = [(end - start) / SAMPLERATE for start, end in chunks]
+            rows.append((f"{minutes:g}", f"{whole_mb:.1f}", concurrency, len(chunks), f"{max(lengths):.0f}",
+                         f"{wall:.2f}", f"{minutes * 60 * args.ms_per_audio_second / 1000.0:.2f}"))
+    backend.close()
+    server.shutdown()
+    print(f"대역 서버: 요청당 {args.latency_ms:g}ms + 오디오 1초당 {args.ms_per_audio_second:g}ms, "
+          f"업로드 제한 {MAX_UPLOAD_BYTES / (1024 * 1024):.0f}MB")
+    print_table(("minutes", "whole_mb", "concurrency", "chunks", "max_chunk_s", "wall_s", "one_request_s"), rows)
+
+
+# ---------------------------------------------------------------------------
+# postprocess: 전사 결과 후처리 10k 글자 처리 시간 (이전 구현과 비교)
+# ---------------------------------------------------------------------------
+def legacy_postprocess(text):
+    """규칙표 엔진 이전의 후처리 (re.sub → strip/마침표 제거 → 두 글자 '\\n'으로 나눠 줄마다 정리)"""
+    text = re.sub(r'\s*(개행|엔터)\s*', '\\n', text)
+    cleaned_text = text.strip()
+    if cleaned_text.startswith('.'):
+        cleaned_text = cleaned_text[1:]
+    if cleaned_text.endswith('.'):
+        cleaned_text = cleaned_text[:-1]
+    cleaned_text = cleaned_text.strip()
+    cleaned_lines = []
+    for line in cleaned_text.split('\\n'):
+        line = line.strip()
+        cleaned_lines.append(line[1:].lstrip() if line.startswith('.') else line)
+    return "\\n".join(cleaned_lines)
+
+
+POSTPROCESS_USER_COMMANDS = {"개행": "\n", "엔터": "\n", "new line": "\n", "새 문단": "\n\n"}
+POSTPROCESS_USER_REPLACEMENTS = {"*": {"open ai": "OpenAI", "open": "Open"}, "en": {"gonna": "going to"},
+                                 "ko": {"회의": "미팅"}}
+
+
+def _postprocess_text(chars, seed):
+    """명령이 가끔 섞인 한국어/영어 전사 결과 흉내 (chars 글자)"""
+    rng = np.random.default_rng(seed)
+    words = ("오늘 회의 내용을 정리하겠습니다 그리고 다음 주 일정은 확인 부탁드립니다 "
+             "the quick brown fox jumps over lazy dog open ai gonna").split()
+    out, length = [], 0
+    while length < chars:
+        word = "개행" if rng.random() < 0.02 else words[rng.integers(len(words))]
+        out.append(word)
+        length += len(word) + 1
+    return " ".join(out)[:chars]
+
+
+def bench_postprocess(args):
+    """긴 전사 결과의 처리 시간 (정답 사례와 이전 구현과의 비교는 tests/test_text_postprocess.py)"""
+    from text_postprocess import TextPostProcessor
+
+    default = TextPostProcessor()
+    text = _postprocess_text(args.chars, args.seed)
+    many = TextPostProcessor(dict(POSTPROCESS_USER_COMMANDS),
+                             {"*": {f"term{i}": f"TERM{i}" for i in range(args.rules)},
+                              **{k: v for k, v in POSTPROCESS_USER_REPLACEMENTS.items() if k != "*"}})
+    rows = []
+    for name, run in (("legacy chain", lambda: legacy_postprocess(text)),
+                      ("engine (default rules)", lambda: default.process(text)),
+                      (f"engine ({args.rules + 7} rules)", lambda: many.process(text, "en"))):
+        run()
+        times = []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - t0)
+        rows.append((name, len(text), f"{percentile_ms(times, 50):.3f}", f"{percentile_ms(times, 99):.3f}"))
+    print_table(("implementation", "chars", "p50_ms", "p99_ms"), rows)
+
+
+# ---------------------------------------------------------------------------
+# inject: 텍스트 입력 방식별 입력 시간 (이전 sleep 방식 vs 클립보드 준비 확인 vs 유니코드 일괄 입력)
+# ---------------------------------------------------------------------------
+def _spin(seconds):
+    """짧은 지연 흉내 (time.sleep은 1ms 미만을 정확히 기다리지 못함)"""
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class SimulatedClipboard:
+    """pyperclip 대역: 복사한 내용은 ready_ms 뒤에 읽힘 (클립보드 소유권이 넘어가는 시간 흉내)"""
+
+    def __init__(self, value, ready_ms):
+        self.value = value
+        self.ready_ms = ready_ms
+        self._pending = None
+
+    def copy(self, text):
+        self._pending = (text, time.perf_counter() + self.ready_ms / 1000.0)
+
+    def paste(self):
+        if self._pending is not None and time.perf_counter() >= self._pending[1]:
+            self.value, self._pending = self._pending[0], None
+        return self.value
+
+
+class SimulatedKeyboard:
+    """pynput Controller 대역: 호출마다 call_us, 키 이벤트마다 event_us가 걸림 (type()은 글자마다 호출)"""
+
+    def __init__(self, call_us, event_us):
+        self.call = call_us / 1e6
+        self.event = event_us / 1e6
+        self.events = 0
+
+    def press(self, key):
+        self.events += 1
+        _spin(self.call + self.event)
+
+    def release(self, key):
+        self.press(key)
+
+    def type(self, text):
+        for _ in text:
+            self.events += 2
+            _spin(self.call + 2 * self.event)
+
+    def send_events(self, events):
+        """SendInput 대역: 이벤트 목록 전체가 호출 한 번"""
+        self.events += len(events)
+        _spin(self.call + len(events) * self.event)
+
+
+def legacy_paste(clipboard, keyboard, text):
+    """이전 deliver_take의 붙여넣기 (복사 → 고정 0.2초 → Ctrl+V)"""
+    clipboard.copy(text)
+    time.sleep(0.2)
+    keyboard.press("ctrl")
+    keyboard.press("v")
+    keyboard.release("v")
+    keyboard.release("ctrl")
+
+
+def legacy_typing(keyboard, text):
+    """이전 deliver_take의 대체 입력 (고정 0.2초 → 글자마다 type() + 0.01초)"""
+    time.sleep(0.2)
+    for char in text:
+        keyboard.type(char)
+        time.sleep(0.01)
+
+
+def bench_inject(args):
+    """입력 방식별 텍스트 길이에 따른 입력 시간과 클립보드 복원 확인"""
+    from text_injection import ClipboardPasteStrategy, UnicodeTypingStrategy, RecordingSink, TextInjector
+
+    original = "사용자가 복사해 둔 내용"
+    clipboard = SimulatedClipboard(original, args.clipboard_ready_ms)
+    keyboard = SimulatedKeyboard(args.call_us, args.event_us)
+    paste = ClipboardPasteStrategy(clipboard, keyboard, "ctrl", restore_delay=args.restore_ms / 1000.0)
+    unicode = UnicodeTypingStrategy(send_events=keyboard.send_events, batch_size=args.batch_size)
+    sink = RecordingSink()
+    # 클립보드가 준비되지 않으면 유니코드 입력으로 넘어가는지 확인하는 입력기
+    fallback = TextInjector([ClipboardPasteStrategy(SimulatedClipboard(original, 10000), keyboard, "ctrl",
+                                                    ready_timeout=0.01), unicode])
+
+    strategies = (
+        ("legacy paste (sleep 0.2s)", lambda text: legacy_paste(clipboard, keyboard, text), True),
+        ("legacy typing (per char)", lambda text: legacy_typing(keyboard, text), True),
+        ("paste (readiness)", paste.inject, False),
+        (f"unicode (batch {args.batch_size})", unicode.inject, False),
+        ("unicode (pynput type)", UnicodeTypingStrategy(keyboard, batch_size=args.batch_size).inject, False),
+        ("record", sink.inject, False),
+    )
+    rows = []
+    for name, inject, legacy in strategies:
+        for length in args.lengths:
+            if name.startswith("legacy typing") and length > args.legacy_max_chars:
+                rows.append((name, length, "-", "-", "-"))
+                continue
+            text = _postprocess_text(length, args.seed)
+            times = []
+            # 이전 방식은 고정 sleep이 대부분이라 한 번만 측정
+            for i in range(1 if legacy else args.repeat):
+                # 반복마다 다른 텍스트 (클립보드에 이미 같은 내용이 있으면 준비 확인이 바로 끝나므로)
+                sample = text[:-1] + str(i % 10) if length else text
+                t0 = time.perf_counter()
+                inject(sample)
+                times.append(time.perf_counter() - t0)
+            p50 = percentile_ms(times, 50)
+            rows.append((name, length, f"{p50:.2f}", f"{percentile_ms(times, 95):.2f}",
+                         f"{length / (p50 / 1000.0):.0f}" if p50 > 0 else "-"))
+    print_table(("strategy", "chars", "p50_ms", "p95_ms", "chars_per_s"), rows)
+
+    # 클립보드 복원: 복원 전에 연속으로 붙여넣어도 처음 저장한 사용자 내용이 돌아와야 함
+    clipboard = SimulatedClipboard(original, args.clipboard_ready_ms)
+    paste = ClipboardPasteStrategy(clipboard, keyboard, "ctrl", restore_delay=args.restore_ms / 1000.0)
+    paste.inject("첫 번째 녹음")
+    paste.inject("두 번째 녹음")
+    time.sleep(args.restore_ms / 1000.0 * 3)
+    restored = clipboard.paste() == original
+    result = fallback.inject("대체 입력 확인")
+    print(f"\n연속 붙여넣기 뒤 이전 클립보드 내용 복원: {'성공' if restored else '실패'} "
+          f"(복원 {paste.restored_count}회, {args.restore_ms:.0f}ms 뒤)")
+    print(f"클립보드가 준비되지 않을 때: {result.strategy} 방식으로 입력 ({result.ms:.1f}ms)")
+    print(f"기록용 입력: {len(sink.texts)}건")
+    print(f"(키 이벤트 비용은 호출당 {args.call_us:.0f}us, 이벤트당 {args.event_us:.0f}us로 흉내 낸 값, "
+          f"클립보드는 복사 {args.clipboard_ready_ms:.1f}ms 뒤 읽힘)")
+
+
+# ---------------------------------------------------------------------------
+# logging: 로그 한 줄 기록에 호출한 스레드가 쓰는 시간 (파일 열기/닫기 vs 대기열)
+# ---------------------------------------------------------------------------
+def legacy_log_to_console(path, message):
+    """이전 log_to_console (출력 후 매번 파일을 열어 한 줄 쓰고 닫음)"""
+    print(message)
+    try:
+        timestamp = datetime.datetime.now().strftime("%H:%M:%S")
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(f"[{timestamp}] {message}\n")
+    except Exception as e:
+        print(f"로그 기록 오류: {str(e)}")
+
+
+def _time_calls(call, count):
+    times = []
+    for i in range(count):
+        t0 = time.perf_counter()
+        call(i)
+        times.append(time.perf_counter() - t0)
+    return times
+
+
+def _logger(name, handlers):
+    import logging
+    logger = logging.getLogger(f"benchmark.{name}")
+    logger.handlers = list(handlers)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return logger
+
+
+def bench_logging(args):
+    """이전 기록 방식과 대기열 기록의 호출당 시간, 쓰기가 밀릴 때 버린 줄 요약"""
+    import logging
+    from async_log import AsyncLogWriter, QueueLogHandler, console_line
+
+    log_format = '%(asctime)s - %(levelname)s - %(message)s'
+    message = "녹음 #12 전사 완료: 처리 후 순서 대기 0ms, 업로드 48213 바이트"
+    rows = []
+    with tempfile.TemporaryDirectory() as directory, open(os.devnull, "w", encoding="utf-8") as devnull:
+        stdout = sys.stdout
+        sys.stdout = devnull     # 출력 비용은 포함하되 화면에는 쓰지 않음
+        try:
+            console_path = os.path.join(directory, "legacy_console.log")
+            legacy = _time_calls(lambda i: legacy_log_to_console(console_path, f"{message} {i}"), args.calls)
+
+            file_handler = logging.FileHandler(os.path.join(directory, "legacy_app.log"), encoding="utf-8")
+            stream_handler = logging.StreamHandler(devnull)
+            for handler in (file_handler, stream_handler):
+                handler.setFormatter(logging.Formatter(log_format))
+            logger = _logger("legacy", [file_handler, stream_handler])
+            legacy_logging = _time_calls(lambda i: logger.info(f"{message} {i}"), args.calls)
+            file_handler.close()
+
+            writer = AsyncLogWriter(max_queue=args.calls * 2 + 10)
+            writer.add_target("console", os.path.join(directory, "console.log"), formatter=console_line, echo=True)
+            queued = _time_calls(lambda i: writer.write("console", f"{message} {i}"), args.calls)
+            handler = QueueLogHandler(writer, "app")
+            handler.setFormatter(logging.Formatter(log_format))
+            writer.add_target("app", os.path.join(directory, "app.log"), formatter=handler.format_record, echo=True)
+            logger = _logger("queued", [handler])
+            queued_logging = _time_calls(lambda i: logger.info(f"{message} {i}"), args.calls)
+            t0 = time.perf_counter()
+            writer.flush(timeout=60)
+            drain = time.perf_counter() - t0
+            writer.close()
+            stats = writer.stats()
+            batches = writer.batch_count
+        finally:
+            sys.stdout = stdout
+
+        for name, times in (("log_to_console (open/append/close)", legacy),
+                            ("logging (FileHandler + stdout)", legacy_logging),
+                            ("log_to_console (queue)", queued),
+                            ("logging (QueueLogHandler)", queued_logging)):
+            rows.append((name, len(times), f"{percentile_ms(times, 50) * 1000:.1f}",
+                         f"{percentile_ms(times, 99) * 1000:.1f}", f"{max(times) * 1e6:.0f}",
+                         f"{sum(times):.3f}"))
+        print_table(("path", "calls", "p50_us", "p99_us", "max_us", "total_s"), rows)
+        written = sum(w for w, _ in stats.values())
+        print(f"\n대기열 기록: {written}줄을 {batches}번에 나눠 씀, 마지막 호출 뒤 남은 줄 쓰기 {drain * 1000:.0f}ms")
+
+        # 디스크가 느릴 때: 묶음마다 slow_ms가 걸리는 쓰기 스레드에 한꺼번에 많은 줄을 넣음
+        class SlowWriter(AsyncLogWriter):
+            def _write_target(self, target, lines):
+                time.sleep(args.slow_ms / 1000.0)
+                super()._write_target(target, lines)
+
+        path = os.path.join(directory, "burst.log")
+        writer = SlowWriter(max_queue=args.max_queue)
+        writer.add_target("console", path, formatter=console_line)
+        burst = _time_calls(lambda i: writer.write("console", f"{message} {i}"), args.burst)
+        writer.close(timeout=60)
+        written, dropped = writer.stats()["console"]
+        with open(path, encoding="utf-8") as f:
+            summaries = sum(1 for line in f if "줄 생략" in line)
+    print(f"\n쓰기 지연 {args.slow_ms:.0f}ms/묶음, 대기열 {args.max_queue}줄에 {args.burst}줄을 한꺼번에 기록:")
+    print(f"  호출당 p50 {percentile_ms(burst, 50) * 1000:.1f}us, p99 {percentile_ms(burst, 99) * 1000:.1f}us, "
+          f"최대 {max(burst) * 1e6:.0f}us")
+    print(f"  쓴 줄 {written - summaries}, 버린 줄 {dropped}, 버린 줄 요약 {summaries}줄")
+
+
+# ---------------------------------------------------------------------------
+# logrotate: 쌓인 로그 압축/정리, 회전, 크기가 제한된 콘솔 로그 읽기
+# ---------------------------------------------------------------------------
+def _fake_log_lines(count, seed):
+    rng = np.random.default_rng(seed)
+    words = "녹음 전사 완료 업로드 바이트 처리 대기 마이크 장치 take upload response ms".split()
+    return [f"2026-01-01 00:00:{i % 60:02d},000 - INFO - " + " ".join(words[j] for j in rng.integers(0, len(words), 8))
+            + f" {i}" for i in range(count)]
+
+
+def _tail_lines(path, count, block=65536):
+    """파일 끝에서부터 count줄 (Get-Content -Tail처럼 끝부분만 읽음)"""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+        data = b""
+        while end > 0 and data.count(b"\n") <= count:
+            start = max(0, end - block)
+            f.seek(start)
+            data = f.read(end - start) + data
+            end = start
+    return data.decode("utf-8", "replace").splitlines()[-count:]
+
+
+def _dir_stats(directory):
+    paths = glob.glob(os.path.join(directory, "*"))
+    return len(paths), sum(os.path.getsize(p) for p in paths)
+
+
+def bench_logrotate(args):
+    """며칠 동안 쌓인 로그 압축/정리 시간과 크기, 크기 제한 회전, 콘솔 로그를 처음부터 읽기 vs 끝만 읽기"""
+    from async_log import AsyncLogWriter, console_line
+    from log_retention import LogCompactor, compact_logs
+
+    lines = _fake_log_lines(2000, args.seed)
+    with tempfile.TemporaryDirectory() as directory:
+        # 1) 항상 켜 둔 PC: 시작할 때마다 만든 로그 파일이 args.days일에 걸쳐 쌓인 상태
+        logs = os.path.join(directory, "logs")
+        os.makedirs(logs)
+        text = ("\n".join(lines) + "\n").encode("utf-8")
+        body = (text * (args.file_kb * 1024 // len(text) + 1))[:args.file_kb * 1024]
+        now = time.time()
+        for i in range(args.files):
+            path = os.path.join(logs, f"whisperer_{i:06d}.log")
+            with open(path, "wb") as f:
+                f.write(body)
+            mtime = now - (args.files - i) * args.days * 86400.0 / args.files
+            os.utime(path, (mtime, mtime))
+        before = _dir_stats(logs)
+        t0 = time.perf_counter()
+        compressed, deleted, total = compact_logs(logs, keep_days=args.keep_days,
+                                                  max_total_bytes=args.max_total_mb * 1048576)
+        elapsed = time.perf_counter() - t0
+        after = _dir_stats(logs)
+        print(f"로그 {before[0]}개 ({before[1] / 1048576:.1f}MB, {args.days}일) 정리: "
+              f"압축 {compressed}개, 삭제 {deleted}개 → {after[0]}개 ({after[1] / 1048576:.2f}MB), {elapsed:.2f}초")
+        t0 = time.perf_counter()
+        compact_logs(logs, keep_days=args.keep_days, max_total_bytes=args.max_total_mb * 1048576)
+        print(f"다시 실행 (정리할 것이 없을 때): {(time.perf_counter() - t0) * 1000:.1f}ms")
+
+        # 2) 크기 제한 회전: 새 파일로 넘어가고 다 쓴 파일은 백그라운드에서 압축
+        rotated = os.path.join(directory, "rotated")
+        os.makedirs(rotated)
+        counter = iter(range(1, 10 ** 6))
+        writer = None
+        compactor = LogCompactor(rotated, keep_days=None, active=lambda: writer.active_paths())
+        writer = AsyncLogWriter(on_rotate=compactor.request)
+        writer.add_target("app", os.path.join(rotated, "whisperer_0.log"), max_bytes=args.max_file_kb * 1024,
+                          next_path=lambda: os.path.join(rotated, f"whisperer_{next(counter)}.log"))
+        t0 = time.perf_counter()
+        for i in range(args.app_lines):
+            writer.write("app", lines[i % len(lines)])
+        writer.close(timeout=60)
+        compactor.request()
+        compactor.wait(60)
+        count, size = _dir_stats(rotated)
+        print(f"\n로그 {args.app_lines}줄, {args.max_file_kb}KB마다 회전: 회전 {writer._targets['app'].rotations}번, "
+              f"파일 {count}개 (압축 {len(glob.glob(os.path.join(rotated, '*.gz')))}개, {size / 1048576:.2f}MB), "
+              f"{time.perf_counter() - t0:.2f}초")
+
+        # 3) 콘솔 로그: 제한 없음 vs console_max_kb, 콘솔 창이 처음 열 때 전체를 읽는 시간 vs 끝 200줄만 읽는 시간
+        rows = []
+        for label, max_bytes in (("unbounded", None), (f"{args.console_max_kb}KB", args.console_max_kb * 1024)):
+            path = os.path.join(directory, f"console_{label}.log")
+            writer = AsyncLogWriter()
+            writer.add_target("console", path, formatter=console_line, max_bytes=max_bytes)
+            for i in range(args.console_lines):
+                writer.write("console", lines[i % len(lines)])
+                if i % 5000 == 4999:
+                    writer.flush()
+            writer.close(timeout=60)
+            size = os.path.getsize(path)
+            t0 = time.perf_counter()
+            with open(path, encoding="utf-8") as f:
+                full = len(f.readlines())
+            read_all = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            tail = len(_tail_lines(path, 200))
+            read_tail = time.perf_counter() - t0
+            rows.append((label, f"{size / 1024:.0f}", full, f"{read_all * 1000:.1f}", tail, f"{read_tail * 1000:.2f}"))
+        print()
+        print_table(("console_log", "size_kb", "lines", "read_all_ms", "tail_lines", "tail_ms"), rows)
+
+
+# ---------------------------------------------------------------------------
+# e2e: 가상 마이크 → start_recording/stop_recording → 로컬 대역 서버 → 붙여넣기 대신 기록
+# ---------------------------------------------------------------------------
+class NullPasteSink:
+    """클립보드와 키 입력 대신 붙여넣을 텍스트를 기록하는 deliver_take 대역"""
+
+    def __init__(self):
+        self.texts = []
+
+    def deliver(self, take):
+        if take.text:
+            self.texts.append(take.text)
+            take.mark("paste_done")
+
+
+def load_e2e_corpus(args):
+    """--corpus의 WAV/FLAC 파일, 없으면 길이가 다른 합성 음성 (시드 고정)"""
+    if args.corpus:
+        from virtual_input import load_clip
+        paths = sorted(glob.glob(os.path.join(args.corpus, "*.wav")) + glob.glob(os.path.join(args.corpus, "*.flac")))
+        clips = [load_clip(path) for path in paths[:args.takes]]
+        return [clips[i % len(clips)] for i in range(args.takes)] if clips else []
+    rng = np.random.default_rng(args.seed)
+    return [(synth_speech(float(rng.uniform(args.min_seconds, args.max_seconds)), seed=i, silence=0.3), SAMPLERATE)
+            for i in range(args.takes)]
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def bench_e2e(args):
+    """
+    whisperer.py의 녹음 시작/종료 경로를 그대로 실행합니다.
+
+    가상 마이크가 말뭉치를 (speed배 빠르게) 재생하고, 전사는 로컬 대역 서버가, 붙여넣기는 NullPasteSink가 맡습니다.
+    단계별 지연은 whisperer의 LatencyRecorder로 모으고, 메모리는 tracemalloc 최대치로 잽니다.
+    """
+    import contextlib
+    import json
+    import logging
+    import openai
+    import soundfile
+    import whisperer as app
+    from device_registry import DeviceRegistry
+    from latency_metrics import LatencyRecorder
+    from mock_whisper_server import MockWhisperServer
+    from session_events import load_events, summarize
+    from virtual_input import VirtualSoundDevice
+
+    logging.getLogger().setLevel(logging.ERROR)
+    corpus = load_e2e_corpus(args)
+    if not corpus:
+        print("말뭉치가 비어 있습니다.")
+        sys.exit(1)
+    server = MockWhisperServer(latency_ms=args.api_ms, latency_dist="lognormal", latency_spread=0.3,
+                               seed=args.seed).start()
+    device = VirtualSoundDevice(samplerate=args.device_rate, speed=args.speed, seed=args.seed)
+    sink = NullPasteSink()
+
+    # whisperer 전역 상태를 실행 환경 대신 설정 (load_modules/load_settings를 거치지 않음)
+    app.sd, app.np, app.openai, app.soundfile = device, np, openai, soundfile
+    app.api_key = "sk-bench"
+    app.api_base_url = server.base_url
+    app.device_registry = DeviceRegistry(device).refresh()
+    app.armed_mode = args.armed
+    app.streaming_mode = args.streaming
+    app.transcript_cache_enabled = False
+    app.max_parallel_takes = args.workers
+    app.latency_recorder = LatencyRecorder()
+    app.deliver_take = sink.deliver
+    audio_seconds = sum(len(audio) / float(rate) for audio, rate in corpus)
+    # 가상 마이크의 레이트 변환이 메모리 측정에 섞이지 않도록 미리 장치 레이트로 변환
+    corpus = [(audio if rate == args.device_rate else resample(audio, rate, args.device_rate), args.device_rate)
+              for audio, rate in corpus]
+
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        cwd = os.getcwd()
+        os.chdir(tmp)       # recordings 폴더를 임시 폴더에 만듦
+        tracemalloc.start()
+        try:
+            if args.armed:
+                app.arm_input_stream()
+                time.sleep(app.preroll_ms / 1000.0 / args.speed)
+            t0 = time.perf_counter()
+            for audio, rate in corpus:
+                app.hotkey_pressed_at = time.perf_counter()
+                app.prewarm_transcription_backend()
+                app.start_recording()
+                device.say(audio, rate).wait()
+                time.sleep(args.tail_ms / 1000.0 / args.speed)   # 말이 끝나고 단축키를 떼기까지
+                app.stop_recording()
+                time.sleep(args.gap_ms / 1000.0 / args.speed)
+            app.get_transcription_pipeline().flush(timeout=120)
+            wall = time.perf_counter() - t0
+            _, peak = tracemalloc.get_traced_memory()
+            # 녹음마다 세션 이벤트가 한 줄씩 남았는지 확인
+            app.get_session_event_log().flush(timeout=10)
+            events = summarize(load_events(os.path.join(tmp, "logs", "sessions")))
+        finally:
+            tracemalloc.stop()
+            app.disarm_input_stream()
+            if app.recording_archiver is not None:
+                app.recording_archiver.flush(timeout=10)
+            os.chdir(cwd)
+    pipeline = app.transcription_pipeline
+    server.shutdown()
+
+    recorder = app.latency_recorder
+    stages = {name: {"count": count, "p50_ms": round(p50, 1), "p95_ms": round(p95, 1), "p99_ms": round(p99, 1)}
+              for name, count, p50, p95, p99, _ in recorder.summary()}
+    result = {
+        "revision": _git_revision(),
+        "config": {"takes": args.takes, "speed": args.speed, "armed": args.armed, "streaming": args.streaming,
+                   "workers": args.workers, "device_rate": args.device_rate, "api_ms": args.api_ms,
+                   "seed": args.seed, "corpus": args.corpus},
+        "takes": len(corpus),
+        "pasted": len(sink.texts),
+        "failed": pipeline.failed_count,
+        "wall_s": round(wall, 3),
+        "audio_s": round(audio_seconds, 3),
+        "takes_per_min": round(len(sink.texts) / wall * 60.0, 2),
+        "peak_python_mb": round(peak / 1e6, 2),
+        "stages": stages,
+        "events": {"count": events["count"], "outcomes": events["outcomes"], "error_rate": events["error_rate"]},
+    }
+
+    print(f"녹음 {len(corpus)}건 (오디오 {audio_seconds:.1f}초, 재생 {args.speed:g}배속, "
+          f"{'항상 대기' if args.armed else '스트림 열기'}, 장치 {args.device_rate}Hz, 대역 서버 {args.api_ms:g}ms)")
+    print(f"붙여넣기 {result['pasted']}건, 실패 {result['failed']}건, {wall:.2f}초, "
+          f"{result['takes_per_min']:.1f}건/분, Python 메모리 최대 {result['peak_python_mb']:.1f}MB")
+    print_table(("stage", "count", "p50_ms", "p95_ms", "p99_ms"),
+                [(name, v["count"], v["p50_ms"], v["p95_ms"], v["p99_ms"]) for name, v in stages.items()])
+    print(f"세션 이벤트 {events['count']}건: " + ", ".join(f"{k} {v}" for k, v in events["outcomes"].items()))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.json}")
+    if result["pasted"] != len(corpus) or events["count"] != len(corpus):
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WhisperTyper 성능 측정")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("capture", help="녹음 버퍼 콜백/종료 비용")
+    p.add_argument("--blocksize", type=int, default=160, help="콜백 블록 크기(프레임)")
+    p.add_argument("--durations", type=float, nargs="+", default=[5, 60, 900], help="녹음 길이(초)")
+    p.set_defaults(func=bench_capture)
+
+    p = sub.add_parser("latency", help="단축키→첫 샘플 지연 (실제 장치 필요)")
+    p.add_argument("--device", type=int, default=None, help="입력 장치 번호")
+    p.add_argument("--trials", type=int, default=10)
+    p.add_argument("--preroll-ms", type=int, default=300)
+    p.set_defaults(func=bench_latency)
+
+    p = sub.add_parser("encode", help="녹음 종료→요청 시작 지연 (일괄 vs 점진적 인코딩)")
+    p.add_argument("--durations", type=float, nargs="+", default=[10, 600], help="녹음 길이(초)")
+    p.add_argument("--speed", type=float, default=20.0, help="점진적 인코딩 입력 배속")
+    p.set_defaults(func=bench_encode)
+
+    p = sub.add_parser("codecs", help="업로드 코덱 크기/인코딩 시간/왕복 비교")
+    p.add_argument("--corpus", default="recordings", help="녹음 파일 폴더")
+    p.add_argument("--limit", type=int, default=200, help="사용할 최대 파일 수")
+    p.set_defaults(func=bench_codecs)
+
+    p = sub.add_parser("resample", help="장치 레이트→16kHz 리샘플링 처리량")
+    p.add_argument("--rates", type=int, nargs="+", default=[48000, 44100, 22050])
+    p.add_argument("--seconds", type=float, default=60.0, help="입력 길이(초)")
+    p.add_argument("--blocksize", type=int, default=480, help="콜백 블록 크기(입력 프레임)")
+    p.set_defaults(func=bench_resample)
+
+    p = sub.add_parser("pipeline", help="녹음 종료 처리 (Tk 스레드 직접 처리 vs 작업 대기열)")
+    p.add_argument("--takes", type=int, default=5)
+    p.add_argument("--seconds", type=float, default=5.0, help="녹음 길이(초)")
+    p.add_argument("--api-ms", type=float, default=1500.0, help="모의 API 왕복 시간")
+    p.set_defaults(func=bench_pipeline)
+
+    p = sub.add_parser("takes", help="연속 녹음 동시 전사 처리 시간과 붙여넣기 대기 (작업 스레드 수 비교)")
+    p.add_argument("--takes", type=int, default=20)
+    p.add_argument("--workers", type=int, default=3)
+    p.add_argument("--seconds", type=float, default=3.0, help="녹음 길이(초)")
+    p.add_argument("--gap-ms", type=float, default=100.0, help="녹음 사이 간격")
+    p.add_argument("--min-ms", type=float, default=300.0, help="모의 API 최소 지연")
+    p.add_argument("--max-ms", type=float, default=1500.0, help="모의 API 최대 지연")
+    p.add_argument("--seed", type=int, default=0)
+    p.set_defaults(func=bench_takes)
+
+    p = sub.add_parser("client", help="API 연결: 새 연결 vs 재사용 vs 미리 연결 (로컬 HTTPS 대역 서버)")
+    p.add_argument("--trials", type=int, default=10)
+    p.add_argument("--seconds", type=float, default=5.0, help="업로드할 녹음 길이(초)")
+    p.add_argument("--latency-ms", type=float, default=50.0, help="대역 서버 처리 지연")
+    p.add_argument("--handshake-ms", type=float, default=120.0, help="새 연결마다 추가되는 네트워크 지연 (DNS+TCP+TLS 왕복)")
+    p.add_argument("--record-ms", type=float, default=1500.0, help="단축키를 누르고 떼기까지의 시간")
+    p.add_argument("--gap-ms", type=float, default=500.0, help="연결 재사용 시 요청 간격")
+    p.set_defaults(func=bench_client)
+
+    p = sub.add_parser("policy", help="재시도/중복 요청/기한 정책 (오류를 섞는 로컬 대역 서버)")
+    p.add_argument("--requests", type=int, default=80)
+    p.add_argument("--concurrency", type=int, default=4)
+    p.add_argument("--attempts", type=int, default=3)
+    p.add_argument("--latency-ms", type=float, default=150.0)
+    p.add_argument("--error-rate", type=float, default=0.15)
+    p.add_argument("--slow-rate", type=float, default=0.04)
+    p.add_argument("--slow-ms", type=float, default=4000.0)
+    p.add_argument("--deadline", type=float, default=6.0, help="녹음별 최종 기한(초)")
+    p.add_argument("--seed", type=int, default=1)
+    p.set_defaults(func=bench_policy)
+
+    p = sub.add_parser("backend", help="전사 백엔드 부하 테스트 (로컬 대역 서버, 동기 vs 비동기)")
+    p.add_argument("--requests", type=int, default=200)
+    p.add_argument("--concurrency", type=int, default=16)
+    p.add_argument("--latency-ms", type=float, default=200.0)
+    p.add_argument("--error-rate", type=float, default=0.05)
+    p.add_argument("--seed", type=int, default=0)
+    p.set_defaults(func=bench_backend)
+
+    p = sub.add_parser("cache", help="전사 결과 캐시 적중 vs API 호출 지연")
+    p.add_argument("--clips", type=int, default=20)
+    p.add_argument("--latency-ms", type=float, default=400.0)
+    p.add_argument("--max-kb", type=int, default=1024)
+    p.add_argument("--seed", type=int, default=0)
+    p.set_defaults(func=bench_cache)
+
+    p = sub.add_parser("language", help="매번 언어 감지 vs 앱별 언어 사전 확률 (전사 지연, 잘못 지정한 비율)")
+    p.add_argument("--takes", type=int, default=200)
+    p.add_argument("--latency-ms", type=float, default=300.0)
+    p.add_argument("--detect-ms", type=float, default=150.0, help="language 없는 요청의 언어 감지 지연")
+    p.add_argument("--switch-rate", type=float, default=0.05, help="녹음마다 그 앱의 언어가 다시 정해질 확률")
+    p.add_argument("--threshold", type=float, default=0.8)
+    p.add_argument("--seed", type=int, default=0)
+    p.set_defaults(func=bench_language)
+
+    p = sub.add_parser("chunks", help="업로드 크기 제한을 넘는 긴 녹음 분할 전사 (녹음 길이 x 동시 요청 수)")
+    p.add_argument("--minutes", type=float, nargs="+", default=[10, 30, 60])
+    p.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    p.add_argument("--latency-ms", type=float, default=200.0, help="대역 서버 요청당 지연")
+    p.add_argument("--ms-per-audio-second", type=float, default=5.0, help="대역 서버의 오디오 1초당 처리 시간")
+    p.add_argument("--seed", type=int, default=0)
+    p.set_defaults(func=bench_chunks)
+
+    p = sub.add_parser("postprocess", help="전사 결과 후처리 처리 시간 (이전 구현 비교)")
+    p.add_argument("--chars", type=int, default=10000)
+    p.add_argument("--rules", type=int, default=100, help="처리 시간 측정에 추가할 치환 규칙 수")
+    p.add_argument("--repeat", type=int, default=200)
+    p.add_argument("--seed", type=int, default=0)
+    p.set_defaults(func=bench_postprocess)
+
+    p = sub.add_parser("inject", help="텍스트 입력 방식별 길이에 따른 입력 시간 (이전 sleep 방식 비교)")
+    p.add_argument("--lengths", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    p.add_argument("--repeat", type=int, default=20)
+    p.add_argument("--batch-size", type=int, default=500, help="유니코드 입력 한 번에 보내는 글자 수")
+    p.add_argument("--call-us", type=float, default=30.0, help="키 입력 호출 한 번의 비용 (흉내)")
+    p.add_argument("--event-us", type=float, default=2.0, help="키 이벤트 하나의 비용 (흉내)")
+    p.add_argument("--clipboard-ready-ms", type=float, default=2.0, help="복사 후 클립보드에서 읽힐 때까지")
+    p.add_argument("--restore-ms", type=float, default=20.0, help="붙여넣은 뒤 이전 클립보드 내용을 되돌리기까지")
+    p.add_argument("--legacy-max-chars", type=int, default=1000, help="이전 글자별 입력을 측정할 최대 길이")
+    p.add_argument("--seed", type=int, default=0)
+    p.set_defaults(func=bench_inject)
+
+    p = sub.add_parser("logging", help="로그 기록 호출당 시간 (파일 열기/닫기 vs 대기열), 쓰기가 밀릴 때 버린 줄 요약")
+    p.add_argument("--calls", type=int, default=20000)
+    p.add_argument("--burst", type=int, default=100000, help="쓰기가 느릴 때 한꺼번에 넣는 줄 수")
+    p.add_argument("--max-queue", type=int, default=1000)
+    p.add_argument("--slow-ms", type=float, default=2.0, help="느린 디스크 흉내: 묶음마다 걸리는 시간")
+    p.set_defaults(func=bench_logging)
+
+    p = sub.add_parser("logrotate", help="쌓인 로그 압축/정리, 크기 제한 회전, 콘솔 로그 전체 읽기 vs 끝만 읽기")
+    p.add_argument("--files", type=int, default=2000, help="쌓여 있는 로그 파일 수")
+    p.add_argument("--file-kb", type=int, default=64)
+    p.add_argument("--days", type=float, default=60.0, help="로그 파일이 쌓인 기간")
+    p.add_argument("--keep-days", type=float, default=14.0)
+    p.add_argument("--max-total-mb", type=float, default=200.0)
+    p.add_argument("--max-file-kb", type=int, default=1024, help="로그 파일 회전 크기")
+    p.add_argument("--app-lines", type=int, default=100000)
+    p.add_argument("--console-lines", type=int, default=200000)
+    p.add_argument("--console-max-kb", type=int, default=1024)
+    p.add_argument("--seed", type=int, default=0)
+    p.set_defaults(func=bench_logrotate)
+
+    p = sub.add_parser("e2e", help="가상 마이크와 대역 서버로 녹음→전사→붙여넣기 전체 경로 측정")
+    p.add_argument("--takes", type=int, default=20)
+    p.add_argument("--corpus", default=None, help="WAV/FLAC 폴더 (없으면 합성 음성)")
+    p.add_argument("--min-seconds", type=float, default=2.0)
+    p.add_argument("--max-seconds", type=float, default=8.0)
+    p.add_argument("--speed", type=float, default=4.0, help="가상 마이크 재생 배속")
+    p.add_argument("--device-rate", type=int, default=48000)
+    p.add_argument("--armed", action="store_true", help="항상 대기 모드")
+    p.add_argument("--streaming", action="store_true", help="스트리밍 전사")
+    p.add_argument("--workers", type=int, default=3)
+    p.add_argument("--api-ms", type=float, default=300.0, help="대역 서버 응답 지연 중앙값")
+    p.add_argument("--tail-ms", type=float, default=300.0, help="말이 끝난 뒤 단축키를 떼기까지")
+    p.add_argument("--gap-ms", type=float, default=500.0, help="녹음 사이 간격")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--json", default=None, help="결과를 JSON으로 저장 (커밋별 비교용)")
+    p.set_defaults(func=bench_e2e)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
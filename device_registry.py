@@ -0,0 +1,131 @@
+# device_registry.py - 오디오 장치 목록 캐시
+
+import logging
+import threading
+
+
+class DeviceRegistry:
+    """
+    sounddevice 장치 목록을 한 번 조회해 캐시하고 백그라운드에서 갱신합니다.
+
+    녹음 시작 경로에서는 get()/default_input()으로 캐시만 조회하므로
+    PortAudio 장치 열거 비용이 들지 않습니다.
+    """
+
+    def __init__(self, sd, refresh_interval=60.0, can_reinitialize=None):
+        self._sd = sd
+        self.refresh_interval = refresh_interval
+        # PortAudio 재초기화는 열린 스트림을 모두 끊으므로 안전할 때만 수행
+        self._can_reinitialize = can_reinitialize or (lambda: False)
+        self._snapshot = ({}, {}, {}, None)  # (index별, 이름별, (이름, 호스트 API)별, 기본 입력 장치)
+        self._listeners = []
+        self._wakeup = threading.Event()
+        self._reinit_requested = False
+        self._thread = None
+        self._refresh_lock = threading.Lock()
+        self.refresh_count = 0
+
+    # 조회 (O(1), 장치 열거 없음)
+    def get(self, index):
+        """장치 번호로 캐시된 장치 정보를 반환합니다. 없으면 None."""
+        return self._snapshot[0].get(index)
+
+    def find(self, name, hostapi=None):
+        """장치 이름(및 호스트 API 이름)으로 장치 번호를 찾습니다."""
+        if hostapi is not None:
+            return self._snapshot[2].get((name, hostapi))
+        return self._snapshot[1].get(name)
+
+    def key_for(self, index):
+        """장치 번호가 바뀌어도 같은 장치를 찾을 수 있는 (이름, 호스트 API) 키"""
+        info = self.get(index)
+        if info is None:
+            return None
+        return (info["name"], info["hostapi_name"])
+
+    def default_input(self):
+        """기본 입력 장치 번호 (없으면 None)"""
+        return self._snapshot[3]
+
+    def input_devices(self):
+        """입력 채널이 있는 장치 목록 [(번호, 정보)]"""
+        return [(idx, info) for idx, info in sorted(self._snapshot[0].items())
+                if info.get("max_input_channels", 0) > 0]
+
+    def add_listener(self, callback):
+        """목록이 갱신될 때마다 callback(registry)를 호출합니다."""
+        self._listeners.append(callback)
+
+    # 갱신
+    def refresh(self, reinitialize=False):
+        """장치 목록을 다시 조회합니다. reinitialize=True면 새로 연결된 장치도 반영합니다."""
+        sd = self._sd
+        with self._refresh_lock:
+            if reinitialize and self._can_reinitialize():
+                try:
+                    # PortAudio는 초기화 시점의 장치 목록만 알고 있으므로 재초기화 필요
+                    sd._terminate()
+                    sd._initialize()
+                    logging.info("PortAudio 재초기화 완료 (장치 목록 갱신)")
+                except Exception as e:
+                    logging.error(f"PortAudio 재초기화 오류: {str(e)}")
+
+            devices = sd.query_devices()
+            hostapis = sd.query_hostapis()
+
+            by_index, by_name, by_key = {}, {}, {}
+            for idx, device in enumerate(devices):
+                info = dict(device)
+                try:
+                    info["hostapi_name"] = hostapis[info["hostapi"]]["name"]
+                except (KeyError, IndexError, TypeError):
+                    info["hostapi_name"] = ""
+                by_index[idx] = info
+                by_name.setdefault(info["name"], idx)
+                by_key[(info["name"], info["hostapi_name"])] = idx
+
+            default_input = None
+            try:
+                default_idx = sd.default.device[0]
+                if default_idx is not None and default_idx >= 0:
+                    default_input = default_idx
+            except Exception:
+                pass
+            if default_input is None or by_index.get(default_input, {}).get("max_input_channels", 0) <= 0:
+                inputs = [idx for idx, info in by_index.items() if info.get("max_input_channels", 0) > 0]
+                default_input = inputs[0] if inputs else None
+
+            # 한 번에 교체하여 조회하는 쪽이 항상 일관된 목록을 보게 함
+            self._snapshot = (by_index, by_name, by_key, default_input)
+            self.refresh_count += 1
+
+        for callback in list(self._listeners):
+            try:
+                callback(self)
+            except Exception as e:
+                logging.error(f"장치 목록 갱신 알림 오류: {str(e)}")
+        return self
+
+    def invalidate(self, reinitialize=False):
+        """스트림 오류 등으로 목록이 낡았을 수 있을 때 백그라운드 갱신을 요청합니다."""
+        if reinitialize:
+            self._reinit_requested = True
+        self._wakeup.set()
+
+    # 백그라운드 갱신 스레드
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="DeviceRegistry", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.refresh_interval)
+            self._wakeup.clear()
+            reinitialize = self._reinit_requested
+            self._reinit_requested = False
+            try:
+                self.refresh(reinitialize=reinitialize)
+            except Exception as e:
+                logging.error(f"장치 목록 백그라운드 갱신 오류: {str(e)}")
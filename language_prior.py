@@ -0,0 +1,171 @@
+# language_prior.py - 최근 감지된 언어로 다음 녹음의 language 파라미터를 정하는 언어 사전 확률
+
+import json
+import logging
+import os
+import threading
+from collections import Counter, deque
+
+try:
+    import ctypes
+    from ctypes import wintypes
+except ImportError:
+    ctypes = None
+
+
+DEFAULT_PRIOR_PATH = "language_prior.json"
+GLOBAL_CONTEXT = "*"
+
+# verbose_json의 language(영어 이름)를 ISO-639-1 코드로
+LANGUAGE_CODES = {
+    "korean": "ko", "english": "en", "japanese": "ja", "chinese": "zh", "spanish": "es", "french": "fr",
+    "german": "de", "russian": "ru", "portuguese": "pt", "italian": "it", "vietnamese": "vi", "thai": "th",
+    "indonesian": "id", "dutch": "nl", "turkish": "tr", "arabic": "ar", "hindi": "hi", "polish": "pl",
+}
+
+
+def language_code(language):
+    """'korean', 'Korean', 'ko' 등을 'ko'로 바꿉니다 (모르면 None)."""
+    if not language:
+        return None
+    language = language.strip().lower()
+    if len(language) == 2:
+        return language
+    return LANGUAGE_CODES.get(language)
+
+
+def foreground_app():
+    """
+    현재 포커스가 있는 창의 실행 파일 이름 (예: 'slack.exe', Windows가 아니거나 알 수 없으면 None).
+
+    녹음 결과는 이 창에 붙여넣어지므로, 앱별로 주로 쓰는 언어를 따로 학습하는 데 사용합니다.
+    """
+    if ctypes is None or not hasattr(ctypes, "windll"):
+        return None
+    try:
+        user32, kernel32 = ctypes.windll.user32, ctypes.windll.kernel32
+        hwnd = user32.GetForegroundWindow()
+        if not hwnd:
+            return None
+        pid = wintypes.DWORD()
+        user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+        # PROCESS_QUERY_LIMITED_INFORMATION
+        handle = kernel32.OpenProcess(0x1000, False, pid.value)
+        if not handle:
+            return None
+        try:
+            size = wintypes.DWORD(260)
+            buffer = ctypes.create_unicode_buffer(size.value)
+            if not kernel32.QueryFullProcessImageNameW(handle, 0, buffer, ctypes.byref(size)):
+                return None
+            return os.path.basename(buffer.value).lower()
+        finally:
+            kernel32.CloseHandle(handle)
+    except Exception as e:
+        logging.debug(f"포커스 창 확인 오류: {str(e)}")
+        return None
+
+
+class LanguagePrior:
+    """
+    문맥(포커스 앱)별 최근 감지 언어를 기록하고, 확신이 높으면 language를 지정하도록 제안합니다.
+
+    최근 window건 중 같은 언어가 threshold 비율 이상이고 min_samples건 이상이면 그 언어를 제안하며,
+    앱별 기록이 부족하면 전체 기록을 사용합니다. 언어를 지정한 요청은 감지 결과가 아니므로 학습하지 않고,
+    지정이 probe_every번 이어지면 한 번은 다시 감지해 사용자가 언어를 바꾼 경우를 따라갑니다.
+    path에는 감지 save_every건마다 저장하고, 남은 기록은 종료할 때 flush()로 저장합니다.
+    여러 작업 스레드에서 동시에 사용할 수 있습니다.
+    """
+
+    def __init__(self, window=20, min_samples=3, threshold=0.8, probe_every=10, path=None, save_every=5):
+        self.window = window
+        self.min_samples = min_samples
+        self.threshold = threshold
+        self.probe_every = probe_every
+        self.path = path
+        self.save_every = save_every
+        self._dirty = 0                 # 마지막 저장 뒤 기록된 감지 수
+        self._history = {}              # 문맥 → deque(언어 코드)
+        self._streak = {}               # 문맥 → 감지 없이 언어를 지정한 연속 횟수
+        self._lock = threading.Lock()
+        self.suggested_count = 0
+        self.detected_count = 0
+        if path and os.path.exists(path):
+            self.load()
+
+    def _confident(self, history):
+        if len(history) < self.min_samples:
+            return None
+        language, count = Counter(history).most_common(1)[0]
+        return language if count / len(history) >= self.threshold else None
+
+    def suggest(self, context=None):
+        """지정할 언어 코드, 확신이 없거나 다시 감지할 차례면 None"""
+        context = context or GLOBAL_CONTEXT
+        with self._lock:
+            history = self._history.get(context)
+            if history is None or len(history) < self.min_samples:
+                history = self._history.get(GLOBAL_CONTEXT, ())
+            language = self._confident(list(history))
+            if language is None:
+                return None
+            streak = self._streak.get(context, 0)
+            if self.probe_every and streak >= self.probe_every:
+                self._streak[context] = 0
+                return None
+            self._streak[context] = streak + 1
+            self.suggested_count += 1
+            return language
+
+    def observe(self, context, language):
+        """감지된 언어를 기록합니다 (language를 지정하지 않은 요청의 결과만)."""
+        code = language_code(language)
+        if code is None:
+            return
+        with self._lock:
+            for key in {context or GLOBAL_CONTEXT, GLOBAL_CONTEXT}:
+                self._history.setdefault(key, deque(maxlen=self.window)).append(code)
+            self.detected_count += 1
+            self._dirty += 1
+            due = self.path and self._dirty >= self.save_every
+        if due:
+            self.save()
+
+    def flush(self):
+        """저장하지 않은 감지 기록이 있으면 저장합니다 (종료할 때)."""
+        if self._dirty:
+            self.save()
+
+    def snapshot(self):
+        """문맥별 (기록 수, 가장 많은 언어, 비율)"""
+        with self._lock:
+            result = {}
+            for context, history in self._history.items():
+                if history:
+                    language, count = Counter(history).most_common(1)[0]
+                    result[context] = (len(history), language, count / len(history))
+            return result
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            with self._lock:
+                self._history = {context: deque(languages, maxlen=self.window)
+                                 for context, languages in data.get("history", {}).items()}
+        except Exception as e:
+            logging.warning(f"언어 기록 불러오기 오류: {str(e)}")
+
+    def save(self):
+        if not self.path:
+            return
+        try:
+            with self._lock:
+                data = {"history": {context: list(history) for context, history in self._history.items()}}
+                self._dirty = 0
+            temp_path = self.path + ".part"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            logging.warning(f"언어 기록 저장 오류: {str(e)}")
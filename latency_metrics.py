@@ -0,0 +1,253 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+녹음 한 건의 단계별 지연 기록과 단계별 히스토그램
+
+단계별 지연은 세션 이벤트(session_events.py)의 필드로 저장되므로 따로 파일을 쓰지 않습니다.
+
+사용법 (세션 이벤트 폴더의 *.jsonl, *.jsonl.gz를 읽어 단계별 요약):
+    python latency_metrics.py [logs/sessions] [--group-by language_source]
+"""
+
+import argparse
+import math
+import sys
+import threading
+import time
+
+from session_events import DEFAULT_EVENTS_DIR, load_events
+
+
+# 녹음 한 건의 단계 (이 순서대로 일어남)
+STAGES = (
+    "hotkey_down",          # 녹음 단축키를 누름
+    "stream_start",         # 입력 스트림 시작 (항상 대기 모드에서는 이미 열려 있음)
+    "first_sample",         # 녹음 버퍼에 기록된 가장 오래된 샘플 (프리롤이 있으면 단축키보다 앞설 수 있음)
+    "key_up",               # 단축키를 뗌
+    "capture_finalized",    # 스트림 정지, 남은 샘플 기록 후 처리 대기열에 넣음
+    "process_start",        # 작업 스레드가 처리를 시작
+    "encode_done",          # 인코딩 마무리 (무음 제거 포함)
+    "upload_start",         # 전사 요청 시작
+    "response",             # 전사 결과 수신
+    "postprocess_done",     # 텍스트 정리 완료
+    "paste_done",           # 붙여넣기 완료
+)
+
+# 요약에 쓰는 구간: (이름, 시작 단계, 끝 단계)
+INTERVALS = (
+    ("stream_open", "hotkey_down", "stream_start"),
+    ("first_sample", "hotkey_down", "first_sample"),
+    ("finalize", "key_up", "capture_finalized"),
+    ("queue_wait", "capture_finalized", "process_start"),
+    ("encode", "process_start", "encode_done"),
+    ("pre_upload", "encode_done", "upload_start"),
+    ("transcribe", "upload_start", "response"),
+    ("postprocess", "response", "postprocess_done"),
+    ("paste", "postprocess_done", "paste_done"),
+    ("release_to_text", "key_up", "paste_done"),
+    ("total", "hotkey_down", "paste_done"),
+)
+
+
+class LatencyHistogram:
+    """
+    HDR 방식의 로그-선형 히스토그램 (마이크로초 단위, 상대 오차 0.4% 이하).
+
+    256 미만은 값 그대로, 그 이상은 2의 거듭제곱 구간마다 128칸으로 나눠 세므로
+    기록 수와 관계없이 메모리가 작고 record()가 O(1)입니다. 음수는 0으로 기록합니다.
+    """
+
+    SUB_BITS = 8
+    SUB_COUNT = 1 << SUB_BITS               # 256
+    HALF_COUNT = SUB_COUNT >> 1             # 128
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total_us = 0
+        self.min_us = None
+        self.max_us = None
+
+    @classmethod
+    def _index(cls, value):
+        if value < cls.SUB_COUNT:
+            return value
+        shift = value.bit_length() - cls.SUB_BITS
+        return cls.SUB_COUNT + (shift - 1) * cls.HALF_COUNT + ((value >> shift) - cls.HALF_COUNT)
+
+    @classmethod
+    def _bounds(cls, index):
+        """칸이 나타내는 값의 범위 [하한, 상한]"""
+        if index < cls.SUB_COUNT:
+            return index, index
+        shift = (index - cls.SUB_COUNT) // cls.HALF_COUNT + 1
+        mantissa = (index - cls.SUB_COUNT) % cls.HALF_COUNT + cls.HALF_COUNT
+        return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+    def record(self, ms):
+        value = max(0, int(round(ms * 1000.0)))
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total_us += value
+        self.min_us = value if self.min_us is None else min(self.min_us, value)
+        self.max_us = value if self.max_us is None else max(self.max_us, value)
+
+    def merge(self, other):
+        for index, n in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + n
+        self.count += other.count
+        self.total_us += other.total_us
+        if other.min_us is not None:
+            self.min_us = other.min_us if self.min_us is None else min(self.min_us, other.min_us)
+            self.max_us = other.max_us if self.max_us is None else max(self.max_us, other.max_us)
+
+    def percentile(self, q):
+        """q 백분위 값 (밀리초, 기록이 없으면 None)"""
+        if not self.count:
+            return None
+        rank = max(1, int(math.ceil(q / 100.0 * self.count)))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                low, high = self._bounds(index)
+                value = min(max((low + high) / 2.0, self.min_us), self.max_us)
+                return value / 1000.0
+        return self.max_us / 1000.0
+
+    @property
+    def mean(self):
+        return self.total_us / self.count / 1000.0 if self.count else None
+
+
+class TakeTimeline:
+    """녹음 한 건의 단계별 시각 (time.perf_counter 기준)"""
+
+    def __init__(self, hotkey_down=None):
+        self.marks = {}
+        self.mark("hotkey_down", hotkey_down)
+
+    def mark(self, stage, at=None):
+        """단계 시각을 기록합니다 (처음 기록만 유지, at을 주지 않으면 지금)."""
+        if stage not in self.marks:
+            self.marks[stage] = time.perf_counter() if at is None else at
+
+    def intervals(self):
+        """두 단계가 모두 기록된 구간의 길이 (밀리초)"""
+        result = {}
+        for name, start, end in INTERVALS:
+            if start in self.marks and end in self.marks:
+                result[name] = (self.marks[end] - self.marks[start]) * 1000.0
+        return result
+
+    def offsets(self):
+        """단축키를 누른 뒤 각 단계까지 걸린 시간 (밀리초)"""
+        origin = self.marks["hotkey_down"]
+        return {stage: (self.marks[stage] - origin) * 1000.0 for stage in STAGES if stage in self.marks}
+
+
+# 단계별 지연 기록에 항상 함께 남기는 필드 (세션 이벤트를 꺼도 기록, --group-by에 사용)
+RECORD_FIELDS = ("take", "mode", "outcome", "audio_seconds", "codec", "cached", "language_source", "injection")
+
+
+def latency_fields(entry):
+    """세션 이벤트 기록에서 단계별 지연 기록만 (RECORD_FIELDS, <구간>_ms, offsets_ms)"""
+    keep = set(RECORD_FIELDS) | {name + "_ms" for name, _, _ in INTERVALS} | {"offsets_ms"}
+    return {k: v for k, v in entry.items() if k in keep}
+
+
+def interval_fields(intervals):
+    """구간 길이를 세션 이벤트 필드로 ({"encode": 12.345} → {"encode_ms": 12.3})"""
+    return {name + "_ms": round(ms, 1) for name, ms in intervals.items()}
+
+
+class LatencyRecorder:
+    """
+    녹음마다 구간별 지연을 히스토그램에 더합니다 (파일은 쓰지 않음).
+
+    record()가 반환하는 기록(구간별 <이름>_ms 필드와 offsets_ms)을 세션 이벤트로 남기면,
+    load()는 그 이벤트 파일에서 같은 히스토그램을 다시 만듭니다. summary()는 프로그램이 실행된 뒤
+    기록된 녹음의 p50/p95/p99를 반환합니다. 여러 스레드에서 호출할 수 있습니다.
+    """
+
+    def __init__(self):
+        self.histograms = {name: LatencyHistogram() for name, _, _ in INTERVALS}
+        self._lock = threading.Lock()
+        self.record_count = 0
+
+    def _add(self, intervals):
+        for name, ms in intervals.items():
+            self.histograms.setdefault(name, LatencyHistogram()).record(ms)
+        self.record_count += 1
+
+    def record(self, timeline, **fields):
+        """구간 길이를 히스토그램에 더하고, fields에 구간 필드와 offsets_ms를 더한 기록을 반환합니다."""
+        intervals = timeline.intervals()
+        with self._lock:
+            self._add(intervals)
+        entry = dict(fields)
+        entry.update(interval_fields(intervals))
+        entry["offsets_ms"] = {k: round(v, 2) for k, v in timeline.offsets().items()}
+        return entry
+
+    @classmethod
+    def load(cls, path, group_by=None):
+        """
+        세션 이벤트 파일 또는 폴더에서 히스토그램을 다시 만듭니다 (구간 필드가 없는 기록은 건너뜀).
+
+        group_by에 기록 필드 이름(예: "language_source", "mode")을 주면 {필드 값: LatencyRecorder}를 반환합니다.
+        """
+        recorders = {}
+        for entry in load_events(path):
+            intervals = {name: entry[name + "_ms"] for name, _, _ in INTERVALS
+                         if isinstance(entry.get(name + "_ms"), (int, float))}
+            if not intervals:
+                continue
+            key = entry.get(group_by) if group_by else None
+            recorders.setdefault(key, cls())._add(intervals)
+        if group_by:
+            return recorders
+        return recorders.get(None) or cls()
+
+    def summary(self):
+        """구간별 (이름, 개수, p50, p95, p99, 최댓값) 목록 (밀리초, 기록 없는 구간 제외)"""
+        rows = []
+        with self._lock:
+            for name, _, _ in INTERVALS:
+                h = self.histograms[name]
+                if h.count:
+                    rows.append((name, h.count, h.percentile(50), h.percentile(95), h.percentile(99),
+                                 h.max_us / 1000.0))
+        return rows
+
+    def format_summary(self):
+        """summary()를 표 형태의 문자열 목록으로 만듭니다."""
+        lines = [f"{'stage':<16}{'count':>7}{'p50_ms':>10}{'p95_ms':>10}{'p99_ms':>10}{'max_ms':>10}"]
+        for name, count, p50, p95, p99, peak in self.summary():
+            lines.append(f"{name:<16}{count:>7}{p50:>10.1f}{p95:>10.1f}{p99:>10.1f}{peak:>10.1f}")
+        return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="녹음별 단계 지연 기록 요약")
+    parser.add_argument("path", nargs="?", default=DEFAULT_EVENTS_DIR, help="세션 이벤트 JSONL 파일 또는 폴더")
+    parser.add_argument("--group-by", default=None, help="이 필드 값별로 나눠 요약 (예: language_source, mode)")
+    args = parser.parse_args()
+
+    groups = LatencyRecorder.load(args.path, args.group_by) if args.group_by else {None: LatencyRecorder.load(args.path)}
+    if not any(recorder.record_count for recorder in groups.values()):
+        print(f"기록이 없습니다: {args.path}")
+        return 1
+    for key, recorder in sorted(groups.items(), key=lambda item: str(item[0])):
+        label = f" ({args.group_by}={key})" if args.group_by else ""
+        print(f"{args.path}{label}: 녹음 {recorder.record_count}건")
+        for line in recorder.format_summary():
+            print(line)
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+# log_retention.py - 다 쓴 로그 파일의 gzip 압축과 보관 기간/전체 크기 제한에 따른 삭제
+
+import glob
+import gzip
+import logging
+import os
+import shutil
+import threading
+import time
+
+
+def compress_file(path, compresslevel=6):
+    """
+    path를 path.gz로 압축하고 원본을 지웁니다 (압축 파일의 수정 시각은 원본과 같게 유지).
+
+    '.part' 파일에 쓴 뒤 이름을 바꾸므로 중간에 종료되어도 손상된 .gz가 남지 않습니다.
+    """
+    target = path + ".gz"
+    temp_path = target + ".part"
+    stat = os.stat(path)
+    with open(path, "rb") as src, gzip.open(temp_path, "wb", compresslevel=compresslevel) as dst:
+        shutil.copyfileobj(src, dst, 1024 * 1024)
+    os.utime(temp_path, (stat.st_atime, stat.st_mtime))
+    os.replace(temp_path, target)
+    os.remove(path)
+    return target
+
+
+def compact_logs(directory, patterns=("whisperer_*.log",), keep_days=14.0, max_total_bytes=None, active=()):
+    """
+    directory의 다 쓴 로그를 압축하고 오래된 로그를 지웁니다. (압축한 수, 지운 수, 남은 전체 크기)를 반환합니다.
+
+    - active에 있는 파일(지금 쓰고 있는 파일)은 건드리지 않습니다.
+    - 수정 시각이 keep_days일보다 오래된 로그와 압축 파일은 지웁니다.
+    - 남은 전체 크기가 max_total_bytes를 넘으면 가장 오래된 파일부터 지웁니다.
+    """
+    active = {os.path.abspath(path) for path in active}
+    compressed = deleted = 0
+
+    def remove(path):
+        try:
+            os.remove(path)
+            return True
+        except OSError as e:
+            logging.warning(f"로그 삭제 오류 ({path}): {str(e)}")
+            return False
+
+    def scan():
+        """(수정 시각, 크기, 경로, 압축 여부) 목록 (오래된 순서, 쓰고 있는 파일 제외)"""
+        files = []
+        for pattern in patterns:
+            for path in glob.glob(os.path.join(directory, pattern)) + glob.glob(os.path.join(directory, pattern + ".gz")):
+                if os.path.abspath(path) in active:
+                    continue
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path, path.endswith(".gz")))
+        files.sort()
+        return files
+
+    # 보관 기간이 지난 파일은 압축하지 않고 바로 지움
+    cutoff = time.time() - keep_days * 86400.0 if keep_days else None
+    files = scan()
+    for mtime, size, path, _ in files:
+        if cutoff is not None and mtime < cutoff and remove(path):
+            deleted += 1
+
+    for mtime, size, path, is_compressed in scan():
+        if not is_compressed:
+            try:
+                compress_file(path)
+                compressed += 1
+            except OSError as e:
+                logging.warning(f"로그 압축 오류 ({path}): {str(e)}")
+
+    # 전체 크기 제한 (쓰고 있는 파일도 크기에는 포함)
+    files = scan()
+    total = sum(size for _, size, _, _ in files)
+    for path in active:
+        if os.path.dirname(path) == os.path.abspath(directory) and os.path.exists(path):
+            total += os.path.getsize(path)
+    for mtime, size, path, _ in files:
+        if not max_total_bytes or total <= max_total_bytes:
+            break
+        if remove(path):
+            deleted += 1
+            total -= size
+    return compressed, deleted, total
+
+
+class LogCompactor:
+    """
+    compact_logs()를 백그라운드 스레드에서 실행합니다.
+
+    실행 중에 다시 요청되면 (연속 회전 등) 끝난 뒤 한 번 더 실행하므로 요청이 겹쳐도 스레드는 하나뿐입니다.
+    active()는 실행할 때마다 호출해 지금 쓰고 있는 파일 목록을 받습니다.
+    """
+
+    def __init__(self, directory, patterns=("whisperer_*.log",), keep_days=14.0, max_total_bytes=None, active=None):
+        self.directory = directory
+        self.patterns = patterns
+        self.keep_days = keep_days
+        self.max_total_bytes = max_total_bytes
+        self.active = active or (lambda: ())
+        self._lock = threading.Lock()
+        self._pending = False
+        self._thread = None
+        self.last_result = None
+
+    def request(self, *args):
+        """정리를 요청합니다 (AsyncLogWriter의 on_rotate로 바로 쓸 수 있도록 인자는 무시)."""
+        with self._lock:
+            self._pending = True
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="LogCompactor", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._thread = None
+                    return
+                self._pending = False
+            try:
+                t0 = time.perf_counter()
+                self.last_result = compact_logs(self.directory, self.patterns, self.keep_days,
+                                                self.max_total_bytes, self.active())
+                compressed, deleted, total = self.last_result
+                if compressed or deleted:
+                    logging.info(f"로그 정리: 압축 {compressed}개, 삭제 {deleted}개, 남은 크기 {total / 1048576:.1f}MB "
+                                 f"({time.perf_counter() - t0:.1f}초)")
+            except Exception as e:
+                logging.warning(f"로그 정리 오류: {str(e)}")
+
+    def wait(self, timeout=None):
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
@@ -27,7 +27,7 @@ messages = {
         "mic_stream_stop_error": "마이크 스트림 중지 오류: {}",
         "no_audio_data": "녹음된 오디오 데이터가 없습니다.",
         "recording_length": "녹음 길이: {:.2f}초",
-        "recording_too_short": "녹음이 1초 미만입니다.",
+        "recording_too_short": "녹음이 {:.1f}초 미만이므로 무시합니다.",
         "audio_file_saved": "오디오 파일 저장 완료: {}",
         "sending_to_whisper": "OpenAI Whisper에 오디오 데이터 전송 중...",
         "using_language": "언어 설정: {}",
@@ -117,6 +117,7 @@ messages = {
         "text_length": "텍스트 길이: {} 글자",
         "attempting_paste": "붙여넣기 시도 중...",
         "paste_complete": "붙여넣기 완료",
+        "clipboard_restore_scheduled": "잠시 뒤 이전 클립보드 내용을 되돌립니다",
         "paste_error": "붙여넣기 오류: {}",
         "attempting_direct_input": "대체 방법으로 텍스트 직접 입력 시도...",
         "direct_input_complete": "직접 텍스트 입력 완료",
@@ -127,7 +128,28 @@ messages = {
         "recognition_error": "음성 인식 오류: {}",
         "openai_api_not_set": "OpenAI API 또는 API 키가 설정되지 않았습니다.",
         "audio_processing_error": "오디오 처리 오류: {}",
-        "recording_stop_error": "녹음 종료 오류: {}"
+        "recording_stop_error": "녹음 종료 오류: {}",
+        "armed_mode": "항상 대기 모드 (첫 음절 보존)",
+        "armed_mode_enabled": "항상 대기 모드가 활성화되었습니다. (프리롤 {}ms)",
+        "armed_mode_disabled": "항상 대기 모드가 비활성화되었습니다.",
+        "armed_stream_error": "항상 대기 입력 스트림 시작 오류: {}",
+        "capture_latency": "단축키→첫 샘플 지연: {:.0f}ms",
+        "no_speech_detected": "음성이 감지되지 않아 전송하지 않습니다.",
+        "silence_trimmed": "앞뒤 무음 {:.2f}초 제거 ({} 바이트 절약)",
+        "streaming_mode": "스트리밍 전사 (긴 받아쓰기)",
+        "streaming_mode_enabled": "스트리밍 전사가 활성화되었습니다. 녹음 중 쉼마다 구간을 먼저 전송합니다.",
+        "streaming_mode_disabled": "스트리밍 전사가 비활성화되었습니다.",
+        "transcription_deadline": "전사가 {:.0f}초 안에 끝나지 않아 중단했습니다. 녹음 파일은 recordings 폴더에 저장되어 있습니다.",
+        "transcription_retried": "전사 요청 재시도 {}회, 중복 요청 {}회",
+        "transcript_cache_hit": "같은 녹음의 전사 결과를 캐시에서 가져왔습니다 (API 호출 생략)",
+        "voice_commands_applied": "음성 명령 {}개를 변환했습니다 (예: '개행', '엔터' → 줄바꿈)",
+        "text_replacements_applied": "설정된 단어 {}개를 바꿨습니다",
+        "text_cleaned": "최종 정리된 텍스트: {}",
+        "long_take_chunked": "녹음이 업로드 크기 제한(25MB)을 넘어 ({:.1f}MB) 쉼에서 나눠 동시에 전사합니다",
+        "latency_summary": "단계별 지연 통계",
+        "latency_summary_title": "녹음 {}건의 단계별 지연 (밀리초, 기록 폴더: {})",
+        "latency_summary_empty": "아직 기록된 녹음이 없습니다.",
+        "language_prior_used": "최근 감지된 언어 사용: {} (언어 감지 생략)"
     },
     "en": {
         "start": "=== Whisperer Voice-to-Text Started ===",
@@ -154,7 +176,7 @@ messages = {
         "mic_stream_stop_error": "Microphone stream stop error: {}",
         "no_audio_data": "No audio data recorded.",
         "recording_length": "Recording length: {:.2f} seconds",
-        "recording_too_short": "Recording is less than 1 second.",
+        "recording_too_short": "Recording is shorter than {:.1f} seconds and was ignored.",
         "audio_file_saved": "Audio file saved: {}",
         "sending_to_whisper": "Sending audio data to OpenAI Whisper...",
         "using_language": "Language setting: {}",
@@ -244,6 +266,7 @@ messages = {
         "text_length": "Text length: {} characters",
         "attempting_paste": "Attempting to paste...",
         "paste_complete": "Paste complete",
+        "clipboard_restore_scheduled": "Your previous clipboard contents will be restored shortly",
         "paste_error": "Paste error: {}",
         "attempting_direct_input": "Attempting to directly input text as an alternative...",
         "direct_input_complete": "Direct text input complete",
@@ -254,7 +277,28 @@ messages = {
         "recognition_error": "Speech recognition error: {}",
         "openai_api_not_set": "OpenAI API or API key is not set.",
         "audio_processing_error": "Audio processing error: {}",
-        "recording_stop_error": "Recording stop error: {}"
+        "recording_stop_error": "Recording stop error: {}",
+        "armed_mode": "Always-Armed Mode (keep first syllable)",
+        "armed_mode_enabled": "Always-armed mode enabled. (pre-roll {}ms)",
+        "armed_mode_disabled": "Always-armed mode disabled.",
+        "armed_stream_error": "Failed to start always-armed input stream: {}",
+        "capture_latency": "Hotkey to first sample: {:.0f}ms",
+        "no_speech_detected": "No speech detected. Nothing was sent.",
+        "silence_trimmed": "Trimmed {:.2f}s of leading/trailing silence ({} bytes saved)",
+        "streaming_mode": "Streaming Transcription (long dictation)",
+        "streaming_mode_enabled": "Streaming transcription enabled. Segments are sent at each pause while recording.",
+        "streaming_mode_disabled": "Streaming transcription disabled.",
+        "transcription_deadline": "Transcription did not finish within {:.0f}s and was cancelled. The recording is saved in the recordings folder.",
+        "transcription_retried": "Transcription requests retried {} time(s), hedged {} time(s)",
+        "transcript_cache_hit": "Reused the cached transcript for identical audio (API call skipped)",
+        "voice_commands_applied": "Converted {} voice command(s) (e.g. '개행', '엔터' → line break)",
+        "text_replacements_applied": "Applied {} configured replacement(s)",
+        "text_cleaned": "Final cleaned text: {}",
+        "long_take_chunked": "Recording exceeds the 25 MB upload limit ({:.1f} MB); transcribing it in parallel chunks split at pauses",
+        "latency_summary": "Latency Breakdown",
+        "latency_summary_title": "Per-stage latency over {} take(s) (ms, log folder: {})",
+        "latency_summary_empty": "No takes recorded yet.",
+        "language_prior_used": "Using recently detected language: {} (detection skipped)"
     },
     # 메뉴 항목
     "open_recordings_folder": {
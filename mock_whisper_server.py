@@ -0,0 +1,353 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+로컬 Whisper API 대역 서버 (벤치마크/부하 테스트/오프라인 테스트용)
+
+OpenAI /v1/audio/transcriptions 계약을 흉내 냅니다: multipart/form-data로 file, model을 받고
+response_format(json, text, verbose_json, srt, vtt)에 맞게 응답하며, 인증 헤더와 필수 필드를 검사합니다.
+실제 API를 호출하지 않으므로 비용과 네트워크 없이 전사 경로 전체를 시험할 수 있습니다.
+
+- 응답 지연 분포: --latency-dist fixed/uniform/lognormal/exponential, --latency-ms(중앙값), --latency-spread
+- 오디오 길이에 비례하는 처리 시간: --ms-per-audio-second (길이는 업로드 크기 / --bytes-per-second로 추정)
+- 오류 주입: --error-rate, --error-codes (429는 --retry-after 포함), --slow-rate/--slow-ms (긴 꼬리 지연)
+- 전사 결과: --transcripts 파일(JSON 목록 또는 한 줄에 하나). 같은 오디오에는 항상 같은 결과를 돌려줌
+- HTTPS: --certfile/--keyfile, 새 연결 지연: --handshake-ms (DNS+TCP+TLS 왕복 흉내)
+
+사용법:
+    python mock_whisper_server.py [--port 8765] [--latency-ms 300] [--handshake-ms 150]
+    python mock_whisper_server.py --latency-dist lognormal --latency-ms 600 --latency-spread 0.5
+    python mock_whisper_server.py --error-rate 0.2 --error-codes 429 503 --slow-rate 0.1 --slow-ms 5000
+    python mock_whisper_server.py --transcripts transcripts.json --language korean
+
+whisperer_settings.json의 api.base_url을 http://127.0.0.1:8765/v1 로 설정하면 프로그램이 이 서버를 사용합니다.
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import ssl
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+DEFAULT_TRANSCRIPTS = ["mock transcript"]
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "lognormal", "exponential")
+
+
+def parse_multipart(content_type, body):
+    """
+    multipart/form-data 본문을 (필드 dict, 파일 dict: 이름 → (파일 이름, 데이터))로 나눕니다.
+
+    수십 MB 파일도 요청 처리 스레드가 오래 붙잡지 않도록 경계 문자열로 바로 나눕니다.
+    """
+    fields, files = {}, {}
+    match = re.search(r'boundary="?([^";]+)"?', content_type or "")
+    if not match:
+        return fields, files
+    delimiter = b"--" + match.group(1).encode("latin-1")
+    for part in body.split(delimiter)[1:]:
+        if part.startswith(b"--"):
+            break
+        head, separator, payload = part.partition(b"\r\n\r\n")
+        if not separator:
+            continue
+        if payload.endswith(b"\r\n"):
+            payload = payload[:-2]
+        disposition = ""
+        for line in head.decode("utf-8", "replace").split("\r\n"):
+            if line.lower().startswith("content-disposition:"):
+                disposition = line
+        name = re.search(r'\bname="([^"]*)"', disposition)
+        filename = re.search(r'\bfilename="([^"]*)"', disposition)
+        if filename is not None:
+            files[name.group(1) if name else None] = (filename.group(1), payload)
+        elif name:
+            fields[name.group(1)] = payload.decode("utf-8", "replace")
+    return fields, files
+
+
+def load_transcripts(path):
+    """JSON 목록 파일 또는 한 줄에 하나씩 쓴 텍스트 파일에서 전사 결과를 읽습니다."""
+    with open(path, "r", encoding="utf-8") as f:
+        content = f.read()
+    try:
+        items = json.loads(content)
+        if isinstance(items, list):
+            return [str(item) for item in items] or DEFAULT_TRANSCRIPTS
+    except ValueError:
+        pass
+    return [line.strip() for line in content.splitlines() if line.strip()] or DEFAULT_TRANSCRIPTS
+
+
+def format_timestamp(seconds, separator):
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{int(hours):02d}:{int(minutes):02d}:{int(secs):02d}{separator}{int(secs % 1 * 1000):03d}"
+
+
+class MockWhisperHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive 지원
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self._send(status, body, "application/json", headers)
+
+    def _send_error(self, status, message=None, error_type=None, headers=None):
+        """OpenAI API와 같은 형식의 오류 응답"""
+        if error_type is None:
+            error_type = {400: "invalid_request_error", 401: "invalid_request_error",
+                          404: "invalid_request_error", 429: "rate_limit_exceeded"}.get(status, "server_error")
+        self._send_json(status, {"error": {"message": message or f"mock error {status}", "type": error_type,
+                                           "param": None, "code": None}}, headers)
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        path = self.path.rstrip("/")
+        if path.endswith("/models"):
+            self._send_json(200, {"object": "list", "data": [{"id": "whisper-1", "object": "model"}]})
+        elif path.endswith("/stats"):
+            self._send_json(200, self.server.stats())
+        else:
+            self._send_error(404, "not found")
+
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        if not self.path.rstrip("/").endswith("/audio/transcriptions"):
+            self._send_error(404, "not found")
+            return
+
+        # 인증과 필수 필드 검사 (실제 API와 같은 상태 코드)
+        auth = self.headers.get("Authorization", "")
+        if not auth.startswith("Bearer ") or (server.api_key and auth[7:] != server.api_key):
+            self._send_error(401, "Incorrect API key provided")
+            return
+        fields, files = parse_multipart(self.headers.get("Content-Type", ""), body)
+        if "file" not in files or not files["file"][1]:
+            self._send_error(400, "'file' is a required property")
+            return
+        if not fields.get("model"):
+            self._send_error(400, "'model' is a required property")
+            return
+
+        audio = files["file"][1]
+        status, delay = server.next_outcome()
+        if not fields.get("language"):
+            delay += server.detect_ms / 1000.0      # language가 없으면 언어 감지 비용 추가
+        delay += len(audio) / float(server.bytes_per_second) * server.ms_per_audio_second / 1000.0
+        if delay:
+            time.sleep(delay)
+        if status != 200:
+            headers = {}
+            if status == 429 and server.retry_after is not None:
+                headers["Retry-After"] = str(server.retry_after)
+            self._send_error(status, headers=headers)
+            return
+        server.count("success_count")
+        self._send_result(fields, server.transcript_for(audio), len(audio))
+
+    def _send_result(self, fields, text, nbytes):
+        server = self.server
+        response_format = fields.get("response_format", "json")
+        duration = round(nbytes / server.bytes_per_second, 2)
+        if response_format == "text":
+            self._send(200, (text + "\n").encode("utf-8"), "text/plain; charset=utf-8")
+        elif response_format == "verbose_json":
+            self._send_json(200, {
+                "task": "transcribe",
+                "language": fields.get("language") or server.language,
+                "duration": duration,
+                "text": text,
+                "segments": [{"id": 0, "seek": 0, "start": 0.0, "end": duration, "text": text,
+                              "tokens": [], "temperature": float(fields.get("temperature") or 0),
+                              "avg_logprob": -0.2, "compression_ratio": 1.2, "no_speech_prob": 0.01}],
+            })
+        elif response_format in ("srt", "vtt"):
+            separator = "," if response_format == "srt" else "."
+            span = f"{format_timestamp(0, separator)} --> {format_timestamp(duration, separator)}"
+            if response_format == "srt":
+                payload = f"1\n{span}\n{text}\n\n"
+            else:
+                payload = f"WEBVTT\n\n{span}\n{text}\n\n"
+            self._send(200, payload.encode("utf-8"), "text/plain; charset=utf-8")
+        else:
+            self._send_json(200, {"text": text})
+
+
+class MockWhisperServer(ThreadingHTTPServer):
+    """
+    연결마다 스레드를 쓰는 대역 서버.
+
+    TLS 핸드셰이크는 accept 스레드가 아닌 연결 스레드에서 하므로, handshake_ms 지연이
+    다른 연결의 요청을 막지 않습니다.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 0), latency_ms=0.0, handshake_ms=0.0,
+                 text="mock transcript", certfile=None, keyfile=None, error_rate=0.0,
+                 error_codes=(429, 500, 503), slow_rate=0.0, slow_ms=5000.0, retry_after=None, seed=None,
+                 latency_dist="fixed", latency_spread=0.5, transcripts=None, language="korean",
+                 api_key=None, bytes_per_second=16000, detect_ms=0.0, ms_per_audio_second=0.0):
+        super().__init__(address, MockWhisperHandler)
+        if latency_dist not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"알 수 없는 지연 분포: {latency_dist}")
+        self.latency_ms = latency_ms            # 중앙값 (exponential은 평균)
+        self.latency_dist = latency_dist
+        self.latency_spread = latency_spread    # uniform: ±비율, lognormal: 로그 표준편차
+        self.handshake_ms = handshake_ms
+        self.transcripts = list(transcripts) if transcripts else [text]
+        self.language = language                # verbose_json에서 language를 주지 않았을 때 감지된 언어
+        self.detect_ms = detect_ms              # language를 주지 않은 요청에 더하는 언어 감지 지연
+        self.api_key = api_key                  # None이면 아무 키나 허용
+        self.bytes_per_second = bytes_per_second  # 업로드 크기로 오디오 길이를 추정 (verbose_json duration)
+        self.ms_per_audio_second = ms_per_audio_second  # 오디오 1초마다 더하는 처리 지연 (긴 파일일수록 느림)
+        self.error_rate = error_rate            # 오류 응답 비율
+        self.error_codes = list(error_codes)
+        self.slow_rate = slow_rate              # 느린 응답 비율 (긴 꼬리 지연)
+        self.slow_ms = slow_ms
+        self.retry_after = retry_after          # 429 응답의 Retry-After (초)
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.request_count = 0
+        self.success_count = 0
+        self.error_count = 0
+        self.connection_count = 0
+        self.ssl_context = None
+        if certfile:
+            self.ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            self.ssl_context.load_cert_chain(certfile, keyfile)
+
+    @property
+    def base_url(self):
+        scheme = "https" if self.ssl_context else "http"
+        host, port = self.server_address[:2]
+        return f"{scheme}://{host}:{port}/v1"
+
+    def count(self, name):
+        with self.lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def sample_latency_ms(self):
+        """설정된 분포에서 응답 지연을 하나 뽑습니다 (lock 안에서 호출)."""
+        base = self.latency_ms
+        if not base or self.latency_dist == "fixed":
+            return base
+        if self.latency_dist == "uniform":
+            return base * self.rng.uniform(1 - self.latency_spread, 1 + self.latency_spread)
+        if self.latency_dist == "lognormal":
+            return self.rng.lognormvariate(math.log(base), self.latency_spread)
+        return self.rng.expovariate(1.0 / base)
+
+    def next_outcome(self):
+        """다음 요청의 (상태 코드, 지연 초)를 정합니다."""
+        with self.lock:
+            self.request_count += 1
+            fault = self.rng.random()
+            slow = self.rng.random() < self.slow_rate
+            status = self.rng.choice(self.error_codes) if fault < self.error_rate else 200
+            delay_ms = self.slow_ms if slow else self.sample_latency_ms()
+            if status != 200:
+                self.error_count += 1
+        return status, max(0.0, delay_ms) / 1000.0
+
+    def transcript_for(self, audio):
+        """같은 오디오에는 항상 같은 전사 결과를 돌려줍니다."""
+        index = int.from_bytes(hashlib.sha1(audio).digest()[:4], "big") % len(self.transcripts)
+        return self.transcripts[index]
+
+    def stats(self):
+        with self.lock:
+            return {"requests": self.request_count, "successes": self.success_count,
+                    "errors": self.error_count, "connections": self.connection_count}
+
+    def finish_request(self, request, client_address):
+        self.count("connection_count")
+        if self.handshake_ms:
+            time.sleep(self.handshake_ms / 1000.0)
+        if self.ssl_context is not None:
+            try:
+                request = self.ssl_context.wrap_socket(request, server_side=True)
+            except (ssl.SSLError, OSError):
+                return
+        super().finish_request(request, client_address)
+
+    def handle_error(self, request, client_address):
+        # 클라이언트가 먼저 끊은 연결 (버려진 중복 요청, 종료 중인 클라이언트)은 무시
+        if isinstance(sys.exc_info()[1], (ConnectionError, ssl.SSLError)):
+            return
+        super().handle_error(request, client_address)
+
+    def start(self):
+        """백그라운드 스레드에서 서버를 시작합니다."""
+        thread = threading.Thread(target=self.serve_forever, name="MockWhisperServer", daemon=True)
+        thread.start()
+        return self
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 Whisper API 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="응답 지연 중앙값 (exponential은 평균)")
+    parser.add_argument("--latency-dist", choices=LATENCY_DISTRIBUTIONS, default="fixed")
+    parser.add_argument("--latency-spread", type=float, default=0.5,
+                        help="uniform: ±비율, lognormal: 로그 표준편차")
+    parser.add_argument("--handshake-ms", type=float, default=0.0, help="새 연결마다 추가되는 지연")
+    parser.add_argument("--text", default="mock transcript", help="돌려줄 전사 결과")
+    parser.add_argument("--transcripts", default=None, help="전사 결과 목록 파일 (JSON 목록 또는 한 줄에 하나)")
+    parser.add_argument("--language", default="korean", help="verbose_json의 감지 언어")
+    parser.add_argument("--detect-ms", type=float, default=0.0, help="language 없는 요청의 언어 감지 지연")
+    parser.add_argument("--ms-per-audio-second", type=float, default=0.0, help="오디오 1초마다 더하는 처리 지연")
+    parser.add_argument("--bytes-per-second", type=float, default=16000, help="오디오 길이 추정에 쓰는 초당 업로드 크기")
+    parser.add_argument("--api-key", default=None, help="이 키만 허용 (기본: 아무 키나 허용)")
+    parser.add_argument("--certfile", default=None)
+    parser.add_argument("--keyfile", default=None)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="오류 응답 비율 (0~1)")
+    parser.add_argument("--error-codes", type=int, nargs="+", default=[429, 500, 503])
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="느린 응답 비율 (0~1)")
+    parser.add_argument("--slow-ms", type=float, default=5000.0, help="느린 응답의 지연")
+    parser.add_argument("--retry-after", type=float, default=None, help="429 응답의 Retry-After(초)")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    transcripts = load_transcripts(args.transcripts) if args.transcripts else None
+    server = MockWhisperServer((args.host, args.port), args.latency_ms, args.handshake_ms,
+                               args.text, args.certfile, args.keyfile, args.error_rate,
+                               args.error_codes, args.slow_rate, args.slow_ms, args.retry_after, args.seed,
+                               args.latency_dist, args.latency_spread, transcripts, args.language, args.api_key,
+                               bytes_per_second=args.bytes_per_second, detect_ms=args.detect_ms,
+                               ms_per_audio_second=args.ms_per_audio_second)
+    print(f"대역 서버 시작: {server.base_url} (지연 {args.latency_dist} {args.latency_ms:g}ms, "
+          f"오류 {args.error_rate:.0%}, 전사 결과 {len(server.transcripts)}개)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
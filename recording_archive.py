@@ -0,0 +1,59 @@
+# recording_archive.py - 녹음 파일 백그라운드 저장
+
+import logging
+import os
+import queue
+import threading
+
+
+class RecordingArchiver:
+    """
+    인코딩된 녹음을 백그라운드 스레드에서 recordings 폴더에 저장합니다.
+
+    전사 요청은 메모리의 데이터로 바로 보내고, 디스크 쓰기는 이 스레드가 맡으므로
+    느린 디스크나 백신 검사가 전사를 지연시키거나 실패하게 만들지 않습니다.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="RecordingArchiver", daemon=True)
+        self._thread.start()
+        self.saved_count = 0
+        self.failed_count = 0
+
+    def submit(self, filename, data):
+        """저장할 녹음을 대기열에 넣습니다 (즉시 반환)."""
+        self._queue.put((filename, data))
+
+    def _write(self, filename, data):
+        directory = os.path.dirname(filename)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        # 임시 파일에 쓴 뒤 이름을 바꿔 중간에 끊겨도 손상된 녹음 파일이 남지 않게 함
+        temp_filename = filename + ".part"
+        with open(temp_filename, "wb") as f:
+            f.write(data)
+        os.replace(temp_filename, filename)
+
+    def _run(self):
+        while True:
+            filename, data = self._queue.get()
+            try:
+                self._write(filename, data)
+                self.saved_count += 1
+                logging.info(f"녹음 파일 저장 완료: {filename} ({len(data)} 바이트)")
+            except Exception as e:
+                self.failed_count += 1
+                logging.error(f"녹음 파일 저장 오류: {filename}: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    def flush(self, timeout=None):
+        """대기 중인 저장이 끝날 때까지 기다립니다 (프로그램 종료 시 사용)."""
+        if timeout is None:
+            self._queue.join()
+            return True
+        waiter = threading.Thread(target=self._queue.join, daemon=True)
+        waiter.start()
+        waiter.join(timeout)
+        return not waiter.is_alive()
@@ -0,0 +1,213 @@
+# request_policy.py - 전사 요청 재시도, 지연 요청 중복 전송(hedging), 녹음별 최종 기한
+
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# 다시 보내면 성공할 수 있는 HTTP 상태 코드
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+class DeadlineExceeded(TimeoutError):
+    """녹음 한 건의 전사가 최종 기한 안에 끝나지 않았을 때 발생합니다."""
+
+
+def status_code_of(error):
+    """openai/httpx 예외에서 HTTP 상태 코드를 꺼냅니다 (없으면 None)."""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        response = getattr(error, "response", None)
+        status = getattr(response, "status_code", None)
+    return status
+
+
+def is_retryable(error):
+    """일시적인 오류(시간 초과, 연결 끊김, 429, 5xx)인지 판단합니다."""
+    status = status_code_of(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    name = type(error).__name__
+    # openai.APITimeoutError/APIConnectionError, httpx.TimeoutException/TransportError 등
+    return isinstance(error, (TimeoutError, ConnectionError)) or any(
+        key in name for key in ("Timeout", "Connection", "Transport", "Network"))
+
+
+def retry_after_of(error):
+    """429/503 응답의 Retry-After 헤더(초)를 반환합니다."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class RequestPolicy:
+    """
+    전사 요청 하나를 재시도/중복 전송/기한과 함께 실행합니다.
+
+    - 일시적인 오류는 지수 백오프에 지터를 더해 max_attempts번까지 다시 보냅니다.
+    - hedge가 켜져 있으면, 첫 요청이 최근 응답 시간의 p95를 넘길 때 같은 요청을 하나 더 보내고
+      먼저 도착한 성공 응답을 사용합니다 (늦은 요청은 결과를 버림). p95는 대부분 짧은 녹음으로 정해지므로
+      hedge_max_bytes보다 큰 요청은 중복 전송하지 않고 응답 시간도 기록하지 않습니다.
+    - 녹음마다 최종 기한이 하나 있으며 (단축키를 뗀 시각 + deadline_for(크기), 재시도와 분할 구간이 모두 공유),
+      각 요청의 시간 제한도 남은 시간으로 줄어듭니다.
+    """
+
+    def __init__(self, max_attempts=3, base_backoff=0.25, max_backoff=2.0, deadline=30.0,
+                 deadline_upload_rate=125000.0, hedge=True, hedge_quantile=95, hedge_min_samples=8,
+                 hedge_floor=1.0, hedge_max_bytes=1024 * 1024, window=50, max_workers=6):
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.deadline = deadline
+        self.deadline_upload_rate = deadline_upload_rate   # 기한에 더하는 업로드 시간의 기준 속도 (바이트/초)
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_floor = hedge_floor     # 이보다 짧은 지연에는 중복 요청을 보내지 않음 (초)
+        self.hedge_max_bytes = hedge_max_bytes
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="Request")
+        self._local = threading.local()    # 호출한 스레드별 마지막 call()의 (시도 횟수, 중복 요청 여부)
+        self.retry_count = 0
+        self.hedge_count = 0
+        self.hedge_win_count = 0
+
+    def deadline_for(self, nbytes=0):
+        """요청 크기에 비례하는 기한(초): deadline + 크기 / deadline_upload_rate (느린 연결의 큰 녹음도 업로드할 시간)"""
+        allowance = nbytes / self.deadline_upload_rate if nbytes and self.deadline_upload_rate else 0.0
+        return self.deadline + allowance
+
+    def record_latency(self, seconds, nbytes=0):
+        """성공한 요청의 응답 시간을 기록합니다 (hedge_max_bytes보다 큰 요청은 중복 전송 기준에서 제외)."""
+        if self.hedge_max_bytes and nbytes > self.hedge_max_bytes:
+            return
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def hedge_delay(self):
+        """중복 요청을 보내기까지 기다릴 시간 (기록이 부족하면 None)"""
+        with self._lock:
+            if len(self._latencies) < self.hedge_min_samples:
+                return None
+            samples = list(self._latencies)
+        if np is not None:
+            threshold = float(np.percentile(samples, self.hedge_quantile))
+        else:
+            samples.sort()
+            threshold = samples[min(len(samples) - 1, int(len(samples) * self.hedge_quantile / 100))]
+        return max(self.hedge_floor, threshold)
+
+    def backoff(self, attempt, error=None):
+        """attempt번째 실패 후 기다릴 시간 (full jitter, Retry-After가 있으면 그 값 이상)"""
+        cap = min(self.max_backoff, self.base_backoff * (2 ** (attempt - 1)))
+        delay = random.uniform(0, cap)
+        retry_after = retry_after_of(error) if error is not None else None
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def last_call_stats(self):
+        """이 스레드에서 마지막으로 실행한 call()의 (시도 횟수, 중복 요청 여부)"""
+        return getattr(self._local, "stats", (0, False))
+
+    def reset_call_stats(self):
+        """이 스레드의 마지막 call() 기록을 지웁니다 (녹음마다 처음에 호출해 이전 녹음의 값이 남지 않도록)."""
+        self._local.stats = (0, False)
+
+    def _attempt(self, fn, timeout, nbytes):
+        start = time.monotonic()
+        result = fn(timeout)
+        self.record_latency(time.monotonic() - start, nbytes)
+        return result
+
+    def call(self, fn, deadline_at=None, nbytes=0, label="request"):
+        """
+        fn(timeout)을 정책에 따라 실행하고 첫 성공 결과를 반환합니다.
+
+        deadline_at은 녹음의 절대 기한(time.monotonic 기준)이며, 없으면 지금부터 deadline_for(nbytes)초입니다.
+        timeout은 이번 요청에 허용된 남은 시간(초)입니다. 기한을 넘기면 DeadlineExceeded,
+        재시도할 수 없는 오류나 마지막 시도의 오류는 그대로 발생합니다.
+        """
+        if deadline_at is None:
+            deadline_at = time.monotonic() + self.deadline_for(nbytes)
+        small = not self.hedge_max_bytes or nbytes <= self.hedge_max_bytes
+        pending = {}            # future → (시도 번호, 시작 시각, 중복 요청 여부)
+        attempts = 0
+        hedged = False
+        last_error = None
+
+        def submit(is_hedge=False):
+            nonlocal attempts
+            attempts += 1
+            self._local.stats = (attempts, hedged or is_hedge)
+            remaining = max(0.001, deadline_at - time.monotonic())
+            future = self._executor.submit(self._attempt, fn, remaining, nbytes)
+            pending[future] = (attempts, time.monotonic(), is_hedge)
+
+        submit()
+        while True:
+            remaining = deadline_at - time.monotonic()
+            if remaining <= 0:
+                raise DeadlineExceeded(f"{label}: 녹음 기한 안에 응답이 없습니다 ({attempts}회 시도)")
+
+            wait_for = remaining
+            hedge_delay = self.hedge_delay() if self.hedge and small and not hedged else None
+            if hedge_delay is not None and len(pending) == 1 and attempts < self.max_attempts:
+                started = next(iter(pending.values()))[1]
+                wait_for = min(remaining, max(0.0, started + hedge_delay - time.monotonic()))
+
+            done, _ = wait(list(pending), timeout=wait_for, return_when=FIRST_COMPLETED)
+            if not done:
+                if hedge_delay is not None and len(pending) == 1 and attempts < self.max_attempts \
+                        and time.monotonic() - next(iter(pending.values()))[1] >= hedge_delay:
+                    hedged = True
+                    with self._lock:
+                        self.hedge_count += 1
+                    logging.info(f"{label}: 응답이 {hedge_delay * 1000:.0f}ms(p{self.hedge_quantile})를 넘어 중복 요청 전송")
+                    submit(is_hedge=True)
+                continue
+
+            for future in done:
+                attempt, _, is_hedge = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    last_error = e
+                    logging.warning(f"{label}: {attempt}번째 요청 실패: {str(e)}")
+                    if not is_retryable(e) and not pending:
+                        raise
+                    continue
+                if is_hedge:
+                    with self._lock:
+                        self.hedge_win_count += 1
+                if attempt > 1:
+                    logging.info(f"{label}: {attempt}번째 요청 성공")
+                return result
+
+            if pending:
+                continue  # 다른 요청이 아직 진행 중
+            if attempts >= self.max_attempts or not is_retryable(last_error):
+                raise last_error
+
+            delay = self.backoff(attempts, last_error)
+            if time.monotonic() + delay >= deadline_at:
+                raise DeadlineExceeded(f"{label}: 재시도 전에 기한을 넘깁니다 ({attempts}회 시도): {str(last_error)}")
+            with self._lock:
+                self.retry_count += 1
+            logging.info(f"{label}: {delay * 1000:.0f}ms 후 재시도 ({attempts + 1}/{self.max_attempts})")
+            time.sleep(delay)
+            submit()
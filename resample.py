@@ -0,0 +1,162 @@
+# resample.py - 블록 단위 폴리페이즈 리샘플러 (장치 기본 샘플링 레이트 → 16kHz)
+
+from math import gcd
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+ZERO_CROSSINGS = 16   # 필터 한쪽의 sinc 영교차 수 (클수록 전이 대역이 좁음)
+KAISER_BETA = 8.6     # 저지 대역 감쇠 약 80dB
+CUTOFF = 0.95         # 출력 나이퀴스트 대비 통과 대역 끝
+
+
+def design_filter(up, down, zero_crossings=ZERO_CROSSINGS, beta=KAISER_BETA, cutoff=CUTOFF):
+    """폴리페이즈 분해된 카이저 윈도 sinc 저역 통과 필터 (up x taps_per_phase)"""
+    ratio = max(up, down)
+    taps_per_phase = int(np.ceil(2 * zero_crossings * ratio / up))
+    length = taps_per_phase * up
+    # 지연이 정수 샘플이 되도록 홀수 길이로 설계하고 남는 자리는 0으로 채움
+    odd_length = length - 1 if length % 2 == 0 else length
+    center = (odd_length - 1) // 2
+    n = np.arange(odd_length) - center
+    fc = cutoff * 0.5 / ratio   # 업샘플된 레이트 기준 차단 주파수 (사이클/샘플)
+    h = 2 * fc * np.sinc(2 * fc * n) * np.kaiser(odd_length, beta)
+    h *= up / h.sum()  # 0 삽입 업샘플링 이득 보정 (DC 이득 = up)
+    h = np.concatenate((h, np.zeros(length - odd_length)))
+    # phases[p, k] = h[p + k*up]
+    phases = h.reshape(taps_per_phase, up).T.astype(np.float32)
+    return phases, center
+
+
+class StreamingResampler:
+    """
+    정수비(up/down) 폴리페이즈 리샘플러. 블록을 이어서 넣어도 한 번에 처리한 것과 같은 결과를 냅니다.
+
+    각 출력 샘플을 계산하는 데 필요한 입력 창을 인덱스 배열로 한 번에 모아
+    벡터 연산으로 필터링하므로 파이썬 반복문이 없습니다.
+    """
+
+    def __init__(self, in_rate, out_rate, channels=1, dtype="int16"):
+        if np is None:
+            raise RuntimeError("StreamingResampler를 사용하려면 numpy가 필요합니다.")
+        g = gcd(int(in_rate), int(out_rate))
+        self.in_rate = int(in_rate)
+        self.out_rate = int(out_rate)
+        self.up = self.out_rate // g
+        self.down = self.in_rate // g
+        self.channels = channels
+        self.dtype = np.dtype(dtype)
+        self._phases, self._delay = design_filter(self.up, self.down)
+        self._taps = self._phases.shape[1]
+        self._tap_offsets = np.arange(self._taps)
+        # 입력 기록: 미리 잡아 둔 _buffer[_offset:_offset+_length] (_history[0]의 절대 입력 인덱스는 _history_start)
+        # 필터가 과거 입력을 참조할 수 있도록 앞에 0을 채워 둠
+        self._buffer = np.zeros((4 * self._taps, channels), dtype=np.float32)
+        self._offset = 0
+        self._length = self._taps
+        self._history_start = -self._taps
+        self._received = 0      # 지금까지 받은 입력 샘플 수
+        self._produced = 0      # 지금까지 만든 출력 샘플 수
+
+    @property
+    def passthrough(self):
+        return self.up == self.down
+
+    @property
+    def _history(self):
+        return self._buffer[self._offset:self._offset + self._length]
+
+    def _append(self, block):
+        """입력 블록을 float32로 바꾸며 기록 뒤에 바로 씀 (블록마다 새 배열을 만들지 않음)"""
+        if block.ndim == 1:
+            block = block[:, None]
+        frames = block.shape[0]
+        end = self._offset + self._length
+        if end + frames > len(self._buffer):
+            # 남은 기록(필터 길이 정도)만 앞으로 옮기고, 더 큰 블록이 처음 들어올 때만 늘림
+            if self._length + frames > len(self._buffer):
+                buffer = np.zeros((2 * (self._length + frames), self.channels), dtype=np.float32)
+            else:
+                buffer = self._buffer
+            buffer[:self._length] = self._history
+            self._buffer, self._offset, end = buffer, 0, self._length
+        dest = self._buffer[end:end + frames]
+        if np.issubdtype(block.dtype, np.integer):
+            np.multiply(block, 1.0 / float(np.iinfo(block.dtype).max + 1), out=dest, casting="unsafe")
+        else:
+            dest[:] = block
+        self._length += frames
+
+    def _output(self, y):
+        if np.issubdtype(self.dtype, np.integer):
+            info = np.iinfo(self.dtype)
+            y = np.clip(np.rint(y * (info.max + 1)), info.min, info.max)
+        return y.astype(self.dtype)
+
+    def _produce(self, available):
+        """절대 입력 인덱스 available-1까지 사용해 만들 수 있는 출력을 계산"""
+        up, down = self.up, self.down
+        # 출력 n에 필요한 마지막 입력 인덱스: (n*down + delay) // up
+        last_n = (available * up - 1 - self._delay) // down  # (n*down + delay)//up <= available-1
+        count = last_n - self._produced + 1
+        if count <= 0:
+            return np.zeros((0, self.channels), dtype=np.float32)
+
+        n = np.arange(self._produced, self._produced + count, dtype=np.int64)
+        pos = n * down + self._delay
+        base = pos // up
+        phase = pos % up
+        # idx[i, k] = base[i] - k (입력 인덱스), 기록 배열 기준으로 변환
+        idx = (base[:, None] - self._tap_offsets[None, :]) - self._history_start
+        taps = self._phases[phase]                   # (count, taps)
+        out = np.empty((count, self.channels), dtype=np.float32)
+        for c in range(self.channels):
+            windows = self._history[idx, c]           # (count, taps)
+            out[:, c] = np.einsum("ij,ij->i", windows, taps)
+        self._produced += count
+        return out
+
+    def _trim_history(self):
+        """다음 출력에 필요한 입력만 남기고 기록을 잘라냄"""
+        next_base = (self._produced * self.down + self._delay) // self.up
+        keep_from = next_base - self._taps + 1
+        drop = keep_from - self._history_start
+        if drop > 0:
+            self._offset += drop
+            self._length -= drop
+            self._history_start += drop
+
+    def process(self, block):
+        """입력 블록(frames x channels)을 받아 지금 만들 수 있는 출력 샘플을 반환합니다."""
+        if self.passthrough:
+            return block.astype(self.dtype, copy=False)
+        self._append(block)
+        self._received += block.shape[0]
+        out = self._produce(self._received)
+        self._trim_history()
+        return self._output(out)
+
+    def flush(self):
+        """남은 입력을 0으로 채워 마지막 출력 샘플까지 만듭니다 (녹음 종료 시)."""
+        if self.passthrough:
+            return np.zeros((0, self.channels), dtype=self.dtype)
+        total = -(-self._received * self.up // self.down)  # 올림
+        pad = self._taps + self._delay // self.up + 1
+        self._append(np.zeros((pad, self.channels), np.float32))
+        out = self._produce(self._received + pad)
+        out = out[:max(0, total - (self._produced - len(out)))]
+        return self._output(out)
+
+
+def resample(audio, in_rate, out_rate, dtype=None):
+    """전체 신호를 한 번에 리샘플링합니다."""
+    audio = np.asarray(audio)
+    squeeze = audio.ndim == 1
+    if squeeze:
+        audio = audio[:, None]
+    resampler = StreamingResampler(in_rate, out_rate, channels=audio.shape[1], dtype=dtype or audio.dtype)
+    out = np.concatenate((resampler.process(audio), resampler.flush()), axis=0)
+    return out[:, 0] if squeeze else out
@@ -0,0 +1,133 @@
+# segmented_transcriber.py - 녹음 중 쉼 구간에서 잘라 먼저 전사하는 스트리밍 모드
+
+import io
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import soundfile
+except ImportError:
+    soundfile = None
+
+from audio_codecs import CODECS, DEFAULT_CODEC, open_encoder
+from vad import frame_features, speech_mask, detect_speech
+
+
+def encode_bytes(audio, samplerate, codec=None):
+    """오디오 구간을 메모리에서 인코딩 (기본 FLAC)"""
+    codec = codec or CODECS[DEFAULT_CODEC]
+    out = io.BytesIO()
+    with open_encoder(codec, out, samplerate, audio.shape[1] if audio.ndim > 1 else 1) as f:
+        f.write(audio)
+    return out.getvalue()
+
+
+class SegmentedTranscriber:
+    """
+    녹음 중 자연스러운 쉼에서 녹음을 잘라, 완성된 구간을 녹음이 끝나기 전에 전사합니다.
+
+    transcribe(audio_bytes, name)는 워커 스레드에서 호출되며 텍스트를 반환해야 합니다.
+    finish()는 마지막 구간을 보내고 모든 결과를 녹음 순서대로 이어 붙여 반환하므로,
+    녹음 종료 후에는 마지막 짧은 구간만 기다리면 됩니다.
+    """
+
+    def __init__(self, buffer, transcribe, max_workers=3, min_segment_ms=4000,
+                 max_segment_ms=30000, pause_ms=600, poll_interval=0.1, codec=None):
+        if np is None or soundfile is None:
+            raise RuntimeError("SegmentedTranscriber를 사용하려면 numpy와 soundfile이 필요합니다.")
+        self.buffer = buffer
+        self.transcribe = transcribe
+        self.codec = codec or CODECS[DEFAULT_CODEC]
+        samplerate = buffer.samplerate
+        self.min_segment = int(samplerate * min_segment_ms / 1000)
+        self.max_segment = int(samplerate * max_segment_ms / 1000)
+        self.pause_ms = pause_ms
+        self.poll_interval = poll_interval
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="Segment")
+        self._futures = []
+        self._segment_start = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self.error = None
+        self.segment_count = 0
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="SegmentedTranscriber", daemon=True)
+        self._thread.start()
+        return self
+
+    def _find_cut(self, length):
+        """현재 구간에서 자를 위치를 찾습니다. 자를 곳이 없으면 None."""
+        start = self._segment_start
+        if length - start < self.min_segment:
+            return None
+        level_db, zcr, frame_len = frame_features(self.buffer.view(start, length), self.buffer.samplerate)
+        silent = ~speech_mask(level_db, zcr)
+        pause_frames = max(1, int(self.pause_ms / 1000.0 * self.buffer.samplerate / frame_len))
+        first_allowed = self.min_segment // frame_len
+
+        # 길이가 pause_frames 이상인 무음 구간(최소 길이 이후) 중 첫 번째의 가운데에서 자름
+        if len(silent) >= pause_frames:
+            runs = np.convolve(silent.astype(np.int32), np.ones(pause_frames, dtype=np.int32), mode="valid")
+            candidates = np.flatnonzero(runs[first_allowed:] == pause_frames)
+            if len(candidates):
+                frame = first_allowed + candidates[0] + pause_frames // 2
+                return start + frame * frame_len
+
+        # 쉼 없이 최대 길이를 넘으면 가장 조용한 프레임에서 자름
+        if length - start >= self.max_segment and len(level_db) > first_allowed:
+            frame = first_allowed + int(np.argmin(level_db[first_allowed:]))
+            return start + frame * frame_len
+        return None
+
+    def _submit(self, start, end):
+        audio = self.buffer.view(start, end)
+        region = detect_speech(audio, self.buffer.samplerate)
+        if not region.has_speech:
+            logging.info(f"스트리밍 전사: 구간 {start}-{end}에 음성 없음, 건너뜀")
+            return
+        data = encode_bytes(audio[region.start:region.end], self.buffer.samplerate, self.codec)
+        index = self.segment_count
+        self.segment_count += 1
+        logging.info(f"스트리밍 전사: 구간 #{index} 전송 ({(end - start) / self.buffer.samplerate:.1f}초, {len(data)} 바이트)")
+        self._futures.append(self._executor.submit(self.transcribe, data, f"segment_{index}{self.codec.extension}"))
+
+    def _run(self):
+        try:
+            while not self._stop.wait(self.poll_interval):
+                cut = self._find_cut(len(self.buffer))
+                if cut is not None:
+                    self._submit(self._segment_start, cut)
+                    self._segment_start = cut
+        except Exception as e:
+            self.error = e
+            logging.error(f"스트리밍 전사 구간 분할 오류: {str(e)}")
+
+    def finish(self):
+        """마지막 구간을 전송하고 모든 구간의 텍스트를 순서대로 이어 붙여 반환합니다."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        try:
+            if self.error is not None:
+                raise self.error
+            length = len(self.buffer)
+            if length > self._segment_start:
+                self._submit(self._segment_start, length)
+            texts = [future.result() for future in self._futures]
+        finally:
+            self._executor.shutdown(wait=False)
+        return " ".join(text.strip() for text in texts if text and text.strip())
+
+    def abort(self):
+        """녹음을 버릴 때 분할을 중단합니다 (이미 보낸 요청은 결과를 무시)."""
+        self._stop.set()
+        for future in self._futures:
+            future.cancel()
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+녹음 한 건마다 JSON 한 줄로 남기는 구조화된 세션 이벤트와 여러 PC에서 모은 기록 분석
+
+사용법 (폴더의 *.jsonl, *.jsonl.gz를 모두 읽어 요약):
+    python session_events.py [logs/sessions ...] [--group-by outcome] [--since-days 7] [--json]
+"""
+
+import argparse
+import datetime
+import glob
+import gzip
+import json
+import math
+import os
+import socket
+import sys
+import uuid
+
+from async_log import AsyncLogWriter
+
+
+EVENT_VERSION = 1
+DEFAULT_EVENTS_DIR = os.path.join("logs", "sessions")
+
+# outcome 값: pasted(붙여넣음), paste_failed(입력 실패, 클립보드에만 남김), no_text(결과 없음),
+# no_speech(음성 없어 업로드 생략), deadline(기한 초과), error(전사/처리 오류)
+ERROR_OUTCOMES = ("paste_failed", "deadline", "error")
+
+# 요약에서 백분위를 계산하는 숫자 필드
+NUMERIC_FIELDS = (
+    "release_to_text_ms", "total_ms", "api_ms", "encode_ms", "paste_ms",
+    "audio_seconds", "speech_seconds", "audio_bytes", "attempts", "text_length",
+)
+
+
+def _hostname():
+    try:
+        return socket.gethostname()
+    except Exception:
+        return None
+
+
+class SessionEventLog:
+    """
+    녹음 한 건의 이벤트를 JSON 한 줄로 AsyncLogWriter 대기열에 넣습니다 (record()는 파일을 기다리지 않음).
+
+    파일은 directory/session_events_<PC 이름>_<시작 시각>.jsonl이며 max_bytes 또는 하루마다 새 파일로 넘어가므로,
+    여러 PC의 폴더를 한곳에 모아도 이름이 겹치지 않습니다. 모든 기록에 버전, 시각, PC 이름, 실행 ID가 들어갑니다.
+    전사 텍스트는 기록하지 않고 길이만 남깁니다. 단계별 지연(<구간>_ms, offsets_ms)은 LatencyRecorder.record()가
+    더한 필드를 그대로 받으므로 latency_metrics.py도 이 파일을 읽어 요약합니다.
+    """
+
+    def __init__(self, writer=None, directory=DEFAULT_EVENTS_DIR, max_bytes=10 * 1024 * 1024,
+                 max_age_seconds=86400.0):
+        self.writer = writer or AsyncLogWriter()
+        self.directory = os.path.abspath(directory)    # 작업 폴더가 바뀌어도 같은 곳에 기록
+        self.host = _hostname()
+        self.session = uuid.uuid4().hex[:12]     # 프로그램 실행 한 번
+        self.record_count = 0
+        self.writer.add_target("events", self._new_path(), max_bytes=max_bytes, max_age_seconds=max_age_seconds,
+                               next_path=self._new_path)
+
+    def _new_path(self):
+        host = "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in (self.host or "unknown"))
+        name = f"session_events_{host}_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        path = os.path.join(self.directory, name + ".jsonl")
+        n = 1
+        while os.path.exists(path):
+            path = os.path.join(self.directory, f"{name}_{n}.jsonl")
+            n += 1
+        return path
+
+    def record(self, **fields):
+        """이벤트 하나를 기록하고 기록 내용을 반환합니다 (값이 None인 필드는 뺌)."""
+        entry = {"v": EVENT_VERSION, "time": datetime.datetime.now().isoformat(timespec="milliseconds"),
+                 "host": self.host, "session": self.session}
+        entry.update((k, v) for k, v in fields.items() if v is not None)
+        # 이벤트는 버리지 않도록 자리를 잠시 기다림
+        self.writer.write("events", json.dumps(entry, ensure_ascii=False), important=True)
+        self.record_count += 1
+        return entry
+
+    def flush(self, timeout=5.0):
+        return self.writer.flush(timeout)
+
+
+def iter_event_files(paths):
+    """파일 또는 폴더(하위 폴더 포함)에서 *.jsonl, *.jsonl.gz 경로"""
+    for path in paths:
+        if os.path.isdir(path):
+            for pattern in ("*.jsonl", "*.jsonl.gz"):
+                yield from sorted(glob.glob(os.path.join(path, "**", pattern), recursive=True))
+        elif os.path.exists(path):
+            yield path
+
+
+def load_events(paths, since=None):
+    """이벤트 목록 (손상된 줄, 이벤트가 아닌 줄은 건너뜀). since는 datetime (이후 기록만)"""
+    if isinstance(paths, str):
+        paths = [paths]
+    events = []
+    for path in iter_event_files(paths):
+        opener = gzip.open if path.endswith(".gz") else open
+        try:
+            with opener(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    if not isinstance(entry, dict) or "outcome" not in entry:
+                        continue
+                    if since is not None:
+                        try:
+                            if datetime.datetime.fromisoformat(entry.get("time", "")) < since:
+                                continue
+                        except ValueError:
+                            continue
+                    events.append(entry)
+        except (OSError, EOFError) as e:
+            print(f"읽기 오류 ({path}): {str(e)}", file=sys.stderr)
+    return events
+
+
+def percentile(sorted_values, q):
+    """정렬된 목록의 q 백분위 (nearest-rank)"""
+    if not sorted_values:
+        return None
+    rank = max(1, int(math.ceil(q / 100.0 * len(sorted_values))))
+    return sorted_values[rank - 1]
+
+
+def summarize(events):
+    """건수, 결과별 건수, 오류율/재시도율, 숫자 필드별 (개수, p50, p95, p99, 최댓값)"""
+    count = len(events)
+    outcomes = {}
+    for entry in events:
+        outcomes[entry["outcome"]] = outcomes.get(entry["outcome"], 0) + 1
+    errors = sum(outcomes.get(name, 0) for name in ERROR_OUTCOMES)
+    uploaded = [entry for entry in events if entry.get("attempts")]
+    retried = sum(1 for entry in uploaded if entry["attempts"] > 1)
+    fields = {}
+    for name in NUMERIC_FIELDS:
+        values = sorted(entry[name] for entry in events if isinstance(entry.get(name), (int, float)))
+        if values:
+            fields[name] = {"count": len(values), "p50": percentile(values, 50), "p95": percentile(values, 95),
+                            "p99": percentile(values, 99), "max": values[-1]}
+    return {
+        "count": count,
+        "outcomes": outcomes,
+        "error_rate": errors / count if count else None,
+        "retry_rate": retried / len(uploaded) if uploaded else None,
+        "hosts": len({entry.get("host") for entry in events}),
+        "fields": fields,
+    }
+
+
+def format_summary(summary):
+    """summarize() 결과를 표 형태의 문자열 목록으로 만듭니다."""
+    rate = lambda value: "-" if value is None else f"{value * 100:.1f}%"
+    lines = [f"녹음 {summary['count']}건 (PC {summary['hosts']}대), 오류율 {rate(summary['error_rate'])}, "
+             f"재시도율 {rate(summary['retry_rate'])}",
+             "결과: " + ", ".join(f"{k} {v}" for k, v in sorted(summary["outcomes"].items(), key=lambda i: -i[1])),
+             f"{'field':<20}{'count':>7}{'p50':>11}{'p95':>11}{'p99':>11}{'max':>11}"]
+    for name, v in summary["fields"].items():
+        lines.append(f"{name:<20}{v['count']:>7}{v['p50']:>11.1f}{v['p95']:>11.1f}{v['p99']:>11.1f}{v['max']:>11.1f}")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="녹음별 세션 이벤트 요약 (백분위, 오류율)")
+    parser.add_argument("paths", nargs="*", default=[DEFAULT_EVENTS_DIR], help="JSONL 파일 또는 폴더")
+    parser.add_argument("--group-by", default=None, help="이 필드 값별로 나눠 요약 (예: outcome, codec, host)")
+    parser.add_argument("--since-days", type=float, default=None, help="최근 며칠 기록만")
+    parser.add_argument("--json", action="store_true", help="요약을 JSON으로 출력")
+    args = parser.parse_args()
+
+    since = datetime.datetime.now() - datetime.timedelta(days=args.since_days) if args.since_days else None
+    events = load_events(args.paths, since)
+    if not events:
+        print(f"기록이 없습니다: {', '.join(args.paths)}")
+        return 1
+    groups = {}
+    for entry in events:
+        groups.setdefault(entry.get(args.group_by) if args.group_by else None, []).append(entry)
+    summaries = {key: summarize(group) for key, group in groups.items()}
+    if args.json:
+        result = summaries[None] if not args.group_by else {str(k): v for k, v in summaries.items()}
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        return 0
+    for key, summary in sorted(summaries.items(), key=lambda item: str(item[0])):
+        if args.group_by:
+            print(f"[{args.group_by}={key}]")
+        for line in format_summary(summary):
+            print(line)
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+# audio_signals.py - 테스트용 합성 오디오 (음성과 비슷한 배음 신호, 무음)
+
+import numpy as np
+
+
+SAMPLERATE = 16000
+
+
+def voiced(seconds, level_db, samplerate=SAMPLERATE, seed=0, syllables=False):
+    """RMS가 level_db(dBFS)인 음성 비슷한 배음 신호 (syllables=True면 음절 단위로 끊김), int16 (n, 1)"""
+    rng = np.random.default_rng(seed)
+    n = int(seconds * samplerate)
+    t = np.arange(n) / samplerate
+    pitch = 140 + 40 * np.sin(2 * np.pi * 0.3 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / samplerate
+    signal = sum(np.sin(k * phase) / k for k in range(1, 6))
+    if syllables:
+        signal = signal * np.clip(np.sin(2 * np.pi * 4 * t), 0, None)
+    signal = signal / np.sqrt(np.mean(signal * signal)) * 32768 * 10 ** (level_db / 20.0)
+    signal = signal + rng.normal(0, 3, n)
+    return np.clip(signal, -32768, 32767).astype(np.int16).reshape(-1, 1)
+
+
+def silence(seconds, level_db=-80.0, samplerate=SAMPLERATE, seed=1):
+    """RMS가 level_db(dBFS)인 배경 잡음, int16 (n, 1)"""
+    rng = np.random.default_rng(seed)
+    n = int(seconds * samplerate)
+    signal = rng.normal(0, 32768 * 10 ** (level_db / 20.0), n)
+    return np.clip(signal, -32768, 32767).astype(np.int16).reshape(-1, 1)
+
+
+def concat(*parts):
+    return np.concatenate(parts, axis=0)
@@ -0,0 +1,6 @@
+# conftest.py - 저장소 루트의 모듈을 테스트에서 바로 가져올 수 있도록 경로 추가
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
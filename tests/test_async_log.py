@@ -0,0 +1,65 @@
+import logging
+import time
+
+from async_log import AsyncLogWriter, CallbackProblemLog, QueueLogHandler
+
+
+class Records(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append((record.levelno, record.getMessage()))
+
+
+def make_logger(handler):
+    logger = logging.getLogger(f"test_async_log.{id(handler)}")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(handler)
+    return logger
+
+
+def test_problems_are_counted_and_reported_once():
+    records = Records()
+    problems = CallbackProblemLog(logger=make_logger(records))
+    for _ in range(3):
+        problems.note("녹음 상태 문제: input overflow")
+    problems.note("오디오 콜백 오류: boom", logging.ERROR)
+    assert records.records == []
+
+    problems.report()
+    assert sorted(records.records) == [(logging.WARNING, "녹음 상태 문제: input overflow (3회)"),
+                                       (logging.ERROR, "오디오 콜백 오류: boom")]
+    problems.report()
+    assert len(records.records) == 2
+    assert problems.noted_count == 4
+
+
+def test_note_does_not_wait_for_a_full_log_queue(tmp_path):
+    # 쓰기 스레드 없이 대기열이 가득 찬 상태: 경고를 바로 쓰면 block_timeout만큼 기다림
+    writer = AsyncLogWriter(max_queue=1, block_timeout=0.2)
+    writer._queue.put_nowait(("app", 0.0, "filler"))
+    logger = make_logger(QueueLogHandler(writer, "app"))
+    problems = CallbackProblemLog(logger=logger)
+
+    t0 = time.perf_counter()
+    for _ in range(50):
+        problems.note("녹음 상태 문제: input overflow")
+    assert time.perf_counter() - t0 < 0.05
+
+    t0 = time.perf_counter()
+    logger.warning("녹음 상태 문제: input overflow")
+    assert time.perf_counter() - t0 >= 0.15
+
+
+def test_reporter_thread_logs_periodically():
+    records = Records()
+    problems = CallbackProblemLog(interval=0.02, logger=make_logger(records)).start()
+    problems.note("녹음 상태 문제: input underflow")
+    deadline = time.perf_counter() + 2.0
+    while not records.records and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    problems.stop()
+    assert records.records == [(logging.WARNING, "녹음 상태 문제: input underflow")]
@@ -0,0 +1,44 @@
+import numpy as np
+
+from audio_buffer import CaptureBuffer, PreRollRing
+
+
+def blocks(total, size, seed=0):
+    rng = np.random.default_rng(seed)
+    audio = rng.integers(-30000, 30000, size=(total, 1), dtype=np.int16)
+    return audio, [audio[i:i + size] for i in range(0, total, size)]
+
+
+def test_writes_across_blocks_read_back_in_order():
+    buffer = CaptureBuffer(samplerate=1000, block_seconds=1.0)
+    audio, parts = blocks(5500, 333)
+    for part in parts:
+        buffer.write(part)
+    assert len(buffer) == 5500
+    assert buffer.grow_count == 5
+    assert np.array_equal(buffer.view(), audio)
+    for start, end in ((0, 1000), (990, 1010), (1500, 4200), (5499, 9999), (3000, 3000), (5500, 5500)):
+        assert np.array_equal(buffer.view(start, end), audio[start:min(end, 5500)])
+
+
+def test_growing_never_moves_earlier_audio():
+    buffer = CaptureBuffer(samplerate=1000, block_seconds=1.0)
+    buffer.write(np.ones((800, 1), dtype=np.int16))
+    head = buffer.view(0, 800)
+    buffer.write(np.full((3000, 1), 2, dtype=np.int16))
+    # 앞 조각은 그대로 (콜백이 이전 오디오를 복사하지 않음), 조각 안의 구간은 복사 없는 뷰
+    assert np.shares_memory(head, buffer.view(0, 1000))
+    assert buffer.capacity == 4000
+
+
+def test_reset_reuses_blocks_and_preroll_drains_in_order():
+    buffer = CaptureBuffer(samplerate=1000, block_seconds=1.0)
+    buffer.write(np.zeros((2500, 1), dtype=np.int16))
+    buffer.reset()
+    ring = PreRollRing(300)
+    audio, parts = blocks(1000, 70, seed=1)
+    for part in parts:
+        ring.write(part)
+    assert ring.drain_to(buffer) == 300
+    assert np.array_equal(buffer.view(), audio[-300:])
+    assert buffer.grow_count == 2
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from audio_chunker import ChunkedTranscriber, merge_transcripts, plan_chunks
+from audio_signals import SAMPLERATE, concat, silence, voiced
+
+
+def speech_with_pauses(seconds, seed=0):
+    """4초 말하고 0.6초 쉬는 녹음"""
+    parts = []
+    for i in range(int(seconds / 4.6) + 1):
+        parts += [voiced(4.0, -24, seed=seed + i, syllables=True), silence(0.6, -60, seed=seed + i)]
+    return concat(*parts)[:int(seconds * SAMPLERATE)]
+
+
+def words_per_chunk(audio, chunks, words_per_second, seed):
+    """
+    녹음 전체에 단어를 고르게 놓고, 각 구간의 전사 결과를 그 구간에 가운데가 들어가는 단어로 흉내 냄
+    (겹친 부분의 단어는 양쪽 구간에 모두 들어감)
+    """
+    rng = np.random.default_rng(seed)
+    vocabulary = [f"word{i}" for i in range(40)] + ["그리고", "the", "a", "음"]
+    count = int(len(audio) / SAMPLERATE * words_per_second)
+    words = [vocabulary[i] for i in rng.integers(0, len(vocabulary), count)]
+    centers = (np.arange(count) + 0.5) * len(audio) / count
+    texts = [" ".join(w for w, c in zip(words, centers) if start <= c < end) for start, end in chunks]
+    return words, texts
+
+
+@pytest.mark.parametrize("target_seconds", [8.0, 12.0, 20.0])
+def test_overlapping_words_are_kept_once(target_seconds):
+    audio = speech_with_pauses(90.0)
+    chunks = plan_chunks(audio, SAMPLERATE, target_seconds, 30.0, overlap_ms=1000)
+    assert len(chunks) > 2
+    for seed in range(5):
+        words, texts = words_per_chunk(audio, chunks, 2.5, seed)
+        assert merge_transcripts(texts) == " ".join(words)
+
+
+def test_merge_keeps_line_breaks_and_boundary_separators():
+    assert merge_transcripts(["첫 줄\n둘째 줄 셋째", "셋째 넷째.\n다섯"]) == "첫 줄\n둘째 줄 셋째 넷째.\n다섯"
+    # 겹친 단어 뒤의 줄바꿈은 뒤 결과에 있던 그대로
+    assert merge_transcripts(["one two three", "two three\nfour"]) == "one two three\nfour"
+    # 겹치지 않은 경계: 앞 결과 끝의 줄바꿈을 유지, 구분자가 없으면 공백
+    assert merge_transcripts(["끝.\n", "다음", "", None, "마지막"]) == "끝.\n다음 마지막"
+
+
+def test_merge_drops_word_cut_at_boundary():
+    assert merge_transcripts(["a b c fra", "b c frag\nment x"]) == "a b c frag\nment x"
+
+
+def test_chunks_are_transcribed_in_order():
+    audio = speech_with_pauses(60.0)
+    names = []
+
+    def transcribe(data, name):
+        names.append(name)
+        return name.split("_part")[1].split(".")[0]
+
+    chunker = ChunkedTranscriber(transcribe, max_workers=3, min_chunk_seconds=10.0, max_chunk_seconds=30.0)
+    text = chunker.transcribe_audio(audio, SAMPLERATE, "take.flac")
+    assert chunker.chunk_count == len(names) > 1
+    assert text == " ".join(str(i) for i in range(chunker.chunk_count))
@@ -0,0 +1,55 @@
+import io
+import time
+
+import pytest
+
+from audio_buffer import CaptureBuffer
+from audio_signals import SAMPLERATE, concat, silence, voiced
+
+soundfile = pytest.importorskip("soundfile")
+from audio_encoder import StreamingEncoder
+
+
+def record(audio, blocksize=1600):
+    """녹음처럼 블록 단위로 버퍼를 채우고, 인코더가 끝부분(holdback)만 남기고 따라온 뒤 종료합니다."""
+    buffer = CaptureBuffer(samplerate=SAMPLERATE)
+    encoder = StreamingEncoder(buffer, io.BytesIO(), poll_interval=0.005).start()
+    for i in range(0, len(audio), blocksize):
+        buffer.write(audio[i:i + blocksize])
+        time.sleep(0.002)
+    deadline = time.time() + 5.0
+    while encoder._pos < len(audio) - encoder.holdback - blocksize and time.time() < deadline:
+        time.sleep(0.005)
+    take = encoder.finish()
+    take.target.seek(0)
+    decoded, _ = soundfile.read(take.target, dtype="int16")
+    return take, decoded
+
+
+def test_quiet_speech_until_key_release_is_not_trimmed():
+    audio = concat(silence(0.5), voiced(4.5, -36.0))
+    take, decoded = record(audio)
+    assert take.has_speech
+    assert take.end == len(audio)
+    assert len(decoded) == take.end - take.start
+
+
+def test_trailing_silence_in_holdback_is_trimmed():
+    audio = concat(silence(0.5), voiced(3.0, -20.0, syllables=True), silence(0.8))
+    take, _ = record(audio)
+    assert take.has_speech
+    assert 3.5 * SAMPLERATE <= take.end <= 3.8 * SAMPLERATE
+
+
+def test_silent_take_produces_nothing():
+    buffer = CaptureBuffer(samplerate=SAMPLERATE)
+    encoder = StreamingEncoder(buffer, io.BytesIO(), poll_interval=0.005).start()
+    buffer.write(silence(2.0))
+    assert not encoder.finish().has_speech
+
+
+def test_speech_trailing_off_quietly_at_key_release_is_kept():
+    # 끝부분만 보면 고른 조용한 소리라 잡음 바닥으로 판단되지만 녹음 전체의 잡음 바닥보다는 훨씬 큼
+    audio = concat(silence(0.5), voiced(3.0, -20.0, syllables=True), voiced(1.5, -46.0, seed=2))
+    take, _ = record(audio)
+    assert take.end == len(audio)
@@ -0,0 +1,52 @@
+import os
+
+import pytest
+
+from audio_codecs import AUTO_CODECS, CodecSelector, available_codecs
+
+pytest.importorskip("soundfile")
+
+
+def selector():
+    if "opus" not in available_codecs():
+        pytest.skip("libsndfile에 Opus 인코더가 없음")
+    return CodecSelector()
+
+
+def test_auto_never_picks_8bit_flac():
+    assert "flac_low" not in AUTO_CODECS
+    s = selector()
+    assert "flac_low" not in s.allowed
+    s.record_upload(1000, 1.0)     # 아주 느린 연결
+    assert s.choose(10).name != "flac_low"
+
+
+def test_fast_link_stays_lossless():
+    s = selector()
+    s.record_upload(160000, 0.002)  # 본문 전송 시간만 측정: 80MB/s
+    assert s.choose(10).name == "flac"
+
+
+def test_slow_link_switches_to_compressed_codec():
+    s = selector()
+    s.record_upload(160000, 2.0)    # 80KB/s
+    assert s.choose(10).name == "opus"
+
+
+def test_upload_time_excludes_server_processing():
+    from mock_whisper_server import MockWhisperServer
+    from api_client import WhisperClient
+
+    server = MockWhisperServer(latency_ms=300)
+    server.start()
+    samples = []
+    client = WhisperClient("sk-test", base_url=server.base_url, on_upload=lambda n, s: samples.append((n, s)))
+    try:
+        client.transcribe(os.urandom(200000), "take.flac")
+        client.transcribe(os.urandom(1000), "short.flac")
+    finally:
+        client.close()
+        server.shutdown()
+    assert len(samples) == 1                    # 작은 본문은 측정하지 않음
+    nbytes, seconds = samples[0]
+    assert nbytes > 200000 and seconds < 0.3    # 응답 대기 300ms는 포함되지 않음
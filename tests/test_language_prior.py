@@ -0,0 +1,37 @@
+import json
+import os
+
+from language_prior import LanguagePrior
+
+
+def saved_history(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["history"]
+
+
+def test_observe_saves_every_few_detections(tmp_path):
+    path = str(tmp_path / "prior.json")
+    prior = LanguagePrior(path=path, save_every=3)
+    prior.observe("slack.exe", "korean")
+    prior.observe("slack.exe", "korean")
+    assert not os.path.exists(path)
+    prior.observe("slack.exe", "english")
+    assert saved_history(path)["slack.exe"] == ["ko", "ko", "en"]
+
+    prior.observe("code.exe", "english")
+    assert "code.exe" not in saved_history(path)
+    prior.flush()
+    assert saved_history(path)["code.exe"] == ["en"]
+
+
+def test_flush_without_new_detections_does_not_write(tmp_path):
+    path = str(tmp_path / "prior.json")
+    prior = LanguagePrior(path=path)
+    prior.observe(None, "unknown language")
+    prior.flush()
+    assert not os.path.exists(path)
+
+    prior.observe(None, "korean")
+    prior.flush()
+    reloaded = LanguagePrior(path=path, min_samples=1)
+    assert reloaded.suggest(None) == "ko"
@@ -0,0 +1,63 @@
+from async_log import AsyncLogWriter
+from latency_metrics import LatencyRecorder, TakeTimeline, latency_fields
+from log_retention import compress_file
+from session_events import SessionEventLog, load_events
+
+
+def timeline(offset=0.0, paste_ms=500.0):
+    take = TakeTimeline(hotkey_down=100.0 + offset)
+    take.mark("key_up", 101.0 + offset)
+    take.mark("paste_done", 101.0 + offset + paste_ms / 1000.0)
+    return take
+
+
+def test_record_adds_interval_fields_to_the_event():
+    recorder = LatencyRecorder()
+    entry = recorder.record(timeline(), take=1, outcome="pasted")
+    assert entry["take"] == 1 and entry["outcome"] == "pasted"
+    assert entry["release_to_text_ms"] == 500.0
+    assert entry["total_ms"] == 1500.0
+    assert entry["offsets_ms"] == {"hotkey_down": 0.0, "key_up": 1000.0, "paste_done": 1500.0}
+    assert recorder.record_count == 1
+    assert recorder.histograms["release_to_text"].count == 1
+
+
+def test_session_events_rebuild_the_same_histograms(tmp_path):
+    writer = AsyncLogWriter()
+    events = SessionEventLog(writer, directory=str(tmp_path), max_bytes=400)
+    recorder = LatencyRecorder()
+    for i in range(10):
+        source = "prior" if i % 2 else "detect"
+        events.record(**recorder.record(timeline(i, 300.0 + 10 * i), take=i, outcome="pasted",
+                                        language_source=source))
+        writer.flush()      # 회전은 묶음 단위이므로 한 건씩 씀
+    # 이전 녹음의 기록 없이 남은 이벤트 (음성 없음)
+    events.record(take=99, outcome="no_speech")
+    writer.close()
+
+    files = sorted(tmp_path.glob("session_events_*.jsonl"))
+    assert len(files) > 1
+    compress_file(str(files[0]))
+    assert len(load_events(str(tmp_path))) == 11
+
+    loaded = LatencyRecorder.load(str(tmp_path))
+    assert loaded.record_count == 10
+    assert loaded.summary() == recorder.summary()
+    groups = LatencyRecorder.load(str(tmp_path), group_by="language_source")
+    assert {key: r.record_count for key, r in groups.items()} == {"prior": 5, "detect": 5}
+
+
+def test_latency_fields_survive_without_session_events(tmp_path):
+    # logging.session_events를 꺼도 단계별 지연 기록은 남김 (장치, 앱 같은 나머지 필드만 뺌)
+    writer = AsyncLogWriter()
+    events = SessionEventLog(writer, directory=str(tmp_path))
+    entry = LatencyRecorder().record(timeline(), take=1, outcome="pasted", language_source="prior",
+                                     device="USB Mic", app="slack.exe", attempts=2)
+    kept = latency_fields(entry)
+    assert "device" not in kept and "app" not in kept and "attempts" not in kept
+    assert kept["language_source"] == "prior" and kept["release_to_text_ms"] == 500.0 and "offsets_ms" in kept
+    events.record(**kept)
+    writer.close()
+
+    groups = LatencyRecorder.load(str(tmp_path), group_by="language_source")
+    assert groups["prior"].record_count == 1
@@ -0,0 +1,54 @@
+import threading
+import time
+
+import pytest
+
+from request_policy import DeadlineExceeded, RequestPolicy
+
+
+def test_call_stats_are_per_thread_and_reset_per_take():
+    policy = RequestPolicy(hedge=False)
+    assert policy.call(lambda timeout: "ok") == "ok"
+    assert policy.last_call_stats() == (1, False)
+    policy.reset_call_stats()
+    # 다른 스레드(스트리밍 구간 등)의 요청은 이 스레드의 기록에 남지 않음
+    worker = threading.Thread(target=lambda: policy.call(lambda timeout: "segment"))
+    worker.start()
+    worker.join()
+    assert policy.last_call_stats() == (0, False)
+
+
+def test_deadline_grows_with_upload_size():
+    policy = RequestPolicy(deadline=30.0, deadline_upload_rate=125000.0)
+    assert policy.deadline_for(0) == 30.0
+    # 20MB를 1Mbps 기준으로 업로드할 시간만큼 늘어남
+    assert policy.deadline_for(20 * 1000 * 1000) == pytest.approx(30.0 + 160.0)
+
+
+def test_absolute_deadline_includes_time_already_spent():
+    policy = RequestPolicy(hedge=False)
+    calls = []
+    with pytest.raises(DeadlineExceeded):
+        # 대기열에서 기한을 다 써 버린 녹음
+        policy.call(lambda timeout: calls.append(timeout) or time.sleep(0.2), deadline_at=time.monotonic() + 0.05)
+    assert calls and calls[0] <= 0.05
+
+
+def _slow_policy(**options):
+    policy = RequestPolicy(hedge_min_samples=2, hedge_floor=0.01, **options)
+    for _ in range(4):
+        policy.record_latency(0.02, nbytes=1000)
+    return policy
+
+
+def test_small_requests_are_hedged():
+    policy = _slow_policy()
+    policy.call(lambda timeout: time.sleep(0.15), nbytes=1000)
+    assert policy.last_call_stats() == (2, True)
+
+
+def test_large_uploads_are_not_hedged_or_recorded():
+    policy = _slow_policy(hedge_max_bytes=100000)
+    policy.call(lambda timeout: time.sleep(0.15), nbytes=5 * 1000 * 1000)
+    assert policy.last_call_stats() == (1, False)
+    assert policy.hedge_delay() == pytest.approx(0.02)
@@ -0,0 +1,85 @@
+from math import gcd
+
+import numpy as np
+import pytest
+
+from audio_signals import SAMPLERATE, voiced
+from resample import StreamingResampler, resample
+
+RATES = (48000, 44100, 22050)
+
+
+def tone_error_db(in_rate, freqs, seconds=1.0):
+    """사인파를 리샘플링한 결과와 16kHz에서 직접 만든 기준 신호의 상대 오차 (dB, 가장자리 제외)"""
+    t_in = np.arange(int(in_rate * seconds)) / in_rate
+    t_out = np.arange(int(SAMPLERATE * seconds)) / SAMPLERATE
+    x = sum(np.sin(2 * np.pi * f * t_in) for f in freqs) * (0.3 / len(freqs))
+    reference = sum(np.sin(2 * np.pi * f * t_out) for f in freqs) * (0.3 / len(freqs))
+    y = resample(x.astype(np.float32), in_rate, SAMPLERATE)
+    edge = SAMPLERATE // 20
+    n = min(len(y), len(reference))
+    error = y[edge:n - edge] - reference[edge:n - edge]
+    return 20 * np.log10(np.sqrt(np.mean(error ** 2)) / np.sqrt(np.mean(reference[edge:n - edge] ** 2)) + 1e-12)
+
+
+@pytest.mark.parametrize("in_rate", RATES)
+@pytest.mark.parametrize("blocksize", (1, 441, 480, 1024, 4800))
+def test_streaming_matches_batch(in_rate, blocksize):
+    audio = voiced(0.5, -20.0, samplerate=in_rate, syllables=True)
+    resampler = StreamingResampler(in_rate, SAMPLERATE)
+    parts = [resampler.process(audio[i:i + blocksize]) for i in range(0, len(audio), blocksize)]
+    parts.append(resampler.flush())
+    streamed = np.concatenate(parts)
+    batch = resample(audio, in_rate, SAMPLERATE)
+    assert streamed.shape == batch.shape
+    assert int(np.abs(streamed.astype(np.int32) - batch).max()) <= 1
+
+
+@pytest.mark.parametrize("in_rate", RATES)
+def test_output_length(in_rate):
+    audio = voiced(1.3, -20.0, samplerate=in_rate)
+    assert len(resample(audio, in_rate, SAMPLERATE)) == -(-len(audio) * SAMPLERATE // in_rate)
+
+
+@pytest.mark.parametrize("in_rate", RATES)
+def test_passband_tones_are_preserved(in_rate):
+    assert tone_error_db(in_rate, (220.0, 1000.0, 3400.0, 6000.0)) < -60.0
+
+
+@pytest.mark.parametrize("in_rate", (48000, 44100))
+def test_tones_above_output_nyquist_are_removed(in_rate):
+    t = np.arange(in_rate) / in_rate
+    y = resample((0.5 * np.sin(2 * np.pi * 11000.0 * t)).astype(np.float32), in_rate, SAMPLERATE)
+    level = np.sqrt(np.mean(y[SAMPLERATE // 20:-SAMPLERATE // 20] ** 2)) / (0.5 / np.sqrt(2))
+    assert 20 * np.log10(level + 1e-12) < -60.0
+
+
+def test_same_rate_passes_through():
+    audio = voiced(0.2, -20.0)
+    resampler = StreamingResampler(SAMPLERATE, SAMPLERATE)
+    assert np.array_equal(resampler.process(audio), audio)
+    assert len(resampler.flush()) == 0
+
+
+@pytest.mark.parametrize("in_rate", RATES)
+def test_matches_scipy_resample_poly(in_rate):
+    signal = pytest.importorskip("scipy.signal")
+    audio = voiced(1.0, -20.0, samplerate=in_rate, syllables=True)
+    g = gcd(in_rate, SAMPLERATE)
+    x = audio[:, 0].astype(np.float32) / 32768.0
+    reference = signal.resample_poly(x, SAMPLERATE // g, in_rate // g)
+    ours = resample(audio, in_rate, SAMPLERATE)[:, 0].astype(np.float32) / 32768.0
+    n = min(len(reference), len(ours))
+    error = np.sqrt(np.mean((reference[:n] - ours[:n]) ** 2)) / np.sqrt(np.mean(reference[:n] ** 2))
+    assert 20 * np.log10(error + 1e-12) < -40.0
+
+
+def test_history_buffer_is_reused_between_blocks():
+    audio = voiced(1.0, -20.0, samplerate=48000)
+    resampler = StreamingResampler(48000, SAMPLERATE)
+    resampler.process(audio[:480])
+    buffer = resampler._buffer
+    for i in range(480, len(audio), 480):
+        resampler.process(audio[i:i + 480])
+    # 콜백 블록마다 기록을 새로 이어 붙이지 않음 (같은 크기 블록이면 처음 잡은 버퍼를 계속 씀)
+    assert resampler._buffer is buffer
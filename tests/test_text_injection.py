@@ -0,0 +1,83 @@
+import time
+
+import pytest
+
+from text_injection import ClipboardPasteStrategy, RecordingSink, TextInjector, wait_until
+
+
+class SlowClipboard:
+    """복사한 내용이 ready_after초 뒤에 읽히는 클립보드 (ready_after=None이면 계속 읽히지 않음)"""
+
+    def __init__(self, value, ready_after=0.0):
+        self.value = value
+        self.ready_after = ready_after
+        self._pending = None
+
+    def copy(self, text):
+        if self.ready_after == 0.0:
+            self.value, self._pending = text, None
+        else:
+            self._pending = (text, time.perf_counter() + (self.ready_after or 1e9))
+
+    def paste(self):
+        if self._pending is not None and time.perf_counter() >= self._pending[1]:
+            self.value, self._pending = self._pending[0], None
+        return self.value
+
+
+class Keyboard:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.events = []
+
+    def press(self, key):
+        if self.fail:
+            raise OSError("입력 실패")
+        self.events.append(("press", key))
+
+    def release(self, key):
+        self.events.append(("release", key))
+
+
+def test_paste_restores_previous_clipboard():
+    clipboard = SlowClipboard("user text")
+    strategy = ClipboardPasteStrategy(clipboard, Keyboard(), "ctrl", restore_delay=0.05)
+    strategy.inject("dictated")
+    assert clipboard.paste() == "dictated"
+    assert wait_until(lambda: clipboard.paste() == "user text", 1.0)
+    assert strategy.restored_count == 1
+
+
+def test_late_copy_after_ready_timeout_is_restored():
+    clipboard = SlowClipboard("user text", ready_after=0.1)
+    keyboard = Keyboard()
+    strategy = ClipboardPasteStrategy(clipboard, keyboard, "ctrl", restore_delay=0.2, ready_timeout=0.02)
+    with pytest.raises(RuntimeError):
+        strategy.inject("dictated")
+    assert keyboard.events == []
+    # 복사는 시간 제한 뒤에 반영되었지만 예약된 복원이 사용자 내용을 되돌림
+    assert wait_until(lambda: clipboard.paste() == "dictated", 1.0)
+    assert wait_until(lambda: clipboard.paste() == "user text", 1.0)
+
+
+def test_failed_key_press_still_restores():
+    clipboard = SlowClipboard("user text")
+    strategy = ClipboardPasteStrategy(clipboard, Keyboard(fail=True), "ctrl", restore_delay=0.05)
+    with pytest.raises(OSError):
+        strategy.inject("dictated")
+    strategy.flush()
+    assert clipboard.paste() == "user text"
+
+
+def test_text_stays_on_clipboard_when_every_strategy_fails():
+    clipboard = SlowClipboard("user text", ready_after=0.05)
+    paste = ClipboardPasteStrategy(clipboard, Keyboard(), "ctrl", restore_delay=0.1, ready_timeout=0.01)
+    injector = TextInjector([paste, RecordingSink(fail=True)])
+    assert injector.inject("dictated").strategy is None
+
+    # deliver_take처럼 직접 붙여넣을 수 있도록 클립보드에 남김
+    injector.cancel_restore()
+    clipboard.copy("dictated")
+    time.sleep(paste.restore_delay + 0.2)
+    assert clipboard.paste() == "dictated"
+    assert paste.restored_count == 0
@@ -0,0 +1,74 @@
+import random
+import re
+
+import pytest
+
+from text_postprocess import TextPostProcessor
+
+
+USER_COMMANDS = {"개행": "\n", "엔터": "\n", "new line": "\n", "새 문단": "\n\n", "enter": "\n"}
+USER_REPLACEMENTS = {"*": {"open ai": "OpenAI", "open": "Open"}, "en": {"gonna": "going to"},
+                     "ko": {"회의": "미팅"}}
+
+
+def legacy_postprocess(text):
+    """규칙표 엔진 이전의 후처리 (re.sub → strip/마침표 제거 → 두 글자 '\\n'으로 나눠 줄마다 정리)"""
+    text = re.sub(r'\s*(개행|엔터)\s*', '\\n', text)
+    cleaned_text = text.strip()
+    if cleaned_text.startswith('.'):
+        cleaned_text = cleaned_text[1:]
+    if cleaned_text.endswith('.'):
+        cleaned_text = cleaned_text[:-1]
+    cleaned_text = cleaned_text.strip()
+    cleaned_lines = []
+    for line in cleaned_text.split('\\n'):
+        line = line.strip()
+        cleaned_lines.append(line[1:].lstrip() if line.startswith('.') else line)
+    return "\\n".join(cleaned_lines)
+
+
+@pytest.mark.parametrize("text, language, expected", [
+    ("안녕하세요 개행 반갑습니다", None, "안녕하세요\n반갑습니다"),
+    ("첫 줄 엔터  둘째 줄.", None, "첫 줄\n둘째 줄"),
+    (". 점으로 시작합니다.", None, "점으로 시작합니다"),
+    ("..두 개", None, "두 개"),
+    ("개행 앞뒤 명령 엔터", None, "앞뒤 명령"),
+    ("문장. 개행 . 다음", None, "문장.\n. 다음"),          # 실제 줄바꿈 뒤의 '.'은 그대로 (이전과 같음)
+    ("엔터테인먼트", None, "테인먼트"),                     # 기본 명령은 단어 중간에서도 인식 (이전과 같음)
+    ("가 \\n . 나 \\n다.", None, "가\\n나\\n다"),         # 글자 그대로의 '\\n'은 줄 구분자
+    ("   ", None, ""),
+])
+def test_default_rules(text, language, expected):
+    assert TextPostProcessor().process(text, language).text == expected
+
+
+@pytest.mark.parametrize("text, language, expected", [
+    ("Hello New Line world", None, "Hello\nworld"),
+    ("I'm gonna go", "en", "I'm going to go"),
+    ("I'm gonna go", "ko", "I'm gonna go"),
+    ("gonnas", "en", "gonnas"),
+    ("open ai is open", None, "OpenAI is Open"),
+    ("회의 새 문단 회의록", "ko", "미팅\n\n회의록"),
+])
+def test_user_rules(text, language, expected):
+    processor = TextPostProcessor(USER_COMMANDS, USER_REPLACEMENTS)
+    assert processor.process(text, language).text == expected
+
+
+def test_user_commands_match_whole_words_only():
+    processor = TextPostProcessor(USER_COMMANDS, USER_REPLACEMENTS)
+    result = processor.process("the center entered, enter done")
+    assert result.text == "the center entered,\ndone"
+    assert result.commands == 1
+    assert processor.process("renew lines new line ok").text == "renew lines\nok"
+    # 사용자 표에 있어도 기본 명령은 이전처럼 단어 중간에서 인식
+    assert processor.process("엔터테인먼트").text == "테인먼트"
+
+
+def test_random_input_matches_legacy_implementation():
+    processor = TextPostProcessor()
+    rng = random.Random(0)
+    tokens = ["개행", "엔터", "개", "행", "엔", " ", "  ", ".", "\\n", "\\", "n", "\n", "가", "a"]
+    for _ in range(5000):
+        text = "".join(rng.choice(tokens) for _ in range(rng.randint(0, 12)))
+        assert processor.process(text).text == legacy_postprocess(text), text
@@ -0,0 +1,62 @@
+import time
+
+from transcript_cache import CachedBackend, TranscriptCache
+from transcription_backend import TranscriptionBackend
+
+
+def stored_total(cache):
+    return cache._db.execute("SELECT COALESCE(SUM(nbytes), 0) FROM transcripts").fetchone()[0]
+
+
+def test_running_total_matches_table(tmp_path):
+    cache = TranscriptCache(str(tmp_path / "cache.sqlite3"), max_bytes=4000, max_age_days=30)
+    for i in range(60):
+        cache.put(f"audio {i}".encode(), {"model": "whisper-1"}, "text " * (i % 7 + 1))
+        if i % 5 == 0:
+            # 같은 키를 다른 결과로 덮어씀
+            cache.put(f"audio {i}".encode(), {"model": "whisper-1"}, "replaced")
+        assert cache.stats()["bytes"] == stored_total(cache)
+    assert stored_total(cache) <= 4000
+    assert cache.stats()["evicted"] > 0
+    cache.clear()
+    assert cache.stats()["bytes"] == 0
+
+
+def test_total_is_loaded_on_open_and_expiry_is_subtracted(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = TranscriptCache(path, max_bytes=None, max_age_days=None)
+    cache.put(b"old", {}, "old text")
+    cache.put(b"new", {}, "new text")
+    cache._db.execute("UPDATE transcripts SET created_at = ? WHERE text = 'old text'", (time.time() - 10 * 86400,))
+    total = stored_total(cache)
+    cache.close()
+
+    reopened = TranscriptCache(path, max_bytes=None, max_age_days=30)
+    assert reopened.stats()["bytes"] == total
+    reopened.max_age_seconds = 5 * 86400.0
+    assert reopened.evict() == 1
+    assert reopened.get(b"new", {}) == "new text"
+    assert reopened.stats()["bytes"] == stored_total(reopened)
+
+
+class ServerBackend(TranscriptionBackend):
+    name = "server"
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.calls = 0
+
+    def transcribe(self, audio_bytes, params):
+        self.calls += 1
+        return f"{self.base_url} text"
+
+
+def test_results_are_not_shared_between_servers(tmp_path):
+    cache = TranscriptCache(str(tmp_path / "cache.sqlite3"))
+    local, remote = ServerBackend("http://127.0.0.1:8000/v1"), ServerBackend("https://api.openai.com/v1")
+    params = {"model": "whisper-1", "language": "ko"}
+    assert CachedBackend(local, cache).transcribe(b"audio", params) == "http://127.0.0.1:8000/v1 text"
+    # base_url만 바꿔도 다른 서버의 결과를 돌려주지 않음
+    assert CachedBackend(remote, cache).transcribe(b"audio", params) == "https://api.openai.com/v1 text"
+    assert CachedBackend(local, cache).transcribe(b"audio", params) == "http://127.0.0.1:8000/v1 text"
+    assert (local.calls, remote.calls) == (1, 1)
@@ -0,0 +1,99 @@
+import random
+import threading
+import time
+
+from transcription_pipeline import TakeSession, TranscriptionPipeline
+
+
+def test_submit_returns_while_previous_take_is_in_flight():
+    release = threading.Event()
+    started = threading.Event()
+
+    def process(session):
+        started.set()
+        release.wait(5)
+        return f"take {session.extra['label']}"
+
+    pipeline = TranscriptionPipeline(process, workers=1).start()
+    try:
+        t0 = time.perf_counter()
+        first = pipeline.submit(TakeSession(None, label=0))
+        assert time.perf_counter() - t0 < 0.05
+        assert started.wait(5)
+        # 앞 녹음이 처리 중인 동안 다음 녹음을 시작하고 대기열에 넣을 수 있음
+        second = pipeline.submit(TakeSession(None, label=1))
+        assert not first.done.is_set() and not second.done.is_set()
+        assert pipeline.pending == 2
+        release.set()
+        assert pipeline.flush(timeout=5)
+        assert (first.text, second.text) == ("take 0", "take 1")
+    finally:
+        release.set()
+        pipeline.stop()
+
+
+def test_failed_take_does_not_block_later_takes():
+    delivered = []
+    completed = []
+
+    def process(session):
+        if session.extra["label"] == 1:
+            raise RuntimeError("API 오류")
+        return session.extra["label"]
+
+    aborted = []
+
+    class Encoder:
+        def abort(self):
+            aborted.append(True)
+
+    pipeline = TranscriptionPipeline(process, lambda s: delivered.append(s.text), workers=2,
+                                     completed=lambda s: completed.append(s.extra["label"])).start()
+    try:
+        sessions = [pipeline.submit(TakeSession(None, Encoder(), label=i)) for i in range(3)]
+        assert pipeline.flush(timeout=5)
+    finally:
+        pipeline.stop()
+    assert delivered == [0, 2]
+    assert completed == [0, 1, 2]
+    assert isinstance(sessions[1].error, RuntimeError) and aborted == [True]
+    assert (pipeline.completed_count, pipeline.failed_count) == (2, 1)
+
+
+def test_flush_times_out_while_take_is_running():
+    release = threading.Event()
+    pipeline = TranscriptionPipeline(lambda s: release.wait(5)).start()
+    try:
+        pipeline.submit(TakeSession(None))
+        assert not pipeline.flush(timeout=0.05)
+    finally:
+        release.set()
+        pipeline.flush(timeout=5)
+        pipeline.stop()
+
+
+def test_concurrent_takes_are_pasted_in_recording_order():
+    rng = random.Random(7)
+    delays = [rng.uniform(0.0, 0.03) for _ in range(40)]
+    pasted = []
+
+    def process(session):
+        time.sleep(delays[session.extra["label"]])
+        return session.extra["label"]
+
+    def deliver(session):
+        pasted.append(session.text)
+
+    pipeline = TranscriptionPipeline(process, deliver, workers=4).start()
+    try:
+        sessions = []
+        for i in range(len(delays)):
+            sessions.append(pipeline.submit(TakeSession(None, label=i)))
+            time.sleep(0.002)
+        assert pipeline.flush(timeout=10)
+    finally:
+        pipeline.stop()
+    # 뒤 녹음의 처리가 먼저 끝난 경우가 있어야 순서 보장을 시험한 것
+    assert any(b.finished_at < a.finished_at for a, b in zip(sessions, sessions[1:]))
+    assert pasted == list(range(len(delays)))
+    assert all(s.delivered_at >= s.finished_at for s in sessions)
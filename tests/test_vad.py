@@ -0,0 +1,29 @@
+from audio_signals import SAMPLERATE, concat, silence, voiced
+from vad import detect_speech
+
+
+def test_silence_only_take_has_no_speech():
+    assert not detect_speech(silence(3.0), SAMPLERATE).has_speech
+    assert not detect_speech(silence(3.0, level_db=-60.0), SAMPLERATE).has_speech
+
+
+def test_leading_and_trailing_silence_are_trimmed():
+    audio = concat(silence(1.0), voiced(2.0, -20.0, syllables=True), silence(1.0))
+    region = detect_speech(audio, SAMPLERATE)
+    assert region.has_speech
+    assert 0.6 * SAMPLERATE <= region.start <= 1.0 * SAMPLERATE
+    assert 3.0 * SAMPLERATE <= region.end <= 3.4 * SAMPLERATE
+
+
+def test_steady_quiet_speech_without_silence_is_speech():
+    # 무음 프레임이 없으면 10번째 백분위가 음성 자체가 됨
+    region = detect_speech(voiced(1.0, -36.0), SAMPLERATE)
+    assert region.has_speech
+    assert region.end == SAMPLERATE
+
+
+def test_quiet_speech_with_short_lead_in_is_kept_to_the_end():
+    audio = concat(silence(0.4), voiced(4.6, -36.0))
+    region = detect_speech(audio, SAMPLERATE)
+    assert region.has_speech
+    assert region.end == len(audio)
@@ -0,0 +1,285 @@
+# text_injection.py - 전사 결과를 현재 창에 넣는 입력 방식 (클립보드 붙여넣기, 유니코드 일괄 입력, 기록용)
+
+import logging
+import threading
+import time
+from collections import namedtuple
+
+try:
+    import ctypes
+    from ctypes import wintypes
+except ImportError:
+    ctypes = None
+
+
+# 입력 결과: 성공한 방식 이름(모두 실패하면 None), 걸린 시간, 실패한 방식별 (이름, 오류) 목록
+Injection = namedtuple("Injection", ["strategy", "ms", "errors"])
+
+KEYEVENTF_KEYUP = 0x0002
+KEYEVENTF_UNICODE = 0x0004
+INPUT_KEYBOARD = 1
+VK_RETURN = 0x0D
+VK_TAB = 0x09
+# 유니코드 이벤트를 무시하는 프로그램이 많아 가상 키로 보내는 글자
+VIRTUAL_KEYS = {"\n": VK_RETURN, "\t": VK_TAB}
+
+
+def wait_until(condition, timeout, interval=0.002):
+    """condition()이 참이 될 때까지 기다립니다 (timeout 초 안에 참이 되면 True)."""
+    deadline = time.perf_counter() + timeout
+    while True:
+        if condition():
+            return True
+        if time.perf_counter() >= deadline:
+            return False
+        time.sleep(interval)
+
+
+def unicode_events(text):
+    """
+    텍스트를 (가상 키, 스캔 코드, 플래그) 키 이벤트 목록으로 만듭니다 (글자마다 누름/뗌).
+
+    KEYEVENTF_UNICODE는 UTF-16 단위로 보내므로 한글, 이모지(서로게이트 쌍)도 자판 배열과 관계없이 그대로 입력됩니다.
+    """
+    events = []
+    for ch in text.replace("\r\n", "\n"):
+        vk = VIRTUAL_KEYS.get(ch)
+        if vk is not None:
+            events.append((vk, 0, 0))
+            events.append((vk, 0, KEYEVENTF_KEYUP))
+            continue
+        data = ch.encode("utf-16-le")
+        for i in range(0, len(data), 2):
+            unit = data[i] | (data[i + 1] << 8)
+            events.append((0, unit, KEYEVENTF_UNICODE))
+            events.append((0, unit, KEYEVENTF_UNICODE | KEYEVENTF_KEYUP))
+    return events
+
+
+if ctypes is not None and hasattr(ctypes, "windll"):
+    class KEYBDINPUT(ctypes.Structure):
+        _fields_ = [("wVk", wintypes.WORD), ("wScan", wintypes.WORD), ("dwFlags", wintypes.DWORD),
+                    ("time", wintypes.DWORD), ("dwExtraInfo", ctypes.c_size_t)]
+
+    class MOUSEINPUT(ctypes.Structure):
+        # INPUT 공용체 크기를 맞추기 위해 필요 (가장 큰 멤버)
+        _fields_ = [("dx", wintypes.LONG), ("dy", wintypes.LONG), ("mouseData", wintypes.DWORD),
+                    ("dwFlags", wintypes.DWORD), ("time", wintypes.DWORD), ("dwExtraInfo", ctypes.c_size_t)]
+
+    class _INPUTUNION(ctypes.Union):
+        _fields_ = [("ki", KEYBDINPUT), ("mi", MOUSEINPUT)]
+
+    class INPUT(ctypes.Structure):
+        _fields_ = [("type", wintypes.DWORD), ("union", _INPUTUNION)]
+
+    def send_input(events):
+        """키 이벤트 목록을 SendInput 한 번으로 보냅니다 (중간에 다른 입력이 끼어들지 않음)."""
+        inputs = (INPUT * len(events))()
+        for item, (vk, scan, flags) in zip(inputs, events):
+            item.type = INPUT_KEYBOARD
+            item.union.ki.wVk = vk
+            item.union.ki.wScan = scan
+            item.union.ki.dwFlags = flags
+        sent = ctypes.windll.user32.SendInput(len(events), inputs, ctypes.sizeof(INPUT))
+        if sent != len(events):
+            # 관리자 권한 창 등 UIPI로 막힌 경우
+            raise OSError(f"SendInput이 {len(events)}개 중 {sent}개만 보냄 (오류 {ctypes.GetLastError()})")
+else:
+    send_input = None
+
+
+class InjectionStrategy:
+    """
+    입력 방식 기본 클래스.
+
+    keys_released()를 주면 입력 전에 사용자가 누르고 있는 수정자 키(단축키)를 뗄 때까지 기다리므로
+    고정된 sleep 없이도 Ctrl+Shift+V처럼 다른 단축키로 입력되는 일을 막습니다.
+    """
+
+    name = "base"
+
+    def __init__(self, keys_released=None, release_timeout=0.5):
+        self.keys_released = keys_released
+        self.release_timeout = release_timeout
+
+    def wait_ready(self):
+        if self.keys_released is not None and not wait_until(self.keys_released, self.release_timeout):
+            logging.warning(f"수정자 키가 {self.release_timeout}초 안에 떼어지지 않아 그대로 입력합니다")
+
+    def inject(self, text):
+        """text를 현재 창에 입력합니다 (실패하면 예외)."""
+        raise NotImplementedError
+
+
+class ClipboardPasteStrategy(InjectionStrategy):
+    """
+    클립보드에 복사하고 Ctrl+V를 보냅니다.
+
+    복사한 내용이 클립보드에서 읽힐 때까지만 기다린 뒤 바로 붙여넣고, restore가 켜져 있으면 restore_delay초 뒤
+    (대상 프로그램이 클립보드를 읽은 뒤) 백그라운드에서 사용자의 이전 클립보드 내용을 되돌립니다.
+    그 사이 사용자가 다른 내용을 복사했으면 되돌리지 않고, 연속으로 붙여넣으면 처음 저장한 내용을 되돌립니다.
+    클립보드 준비를 기다리다 실패해 예외를 던질 때도 복원은 같은 방식으로 예약하며, 모든 입력 방식이 실패해
+    텍스트를 클립보드에 남길 때는 cancel_restore()로 복원을 취소합니다.
+    pyperclip은 텍스트만 다루므로 이전 내용이 텍스트가 아니었거나 비어 있었으면 붙여넣은 텍스트를 그대로 둡니다.
+    """
+
+    name = "paste"
+
+    def __init__(self, clipboard, keyboard, modifier_key, restore=True, restore_delay=0.5,
+                 ready_timeout=0.5, keys_released=None, release_timeout=0.5):
+        super().__init__(keys_released, release_timeout)
+        self.clipboard = clipboard              # copy(text) / paste()가 있는 객체 (pyperclip)
+        self.keyboard = keyboard                # press() / release()가 있는 객체 (pynput Controller)
+        self.modifier_key = modifier_key
+        self.restore = restore
+        self.restore_delay = restore_delay
+        self.ready_timeout = ready_timeout
+        self._lock = threading.Lock()
+        self._saved = None
+        self._timer = None
+        self._generation = 0
+        self.restored_count = 0
+
+    def _read(self):
+        try:
+            return self.clipboard.paste()
+        except Exception as e:
+            logging.debug(f"클립보드 읽기 오류: {str(e)}")
+            return None
+
+    def inject(self, text):
+        with self._lock:
+            if self._timer is not None:
+                # 앞 붙여넣기의 복원이 아직이면 취소하고 그때 저장한 사용자 내용을 유지
+                self._timer.cancel()
+                self._timer = None
+            elif self.restore:
+                self._saved = self._read()
+            self._generation += 1
+            self.clipboard.copy(text)
+            try:
+                if not wait_until(lambda: self._read() == text, self.ready_timeout):
+                    raise RuntimeError(f"클립보드에 {self.ready_timeout}초 안에 복사되지 않음")
+                self.wait_ready()
+                self.keyboard.press(self.modifier_key)
+                try:
+                    self.keyboard.press("v")
+                    self.keyboard.release("v")
+                finally:
+                    self.keyboard.release(self.modifier_key)
+            finally:
+                # 붙여넣지 못해도 복원 예약 (복사가 늦게 반영되어도 사용자 내용을 되돌림)
+                if self.restore and self._saved:
+                    self._timer = threading.Timer(self.restore_delay, self._restore, args=(text, self._generation))
+                    self._timer.daemon = True
+                    self._timer.start()
+
+    def _restore(self, text, generation):
+        with self._lock:
+            if generation != self._generation or not self._saved:
+                # 취소되기 전에 시작된 복원 (그 뒤 다시 붙여넣음)
+                return
+            self._timer = None
+            saved, self._saved = self._saved, None
+            try:
+                if self._read() == text:
+                    self.clipboard.copy(saved)
+                    self.restored_count += 1
+            except Exception as e:
+                logging.warning(f"이전 클립보드 내용 복원 오류: {str(e)}")
+
+    def cancel_restore(self):
+        """예약된 클립보드 복원을 취소합니다 (입력에 모두 실패해 텍스트를 클립보드에 남길 때)."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._saved = None
+            # 이미 시작된 복원도 되돌리지 않도록
+            self._generation += 1
+
+    def flush(self):
+        """예약된 클립보드 복원을 지금 실행합니다 (프로그램 종료 전)."""
+        with self._lock:
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+            self._restore(*timer.args)
+
+
+class UnicodeTypingStrategy(InjectionStrategy):
+    """
+    클립보드를 거치지 않고 텍스트를 키 입력으로 보냅니다.
+
+    Windows에서는 batch_size글자씩 KEYEVENTF_UNICODE 이벤트를 SendInput 한 번으로 보내고 (1000글자가 호출 2번),
+    SendInput이 없으면 pynput Controller.type()에 같은 크기로 나눠 넘깁니다. 글자 사이에 sleep은 없습니다.
+    """
+
+    name = "unicode"
+
+    def __init__(self, keyboard=None, send_events=None, batch_size=500, keys_released=None, release_timeout=0.5):
+        super().__init__(keys_released, release_timeout)
+        self.send_events = send_events if send_events is not None else send_input
+        self.keyboard = keyboard
+        self.batch_size = max(1, batch_size)
+        if self.send_events is None and keyboard is None:
+            raise RuntimeError("유니코드 입력에는 SendInput(Windows) 또는 pynput Controller가 필요합니다.")
+
+    def inject(self, text):
+        self.wait_ready()
+        for start in range(0, len(text), self.batch_size):
+            batch = text[start:start + self.batch_size]
+            if self.send_events is not None:
+                self.send_events(unicode_events(batch))
+            else:
+                self.keyboard.type(batch)
+
+
+class RecordingSink(InjectionStrategy):
+    """입력 대신 텍스트를 기록합니다 (시험, 벤치마크용). fail=True면 항상 실패해 다음 방식으로 넘어갑니다."""
+
+    name = "record"
+
+    def __init__(self, fail=False):
+        super().__init__()
+        self.fail = fail
+        self.texts = []
+
+    def inject(self, text):
+        if self.fail:
+            raise RuntimeError("기록용 입력 실패 (fail=True)")
+        self.texts.append(text)
+
+
+class TextInjector:
+    """입력 방식을 순서대로 시도해 처음 성공한 방식으로 텍스트를 넣습니다."""
+
+    def __init__(self, strategies):
+        self.strategies = list(strategies)
+
+    @property
+    def names(self):
+        return [strategy.name for strategy in self.strategies]
+
+    def inject(self, text):
+        t0 = time.perf_counter()
+        errors = []
+        for strategy in self.strategies:
+            try:
+                strategy.inject(text)
+                return Injection(strategy.name, (time.perf_counter() - t0) * 1000.0, errors)
+            except Exception as e:
+                logging.warning(f"텍스트 입력 실패 ({strategy.name}): {str(e)}")
+                errors.append((strategy.name, e))
+        return Injection(None, (time.perf_counter() - t0) * 1000.0, errors)
+
+    def cancel_restore(self):
+        """입력 방식이 예약한 클립보드 복원을 모두 취소합니다."""
+        for strategy in self.strategies:
+            if hasattr(strategy, "cancel_restore"):
+                strategy.cancel_restore()
+
+    def flush(self):
+        for strategy in self.strategies:
+            if hasattr(strategy, "flush"):
+                strategy.flush()
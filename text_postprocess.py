@@ -0,0 +1,167 @@
+# text_postprocess.py - 음성 명령, 줄 단위 정리, 언어별 치환을 한 번의 정규식 탐색으로 처리하는 전사 결과 후처리
+
+import re
+import threading
+from collections import namedtuple
+
+
+# 말로 하는 명령 → 넣을 문자열 (앞뒤 공백까지 바꿈, 이 기본 명령만 이전처럼 단어 중간에서도 인식)
+DEFAULT_COMMANDS = {"개행": "\n", "엔터": "\n"}
+ALL_LANGUAGES = "*"
+# API 결과에 글자 그대로 들어 있는 두 글자 '\n'은 줄 구분자로 보고 줄마다 앞뒤 공백과 시작의 '.'을 지움
+LITERAL_NEWLINE = "\\n"
+
+# 후처리 결과: 정리된 텍스트, 바꾼 음성 명령 수, 바꾼 단어 수
+Processed = namedtuple("Processed", ["text", "commands", "replacements"])
+
+
+def trie_pattern(phrases):
+    """
+    문구 목록을 공통 접두사로 묶은 정규식으로 만듭니다 (긴 문구 우선).
+
+    ["개행", "개행문자", "엔터"] → '(?:개행(?:문자)?|엔터)'처럼 글자마다 갈래가 한 번만 나뉘므로
+    문구가 많아도 위치마다 확인하는 양이 거의 늘지 않습니다.
+    """
+    root = {}
+    for phrase in phrases:
+        node = root
+        for ch in phrase:
+            node = node.setdefault(ch, {})
+        node[""] = True
+    return _trie_regex(root)
+
+
+def _trie_regex(node):
+    branches = [re.escape(ch) + _trie_regex(child) for ch, child in sorted(node.items()) if ch]
+    if not branches:
+        return ""
+    if "" in node:
+        return "(?:" + "|".join(branches) + ")?"
+    return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == "_"
+
+
+class TextPostProcessor:
+    """
+    전사 결과 정리 규칙표를 언어별 정규식 하나로 컴파일해 텍스트를 한 번만 훑으며 처리합니다.
+
+    - commands: 음성 명령 → 문자열 (예: {"개행": "\\n", "new paragraph": "\\n\\n"}), 앞뒤 공백도 함께 바꿈.
+      사용자가 추가한 명령은 단어 단위로만 인식합니다 ("center" 안의 "enter"는 명령이 아님).
+    - replacements: 언어 코드("*"는 모든 언어) → {문구: 바꿀 문구}, 단어 단위로만 바꿈
+    같은 위치에서는 긴 문구가 우선이고, 바꾼 결과는 다시 검사하지 않습니다. 대소문자는 구분하지 않습니다.
+    탐색 뒤에 전체 앞뒤 공백과 시작/끝의 '.'을 지우고, 글자 그대로의 '\\n'이 있으면 줄마다 정리합니다.
+    여러 스레드에서 동시에 사용할 수 있습니다.
+    """
+
+    def __init__(self, commands=None, replacements=None):
+        self.commands = {k.lower(): v for k, v in (DEFAULT_COMMANDS if commands is None else commands).items() if k}
+        self.replacements = {language: {k.lower(): v for k, v in table.items() if k}
+                             for language, table in (replacements or {}).items()}
+        self._compiled = {}
+        self._lock = threading.Lock()
+
+    def _rules(self, language):
+        rules = dict(self.replacements.get(ALL_LANGUAGES, {}))
+        if language and language != ALL_LANGUAGES:
+            rules.update(self.replacements.get(language, {}))
+        return rules
+
+    def compile(self, language=None):
+        """
+        언어별 (정규식, 대소문자 무시 정규식, 치환표)를 만들어 둡니다 (같은 언어는 한 번만 컴파일).
+
+        모든 문구를 트라이 정규식 하나로 묶고 소문자로 바꾼 텍스트에서 찾으므로, 정규식이 글자 단위
+        대안으로 시작해 re 모듈이 문구의 첫 글자가 아닌 위치를 빠르게 건너뜁니다.
+        """
+        with self._lock:
+            compiled = self._compiled.get(language)
+        if compiled is not None:
+            return compiled
+        rules = self._rules(language)
+        phrases = set(self.commands) | set(rules)
+        if phrases:
+            source = trie_pattern(sorted(phrases))
+            compiled = (re.compile(source), re.compile(source, re.IGNORECASE), rules)
+        else:
+            compiled = (None, None, rules)
+        with self._lock:
+            self._compiled[language] = compiled
+        return compiled
+
+    def _match_at(self, haystack, start, end, rules):
+        """
+        start에서 시작하는 가장 긴 규칙 (끝, 명령인지), 없으면 None.
+
+        기본 명령(DEFAULT_COMMANDS)은 단어 중간에서도, 사용자 명령과 치환 문구는 단어 경계에서만 인정합니다.
+        """
+        before_ok = start == 0 or not _is_word_char(haystack[start - 1])
+        for stop in range(end, start, -1):
+            key = haystack[start:stop].lower()
+            bounded = before_ok and (stop == len(haystack) or not _is_word_char(haystack[stop]))
+            if key in self.commands and (bounded or key in DEFAULT_COMMANDS):
+                return stop, True
+            if key in rules and bounded:
+                return stop, False
+        return None
+
+    def _scan(self, text, language):
+        pattern, pattern_ci, rules = self.compile(language)
+        if pattern is None:
+            return text, 0, 0
+        haystack = text.lower()
+        if len(haystack) != len(text):
+            # 소문자로 바꾸면 길이가 달라지는 글자가 있으면 원문에서 대소문자를 무시하고 찾음
+            haystack, pattern = text, pattern_ci
+        out = []
+        commands = replacements = 0
+        last = pos = 0
+        length = len(text)
+        while True:
+            match = pattern.search(haystack, pos)
+            if match is None:
+                break
+            start = match.start()
+            found = self._match_at(haystack, start, match.end(), rules)
+            if found is None:
+                pos = start + 1
+                continue
+            end, is_command = found
+            key = haystack[start:end].lower()
+            if is_command:
+                # 명령 앞뒤 공백은 명령과 함께 바꿈
+                out.append(text[last:start].rstrip())
+                out.append(self.commands[key])
+                while end < length and text[end].isspace():
+                    end += 1
+                commands += 1
+            else:
+                out.append(text[last:start])
+                out.append(rules[key])
+                replacements += 1
+            last = pos = end
+        out.append(text[last:])
+        return "".join(out), commands, replacements
+
+    def process(self, text, language=None):
+        """정리한 텍스트와 바꾼 개수를 반환합니다."""
+        if not text:
+            return Processed(text or "", 0, 0)
+        result, commands, replacements = self._scan(text, language)
+
+        # 전체 앞뒤 공백과 시작/끝의 '.' (전사 결과가 말줄임표나 마침표로 시작/끝나는 경우)
+        result = result.strip()
+        if result.startswith("."):
+            result = result[1:]
+        if result.endswith("."):
+            result = result[:-1]
+        result = result.strip()
+
+        # 줄마다 앞뒤 공백과 시작의 '.' 제거 (구분자가 없으면 첫 줄만)
+        lines = result.split(LITERAL_NEWLINE) if LITERAL_NEWLINE in result else [result]
+        for i, line in enumerate(lines):
+            line = line.strip()
+            lines[i] = line[1:].lstrip() if line.startswith(".") else line
+        return Processed(LITERAL_NEWLINE.join(lines), commands, replacements)
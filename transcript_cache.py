@@ -0,0 +1,243 @@
+# transcript_cache.py - 인코딩된 오디오 해시와 요청 파라미터로 찾는 전사 결과 캐시 (SQLite)
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from transcription_backend import TranscriptionBackend
+
+
+DEFAULT_CACHE_PATH = "transcript_cache.sqlite3"
+
+# 캐시 키에 넣지 않는 파라미터 (결과에 영향 없음)
+IGNORED_PARAMS = {"filename", "timeout", "deadline_at"}
+
+
+def audio_digest(audio_bytes):
+    """인코딩된 오디오의 SHA-256 해시"""
+    return hashlib.sha256(audio_bytes).hexdigest()
+
+
+def cache_key(audio_bytes, params, backend=None):
+    """
+    (오디오 해시, 파라미터 JSON)을 반환합니다.
+
+    model, language, prompt, response_format, temperature 등 결과에 영향을 주는 파라미터는 모두 키에 들어가므로
+    같은 오디오라도 언어 설정이 다르면 다시 전사합니다. 파일 이름은 키에 넣지 않습니다.
+    backend(서버 주소)도 키에 넣으므로 base_url을 바꾸면 다른 서버의 결과를 돌려주지 않습니다.
+    """
+    relevant = {k: v for k, v in (params or {}).items() if k not in IGNORED_PARAMS and v is not None}
+    if backend:
+        relevant["backend"] = backend
+    return audio_digest(audio_bytes), json.dumps(relevant, sort_keys=True, ensure_ascii=False)
+
+
+def backend_identity(backend):
+    """캐시 키에 쓰는 백엔드 식별자 (서버 주소, 없으면 백엔드 이름)"""
+    return getattr(backend, "base_url", None) or backend.name
+
+
+class TranscriptCache:
+    """
+    디스크에 유지되는 전사 결과 캐시.
+
+    recordings 폴더의 파일을 다시 전사하거나 붙여넣기 실패 후 다시 시도할 때, 같은 오디오와 파라미터면
+    API를 호출하지 않고 몇 밀리초 안에 저장된 결과를 반환합니다.
+    max_age_days보다 오래된 항목은 지우고, 전체 크기가 max_bytes를 넘으면 가장 오래 쓰이지 않은 항목부터 지웁니다.
+    여러 작업 스레드에서 동시에 사용할 수 있습니다.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=20 * 1024 * 1024, max_age_days=30.0):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_days * 86400.0 if max_age_days else None
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS transcripts (
+                audio_hash TEXT NOT NULL,
+                params TEXT NOT NULL,
+                text TEXT NOT NULL,
+                nbytes INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (audio_hash, params)
+            )""")
+        self._db.execute("CREATE INDEX IF NOT EXISTS transcripts_last_used ON transcripts (last_used)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS transcripts_created_at ON transcripts (created_at)")
+        # 전체 크기는 열 때 한 번만 합산하고 이후 추가/삭제할 때마다 갱신 (저장할 때마다 전체를 훑지 않도록)
+        self._total = self._db.execute("SELECT COALESCE(SUM(nbytes), 0) FROM transcripts").fetchone()[0]
+        self.hit_count = 0
+        self.miss_count = 0
+        self.evicted_count = 0
+        self.evict()
+
+    def get(self, audio_bytes, params, backend=None):
+        """저장된 전사 결과를 반환합니다 (없거나 만료되었으면 None)."""
+        audio_hash, params_json = cache_key(audio_bytes, params, backend)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT text, created_at, nbytes FROM transcripts WHERE audio_hash = ? AND params = ?",
+                (audio_hash, params_json)).fetchone()
+            if row is not None and self.max_age_seconds is not None and now - row[1] > self.max_age_seconds:
+                self._db.execute("DELETE FROM transcripts WHERE audio_hash = ? AND params = ?",
+                                 (audio_hash, params_json))
+                self._total -= row[2]
+                self.evicted_count += 1
+                row = None
+            if row is None:
+                self.miss_count += 1
+                return None
+            self._db.execute(
+                "UPDATE transcripts SET last_used = ?, hits = hits + 1 WHERE audio_hash = ? AND params = ?",
+                (now, audio_hash, params_json))
+            self.hit_count += 1
+            return row[0]
+
+    def put(self, audio_bytes, params, text, backend=None):
+        """전사 결과를 저장하고, 크기 제한을 넘으면 오래 쓰이지 않은 항목을 지웁니다."""
+        if text is None:
+            return
+        audio_hash, params_json = cache_key(audio_bytes, params, backend)
+        nbytes = len(text.encode("utf-8")) + len(audio_hash) + len(params_json)
+        now = time.time()
+        with self._lock:
+            old = self._db.execute("SELECT nbytes FROM transcripts WHERE audio_hash = ? AND params = ?",
+                                   (audio_hash, params_json)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO transcripts (audio_hash, params, text, nbytes, created_at, last_used, hits) "
+                "VALUES (?, ?, ?, ?, ?, ?, 0)",
+                (audio_hash, params_json, text, nbytes, now, now))
+            self._total += nbytes - (old[0] if old else 0)
+            self._evict_locked(now)
+
+    def evict(self):
+        """만료된 항목과 크기 제한을 넘는 항목을 지우고 지운 개수를 반환합니다."""
+        with self._lock:
+            return self._evict_locked(time.time())
+
+    def _evict_locked(self, now):
+        removed = 0
+        if self.max_age_seconds is not None:
+            cutoff = now - self.max_age_seconds
+            # created_at 색인으로 만료된 항목만 읽음
+            expired = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(nbytes), 0) FROM transcripts WHERE created_at < ?",
+                (cutoff,)).fetchone()
+            if expired[0]:
+                removed += self._db.execute("DELETE FROM transcripts WHERE created_at < ?", (cutoff,)).rowcount
+                self._total -= expired[1]
+        if self.max_bytes and self._total > self.max_bytes:
+            # 가장 오래 쓰이지 않은 항목부터 합계가 제한 아래로 내려갈 때까지 지움
+            victims = []
+            for rowid, nbytes in self._db.execute("SELECT rowid, nbytes FROM transcripts ORDER BY last_used"):
+                if self._total <= self.max_bytes:
+                    break
+                victims.append((rowid,))
+                self._total -= nbytes
+            self._db.executemany("DELETE FROM transcripts WHERE rowid = ?", victims)
+            removed += len(victims)
+        self.evicted_count += removed
+        return removed
+
+    def stats(self):
+        """항목 수, 전체 크기, 적중/실패/삭제 횟수"""
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM transcripts").fetchone()[0]
+            total = self._total
+        return {"entries": entries, "bytes": total, "hits": self.hit_count,
+                "misses": self.miss_count, "evicted": self.evicted_count}
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM transcripts")
+            self._total = 0
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class CachedBackend(TranscriptionBackend):
+    """
+    네트워크 요청 전에 TranscriptCache를 확인하는 전사 백엔드 래퍼.
+
+    캐시 읽기/쓰기 오류는 기록만 하고 원래 백엔드로 전사하므로, 캐시 파일이 손상되어도 전사는 계속됩니다.
+    last_hit()으로 이 스레드의 마지막 전사가 캐시에서 왔는지 확인할 수 있습니다.
+    """
+
+    name = "cached"
+
+    def __init__(self, backend, cache):
+        self.backend = backend
+        self.cache = cache
+        self.identity = backend_identity(backend)
+        self._local = threading.local()
+
+    @property
+    def api_key(self):
+        return getattr(self.backend, "api_key", None)
+
+    def last_hit(self):
+        """이 스레드에서 마지막으로 실행한 transcribe()가 캐시 적중이었는지"""
+        return getattr(self._local, "hit", False)
+
+    def _lookup(self, audio_bytes, params):
+        try:
+            return self.cache.get(audio_bytes, params, self.identity)
+        except Exception as e:
+            logging.warning(f"전사 캐시 읽기 오류: {str(e)}")
+            return None
+
+    def _store(self, audio_bytes, params, text):
+        try:
+            self.cache.put(audio_bytes, params, text, self.identity)
+        except Exception as e:
+            logging.warning(f"전사 캐시 저장 오류: {str(e)}")
+
+    def transcribe(self, audio_bytes, params):
+        text = self._lookup(audio_bytes, params)
+        self._local.hit = text is not None
+        if text is not None:
+            return text
+        text = self.backend.transcribe(audio_bytes, params)
+        self._store(audio_bytes, params, text)
+        return text
+
+    def transcribe_with_language(self, audio_bytes, params):
+        """캐시에서 가져온 결과는 감지된 언어를 알 수 없으므로 언어는 None입니다."""
+        text = self._lookup(audio_bytes, params)
+        self._local.hit = text is not None
+        if text is not None:
+            return text, None
+        text, language = self.backend.transcribe_with_language(audio_bytes, params)
+        self._store(audio_bytes, params, text)
+        return text, language
+
+    async def transcribe_async(self, audio_bytes, params):
+        text = self._lookup(audio_bytes, params)
+        if text is not None:
+            return text
+        text = await self.backend.transcribe_async(audio_bytes, params)
+        self._store(audio_bytes, params, text)
+        return text
+
+    def prewarm(self):
+        return self.backend.prewarm()
+
+    def close(self):
+        self.backend.close()
+
+    async def aclose(self):
+        await self.backend.aclose()
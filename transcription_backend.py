@@ -0,0 +1,162 @@
+# transcription_backend.py - 전사 백엔드 인터페이스와 OpenAI Whisper 구현
+
+import asyncio
+import logging
+import time
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import openai
+except ImportError:
+    openai = None
+
+from api_client import WhisperClient, DEFAULT_MODEL
+from request_policy import DeadlineExceeded, is_retryable
+
+
+class TranscriptionBackend:
+    """
+    전사 백엔드 인터페이스.
+
+    transcribe(audio_bytes, params)는 인코딩된 오디오와 API 파라미터(model, language, filename 등)를
+    받아 텍스트를 반환합니다. params의 deadline_at은 녹음의 절대 기한(time.monotonic 기준)으로 API에는 보내지 않습니다. transcribe_async는 기본적으로 스레드 풀에서 transcribe를 실행하며,
+    비동기 클라이언트가 있는 백엔드는 직접 구현합니다.
+    """
+
+    name = "base"
+
+    def transcribe(self, audio_bytes, params):
+        raise NotImplementedError
+
+    def transcribe_with_language(self, audio_bytes, params):
+        """(텍스트, 감지된 언어)를 반환합니다. 언어를 알 수 없는 백엔드는 None을 돌려줍니다."""
+        return self.transcribe(audio_bytes, params), None
+
+    async def transcribe_async(self, audio_bytes, params):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.transcribe, audio_bytes, params)
+
+    def prewarm(self):
+        """녹음을 시작할 때 연결을 미리 엽니다 (필요한 백엔드만 구현)."""
+        return False
+
+    def close(self):
+        pass
+
+    async def aclose(self):
+        self.close()
+
+
+def split_params(params):
+    """API 파라미터에서 업로드 파일 이름, 모델, 녹음 기한을 분리합니다."""
+    params = dict(params or {})
+    filename = params.pop("filename", "audio.flac")
+    model = params.pop("model", DEFAULT_MODEL)
+    deadline_at = params.pop("deadline_at", None)
+    return filename, model, deadline_at, params
+
+
+class OpenAIBackend(TranscriptionBackend):
+    """
+    OpenAI /v1/audio/transcriptions 백엔드 (base_url을 바꾸면 호환 서버나 로컬 대역 서버에도 사용 가능).
+
+    동기 호출은 연결을 유지하는 WhisperClient와 RequestPolicy(재시도, 중복 요청, 기한)를 사용하고,
+    비동기 호출은 openai.AsyncOpenAI로 같은 재시도/기한 규칙을 적용합니다 (중복 요청 없음).
+    """
+
+    name = "openai"
+
+    def __init__(self, api_key, base_url=None, policy=None, **client_options):
+        self.api_key = api_key
+        self.policy = policy
+        self.client = WhisperClient(api_key, base_url=base_url, **client_options)
+        self._client_options = client_options
+        self._async_client = None
+
+    @property
+    def base_url(self):
+        return self.client.base_url
+
+    def transcribe(self, audio_bytes, params):
+        filename, model, deadline_at, params = split_params(params)
+        if self.policy is None:
+            return self.client.transcribe(audio_bytes, filename, model=model, **params)
+        return self.policy.call(
+            lambda timeout: self.client.transcribe(audio_bytes, filename, model=model, timeout=timeout, **params),
+            deadline_at=deadline_at, nbytes=len(audio_bytes), label=filename)
+
+    def transcribe_with_language(self, audio_bytes, params):
+        """verbose_json 응답으로 감지된 언어 이름(예: 'korean')도 함께 반환합니다."""
+        filename, model, deadline_at, params = split_params(params)
+        if self.policy is None:
+            return self.client.transcribe_verbose(audio_bytes, filename, model=model, **params)
+        return self.policy.call(
+            lambda timeout: self.client.transcribe_verbose(audio_bytes, filename, model=model, timeout=timeout,
+                                                           **params),
+            deadline_at=deadline_at, nbytes=len(audio_bytes), label=filename)
+
+    def _get_async_client(self):
+        if self._async_client is None:
+            options = self._client_options
+            http = httpx.AsyncClient(
+                timeout=httpx.Timeout(connect=options.get("connect_timeout", 5.0),
+                                      read=options.get("read_timeout", 60.0),
+                                      write=options.get("write_timeout", 30.0),
+                                      pool=options.get("pool_timeout", 5.0)),
+                limits=httpx.Limits(max_connections=options.get("max_connections", 8),
+                                    keepalive_expiry=options.get("keepalive_expiry", 90.0)),
+                verify=options.get("verify", True),
+            )
+            self._async_client = openai.AsyncOpenAI(api_key=self.api_key, base_url=self.base_url,
+                                                    http_client=http, max_retries=0)
+        return self._async_client
+
+    async def transcribe_async(self, audio_bytes, params):
+        filename, model, deadline_at, params = split_params(params)
+        client = self._get_async_client()
+        policy = self.policy
+        max_attempts = policy.max_attempts if policy else 1
+        if deadline_at is None and policy is not None:
+            deadline_at = time.monotonic() + policy.deadline_for(len(audio_bytes))
+
+        attempt = 0
+        while True:
+            attempt += 1
+            remaining = None if deadline_at is None else deadline_at - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise DeadlineExceeded(f"{filename}: 녹음 기한 안에 응답이 없습니다 ({attempt - 1}회 시도)")
+            try:
+                start = time.monotonic()
+                result = await asyncio.wait_for(
+                    client.audio.transcriptions.create(file=(filename, audio_bytes), model=model, **params),
+                    timeout=remaining)
+                if policy is not None:
+                    policy.record_latency(time.monotonic() - start, len(audio_bytes))
+                return result.text
+            except asyncio.TimeoutError:
+                raise DeadlineExceeded(f"{filename}: 녹음 기한 안에 응답이 없습니다 ({attempt}회 시도)")
+            except Exception as e:
+                if attempt >= max_attempts or not is_retryable(e):
+                    raise
+                delay = policy.backoff(attempt, e)
+                if deadline_at is not None and time.monotonic() + delay >= deadline_at:
+                    raise DeadlineExceeded(f"{filename}: 재시도 전에 기한을 넘깁니다 ({attempt}회 시도): {str(e)}")
+                logging.warning(f"{filename}: {attempt}번째 요청 실패, {delay * 1000:.0f}ms 후 재시도: {str(e)}")
+                await asyncio.sleep(delay)
+
+    def prewarm(self):
+        return self.client.prewarm()
+
+    def close(self):
+        self.client.close()
+
+    async def aclose(self):
+        """비동기 클라이언트는 만든 이벤트 루프에서 닫아야 합니다."""
+        self.close()
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
@@ -0,0 +1,196 @@
+# transcription_pipeline.py - 녹음 종료 후 처리(인코딩→업로드→후처리→붙여넣기)를 맡는 작업 대기열
+
+import itertools
+import logging
+import queue
+import threading
+import time
+
+
+class TakeSession:
+    """
+    녹음 한 건의 상태 (버퍼, 입력 스트림, 인코더, 구간 전사, 결과).
+
+    녹음마다 새 세션을 만들므로 이전 녹음이 전사 중이어도 다음 녹음은 자기 버퍼에 기록합니다.
+    녹음이 끝나면 Tk 스레드는 세션을 대기열에 넣기만 하고, 이후 처리는 모두 작업 스레드에서 진행됩니다.
+    타이밍은 time.perf_counter() 기준입니다.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, buffer, encoder=None, segmenter=None, stream=None, resampler=None, timeline=None, **extra):
+        self.id = next(self._ids)
+        self.buffer = buffer
+        self.encoder = encoder
+        self.segmenter = segmenter
+        self.stream = stream            # 항상 대기 모드에서는 None (공유 스트림 사용)
+        self.resampler = resampler
+        self.timeline = timeline        # 단계별 시각 (latency_metrics.TakeTimeline)
+        self.extra = extra
+        self.seq = None                 # 대기열에 들어간 순서 (붙여넣기 순서)
+        self.text = None
+        self.error = None
+        self.created_at = time.perf_counter()
+        self.queued_at = None
+        self.started_at = None
+        self.finished_at = None
+        self.delivered_at = None
+        self.done = threading.Event()   # 붙여넣기까지 끝나면 설정
+
+    def mark(self, stage, at=None):
+        """단계 시각을 기록합니다 (timeline이 없으면 무시)."""
+        if self.timeline is not None:
+            self.timeline.mark(stage, at)
+
+    def abort(self):
+        """처리하지 않고 버릴 때 인코더와 구간 전사를 정리합니다."""
+        if self.encoder is not None:
+            self.encoder.abort()
+        if self.segmenter is not None:
+            self.segmenter.abort()
+
+    @property
+    def wait_ms(self):
+        """대기열에서 기다린 시간"""
+        if self.started_at is None:
+            return None
+        return (self.started_at - self.queued_at) * 1000.0
+
+    @property
+    def run_ms(self):
+        """처리에 걸린 시간"""
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return (self.finished_at - self.started_at) * 1000.0
+
+    @property
+    def hold_ms(self):
+        """처리가 끝난 뒤 앞선 녹음의 붙여넣기를 기다린 시간"""
+        if self.finished_at is None or self.delivered_at is None:
+            return None
+        return (self.delivered_at - self.finished_at) * 1000.0
+
+
+class TranscriptionPipeline:
+    """
+    녹음 처리 작업 대기열.
+
+    process(session)은 작업 스레드(workers개)에서 동시에 호출되며 인코딩, API 호출, 텍스트 정리를 맡고
+    텍스트를 반환합니다. deliver(session)은 붙여넣기 스레드 하나에서 녹음 순서대로 호출되므로,
+    뒤 녹음의 전사가 먼저 끝나도 텍스트는 항상 말한 순서대로 입력됩니다.
+    completed(session)은 실패한 세션을 포함해 모든 세션의 붙여넣기 단계가 끝난 뒤 같은 스레드에서 호출됩니다.
+    submit()은 즉시 반환하므로 Tk 스레드와 단축키 처리가 API 응답을 기다리지 않습니다.
+    """
+
+    def __init__(self, process, deliver=None, workers=1, name="TranscriptionPipeline", completed=None):
+        self.process = process
+        self.deliver = deliver
+        self.completed = completed
+        self.workers = max(1, int(workers))
+        self.name = name
+        self._queue = queue.Queue()
+        self._threads = []
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        self._next_seq = 0              # 다음에 대기열에 넣을 순서 번호
+        self._next_delivery = 0         # 다음에 붙여넣을 순서 번호
+        self._finished = {}             # 처리는 끝났지만 아직 붙여넣지 않은 세션 (순서 번호 → 세션)
+        self._active = 0
+        self.completed_count = 0
+        self.failed_count = 0
+
+    def start(self):
+        with self._lock:
+            if not self._threads:
+                for i in range(self.workers):
+                    thread = threading.Thread(target=self._run, name=f"{self.name}-{i}", daemon=True)
+                    thread.start()
+                    self._threads.append(thread)
+                thread = threading.Thread(target=self._deliver_loop, name=f"{self.name}-deliver", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        return self
+
+    def submit(self, session):
+        """세션을 대기열에 넣고 바로 반환합니다."""
+        self.start()
+        with self._lock:
+            session.seq = self._next_seq
+            self._next_seq += 1
+            self._active += 1
+            pending = self._active
+        session.queued_at = time.perf_counter()
+        self._queue.put(session)
+        logging.info(f"녹음 #{session.id} 처리 대기열 추가 (대기 {pending}건)")
+        return session
+
+    @property
+    def pending(self):
+        """대기 중이거나 처리 중, 붙여넣기 대기 중인 세션 수"""
+        with self._lock:
+            return self._active
+
+    def _run(self):
+        while True:
+            session = self._queue.get()
+            if session is None:
+                return
+            session.started_at = time.perf_counter()
+            try:
+                session.text = self.process(session)
+            except Exception as e:
+                session.error = e
+                logging.error(f"녹음 #{session.id} 처리 오류: {str(e)}")
+                session.abort()
+            finally:
+                session.finished_at = time.perf_counter()
+                logging.info(f"녹음 #{session.id} 처리 완료: 대기 {session.wait_ms:.0f}ms, 처리 {session.run_ms:.0f}ms")
+                with self._ready:
+                    self._finished[session.seq] = session
+                    self._ready.notify_all()
+
+    def _deliver_loop(self):
+        while True:
+            with self._ready:
+                while self._next_delivery not in self._finished:
+                    self._ready.wait()
+                session = self._finished.pop(self._next_delivery)
+            # 실패한 녹음도 순서를 지키며 넘어가야 뒤 녹음이 막히지 않음
+            try:
+                if self.deliver is not None and session.error is None:
+                    self.deliver(session)
+            except Exception as e:
+                session.error = e
+                logging.error(f"녹음 #{session.id} 붙여넣기 오류: {str(e)}")
+            finally:
+                session.delivered_at = time.perf_counter()
+                if self.completed is not None:
+                    try:
+                        self.completed(session)
+                    except Exception as e:
+                        logging.error(f"녹음 #{session.id} 완료 처리 오류: {str(e)}")
+                with self._ready:
+                    self._next_delivery += 1
+                    self._active -= 1
+                    if session.error is None:
+                        self.completed_count += 1
+                    else:
+                        self.failed_count += 1
+                    self._ready.notify_all()
+                session.done.set()
+
+    def flush(self, timeout=None):
+        """대기 중인 세션이 모두 붙여넣기까지 끝날 때까지 기다립니다 (프로그램 종료 시 사용)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._ready:
+            while self._active:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._ready.wait(remaining)
+        return True
+
+    def stop(self):
+        """작업 스레드를 종료합니다 (남은 세션은 flush()로 먼저 처리)."""
+        for _ in range(self.workers):
+            self._queue.put(None)
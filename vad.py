@@ -0,0 +1,113 @@
+# vad.py - 음성 구간 검출 (프레임 에너지 + 영교차율)
+
+from collections import namedtuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+FRAME_MS = 30             # 분석 프레임 길이
+PADDING_MS = 200          # 음성 구간 앞뒤로 남겨 둘 여유
+MIN_SPEECH_MS = 150       # 이보다 음성 프레임이 적으면 음성이 없는 녹음으로 판단
+MARGIN_DB = 9.0           # 잡음 바닥보다 이만큼 커야 음성으로 판단
+THRESHOLD_FLOOR_DB = -50.0  # 임계값 하한 (아주 조용한 환경)
+THRESHOLD_CEIL_DB = -30.0   # 임계값 상한 (녹음 전체가 음성일 때도 큰 소리는 음성으로 판단)
+MIN_SPREAD_DB = 6.0         # 프레임 레벨의 10~90번째 백분위 차이가 이보다 작으면 잡음 바닥을 구할 수 없는 고른 녹음
+SPEECH_LEVEL_DB = -40.0     # 고른 녹음에 쓰는 고정 임계값 (조용한 음성만 계속된 짧은 녹음도 음성으로 판단)
+
+# 검출 결과: start/end는 샘플 단위(end 미포함), speech_ms는 음성으로 판단된 길이
+SpeechRegion = namedtuple("SpeechRegion", ["has_speech", "start", "end", "speech_ms"])
+
+
+def frame_features(audio, samplerate, frame_ms=FRAME_MS):
+    """프레임별 RMS 레벨(dBFS)과 영교차율을 한 번에 계산합니다."""
+    x = np.asarray(audio)
+    if x.ndim > 1:
+        x = x[:, 0]
+    if np.issubdtype(x.dtype, np.integer):
+        x = x.astype(np.float32) / float(np.iinfo(x.dtype).max + 1)
+    else:
+        x = x.astype(np.float32, copy=False)
+
+    frame_len = max(2, int(samplerate * frame_ms / 1000))
+    n_frames = len(x) // frame_len
+    frames = x[:n_frames * frame_len].reshape(n_frames, frame_len)
+
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    level_db = 20.0 * np.log10(rms + 1e-10)
+
+    signs = np.signbit(frames)
+    zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / float(frame_len - 1)
+    return level_db, zcr, frame_len
+
+
+def adaptive_threshold(level_db):
+    """
+    프레임 레벨에서 음성 임계값(dBFS)을 구합니다 (잡음 바닥 + MARGIN_DB).
+
+    무음 프레임이 거의 없는 녹음(처음부터 끝까지 조용히 말함)은 10번째 백분위가 음성 자체가 되어
+    음성을 잡음으로 판단하므로, 레벨 차이가 MIN_SPREAD_DB보다 작으면 고정 임계값을 씁니다.
+    """
+    if len(level_db) == 0:
+        return SPEECH_LEVEL_DB
+    noise_floor, loud = np.percentile(level_db, [10, 90])
+    if loud - noise_floor < MIN_SPREAD_DB:
+        return SPEECH_LEVEL_DB
+    return float(np.clip(noise_floor + MARGIN_DB, THRESHOLD_FLOOR_DB, THRESHOLD_CEIL_DB))
+
+
+def speech_mask(level_db, zcr, threshold=None):
+    """프레임별 음성 여부 (threshold가 없으면 이 프레임들로 구한 적응형 임계값)"""
+    if len(level_db) == 0:
+        return np.zeros(0, dtype=bool)
+    if threshold is None:
+        threshold = adaptive_threshold(level_db)
+
+    voiced = level_db > threshold
+    # 무성 자음(ㅅ, s, f 등)은 에너지가 낮고 영교차율이 높으므로 조금 낮은 임계값 허용
+    unvoiced = (level_db > threshold - 6.0) & (zcr > 0.1) & (zcr < 0.5)
+    mask = voiced | unvoiced
+
+    # 3프레임 다수결로 짧은 클릭 잡음 제거
+    if len(mask) >= 3:
+        mask = np.convolve(mask.astype(np.int8), np.ones(3, dtype=np.int8), mode="same") >= 2
+    return mask
+
+
+def detect_speech(audio, samplerate, padding_ms=PADDING_MS, min_speech_ms=MIN_SPEECH_MS, threshold=None):
+    """녹음에서 음성 구간(앞뒤 무음 제외)을 찾습니다."""
+    level_db, zcr, frame_len = frame_features(audio, samplerate)
+    mask = speech_mask(level_db, zcr, threshold)
+    speech_frames = int(np.count_nonzero(mask))
+    speech_ms = speech_frames * frame_len * 1000.0 / samplerate
+
+    if speech_ms < min_speech_ms:
+        return SpeechRegion(False, 0, 0, speech_ms)
+
+    indices = np.flatnonzero(mask)
+    padding = int(samplerate * padding_ms / 1000)
+    start = max(0, indices[0] * frame_len - padding)
+    end = min(len(audio), (indices[-1] + 1) * frame_len + padding)
+    return SpeechRegion(True, int(start), int(end), speech_ms)
+
+
+
+def speech_tail_end(audio, samplerate, threshold, padding_ms=PADDING_MS):
+    """
+    녹음 끝부분에서 남길 길이(샘플): 마지막 음성 프레임 뒤 padding까지, 음성이 없으면 padding만.
+
+    threshold는 녹음 전체에서 구한 값을 넘깁니다. 끝부분만으로 잡음 바닥을 구하면 종료 순간까지 조용히 말한
+    구간이 스스로의 잡음 바닥이 되어 잘리므로, THRESHOLD_FLOOR_DB보다 큰 프레임은 임계값과 관계없이 남깁니다.
+    """
+    level_db, zcr, frame_len = frame_features(audio, samplerate)
+    mask = speech_mask(level_db, zcr, threshold) | (level_db > THRESHOLD_FLOOR_DB)
+    padding = int(samplerate * padding_ms / 1000)
+    indices = np.flatnonzero(mask)
+    if len(indices) == 0:
+        return min(len(audio), padding)
+    if indices[-1] == len(mask) - 1:
+        # 마지막 프레임까지 음성이면 프레임에 못 미치는 나머지 샘플까지 모두
+        return len(audio)
+    return min(len(audio), int((indices[-1] + 1) * frame_len + padding))
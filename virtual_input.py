@@ -0,0 +1,180 @@
+# virtual_input.py - 사람이 말하지 않아도 녹음 경로를 시험할 수 있는 가상 마이크 (sounddevice 호환 일부)
+
+import logging
+import threading
+import time
+from collections import deque
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import soundfile
+except ImportError:
+    soundfile = None
+
+from resample import resample
+
+
+def load_clip(path):
+    """WAV/FLAC 파일을 int16 (프레임, 채널) 배열과 샘플링 레이트로 읽습니다."""
+    audio, samplerate = soundfile.read(path, dtype="int16", always_2d=True)
+    return audio, samplerate
+
+
+class _Default:
+    def __init__(self):
+        self.device = [0, None]
+        self.samplerate = None
+
+
+class VirtualInputStream:
+    """
+    sounddevice.InputStream처럼 동작하는 가상 입력 스트림.
+
+    start()하면 스레드가 blocksize 프레임씩 장치의 재생 대기열(말할 오디오, 없으면 약한 잡음)을 꺼내
+    callback(indata, frames, time_info, status)을 호출합니다. speed가 1이면 실제 시간과 같은 속도로,
+    2면 두 배 빠르게 전달하며, 블록마다 절대 시각에 맞춰 기다리므로 누적 오차가 생기지 않습니다.
+    """
+
+    def __init__(self, device_model, device=None, samplerate=None, channels=1, dtype="int16",
+                 callback=None, blocksize=0, **kwargs):
+        self._model = device_model
+        self.device = device
+        self.samplerate = float(samplerate or device_model.samplerate)
+        if int(self.samplerate) not in device_model.supported_rates:
+            raise ValueError(f"Invalid sample rate: {self.samplerate:g}")
+        self.channels = channels
+        self.dtype = dtype
+        self.callback = callback
+        self.blocksize = blocksize or int(self.samplerate * device_model.block_ms / 1000)
+        self.latency = device_model.block_ms / 1000.0
+        self._stop = threading.Event()
+        self._thread = None
+        self.block_count = 0
+
+    @property
+    def active(self):
+        return self._thread is not None and self._thread.is_alive() and not self._stop.is_set()
+
+    def start(self):
+        if self._model.start_delay_ms:
+            time.sleep(self._model.start_delay_ms / 1000.0)   # 장치를 여는 데 걸리는 시간 흉내
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="VirtualInputStream", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        period = self.blocksize / self.samplerate / self._model.speed
+        next_at = time.perf_counter() + period
+        while not self._stop.is_set():
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            next_at += period
+            block = self._model.read(self.blocksize, int(self.samplerate), self.channels)
+            try:
+                self.callback(block, self.blocksize, None, None)
+            except Exception as e:
+                logging.error(f"가상 입력 콜백 오류: {str(e)}")
+            self.block_count += 1
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def close(self):
+        self.stop()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class VirtualSoundDevice:
+    """
+    가상 마이크 하나를 가진 sounddevice 대역 (InputStream, query_devices, query_hostapis, default).
+
+    say(audio, samplerate)로 넣은 오디오를 장치 레이트로 변환해 차례대로 재생하며,
+    재생할 오디오가 없을 때는 noise_level 크기의 잡음을 보냅니다.
+    스트림을 장치 레이트가 아닌 레이트로 열면 블록마다 변환하므로 블록 경계에 약간의 왜곡이 생깁니다.
+    """
+
+    def __init__(self, samplerate=48000, speed=1.0, block_ms=10, noise_level=30, start_delay_ms=0.0,
+                 supported_rates=(16000, 22050, 44100, 48000), name="Virtual Microphone", seed=0):
+        if np is None:
+            raise RuntimeError("VirtualSoundDevice를 사용하려면 numpy가 필요합니다.")
+        self.samplerate = samplerate
+        self.speed = speed
+        self.block_ms = block_ms
+        self.noise_level = noise_level
+        self.start_delay_ms = start_delay_ms
+        self.supported_rates = set(supported_rates) | {samplerate}
+        self.name = name
+        self.default = _Default()
+        self._rng = np.random.default_rng(seed)
+        self._queue = deque()           # (장치 레이트 오디오, 재생 위치 목록, 끝나면 설정할 Event)
+        self._lock = threading.Lock()
+
+    # sounddevice 호환
+    def InputStream(self, **kwargs):
+        return VirtualInputStream(self, **kwargs)
+
+    def query_devices(self, device=None, kind=None):
+        info = {"name": self.name, "index": 0, "hostapi": 0, "max_input_channels": 1,
+                "max_output_channels": 0, "default_samplerate": float(self.samplerate),
+                "default_low_input_latency": self.block_ms / 1000.0,
+                "default_high_input_latency": self.block_ms / 1000.0}
+        if device is not None or kind == "input":
+            return info
+        return [info]
+
+    def query_hostapis(self):
+        return [{"name": "Virtual", "devices": [0], "default_input_device": 0, "default_output_device": -1}]
+
+    # 재생
+    def say(self, audio, samplerate):
+        """오디오를 재생 대기열에 넣고, 마이크로 모두 전달되면 설정되는 Event를 반환합니다."""
+        audio = np.asarray(audio)
+        if audio.ndim == 1:
+            audio = audio[:, None]
+        if audio.shape[1] > 1:
+            audio = np.round(audio.mean(axis=1, keepdims=True)).astype(np.int16)
+        if samplerate != self.samplerate:
+            audio = resample(audio.astype(np.int16), samplerate, self.samplerate)
+        done = threading.Event()
+        with self._lock:
+            self._queue.append([audio.astype(np.int16), 0, done])
+        return done
+
+    def say_file(self, path):
+        audio, samplerate = load_clip(path)
+        return self.say(audio, samplerate)
+
+    def read(self, frames, samplerate, channels):
+        """입력 스트림 한 블록 (스트림 레이트가 장치 레이트와 다르면 블록 단위로 변환)"""
+        need = frames if samplerate == self.samplerate else int(round(frames * self.samplerate / samplerate))
+        block = self._rng.normal(0, self.noise_level, size=(need, 1)).astype(np.int16) \
+            if self.noise_level else np.zeros((need, 1), dtype=np.int16)
+        filled = 0
+        with self._lock:
+            while filled < need and self._queue:
+                item = self._queue[0]
+                audio, pos, done = item
+                n = min(need - filled, len(audio) - pos)
+                block[filled:filled + n] = audio[pos:pos + n]
+                filled += n
+                item[1] = pos + n
+                if item[1] >= len(audio):
+                    self._queue.popleft()
+                    done.set()
+        if need != frames:
+            block = resample(block, self.samplerate, samplerate)
+            block = np.pad(block, ((0, max(0, frames - len(block))), (0, 0)))[:frames]
+        return np.repeat(block, channels, axis=1) if channels > 1 else block
@@ -14,12 +14,35 @@ import json
 import tkinter as tk
 from tkinter import messagebox
 import logging
+import atexit
 import socket
-import winsound  # winsound import 추가 확인 (이미 상단에 있을 수 있음)
-import re # 정규식 모듈 임포트
+try:
+    import winsound  # winsound import 추가 확인 (이미 상단에 있을 수 있음)
+except ImportError:
+    winsound = None  # Windows가 아닌 환경 (benchmark.py e2e에서 모듈로 불러올 때)
+import io
 
 # 메시지 모듈 가져오기
 from messages import messages, get_message
+from audio_buffer import CaptureBuffer, PreRollRing
+from device_registry import DeviceRegistry
+from audio_encoder import StreamingEncoder
+from segmented_transcriber import SegmentedTranscriber
+from recording_archive import RecordingArchiver
+from audio_codecs import CodecSelector
+from resample import StreamingResampler
+from transcription_pipeline import TakeSession, TranscriptionPipeline
+from transcription_backend import OpenAIBackend
+from request_policy import RequestPolicy, DeadlineExceeded
+from transcript_cache import TranscriptCache, CachedBackend
+from latency_metrics import TakeTimeline, LatencyRecorder, latency_fields
+from language_prior import LanguagePrior, foreground_app, language_code, DEFAULT_PRIOR_PATH
+from audio_chunker import ChunkedTranscriber, MAX_UPLOAD_BYTES
+from text_postprocess import TextPostProcessor, DEFAULT_COMMANDS
+from text_injection import TextInjector, ClipboardPasteStrategy, UnicodeTypingStrategy
+from async_log import AsyncLogWriter, CallbackProblemLog, QueueLogHandler, console_line
+from log_retention import LogCompactor
+from session_events import SessionEventLog
 
 # 언어 설정 (기본값: 한국어)
 current_language = "ko"  # "ko" 또는 "en"
@@ -29,8 +52,7 @@ api_key_shortcut = False
 
 # 전역 변수
 recording = False
-audio_data = []
-stream = None
+current_take = None     # 현재 녹음의 TakeSession (버퍼, 입력 스트림, 인코더, 구간 전사)
 force_clipboard = False
 ctrl_pressed = False
 shift_pressed = False
@@ -38,14 +60,114 @@ alt_pressed = False
 recording_started_with_combo = False
 selected_device = None  # 선택된 마이크 장치
 default_device = None   # 기본 마이크 장치
+selected_device_key = None # 선택된 마이크의 (이름, 호스트 API) - 장치 번호가 바뀌어도 다시 찾기 위함
+device_registry = None  # 오디오 장치 목록 캐시 (DeviceRegistry)
 root = None             # Tk 창
 status_label = None     # 상태 표시 레이블
 tray_icon = None        # 트레이 아이콘
 console_log_file = None # 콘솔 로그 파일
+log_writer = None       # AsyncLogWriter (콘솔 로그와 로그 파일을 백그라운드 스레드에서 기록)
+log_compactor = None    # LogCompactor (다 쓴 로그 압축, 오래된 로그 삭제)
+session_event_compactor = None  # LogCompactor (다 쓴 세션 이벤트 파일)
+
+# 로그 회전/보관 (설정 파일 logging.*)
+# logs/의 로그 파일은 log_max_file_mb 또는 log_rotate_hours마다 새 파일로 넘어가고, 다 쓴 파일은 gzip으로 압축되며
+# log_keep_days보다 오래되었거나 전체가 log_max_total_mb를 넘으면 오래된 것부터 지움
+# 콘솔 로그(whisperer_console.log)는 console_log_max_kb를 넘으면 whisperer_console.log.1로 옮기고 비움
+log_max_file_mb = 10
+log_rotate_hours = 24
+log_keep_days = 14
+log_max_total_mb = 200
+console_log_max_kb = 1024
+
+# 녹음마다 구조화된 이벤트 한 줄 (logs/sessions/*.jsonl, 설정 파일 logging.session_events)
+# python session_events.py로 여러 PC에서 모은 기록의 백분위/오류율을 볼 수 있음
+# 꺼도 단계별 지연 기록(latency_metrics.latency_fields)은 같은 파일에 남김
+session_events_enabled = True
+session_event_log = None    # SessionEventLog
 api_key = None          # OpenAI API 키
 keyboard_listener = None # 키보드 리스너
 pynput_initialized = False # Pynput 초기화 여부
 
+# 항상 대기(armed) 모드: 입력 스트림을 열어 두고 프리롤을 유지해 첫 음절이 잘리지 않게 함
+armed_mode = False       # 항상 대기 모드 사용 여부 (설정 파일 audio.armed_mode)
+preroll_ms = 300         # 프리롤 길이 (밀리초, 설정 파일 audio.preroll_ms)
+armed_stream = None      # 계속 열려 있는 입력 스트림
+preroll_buffer = None    # 프리롤 링 버퍼
+armed_capture = None     # 녹음 중 콜백이 기록할 CaptureBuffer
+armed_request = None     # 다음 콜백에서 녹음을 시작할 CaptureBuffer
+armed_lock = threading.Lock()  # 콜백과 녹음 시작/종료 사이의 상태 전환 보호
+hotkey_pressed_at = None # 녹음 단축키가 눌린 시각 (time.perf_counter)
+capture_latency_ms = None # 단축키→첫 샘플 지연 (음수면 프리롤이 단축키 이전 소리까지 포함)
+callback_problems = None # CallbackProblemLog (녹음 콜백은 문제를 세기만 하고 로그는 다른 스레드에서 기록)
+
+# 녹음 샘플링 레이트: 장치 기본 레이트로 녹음하고 16kHz로 직접 리샘플링 (설정 파일 audio.native_rate_capture)
+TARGET_SAMPLERATE = 16000   # OpenAI Whisper에 적합한 샘플링 레이트
+native_rate_capture = True
+armed_resampler = None      # 항상 대기 스트림의 StreamingResampler
+
+# 음성 구간 검출 (업로드 전 앞뒤 무음 제거, 음성 없는 녹음은 API 호출 생략)
+vad_enabled = True          # 설정 파일 audio.vad_enabled
+min_recording_seconds = 0.5 # 이보다 짧은 녹음은 실수로 누른 단축키로 보고 무시 (audio.min_recording_seconds)
+recording_archiver = None   # 녹음 파일을 백그라운드에서 저장하는 RecordingArchiver
+
+# 스트리밍 전사: 녹음 중 쉼에서 잘라 완성된 구간을 먼저 전송 (긴 받아쓰기용, 설정 파일 transcription.streaming_mode)
+streaming_mode = False
+
+# 업로드 코덱: "auto"(최근 업로드 처리량으로 flac/vorbis/opus 중 자동 선택), "flac", "flac_low", "vorbis", "opus"
+# (transcription.codec)
+upload_codec = "auto"
+codec_selector = None       # CodecSelector
+
+# 녹음 처리 작업 대기열: 녹음 종료 후 인코딩→업로드→후처리→붙여넣기를 Tk 스레드 밖에서 처리
+# 연속으로 말한 녹음은 동시에 전사하고 붙여넣기는 녹음 순서대로 (transcription.max_parallel_takes)
+max_parallel_takes = 3
+transcription_pipeline = None  # TranscriptionPipeline
+
+# 업로드 크기 제한(25MB)을 넘는 긴 녹음은 쉼에서 나눠 동시에 전사 (transcription.max_parallel_chunks)
+max_parallel_chunks = 4
+
+# 전사 백엔드: 연결을 유지하고 단축키를 누를 때 미리 연결 (설정 파일 api.*)
+# base_url을 mock_whisper_server.py 주소로 바꾸면 API 비용 없이 시험할 수 있음
+api_base_url = None         # None이면 https://api.openai.com/v1
+api_connect_timeout = 5.0
+api_read_timeout = 60.0
+transcription_backend = None  # TranscriptionBackend (OpenAIBackend)
+
+# 전사 요청 정책: 일시적인 오류 재시도, p95를 넘는 요청 중복 전송, 녹음별 최종 기한 (설정 파일 api.*)
+api_max_attempts = 3
+api_hedge = True
+take_deadline_seconds = 30.0
+# 녹음 기한에 더하는 업로드 여유의 기준 속도 (이 속도로도 업로드할 수 있도록 크기에 비례해 기한을 늘림)
+take_deadline_upload_kbps = 1000
+request_policy = None       # RequestPolicy
+
+# 전사 결과 캐시: 같은 오디오와 파라미터는 API를 다시 호출하지 않음 (설정 파일 transcription.cache_*)
+transcript_cache_enabled = True
+transcript_cache_max_mb = 20
+transcript_cache_max_age_days = 30
+transcript_cache = None     # TranscriptCache
+
+# 녹음별 단계 지연 기록 (단축키 → 붙여넣기, 단계별 히스토그램 + JSONL)
+latency_recorder = None     # LatencyRecorder
+
+# 언어 사전 확률: 자동 감지 모드에서 최근 감지된 언어가 확실하면 language를 지정해 감지 비용을 줄임
+# (포커스 앱별로 학습, 설정 파일 transcription.language_prior)
+language_prior_enabled = True
+language_prior = None       # LanguagePrior
+
+# 전사 결과 후처리 규칙 (설정 파일 transcription.voice_commands, transcription.replacements)
+# voice_commands: {"개행": "\n", ...}, replacements: {"*" 또는 언어 코드: {"문구": "바꿀 문구"}}
+voice_commands = dict(DEFAULT_COMMANDS)
+text_replacements = {}
+text_postprocessor = None   # TextPostProcessor
+
+# 텍스트 입력 방식: 앞에서부터 시도 (설정 파일 transcription.injection, "paste" / "unicode")
+# paste로 붙여넣은 뒤 이전 클립보드 내용을 되돌림 (transcription.restore_clipboard)
+injection_strategies = ["paste", "unicode"]
+restore_clipboard = True
+text_injector = None        # TextInjector
+
 # 중요 모듈들은 비동기적으로 나중에 로드
 openai = None
 pyperclip = None
@@ -168,70 +290,97 @@ def set_status(text):
         except Exception as e:
             logging.error(f"상태 업데이트 오류: {str(e)}")
 
+# 장치 목록이 갱신되면 선택된 마이크를 (이름, 호스트 API) 기준으로 다시 찾음
+def on_devices_refreshed(registry):
+    """장치 목록 갱신 시 장치 번호가 바뀐 선택 마이크를 다시 매핑"""
+    global selected_device, selected_device_key, default_device
+
+    default_device = registry.default_input()
+    if selected_device_key is None:
+        return
+    idx = registry.find(*selected_device_key)
+    if idx is None:
+        logging.warning(f"선택된 마이크를 찾을 수 없어 기본 마이크를 사용합니다: {selected_device_key[0]}")
+        selected_device = default_device
+        selected_device_key = registry.key_for(default_device)
+    elif idx != selected_device:
+        logging.info(f"선택된 마이크 장치 번호 변경: #{selected_device} -> #{idx} ({selected_device_key[0]})")
+        selected_device = idx
+
+# 녹음 기록에 남길 마이크 이름
+def selected_device_name():
+    if selected_device_key is not None:
+        return selected_device_key[0]
+    try:
+        device = selected_device if selected_device is not None else default_device
+        return device_registry.get(device)["name"] if device_registry is not None and device is not None else None
+    except Exception:
+        return None
+
+# 마이크 연결 테스트 (백그라운드 스레드에서 실행)
+def test_microphone(device):
+    """짧은 스트림을 열어 마이크 연결을 확인합니다"""
+    try:
+        logging.info(f"마이크 연결 테스트 중 (장치 #{device})...")
+        test_stream = sd.InputStream(device=device, channels=1, samplerate=capture_samplerates(device)[0])
+        test_stream.start()
+        time.sleep(0.1)  # 짧게 테스트
+        test_stream.stop()
+        test_stream.close()
+        logging.info("마이크 연결 테스트 성공")
+    except Exception as e:
+        logging.error(f"마이크 연결 테스트 실패: {str(e)}")
+        # 실패해도 계속 진행 (실제 녹음 시 다시 시도)
+        if device_registry:
+            device_registry.invalidate(reinitialize=True)
+
 # 마이크 초기화를 비동기적으로 수행
 def init_microphone_async():
     """마이크 초기화를 비동기적으로 수행"""
-    global sd, selected_device, default_device
+    global sd, selected_device, selected_device_key, default_device, device_registry
 
     if not sd:
         logging.warning("Sounddevice 모듈이 로드되지 않아 마이크 초기화를 건너뜁니다.")
         return
 
     try:
-        # 현재 자동 감지된 기본 장치
-        default_device_idx = sd.default.device[0]  # 기본 입력 장치 인덱스
-
-        # 사용 가능한 오디오 장치 목록 가져오기
-        devices = sd.query_devices()
-        logging.info(f"사용 가능한 오디오 장치: {len(devices)}개 감지됨")
+        # 장치 목록 캐시 생성 (이후 갱신은 백그라운드 스레드에서 수행)
+        if device_registry is None:
+            device_registry = DeviceRegistry(
+                sd,
+                can_reinitialize=lambda: not recording and armed_stream is None
+            )
+            device_registry.add_listener(on_devices_refreshed)
+            device_registry.refresh()
+            device_registry.start()
+        else:
+            device_registry.refresh(reinitialize=not recording and armed_stream is None)
 
         # 입력 장치 필터링 (마이크만)
-        input_devices = []
-        for idx, device in enumerate(devices):
-            try:
-                if device['max_input_channels'] > 0:
-                    logging.info(f"입력 장치 #{idx}: {device['name']} (채널: {device['max_input_channels']})")
-                    input_devices.append((idx, device))
-            except KeyError:
-                continue
+        input_devices = device_registry.input_devices()
+        for idx, device in input_devices:
+            logging.info(f"입력 장치 #{idx}: {device['name']} (채널: {device['max_input_channels']}, {device['hostapi_name']})")
 
         if not input_devices:
             logging.error("사용 가능한 입력 장치(마이크)가 없습니다.")
             return
 
         # 기본 입력 장치 정보 로깅
-        try:
-            default_device_info = sd.query_devices(kind='input')
-            default_device = default_device_idx
+        default_device = device_registry.default_input()
+        if default_device is not None:
+            default_device_info = device_registry.get(default_device)
             logging.info(f"기본 입력 장치: {default_device_info['name']} (장치 번호: {default_device})")
 
-            # 첫 번째 실행 시 기본 장치를, 아니면 이전에 사용한 장치 계속 사용
-            if selected_device is None:
-                selected_device = default_device
-                logging.info(f"기본 마이크로 선택됨: {default_device_info['name']}")
+        # 첫 번째 실행 시 기본 장치를, 아니면 이전에 사용한 장치 계속 사용
+        if selected_device is None or device_registry.get(selected_device) is None:
+            selected_device = default_device
+            logging.info(f"기본 마이크로 선택됨: {device_registry.get(selected_device)['name']}")
+        selected_device_key = device_registry.key_for(selected_device)
 
-        except Exception as e:
-            logging.error(f"기본 입력 장치 정보 가져오기 오류: {str(e)}")
-
-            # 기본 장치가 없으면 첫 번째 이용 가능한 입력 장치 사용
-            if input_devices:
-                idx, device = input_devices[0]
-                selected_device = idx
-                logging.info(f"첫 번째 가용 마이크로 선택됨: {device['name']} (장치 번호: {idx})")
-
-        # 마이크 작동 테스트 (짧은 스트림 생성해보기)
-        try:
-            if selected_device is not None:
-                logging.info(f"마이크 연결 테스트 중 (장치 #{selected_device})...")
-                test_stream = sd.InputStream(device=selected_device, channels=1, samplerate=16000)
-                test_stream.start()
-                time.sleep(0.1)  # 짧게 테스트
-                test_stream.stop()
-                test_stream.close()
-                logging.info("마이크 연결 테스트 성공")
-        except Exception as e:
-            logging.error(f"마이크 연결 테스트 실패: {str(e)}")
-            # 실패해도 계속 진행 (실제 녹음 시 다시 시도)
+        # 마이크 작동 테스트는 UI 스레드를 막지 않도록 백그라운드에서 수행
+        # (항상 대기 모드에서는 대기 스트림 자체가 테스트 역할을 함)
+        if selected_device is not None and not armed_mode:
+            threading.Thread(target=test_microphone, args=(selected_device,), daemon=True).start()
 
     except Exception as e:
         logging.error(f"마이크 초기화 오류: {str(e)}")
@@ -241,7 +390,10 @@ def init_microphone_async():
 # 기본 로깅 설정
 def setup_logging():
     """로깅 설정"""
-    global console_log_file
+    global console_log_file, log_writer, log_compactor
+
+    # 로그 크기/보관 설정
+    load_settings()
 
     # 로그 파일 이름 설정
     timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -251,27 +403,43 @@ def setup_logging():
     if not os.path.exists(log_dir):
         os.makedirs(log_dir)
 
-    # 로그 파일 경로
-    log_file = os.path.join(log_dir, f"whisperer_{timestamp}.log")
+    # 로그 파일 경로 (회전할 때마다 새 이름, 같은 초에 회전하면 번호를 붙임)
+    def new_log_file():
+        name = f"whisperer_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        path = os.path.join(log_dir, name + ".log")
+        n = 1
+        while os.path.exists(path) or os.path.exists(path + ".gz"):
+            path = os.path.join(log_dir, f"{name}_{n}.log")
+            n += 1
+        return path
+
+    log_file = new_log_file()
     console_log_file = "whisperer_console.log"
 
     # 로그 포맷 설정
     log_format = '%(asctime)s - %(levelname)s - %(message)s'
 
-    # 기본 로거 설정
-    logging.basicConfig(
-        level=logging.INFO,
-        format=log_format,
-        handlers=[
-            logging.FileHandler(log_file, encoding='utf-8'),
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
+    # 로그 파일과 콘솔 로그는 쓰기 스레드 하나가 모아서 기록 (호출한 스레드는 대기열에 넣기만 함)
+    # 다 쓴 로그는 백그라운드에서 압축/정리 (시작할 때 한 번, 이후 회전할 때마다)
+    log_compactor = LogCompactor(log_dir, keep_days=log_keep_days, max_total_bytes=int(log_max_total_mb * 1048576),
+                                 active=lambda: log_writer.active_paths())
+    log_writer = AsyncLogWriter(on_rotate=on_log_rotated)
+    atexit.register(log_writer.close)
+
+    # 기본 로거 설정 (설정을 읽는 중에 기본 핸들러가 만들어졌을 수 있으므로 force)
+    handler = QueueLogHandler(log_writer, "app")
+    handler.setFormatter(logging.Formatter(log_format))
+    log_writer.add_target("app", log_file, formatter=handler.format_record, echo=True,
+                          max_bytes=int(log_max_file_mb * 1048576), max_age_seconds=log_rotate_hours * 3600.0,
+                          next_path=new_log_file)
+    logging.basicConfig(level=logging.INFO, handlers=[handler], force=True)
+    log_compactor.request()
 
     # 콘솔 로그 초기화
     try:
-        with open(console_log_file, 'w', encoding='utf-8') as f:
-            f.write(f"=== Whisperer 로그 시작: {timestamp} ===\n\n")
+        log_writer.add_target("console", console_log_file, formatter=console_line, echo=True,
+                              header=f"=== Whisperer 로그 시작: {timestamp} ===\n\n",
+                              max_bytes=int(console_log_max_kb * 1024))
 
         # 시작 로그 기록
         log_to_console("=== Yeogiaen WhisperTyper 콘솔 ===")
@@ -284,20 +452,12 @@ def setup_logging():
 
 # 콘솔 로그 기록 함수
 def log_to_console(message):
-    """콘솔 로그 파일에 메시지 기록"""
-    global console_log_file
-
-    # 콘솔에 출력
-    print(message)
-
-    # 파일에 기록
-    if console_log_file:
-        try:
-            timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-            with open(console_log_file, 'a', encoding='utf-8') as f:
-                f.write(f"[{timestamp}] {message}\n")
-        except Exception as e:
-            print(f"로그 기록 오류: {str(e)}")
+    """콘솔 로그 파일에 메시지 기록 (대기열에 넣기만 하고 출력과 파일 기록은 쓰기 스레드에서)"""
+    if log_writer is not None:
+        log_writer.write("console", message)
+    else:
+        # 로깅 설정 전
+        print(message)
 
 def main():
     # README 파일 추출
@@ -341,6 +501,10 @@ def main():
         language_name = "한국어" if current_language == "ko" else "English"
         log_to_console(f"현재 언어 설정: {language_name} ({current_language})")
 
+        # 항상 대기 모드이면 입력 스트림을 미리 열어 둠
+        if armed_mode:
+            arm_input_stream()
+
         # 현재 단축키 설정 로그
         hotkey_str = []
         if hotkey_modifiers.get("ctrl", False):
@@ -361,6 +525,10 @@ def main():
             os.makedirs(recordings_dir)
             log_to_console(f"녹음 폴더 생성됨: {recordings_dir}")
 
+        # 녹음 파일 백그라운드 저장 스레드 시작
+        global recording_archiver
+        recording_archiver = RecordingArchiver()
+
         # API 키 확인 및 설정
         print("API 키 확인 중...")
         log_to_console("API 키 확인 중...")
@@ -493,7 +661,7 @@ def setup_keyboard_listener():
 
     def on_press(key):
         """키 누름 이벤트 핸들러"""
-        global ctrl_pressed, shift_pressed, alt_pressed, recording, recording_started_with_combo
+        global ctrl_pressed, shift_pressed, alt_pressed, recording, recording_started_with_combo, hotkey_pressed_at
 
         try:
             logging.debug(f"키 누름: {key}")
@@ -517,6 +685,8 @@ def setup_keyboard_listener():
                 if hotkey_key is None and ctrl_pressed and shift_pressed and alt_pressed:
                     logging.info("기본 녹음 단축키 감지됨 (Ctrl+Shift+Alt)")
                     log_to_console("녹음 시작 단축키 감지...")
+                    hotkey_pressed_at = time.perf_counter()
+                    prewarm_transcription_backend()
                     if root:
                         root.after(10, start_recording)
                     else:
@@ -550,6 +720,8 @@ def setup_keyboard_listener():
                 if modifier_match and key_match:
                     logging.info(f"사용자 정의 녹음 단축키 감지됨: 수정자={hotkey_modifiers}, 키={hotkey_key}")
                     log_to_console("사용자 정의 녹음 단축키 감지...")
+                    hotkey_pressed_at = time.perf_counter()
+                    prewarm_transcription_backend()
                     if root:
                         root.after(10, start_recording)
                     else:
@@ -638,6 +810,44 @@ def save_settings():
             "hotkey": {
                 "modifiers": hotkey_modifiers,
                 "key": hotkey_key
+            },
+            "transcription": {
+                "streaming_mode": streaming_mode,
+                "codec": upload_codec,
+                "max_parallel_takes": max_parallel_takes,
+                "max_parallel_chunks": max_parallel_chunks,
+                "cache_enabled": transcript_cache_enabled,
+                "cache_max_mb": transcript_cache_max_mb,
+                "cache_max_age_days": transcript_cache_max_age_days,
+                "language_prior": language_prior_enabled,
+                "voice_commands": voice_commands,
+                "replacements": text_replacements,
+                "injection": injection_strategies,
+                "restore_clipboard": restore_clipboard
+            },
+            "api": {
+                "base_url": api_base_url,
+                "connect_timeout": api_connect_timeout,
+                "read_timeout": api_read_timeout,
+                "max_attempts": api_max_attempts,
+                "hedge": api_hedge,
+                "deadline_seconds": take_deadline_seconds,
+                "deadline_upload_kbps": take_deadline_upload_kbps
+            },
+            "logging": {
+                "max_file_mb": log_max_file_mb,
+                "rotate_hours": log_rotate_hours,
+                "keep_days": log_keep_days,
+                "max_total_mb": log_max_total_mb,
+                "console_max_kb": console_log_max_kb,
+                "session_events": session_events_enabled
+            },
+            "audio": {
+                "armed_mode": armed_mode,
+                "preroll_ms": preroll_ms,
+                "native_rate_capture": native_rate_capture,
+                "vad_enabled": vad_enabled,
+                "min_recording_seconds": min_recording_seconds
             }
         }
         print(f"저장할 설정: {settings}")
@@ -654,6 +864,13 @@ def save_settings():
 
 def load_settings():
     global current_language, hotkey_modifiers, hotkey_key, auto_language_detection
+    global armed_mode, preroll_ms, vad_enabled, min_recording_seconds, streaming_mode, upload_codec
+    global native_rate_capture, max_parallel_takes, max_parallel_chunks, api_base_url, api_connect_timeout, api_read_timeout
+    global api_max_attempts, api_hedge, take_deadline_seconds, take_deadline_upload_kbps
+    global transcript_cache_enabled, transcript_cache_max_mb, transcript_cache_max_age_days, language_prior_enabled
+    global voice_commands, text_replacements, injection_strategies, restore_clipboard
+    global log_max_file_mb, log_rotate_hours, log_keep_days, log_max_total_mb, console_log_max_kb
+    global session_events_enabled
     try:
         if os.path.exists('whisperer_settings.json'):
             with open('whisperer_settings.json', 'r', encoding='utf-8') as f:
@@ -668,6 +885,41 @@ def load_settings():
                         hotkey_modifiers = settings["hotkey"]["modifiers"]
                     if "key" in settings["hotkey"]:
                         hotkey_key = settings["hotkey"]["key"]
+                if "transcription" in settings:
+                    streaming_mode = settings["transcription"].get("streaming_mode", streaming_mode)
+                    upload_codec = settings["transcription"].get("codec", upload_codec)
+                    max_parallel_takes = settings["transcription"].get("max_parallel_takes", max_parallel_takes)
+                    max_parallel_chunks = settings["transcription"].get("max_parallel_chunks", max_parallel_chunks)
+                    transcript_cache_enabled = settings["transcription"].get("cache_enabled", transcript_cache_enabled)
+                    transcript_cache_max_mb = settings["transcription"].get("cache_max_mb", transcript_cache_max_mb)
+                    transcript_cache_max_age_days = settings["transcription"].get("cache_max_age_days",
+                                                                                  transcript_cache_max_age_days)
+                    language_prior_enabled = settings["transcription"].get("language_prior", language_prior_enabled)
+                    voice_commands = settings["transcription"].get("voice_commands", voice_commands)
+                    text_replacements = settings["transcription"].get("replacements", text_replacements)
+                    injection_strategies = settings["transcription"].get("injection", injection_strategies)
+                    restore_clipboard = settings["transcription"].get("restore_clipboard", restore_clipboard)
+                if "api" in settings:
+                    api_base_url = settings["api"].get("base_url", api_base_url)
+                    api_connect_timeout = settings["api"].get("connect_timeout", api_connect_timeout)
+                    api_read_timeout = settings["api"].get("read_timeout", api_read_timeout)
+                    api_max_attempts = settings["api"].get("max_attempts", api_max_attempts)
+                    api_hedge = settings["api"].get("hedge", api_hedge)
+                    take_deadline_seconds = settings["api"].get("deadline_seconds", take_deadline_seconds)
+                    take_deadline_upload_kbps = settings["api"].get("deadline_upload_kbps", take_deadline_upload_kbps)
+                if "logging" in settings:
+                    log_max_file_mb = settings["logging"].get("max_file_mb", log_max_file_mb)
+                    log_rotate_hours = settings["logging"].get("rotate_hours", log_rotate_hours)
+                    log_keep_days = settings["logging"].get("keep_days", log_keep_days)
+                    log_max_total_mb = settings["logging"].get("max_total_mb", log_max_total_mb)
+                    console_log_max_kb = settings["logging"].get("console_max_kb", console_log_max_kb)
+                    session_events_enabled = settings["logging"].get("session_events", session_events_enabled)
+                if "audio" in settings:
+                    armed_mode = settings["audio"].get("armed_mode", armed_mode)
+                    preroll_ms = settings["audio"].get("preroll_ms", preroll_ms)
+                    vad_enabled = settings["audio"].get("vad_enabled", vad_enabled)
+                    native_rate_capture = settings["audio"].get("native_rate_capture", native_rate_capture)
+                    min_recording_seconds = settings["audio"].get("min_recording_seconds", min_recording_seconds)
             logging.info(f"설정 로드 완료: 언어={current_language}, 단축키 수정자={hotkey_modifiers}, 단축키={hotkey_key}")
             print(f"설정 로드 완료: 언어={current_language}, 단축키 수정자={hotkey_modifiers}, 단축키={hotkey_key}")
         else:
@@ -798,6 +1050,20 @@ def setup_tray_icon():
         # 메뉴 항목 정의
         def exit_action(icon, item):
             icon.stop()
+            # 처리 중인 녹음과 아직 저장 중인 녹음 파일이 있으면 잠시 기다림
+            if transcription_pipeline is not None:
+                transcription_pipeline.flush(timeout=10)
+            # 붙여넣은 뒤 되돌리기로 예약된 클립보드 내용을 지금 되돌림
+            if text_injector is not None:
+                text_injector.flush()
+            if recording_archiver is not None:
+                recording_archiver.flush(timeout=5)
+            if language_prior is not None:
+                language_prior.flush()
+            if callback_problems is not None:
+                callback_problems.stop()
+            if log_writer is not None:
+                log_writer.close(timeout=2)
             os._exit(0)
 
         # 녹음 파일 폴더 열기 함수
@@ -844,8 +1110,8 @@ def setup_tray_icon():
                     # 현재 선택된 마이크 정보
                     current_info = ""
                     try:
-                        if selected_device is not None:
-                            device_info = sd.query_devices(selected_device)
+                        if selected_device is not None and device_registry is not None:
+                            device_info = device_registry.get(selected_device)
                             current_info = f"현재 마이크: {device_info['name']} (장치 #{selected_device})"
                             log_to_console(current_info)
                         else:
@@ -857,12 +1123,14 @@ def setup_tray_icon():
                     # 사용 가능한 마이크 다시 검색
                     log_to_console("마이크 초기화 중...")
                     init_microphone_async()
+                    if armed_mode:
+                        arm_input_stream()
                     log_to_console("마이크 초기화 완료")
 
                     # 새로 설정된 마이크 정보
                     if selected_device is not None:
                         try:
-                            device_info = sd.query_devices(selected_device)
+                            device_info = device_registry.get(selected_device)
                             log_to_console(f"설정된 마이크: {device_info['name']} (장치 #{selected_device})")
                         except Exception as e:
                             log_to_console(f"마이크 정보 확인 오류: {str(e)}")
@@ -886,12 +1154,10 @@ def setup_tray_icon():
                     f.write('echo.\n')
                     f.write(f'echo {get_msg("log_start")}\n')
                     f.write('echo.\n')
-                    # 로그 파일 생성 및 실시간 모니터링
-                    f.write('echo > whisperer_console.log\n')
                     f.write(f'echo {get_msg("key_monitoring")}\n')
                     f.write('echo.\n')
-                    # 로그 파일 실시간 모니터링 (PowerShell 사용)
-                    f.write('powershell -command "Get-Content -Path whisperer_console.log -Wait -Encoding UTF8"\n')
+                    # 로그 파일 실시간 모니터링 (PowerShell 사용, 파일 전체가 아니라 마지막 200줄부터)
+                    f.write('powershell -command "Get-Content -Path whisperer_console.log -Tail 200 -Wait -Encoding UTF8"\n')
 
                 # 새 콘솔 창에서 배치 파일 실행
                 subprocess.Popen(['start', 'open_console.bat'],
@@ -903,6 +1169,9 @@ def setup_tray_icon():
                 # 콘솔 로그 파일 경로 설정
                 global console_log_file
                 console_log_file = os.path.abspath("whisperer_console.log")
+                if log_writer is not None:
+                    log_writer.add_target("console", console_log_file, formatter=console_line, echo=True,
+                                          max_bytes=int(console_log_max_kb * 1024))
 
                 # 콘솔 창이 열렸음을 로그에 기록
                 log_to_console(get_msg("console_opened"))
@@ -955,7 +1224,34 @@ def setup_tray_icon():
             # 트레이 아이콘 메뉴 업데이트
             update_tray_menu()
 
+        # 항상 대기 모드 토글 함수
+        def toggle_armed_mode(icon, item):
+            global armed_mode
+            armed_mode = not armed_mode
+            save_settings()
+            if armed_mode:
+                arm_input_stream()
+                log_to_console(get_msg("armed_mode_enabled", preroll_ms))
+            else:
+                disarm_input_stream()
+                log_to_console(get_msg("armed_mode_disabled"))
+            update_tray_menu()
+
+        # 스트리밍 전사 토글 함수
+        def toggle_streaming_mode(icon, item):
+            global streaming_mode
+            streaming_mode = not streaming_mode
+            save_settings()
+            if streaming_mode:
+                log_to_console(get_msg("streaming_mode_enabled"))
+            else:
+                log_to_console(get_msg("streaming_mode_disabled"))
+            update_tray_menu()
+
         # 단축키 설정 함수 추가 (언어 변경 함수 아래에 추가)
+        def show_latency_summary_action(icon, item):
+            show_latency_summary()
+
         def set_hotkey(icon, item):
             show_hotkey_dialog()
             log_to_console(get_msg("hotkey_updated", "단축키가 업데이트되었습니다."))
@@ -966,8 +1262,19 @@ def setup_tray_icon():
                 pystray.MenuItem(get_msg("open_recordings_folder"), open_recordings_folder),
                 pystray.MenuItem(get_msg("open_readme"), open_readme_file),
                 pystray.MenuItem(get_msg("open_console"), open_console),
+                pystray.MenuItem(get_msg("latency_summary"), show_latency_summary_action),
                 pystray.MenuItem(get_msg("set_openai_api_key"), set_openai_api_key),
                 pystray.MenuItem(get_msg("set_hotkey", "단축키 설정"), set_hotkey),
+                pystray.MenuItem(
+                    get_msg("armed_mode"),
+                    toggle_armed_mode,
+                    checked=lambda item: armed_mode
+                ),
+                pystray.MenuItem(
+                    get_msg("streaming_mode"),
+                    toggle_streaming_mode,
+                    checked=lambda item: streaming_mode
+                ),
                 # 언어 설정 하위 메뉴 추가
                 pystray.MenuItem(
                     get_msg("language_menu"),
@@ -1004,6 +1311,7 @@ def setup_tray_icon():
             pystray.MenuItem(get_msg("open_recordings_folder"), open_recordings_folder),
             pystray.MenuItem(get_msg("open_readme"), open_readme_file),
             pystray.MenuItem(get_msg("open_console"), open_console),
+            pystray.MenuItem(get_msg("latency_summary"), show_latency_summary_action),
             pystray.MenuItem(get_msg("set_openai_api_key"), set_openai_api_key),
             # 언어 설정 하위 메뉴 추가
             pystray.MenuItem(
@@ -1027,6 +1335,16 @@ def setup_tray_icon():
                 )
             ),
             pystray.MenuItem(get_msg("set_hotkey", "단축키 설정"), set_hotkey),
+            pystray.MenuItem(
+                get_msg("armed_mode"),
+                toggle_armed_mode,
+                checked=lambda item: armed_mode
+            ),
+            pystray.MenuItem(
+                get_msg("streaming_mode"),
+                toggle_streaming_mode,
+                checked=lambda item: streaming_mode
+            ),
             pystray.MenuItem(get_msg("exit"), exit_action)
         )
 
@@ -1508,10 +1826,351 @@ def show_hotkey_dialog():
     # 대화 상자 표시
     dialog.wait_window()
 
+# 녹음 스트림을 열 샘플링 레이트 후보
+def capture_samplerates(device):
+    """장치 기본 레이트를 먼저, 실패하면 16kHz 직접 녹음을 시도하도록 후보 목록을 반환"""
+    rates = []
+    if native_rate_capture and device_registry is not None:
+        info = device_registry.get(device if device is not None else device_registry.default_input())
+        if info and info.get("default_samplerate"):
+            rates.append(int(info["default_samplerate"]))
+    if TARGET_SAMPLERATE not in rates:
+        rates.append(TARGET_SAMPLERATE)
+    return rates
+
+# 입력 스트림 열기 (장치 기본 레이트 우선)
+def open_input_stream(device, callback):
+    """입력 스트림을 열고 (스트림, 리샘플러)를 반환합니다. 모든 레이트가 실패하면 마지막 오류를 발생시킵니다"""
+    last_error = None
+    for rate in capture_samplerates(device):
+        try:
+            resampler = StreamingResampler(rate, TARGET_SAMPLERATE, channels=1, dtype="int16")
+            stream = sd.InputStream(
+                device=device,
+                samplerate=rate,
+                channels=1,
+                dtype="int16",  # FLAC(16비트)로 저장하므로 int16으로 받아 메모리를 절반으로 줄임
+                callback=callback
+            )
+            logging.info(f"입력 스트림: {rate}Hz로 녹음, {TARGET_SAMPLERATE}Hz로 리샘플링")
+            return stream, resampler
+        except Exception as e:
+            logging.warning(f"{rate}Hz 입력 스트림 열기 실패: {str(e)}")
+            last_error = e
+    raise last_error
+
+# 녹음 콜백의 문제 기록 (콜백 스레드는 로그 대기열을 기다리지 않음)
+def get_callback_problems():
+    global callback_problems
+    if callback_problems is None:
+        callback_problems = CallbackProblemLog().start()
+    return callback_problems
+
+# 단축키→첫 샘플 지연 기록
+def note_first_sample(frames, samplerate=TARGET_SAMPLERATE):
+    """녹음의 첫 콜백에서 호출되어 단축키→첫 샘플 지연을 계산합니다."""
+    global capture_latency_ms
+    # 콜백에 전달된 프레임 중 가장 오래된 샘플의 시각
+    first_sample_time = time.perf_counter() - frames / float(samplerate)
+    take = current_take
+    if take is not None:
+        take.mark("first_sample", first_sample_time)
+    if hotkey_pressed_at is None:
+        return
+    capture_latency_ms = (first_sample_time - hotkey_pressed_at) * 1000
+
+# 항상 대기 입력 스트림 열기
+def arm_input_stream():
+    """프리롤 링 버퍼를 계속 채우는 입력 스트림을 열어 둡니다 (항상 대기 모드)"""
+    global armed_stream, preroll_buffer, armed_capture, armed_request, armed_resampler
+
+    if sd is None or np is None:
+        logging.warning("Sounddevice 모듈이 로드되지 않아 항상 대기 모드를 시작할 수 없습니다.")
+        return False
+
+    disarm_input_stream()
+
+    samplerate = TARGET_SAMPLERATE
+    preroll_buffer = PreRollRing(samplerate * preroll_ms // 1000, channels=1, dtype="int16")
+    armed_capture = None
+    armed_request = None
+    problems = get_callback_problems()
+
+    def armed_callback(indata, frames, time_info, status):
+        global armed_capture, armed_request
+        if status:
+            problems.note(f"녹음 상태 문제: {status}")
+        try:
+            block = armed_resampler.process(indata)
+            with armed_lock:
+                if armed_request is not None:
+                    # 단축키가 눌린 뒤 첫 콜백: 프리롤을 먼저 옮기고 이번 블록을 이어서 기록
+                    buffer = armed_request
+                    preroll_frames = preroll_buffer.drain_to(buffer)
+                    buffer.write(block)
+                    note_first_sample(preroll_frames + len(block), samplerate)
+                    armed_capture = buffer
+                    armed_request = None
+                elif armed_capture is not None:
+                    armed_capture.write(block)
+                else:
+                    preroll_buffer.write(block)
+        except Exception as cb_e:
+            problems.note(f"오디오 콜백 오류: {str(cb_e)}", logging.ERROR)
+
+    try:
+        armed_stream, armed_resampler = open_input_stream(selected_device, armed_callback)
+        armed_stream.start()
+        logging.info(f"항상 대기 입력 스트림 시작됨 (프리롤 {preroll_ms}ms)")
+        return True
+    except Exception as e:
+        logging.error(f"항상 대기 입력 스트림 시작 오류: {str(e)}")
+        log_to_console(get_msg("armed_stream_error", str(e)))
+        armed_stream = None
+        if device_registry:
+            device_registry.invalidate(reinitialize=True)
+        return False
+
+# 항상 대기 입력 스트림 닫기
+def disarm_input_stream():
+    """항상 대기 입력 스트림을 닫습니다"""
+    global armed_stream, armed_capture, armed_request
+
+    if armed_stream is None:
+        return
+    try:
+        armed_stream.stop()
+        armed_stream.close()
+        logging.info("항상 대기 입력 스트림 종료됨")
+    except Exception as e:
+        logging.error(f"항상 대기 입력 스트림 종료 오류: {str(e)}")
+    finally:
+        armed_stream = None
+        with armed_lock:
+            armed_capture = None
+            armed_request = None
+
+# 녹음 파일 경로 생성
+def new_recording_filename(extension=".flac"):
+    """recordings 폴더의 현재 시각 기반 파일 경로 (폴더는 저장 시 생성)"""
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    return os.path.join("recordings", f"recording_{timestamp}{extension}")
+
+# 업로드 코덱 선택기
+def get_codec_selector():
+    """설정과 최근 업로드 처리량에 따라 코덱을 고르는 CodecSelector를 반환합니다"""
+    global codec_selector
+    if codec_selector is None or codec_selector.preferred != upload_codec:
+        codec_selector = CodecSelector(preferred=upload_codec)
+    return codec_selector
+
+# 녹음 인코더 생성 (메모리에 인코딩하고, 디스크 저장은 RecordingArchiver가 담당)
+def create_take_encoder(buffer):
+    """메모리 버퍼에 인코딩하는 StreamingEncoder를 만듭니다 (코덱은 자동 선택)"""
+    codec = get_codec_selector().choose()
+    return StreamingEncoder(buffer, io.BytesIO(), codec=codec, vad=vad_enabled,
+                            name=new_recording_filename(codec.extension))
+
+# 녹음과 동시에 인코딩 시작
+def start_take_encoder(buffer):
+    """녹음 중 백그라운드에서 FLAC 인코딩을 시작합니다 (실패 시 녹음 종료 후 한 번에 인코딩)"""
+    try:
+        return create_take_encoder(buffer).start()
+    except Exception as e:
+        logging.error(f"점진적 인코딩 시작 오류: {str(e)}")
+        return None
+
+# 녹음 파일 백그라운드 저장
+def archive_recording(filename, data):
+    """녹음 파일 저장을 백그라운드 스레드에 맡깁니다 (전사를 지연시키거나 실패시키지 않음)"""
+    global recording_archiver
+    try:
+        if recording_archiver is None:
+            recording_archiver = RecordingArchiver()
+        recording_archiver.submit(filename, data)
+    except Exception as e:
+        logging.error(f"녹음 파일 저장 요청 오류: {str(e)}")
+
+# Whisper API 요청 파라미터
+def transcription_params(context=None):
+    """현재 언어 설정에 맞는 Whisper API 파라미터를 만듭니다 (context: 포커스 앱)"""
+    api_params = {
+        "model": "whisper-1",
+    }
+    # 자동 감지를 사용하지 않으면 트레이 아이콘 언어 설정에 따라 language 파라미터 추가
+    if not auto_language_detection and current_language in ("ko", "en"):
+        api_params["language"] = current_language
+    elif auto_language_detection and language_prior_enabled:
+        # 이 앱에서 최근 감지된 언어가 확실하면 감지하지 않고 지정
+        language = get_language_prior().suggest(context)
+        if language:
+            api_params["language"] = language
+    return api_params
+
+def take_transcription_params(context):
+    """스트리밍 모드이면 녹음을 시작할 때 파라미터를 한 번 정합니다 (구간과 전체 결과가 같은 언어 제안을 씀)"""
+    return transcription_params(context) if streaming_mode else None
+
+# 언어 사전 확률 (프로그램을 다시 시작해도 유지)
+def get_language_prior():
+    global language_prior
+    if language_prior is None:
+        language_prior = LanguagePrior(path=DEFAULT_PRIOR_PATH)
+    return language_prior
+
+# 언어 감지 결과와 함께 전사 (자동 감지 요청의 결과를 언어 사전 확률에 반영)
+def transcribe_bytes_detecting(audio_bytes, name, context=None, **api_params):
+    """verbose_json으로 전사해 감지된 언어를 기록하고 (텍스트, 감지된 언어)를 반환합니다"""
+    text, language = get_transcription_backend().transcribe_with_language(
+        audio_bytes, dict(api_params, filename=name))
+    if language and language_prior_enabled:
+        prior = get_language_prior()
+        # 파일에는 몇 건마다 한 번 저장 (남은 기록은 종료할 때 저장)
+        prior.observe(context, language)
+        logging.info(f"감지된 언어: {language} (앱: {context or '알 수 없음'})")
+    return text, language
+
+# 전사 결과 후처리 (규칙표는 처음 사용할 때 컴파일)
+def get_text_postprocessor():
+    global text_postprocessor
+    if text_postprocessor is None:
+        text_postprocessor = TextPostProcessor(voice_commands, text_replacements)
+    return text_postprocessor
+
+# 텍스트 입력 (pyperclip/pynput이 로드된 뒤 처음 붙여넣을 때 구성)
+def get_text_injector():
+    global text_injector
+    # 모듈이 아직 로드되지 않아 입력 방식이 없으면 다음에 다시 구성
+    if text_injector is None or not text_injector.strategies:
+        keyboard = Controller() if Controller else None
+        # 단축키의 수정자 키를 뗄 때까지만 기다림 (이전에는 고정 0.2초)
+        keys_released = lambda: not (ctrl_pressed or shift_pressed or alt_pressed)
+        strategies = []
+        for name in injection_strategies:
+            try:
+                if name == "paste" and pyperclip and keyboard:
+                    strategies.append(ClipboardPasteStrategy(pyperclip, keyboard, Key.ctrl, restore=restore_clipboard,
+                                                             keys_released=keys_released))
+                elif name == "unicode":
+                    strategies.append(UnicodeTypingStrategy(keyboard, keys_released=keys_released))
+            except Exception as e:
+                logging.warning(f"텍스트 입력 방식 {name} 사용 불가: {str(e)}")
+        text_injector = TextInjector(strategies)
+        logging.info(f"텍스트 입력 방식: {text_injector.names}")
+    return text_injector
+
+# 전사 백엔드 (프로그램 실행 중 연결 유지)
+def get_transcription_backend():
+    """현재 API 키로 만든 전사 백엔드를 반환합니다 (키가 바뀌면 새로 만듦)"""
+    global transcription_backend
+    if transcription_backend is None or transcription_backend.api_key != api_key:
+        if transcription_backend is not None:
+            transcription_backend.close()
+        # 업로드 처리량은 요청 본문 전송 시간으로 측정해 코덱 자동 선택에 사용
+        transcription_backend = OpenAIBackend(api_key, base_url=api_base_url, policy=get_request_policy(),
+                                              connect_timeout=api_connect_timeout, read_timeout=api_read_timeout,
+                                              on_upload=lambda nbytes, seconds: get_codec_selector().record_upload(
+                                                  nbytes, seconds))
+        cache = get_transcript_cache()
+        if cache is not None:
+            transcription_backend = CachedBackend(transcription_backend, cache)
+    return transcription_backend
+
+# 전사 결과 캐시 (네트워크 요청 전에 확인)
+def get_transcript_cache():
+    """설정에 따라 TranscriptCache를 반환합니다 (꺼져 있거나 열 수 없으면 None)"""
+    global transcript_cache
+    if transcript_cache is None and transcript_cache_enabled:
+        try:
+            transcript_cache = TranscriptCache(max_bytes=transcript_cache_max_mb * 1024 * 1024,
+                                               max_age_days=transcript_cache_max_age_days)
+        except Exception as e:
+            logging.error(f"전사 캐시 열기 오류: {str(e)}")
+            return None
+    return transcript_cache
+
+# 마지막 전사가 캐시에서 왔는지 (작업 스레드별)
+def last_transcription_cached():
+    backend = transcription_backend
+    return isinstance(backend, CachedBackend) and backend.last_hit()
+
+# 전사 요청 정책 (응답 시간 기록은 녹음 사이에 유지)
+def get_request_policy():
+    """재시도/중복 요청/기한을 적용하는 RequestPolicy를 반환합니다"""
+    global request_policy
+    if request_policy is None:
+        request_policy = RequestPolicy(max_attempts=api_max_attempts, hedge=api_hedge,
+                                       deadline=take_deadline_seconds,
+                                       deadline_upload_rate=take_deadline_upload_kbps * 1000 / 8.0)
+    return request_policy
+
+# 오디오 한 건 전사 (재시도/중복 요청/기한은 백엔드의 요청 정책이 처리)
+def transcribe_bytes(audio_bytes, name, **api_params):
+    """전사 백엔드로 메모리의 오디오를 전사하고 텍스트를 반환합니다"""
+    return get_transcription_backend().transcribe(audio_bytes, dict(api_params, filename=name))
+
+# 단축키를 누를 때 API 연결 미리 열기
+def prewarm_transcription_backend():
+    """녹음하는 동안 DNS/TCP/TLS 연결을 미리 맺어, 녹음이 끝나면 바로 업로드하도록 합니다"""
+    if not openai or not api_key:
+        return
+    try:
+        get_transcription_backend().prewarm()
+    except Exception as e:
+        logging.warning(f"API 연결 미리 열기 오류: {str(e)}")
+
+# 스트리밍 전사 구간 하나를 전사 (워커 스레드에서 실행)
+def segment_transcriber(context, api_params):
+    """
+    녹음 한 건의 구간 전사 함수 (context: 녹음을 시작할 때의 포커스 앱, api_params: 녹음마다 한 번 정한 파라미터)
+
+    모든 구간이 같은 파라미터를 쓰므로 언어 사전 확률의 제안은 구간이 아니라 녹음마다 한 번만 진행됩니다.
+    언어를 지정하지 않는 첫 구간은 감지된 언어를 언어 사전 확률에 반영하고,
+    나머지 구간은 같은 녹음이므로 다시 반영하지 않습니다.
+    """
+    observed = threading.Event()
+
+    def transcribe_segment(audio_bytes, name):
+        """메모리의 인코딩된 구간을 Whisper API로 전사하고 텍스트를 반환합니다"""
+        if auto_language_detection and "language" not in api_params and not observed.is_set():
+            observed.set()
+            text, _ = transcribe_bytes_detecting(audio_bytes, name, context, **api_params)
+            return text
+        return transcribe_bytes(audio_bytes, name, **api_params)
+
+    return transcribe_segment
+
+# 업로드 크기 제한을 넘는 긴 녹음 전사
+def transcribe_long_take(audio, samplerate, name, codec=None, deadline_at=None, **api_params):
+    """
+    녹음을 쉼에서 나눠 동시에 전사하고, 경계에서 겹친 단어를 정리해 녹음 순서대로 합친 텍스트를 반환합니다
+
+    구간 요청은 모두 녹음 전체 크기로 정한 같은 기한(deadline_at)을 따릅니다.
+    """
+    chunker = ChunkedTranscriber(lambda data, part: transcribe_bytes(data, part, deadline_at=deadline_at,
+                                                                     **api_params),
+                                 max_workers=max_parallel_chunks, codec=codec)
+    text = chunker.transcribe_audio(audio, samplerate, name)
+    logging.info(f"분할 전사 완료: {chunker.chunk_count}개 구간")
+    return text
+
+# 스트리밍 전사 시작
+def start_take_segmenter(buffer, context=None, api_params=None):
+    """스트리밍 모드이면 녹음 중 구간 전사를 시작합니다 (context: 포커스 앱, api_params: 녹음의 전사 파라미터)"""
+    if not streaming_mode or not openai or not api_key:
+        return None
+    try:
+        return SegmentedTranscriber(buffer, segment_transcriber(context, api_params or transcription_params(context)),
+                                    codec=get_codec_selector().choose()).start()
+    except Exception as e:
+        logging.error(f"스트리밍 전사 시작 오류: {str(e)}")
+        return None
+
 # 녹음 관련 함수
 def start_recording():
     """녹음 시작 함수"""
-    global recording, audio_data, sd, np, stream, selected_device, winsound # winsound 전역 변수 사용 명시
+    global recording, current_take, sd, np, selected_device, winsound # winsound 전역 변수 사용 명시
+    global armed_request, capture_latency_ms
 
     if recording:
         logging.info("이미 녹음 중입니다.")
@@ -1527,66 +2186,96 @@ def start_recording():
             root.after(10, lambda: messagebox.showerror("녹음 오류", error_msg))
         return
 
+    capture_latency_ms = None
+
+    # 항상 대기 모드: 스트림을 새로 열지 않고 다음 콜백에서 녹음을 시작하도록 표시만 함
+    if armed_mode and armed_stream is not None and armed_stream.active:
+        buffer = CaptureBuffer(samplerate=TARGET_SAMPLERATE, channels=1, dtype="int16")
+        app_context = foreground_app()
+        api_params = take_transcription_params(app_context)
+        current_take = TakeSession(buffer, start_take_encoder(buffer),
+                                   start_take_segmenter(buffer, app_context, api_params),
+                                   timeline=TakeTimeline(hotkey_pressed_at), mode="armed",
+                                   app_context=app_context, api_params=api_params, device=selected_device_name())
+        current_take.mark("stream_start")
+        logging.info(f"녹음 #{current_take.id} 시작 (항상 대기 스트림)")
+        recording = True
+        with armed_lock:
+            armed_request = buffer
+
+        if winsound:
+            try:
+                winsound.Beep(600, 200) # 600Hz, 200ms 비프음
+            except Exception as beep_e:
+                logging.warning(f"녹음 시작 비프음 재생 오류: {str(beep_e)}")
+
+        log_to_console("녹음 중... (단축키를 떼면 종료)")
+        return
+
     try:
-        # 녹음 시작
+        # 녹음 시작 (녹음마다 새 세션: 이전 녹음이 전사 중이어도 독립적으로 기록)
         logging.info("녹음 시작")
         log_to_console("녹음 시작 중...")
 
-        # 마이크 정보 확인
+        # 마이크 정보 확인 (캐시된 장치 목록 사용, PortAudio 장치 열거 없음)
         try:
-            # 사용 가능한 장치 확인
-            devices = sd.query_devices()
-            logging.info(f"사용 가능한 오디오 장치: {len(devices)}개")
-
             # 입력 장치 선택 (선택된 장치가 없으면 기본 장치 사용)
             device_info = None
-            if selected_device is not None:
-                device_info = sd.query_devices(selected_device)
-                logging.info(f"선택된 마이크 사용: {device_info['name']}")
-            else:
-                device_info = sd.query_devices(kind='input')
-                logging.info(f"기본 마이크 사용: {device_info['name']}")
+            if device_registry is not None:
+                if selected_device is not None:
+                    device_info = device_registry.get(selected_device)
+                    logging.info(f"선택된 마이크 사용: {device_info['name']}")
+                else:
+                    device_info = device_registry.get(device_registry.default_input())
+                    logging.info(f"기본 마이크 사용: {device_info['name']}")
 
-            # 로그에 디바이스 정보 기록
-            log_to_console(f"마이크: {device_info['name']}")
+                # 로그에 디바이스 정보 기록
+                log_to_console(f"마이크: {device_info['name']}")
         except Exception as e:
             logging.error(f"마이크 정보 확인 오류: {str(e)}")
             log_to_console(f"마이크 정보 확인 오류: {str(e)}")
             # 계속 진행 (기본 설정으로 시도)
 
-        # 샘플링 설정
-        samplerate = 16000  # OpenAI Whisper에 적합한 샘플링 레이트
+        # 샘플링 설정 (장치 레이트로 녹음하고 콜백에서 16kHz로 리샘플링)
+        samplerate = TARGET_SAMPLERATE
         channels = 1        # 모노 녹음
 
-        # 오디오 데이터 초기화
-        audio_data = []
+        # 오디오 데이터 초기화 (콜백에서 블록마다 할당하지 않도록 미리 할당된 버퍼 사용)
+        buffer = CaptureBuffer(samplerate=samplerate, channels=channels, dtype="int16")
+        app_context = foreground_app()
+        take = TakeSession(buffer, timeline=TakeTimeline(hotkey_pressed_at), mode="stream",
+                           app_context=app_context, api_params=take_transcription_params(app_context),
+                           device=selected_device_name())
+        current_take = take
         recording = True
+        problems = get_callback_problems()
 
-        # 녹음 콜백 함수
-        def audio_callback(indata, frames, time, status):
+        # 녹음 콜백 함수 (문제는 세기만 하고 로그는 다른 스레드에서 남김)
+        def audio_callback(indata, frames, time_info, status):
             if status:
-                logging.warning(f"녹음 상태 문제: {status}")
-            if recording:
+                problems.note(f"녹음 상태 문제: {status}")
+            if recording and current_take is take and take.resampler is not None:
                 try:
                     if indata.shape[1] == channels:  # 채널 수 확인
-                        audio_data.append(indata.copy())
+                        block = take.resampler.process(indata)
+                        if len(buffer) == 0 and len(block):
+                            note_first_sample(len(block), samplerate)
+                        buffer.write(block)
                     else:
                         # 채널 수가 맞지 않으면 로그만 남기고 계속 진행
-                        logging.warning(f"채널 수 불일치: 예상 {channels}, 실제 {indata.shape[1]}")
+                        problems.note(f"채널 수 불일치: 예상 {channels}, 실제 {indata.shape[1]}")
                 except Exception as cb_e:
-                    logging.error(f"오디오 콜백 오류: {str(cb_e)}")
+                    problems.note(f"오디오 콜백 오류: {str(cb_e)}", logging.ERROR)
 
         # 스트림 시작
         try:
             device_id = selected_device if selected_device is not None else None
-            stream = sd.InputStream(
-                device=device_id,
-                samplerate=samplerate,
-                channels=channels,
-                callback=audio_callback
-            )
-            stream.start()
-            logging.info("오디오 스트림 시작됨")
+            take.stream, take.resampler = open_input_stream(device_id, audio_callback)
+            take.stream.start()
+            take.mark("stream_start")
+            logging.info(f"녹음 #{take.id} 오디오 스트림 시작됨")
+            take.encoder = start_take_encoder(buffer)
+            take.segmenter = start_take_segmenter(buffer, app_context, take.extra.get("api_params"))
 
             # 녹음 시작 비프음 추가 (Windows 환경)
             if winsound:
@@ -1600,6 +2289,10 @@ def start_recording():
             logging.error(error_msg)
             log_to_console(error_msg)
             recording = False
+            current_take = None
+            # 장치가 분리되었을 수 있으므로 장치 목록을 백그라운드에서 갱신
+            if device_registry:
+                device_registry.invalidate(reinitialize=True)
             # GUI 오류 메시지 표시 (메인 스레드에서)
             if root:
                 root.after(10, lambda: messagebox.showerror("녹음 오류", f"마이크를 시작할 수 없습니다: {str(stream_e)}"))
@@ -1613,27 +2306,51 @@ def start_recording():
         logging.error(error_msg)
         log_to_console(error_msg)
         recording = False
+        current_take = None
         # GUI 오류 메시지 표시 (메인 스레드에서)
         if root:
             root.after(10, lambda: messagebox.showerror("녹음 오류", error_msg))
 
 def stop_recording():
-    """녹음 중지 및 오디오 처리 함수"""
-    global recording, audio_data, stream, openai, api_key, pyperclip
+    """녹음 중지 함수 (녹음 세션을 처리 대기열에 넣고 바로 반환, 전사와 붙여넣기는 작업 스레드에서 진행)"""
+    global recording, current_take
+    global armed_capture, armed_request, hotkey_pressed_at
 
-    if not recording:
+    if not recording or current_take is None:
         logging.info("녹음 중이 아닙니다.")
         return
 
+    take = current_take
+    take.mark("key_up")
+    # 녹음 기한은 단축키를 뗀 시각부터 (대기열에서 기다린 시간도 포함)
+    take.extra["released_at"] = time.monotonic()
+    buffer = take.buffer
+    submitted = False
+
     try:
         # 녹음 중지
         recording = False
+        current_take = None
         log_to_console("녹음 종료 중...")
 
-        # 스트림 종료
-        if stream:
-            stream.stop()
-            stream.close()
+        # 스트림 종료 (항상 대기 모드에서는 스트림을 유지하고 프리롤로 되돌림)
+        if take.stream:
+            take.stream.stop()
+            take.stream.close()
+            # 리샘플러에 남은 마지막 샘플까지 버퍼에 기록
+            if take.resampler is not None:
+                buffer.write(take.resampler.flush())
+        with armed_lock:
+            if armed_capture is buffer or armed_request is buffer:
+                armed_capture = None
+                armed_request = None
+
+        # 단축키→첫 샘플 지연 기록
+        if capture_latency_ms is not None:
+            mode = "armed" if take.stream is None else "stream"
+            logging.info(f"단축키→첫 샘플 지연 ({mode}): {capture_latency_ms:.1f}ms")
+            log_to_console(get_msg("capture_latency", capture_latency_ms))
+        hotkey_pressed_at = None
 
         # 소리로 녹음 종료 알림 (Windows 환경)
         if winsound:
@@ -1643,240 +2360,381 @@ def stop_recording():
                 pass
 
         # 녹음된 데이터가 없으면 종료
-        if not audio_data:
+        if len(buffer) == 0:
             logging.warning("녹음된 데이터가 없습니다.")
             log_to_console(get_msg("no_audio_data"))
             return
 
+        logging.info(f"녹음 #{take.id} 버퍼: {buffer.duration:.2f}초, 버퍼 확장 {buffer.grow_count}회")
+        log_to_console(get_msg("recording_length", buffer.duration))
+
+        # 실수로 짧게 누른 단축키는 무시
+        if buffer.duration < min_recording_seconds:
+            log_to_console(get_msg("recording_too_short", min_recording_seconds))
+            return
+
+        # 인코딩 마무리, API 호출, 붙여넣기는 작업 스레드에서 진행 (Tk 스레드는 바로 반환)
         log_to_console(get_msg("processing_audio"))
+        take.mark("capture_finalized")
+        get_transcription_pipeline().submit(take)
+        submitted = True
 
-        # 오디오 데이터 합치기
-        try:
-            audio = np.concatenate(audio_data, axis=0)
-
-            # 녹음 폴더 확인
-            recordings_dir = "recordings"
-            if not os.path.exists(recordings_dir):
-                os.makedirs(recordings_dir)
-
-            # 현재 시간을 파일명으로 사용
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = os.path.join(recordings_dir, f"recording_{timestamp}.flac")
-
-            # FLAC 파일로 저장 (Whisper API에 최적)
-            log_to_console(get_msg("saving_audio_file", filename))
-            soundfile.write(filename, audio, 16000)
-
-            # API 키가 없는 경우 즉시 API 키 설정 창 표시
-            if not api_key:
-                log_to_console(get_msg("no_api_key_set"))
-                # 메인 스레드에서 API 키 설정 창 표시
-                if root:
-                    root.after(100, lambda: show_api_key_dialog(required=True))
-                return
-
-            # Whisper API로 음성 인식
-            if openai and api_key:
-                log_to_console(get_msg("sending_to_whisper"))
-                log_to_console(get_msg("auto_language_detection"))
+    except Exception as e:
+        logging.error(f"녹음 종료 오류: {str(e)}")
+        log_to_console(get_msg("recording_stop_error", str(e)))
 
-                try:
-                    # 파일을 FLAC 형식으로 Whisper API에 전송
-                    openai.api_key = api_key
-
-                    # API 호출 시간 측정 시작
-                    api_start_time = time.time()
-
-                    # 언어 설정에 따른 파라미터 처리
-                    api_params = {
-                        "model": "whisper-1",
-                    }
-                    
-                    # 자동 감지 사용 여부
-                    if auto_language_detection:
-                        # 자동 감지 사용 - language 파라미터 제외
-                        log_to_console(get_msg("auto_language_detection"))
+    finally:
+        # 상태 초기화 (대기열에 넘기지 못한 세션의 인코더와 구간 전사는 정리)
+        recording = False
+        take.stream = None
+        take.resampler = None
+        if not submitted:
+            take.abort()
+
+# 녹음 처리 작업 대기열
+def get_transcription_pipeline():
+    """녹음 처리 작업 스레드를 필요할 때 시작해 반환합니다"""
+    global transcription_pipeline
+    if transcription_pipeline is None:
+        transcription_pipeline = TranscriptionPipeline(process_take, deliver_take, workers=max_parallel_takes,
+                                                       completed=record_take_latency).start()
+    return transcription_pipeline
+
+# 녹음별 단계 지연 기록
+def get_latency_recorder():
+    global latency_recorder
+    if latency_recorder is None:
+        latency_recorder = LatencyRecorder()
+    return latency_recorder
+
+def take_outcome(take):
+    """녹음 결과 (session_events.py의 outcome 값)"""
+    if take.extra.get("outcome"):
+        return take.extra["outcome"]
+    if take.error is not None:
+        return "error"
+    return "pasted" if take.text else "no_text"
+
+def record_take_latency(take):
+    """
+    붙여넣기 단계가 끝난 녹음의 단계별 지연을 히스토그램에 더하고, 같은 내용을 세션 이벤트 한 줄로 남깁니다
+
+    세션 이벤트를 꺼도 단계별 지연 기록은 남기고 나머지 필드(장치, 앱, 재시도 등)만 뺍니다.
+    """
+    fields = take_event_fields(take)
+    if take.timeline is not None:
+        # 단계별 지연은 세션 이벤트의 <구간>_ms, offsets_ms 필드로 저장 (latency_metrics.py가 다시 읽음)
+        fields = get_latency_recorder().record(take.timeline, **fields)
+        intervals = take.timeline.intervals()
+        release_ms = intervals.get("release_to_text")
+        if release_ms is not None:
+            rounded = {name: round(ms, 1) for name, ms in intervals.items()}
+            logging.info(f"녹음 #{take.id} 단축키 뗌→붙여넣기: {release_ms:.0f}ms {rounded}")
+    if not session_events_enabled:
+        if take.timeline is None:
+            return
+        fields = latency_fields(fields)
+    try:
+        get_session_event_log().record(**fields)
+    except Exception as e:
+        logging.warning(f"세션 이벤트 기록 오류: {str(e)}")
+
+# 세션 이벤트 (로그 쓰기 스레드로 기록)
+def get_session_event_log():
+    global session_event_log, session_event_compactor
+    if session_event_log is None:
+        session_event_log = SessionEventLog(log_writer)
+        # 다 쓴 이벤트 파일도 일반 로그와 같은 보관 설정으로 압축/정리 (분석기는 .jsonl.gz도 읽음)
+        session_event_compactor = LogCompactor(session_event_log.directory, patterns=("session_events_*.jsonl",),
+                                               keep_days=log_keep_days,
+                                               max_total_bytes=int(log_max_total_mb * 1048576),
+                                               active=lambda: log_writer.active_paths())
+        session_event_compactor.request()
+    return session_event_log
+
+def on_log_rotated(name, path):
+    """로그 회전 알림 (쓰기 스레드): 회전한 파일이 있는 폴더의 정리를 요청"""
+    compactor = session_event_compactor if name == "events" else log_compactor
+    if compactor is not None:
+        compactor.request()
+
+def take_event_fields(take):
+    """녹음 한 건의 세션 이벤트 필드 (전사 텍스트는 남기지 않고 길이만, 단계별 지연은 LatencyRecorder가 더함)"""
+    extra = take.extra
+    encoder = take.encoder
+    codec = encoder.codec.name if encoder is not None else None
+    return dict(
+        take=take.id, mode=extra.get("mode"), device=extra.get("device"), app=extra.get("app_context"),
+        audio_seconds=round(take.buffer.duration, 3), speech_seconds=extra.get("speech_seconds"),
+        audio_bytes=extra.get("audio_bytes"), codec=codec, streaming=take.segmenter is not None,
+        language_source=extra.get("language_source"), language=extra.get("language"), model=extra.get("model"),
+        api_ms=extra.get("api_ms"), attempts=extra.get("attempts"), hedged=extra.get("hedged"),
+        cached=bool(extra.get("cached")), chunked=bool(extra.get("chunked")),
+        text_length=len(take.text) if take.text else 0, injection=extra.get("injection"),
+        outcome=take_outcome(take), error=extra.get("error"))
+
+# 단계별 지연 요약 (트레이 메뉴)
+def show_latency_summary():
+    """이번 실행에서 기록된 녹음의 단계별 p50/p95/p99를 콘솔에 표시합니다"""
+    recorder = get_latency_recorder()
+    if not recorder.record_count:
+        log_to_console(get_msg("latency_summary_empty"))
+        return
+    log_to_console(get_msg("latency_summary_title", recorder.record_count, get_session_event_log().directory))
+    for line in recorder.format_summary():
+        log_to_console(line)
+
+# 녹음 한 건 처리 (작업 스레드에서 여러 녹음을 동시에 실행)
+def process_take(take):
+    """인코딩 마무리 → Whisper API 전사 → 텍스트 정리를 처리하고 붙여넣을 텍스트를 반환합니다"""
+    audio_data = take.buffer
+    text = None
+    take.mark("process_start")
+    try:
+        # 녹음 중 인코딩이 시작되지 않았으면 지금 한 번에 인코딩
+        encoder = take.encoder or create_take_encoder(audio_data)
+        take.encoder = encoder
+        segmenter = take.segmenter
+
+        # 남은 끝부분만 인코딩 (앞뒤 무음 제거 포함), 음성이 없으면 API 호출 없이 종료
+        filename = encoder.name
+        encode_start_time = time.time()
+        encoded = encoder.finish()
+        take.mark("encode_done")
+        logging.info(f"인코딩 마무리: {(time.time() - encode_start_time) * 1000:.0f}ms")
+        if not encoded.has_speech:
+            if segmenter:
+                segmenter.abort()
+            logging.info("음성 없음 - 업로드 생략")
+            log_to_console(get_msg("no_speech_detected"))
+            take.extra["outcome"] = "no_speech"
+            return
+        trimmed_frames = encoded.total_frames - (encoded.end - encoded.start)
+        if trimmed_frames > 0:
+            saved_seconds = trimmed_frames / float(audio_data.samplerate)
+            saved_bytes = trimmed_frames * audio_data.dtype.itemsize * audio_data.channels
+            logging.info(f"무음 제거: {saved_seconds:.2f}초, PCM {saved_bytes} 바이트 절약")
+            log_to_console(get_msg("silence_trimmed", saved_seconds, saved_bytes))
+        speech_seconds = (encoded.end - encoded.start) / float(audio_data.samplerate)
+        get_codec_selector().record_encoding(encoder.codec.name, encoded.nbytes, speech_seconds)
+        logging.info(f"인코딩 결과: {encoder.codec.name}, {encoded.nbytes} 바이트 ({speech_seconds:.2f}초)")
+
+        # 업로드는 메모리의 데이터로 바로 하고, 파일 저장은 백그라운드에서 진행
+        audio_bytes = encoded.target.getvalue()
+        take.extra["speech_seconds"] = round(speech_seconds, 3)
+        take.extra["audio_bytes"] = len(audio_bytes)
+        # 녹음 한 건의 최종 기한: 단축키를 뗀 시각 + 기본 기한 + 크기에 비례하는 업로드 여유 (재시도가 모두 공유)
+        deadline_seconds = get_request_policy().deadline_for(len(audio_bytes))
+        deadline_at = take.extra.get("released_at", time.monotonic()) + deadline_seconds
+        log_to_console(get_msg("saving_audio_file", filename))
+        archive_recording(filename, audio_bytes)
+
+        # API 키가 없는 경우 즉시 API 키 설정 창 표시
+        if not api_key:
+            log_to_console(get_msg("no_api_key_set"))
+            take.extra.update(outcome="error", error="no_api_key")
+            # 메인 스레드에서 API 키 설정 창 표시
+            if root:
+                root.after(100, lambda: show_api_key_dialog(required=True))
+            return
+
+        # Whisper API로 음성 인식
+        if openai and api_key:
+            log_to_console(get_msg("sending_to_whisper"))
+            log_to_console(get_msg("auto_language_detection"))
+
+            try:
+                # 연결을 유지하는 클라이언트로 전송 (단축키를 누를 때 미리 연결됨)
+                # API 호출 시간 측정 시작
+                api_start_time = time.time()
+                take.mark("upload_start")
+                # 작업 스레드를 재사용하므로 이전 녹음의 시도 횟수가 남지 않도록
+                get_request_policy().reset_call_stats()
+
+                # 언어 설정에 따른 파라미터 처리
+                # 스트리밍 녹음은 구간 전사와 같은 파라미터 (언어 제안은 녹음마다 한 번)
+                app_context = take.extra.get("app_context")
+                api_params = dict(take.extra.get("api_params") or transcription_params(app_context))
+                take.extra["model"] = api_params.get("model")
+
+                # 자동 감지 사용 여부
+                if auto_language_detection and "language" in api_params:
+                    # 최근 감지된 언어가 확실해 language 지정
+                    take.extra["language_source"] = "prior"
+                    log_to_console(get_msg("language_prior_used", api_params["language"]))
+                elif auto_language_detection:
+                    # 자동 감지 사용 - language 파라미터 제외
+                    take.extra["language_source"] = "detect"
+                    log_to_console(get_msg("auto_language_detection"))
+                else:
+                    # 트레이 아이콘 언어 설정에 따라 language 파라미터 추가
+                    take.extra["language_source"] = "fixed"
+                    if current_language == "ko":
+                        log_to_console(get_msg("using_language", "한국어"))
+                    elif current_language == "en":
+                        log_to_console(get_msg("using_language", "English"))
                     else:
-                        # 트레이 아이콘 언어 설정에 따라 language 파라미터 추가
-                        if current_language == "ko":
-                            api_params["language"] = "ko"
-                            log_to_console(get_msg("using_language", "한국어"))
-                        elif current_language == "en":
-                            api_params["language"] = "en"
-                            log_to_console(get_msg("using_language", "English"))
-                        else:
-                            # 다른 언어나 미정의 경우 자동 감지 사용 (현재와 동일)
-                            log_to_console(get_msg("auto_language_detection"))
-                    
-                    with open(filename, "rb") as audio_file:
-                        # API 호출 (언어 파라미터 적용)
-                        api_params["file"] = audio_file
-                        transcript = openai.Audio.transcribe(**api_params)
-
-                    # API 호출 시간 측정 종료 및 레이턴시 계산
-                    api_end_time = time.time()
-                    api_latency = (api_end_time - api_start_time) * 1000  # 초 단위를 밀리초 단위로 변환
-
-                    text = transcript["text"]
-
-                    # 텍스트 처리
-                    if text:
-                        # 원본 텍스트 로깅 (이전과 동일)
-                        log_to_console("====== " + get_msg("recognition_result") + " ======")
-                        log_to_console(get_msg("api_response_time", api_latency))
-                        log_to_console(get_msg("recognized_text", text))
-                        log_to_console(get_msg("text_length", len(text)))
-                        log_to_console("=========================")
-                        logging.info(f"[인식결과] 원본 텍스트: {text}")
-
-                        # 1. "개행" 또는 "엔터" 및 주변 공백을 줄바꿈 문자로 변환 (정규식 사용)
-                        original_text_before_newline = text
-                        text = re.sub(r'\s*(개행|엔터)\s*', '\\n', text) # Regex replace
-
-                        # 변환 로그 (이전과 유사)
-                        if text != original_text_before_newline:
-                            log_to_console("특정 단어('개행', '엔터') 및 주변 공백을 줄바꿈 문자로 변환했습니다.")
-                            logging.info(f"[텍스트 변환] 완료. 변환된 텍스트: {text}")
-                        else:
-                            logging.info("[텍스트 변환] 변환할 단어('개행', '엔터') 없음")
-
-                        # 2. 전체 텍스트 앞뒤 공백/개행 제거 및 시작/끝 마침표 제거
-                        cleaned_text = text.strip()
-                        initial_cleaned_text = cleaned_text # 비교용
-                        if cleaned_text.startswith('.'):
-                            cleaned_text = cleaned_text[1:]
-                        if cleaned_text.endswith('.'):
-                            cleaned_text = cleaned_text[:-1]
-                        cleaned_text = cleaned_text.strip() # 마침표 제거 후 남을 수 있는 공백 재제거
-
-                        # 3. 줄 단위 추가 정리: 각 줄 시작의 '.' 및 공백 제거
-                        lines = cleaned_text.split('\\n')
-                        cleaned_lines = []
-                        text_changed_in_loop = False # 줄 단위 변경 추적
-
-                        for line in lines:
-                            processed_line = line.strip() # 각 줄의 앞뒤 공백 제거
-                            original_processed_line = processed_line
-                            if processed_line.startswith('.'):
-                                # 맨 앞 '.' 제거 및 뒤따르는 공백 제거
-                                processed_line = processed_line[1:].lstrip()
-
-                            cleaned_lines.append(processed_line)
-                            if processed_line != original_processed_line:
-                                text_changed_in_loop = True
-
-                        # 4. 최종 텍스트 재구성
-                        final_cleaned_text = "\\n".join(cleaned_lines)
-
-                        # 최종 변경 로그 및 결과 할당
-                        if final_cleaned_text != initial_cleaned_text or text_changed_in_loop:
-                             log_to_console("텍스트 앞/뒤 및 각 줄 시작의 불필요한 공백/마침표를 최종 정리했습니다.")
-                             log_to_console(f"최종 정리된 텍스트: {final_cleaned_text}")
-                             logging.info(f"[텍스트 최종 정리] 완료. 최종 텍스트: {final_cleaned_text}")
-                             text = final_cleaned_text # 최종 결과 사용
-                        elif cleaned_text != text.strip(): # Regex 변환 후 첫 strip에서만 변경된 경우
-                             log_to_console("텍스트 앞/뒤 공백/개행을 제거했습니다.")
-                             log_to_console(f"정리된 텍스트: {cleaned_text}")
-                             logging.info(f"[텍스트 정리] 앞/뒤 공백 제거 완료. 텍스트: {cleaned_text}")
-                             text = cleaned_text # 중간 결과 사용
-                        # else: 로그 불필요
-
-                        # 클립보드/붙여넣기 (최종 text 사용)
-                        clipboard_success = False
-                        if pyperclip:
-                            try:
-                                pyperclip.copy(text) # 최종 정리된 text 사용
-                                clipboard_success = True
-                                log_to_console(get_msg("text_copied"))
-                            except Exception as clip_e:
-                                logging.error(f"클립보드 복사 오류: {str(clip_e)}")
-                                log_to_console(get_msg("copy_error", str(clip_e)))
-
-                        # 붙여넣기 방법 1: 컨트롤러로 붙여넣기
-                        paste_success = False
-                        if Controller:
-                            try:
-                                time.sleep(0.2)
-                                keyboard = Controller()
-                                log_to_console(get_msg("attempting_paste"))
-
-                                keyboard.press(Key.ctrl)
-                                keyboard.press('v')
-                                keyboard.release('v')
-                                keyboard.release(Key.ctrl)
-                                paste_success = True
-                                log_to_console(get_msg("paste_complete"))
-
-                            except Exception as paste_e:
-                                logging.error(f"붙여넣기 오류: {str(paste_e)}")
-                                log_to_console(get_msg("paste_error", str(paste_e)))
-
-                                # 붙여넣기 실패 시 대체 방법으로 직접 텍스트 입력 시도
-                                try:
-                                    log_to_console(get_msg("attempting_direct_input"))
-                                    time.sleep(0.2)
-
-                                    # 각 문자를 하나씩 입력 시도
-                                    for char in text: # 최종 정리된 text 사용
-                                        try:
-                                            keyboard.type(char)
-                                            time.sleep(0.01)  # 약간의 지연
-                                        except:
-                                            pass
-
-                                    log_to_console(get_msg("direct_input_complete"))
-                                except Exception as direct_e:
-                                    logging.error(f"직접 텍스트 입력 오류: {str(direct_e)}")
-                                    log_to_console(get_msg("direct_input_error", str(direct_e)))
-
-                        # 최종 상태 보고
-                        if clipboard_success:
-                            log_to_console(get_msg("clipboard_success"))
-
-                        if not paste_success and not clipboard_success:
-                            log_to_console(get_msg("all_input_failed"))
-                            log_to_console(get_msg("manual_copy"))
-                            log_to_console(text)
+                        # 다른 언어나 미정의 경우 자동 감지 사용 (현재와 동일)
+                        log_to_console(get_msg("auto_language_detection"))
+
+                text = None
+                if segmenter:
+                    # 스트리밍 전사: 녹음 중 보낸 구간 결과를 기다리고 마지막 구간만 전송
+                    try:
+                        text = segmenter.finish()
+                        logging.info(f"스트리밍 전사 완료: {segmenter.segment_count}개 구간")
+                    except Exception as seg_e:
+                        # 구간 전사 실패 시 전체 파일로 다시 시도
+                        logging.error(f"스트리밍 전사 오류, 전체 파일로 재시도: {str(seg_e)}")
+                        text = None
+
+                if text is None:
+                    # API 호출 (언어 파라미터 적용, 메모리의 인코딩된 데이터 전송)
+                    # 일시적인 오류는 재시도, 느린 요청은 중복 전송, 최종 기한을 넘기면 DeadlineExceeded
+                    chunked = len(audio_bytes) > MAX_UPLOAD_BYTES
+                    if chunked:
+                        # 업로드 크기 제한을 넘으면 한 번에 보내면 실패하므로 나눠서 동시에 전사
+                        log_to_console(get_msg("long_take_chunked", len(audio_bytes) / (1024 * 1024.0)))
+                        text = transcribe_long_take(audio_data.view(encoded.start, encoded.end),
+                                                    audio_data.samplerate, os.path.basename(filename),
+                                                    codec=encoder.codec, deadline_at=deadline_at, **api_params)
+                    elif take.extra["language_source"] == "detect":
+                        text, detected = transcribe_bytes_detecting(audio_bytes, os.path.basename(filename),
+                                                                    app_context, deadline_at=deadline_at,
+                                                                    **api_params)
+                        take.extra["language"] = language_code(detected)
                     else:
-                        log_to_console(get_msg("no_text_recognized"))
+                        text = transcribe_bytes(audio_bytes, os.path.basename(filename), deadline_at=deadline_at,
+                                                **api_params)
+                    if chunked:
+                        # 구간별 요청은 다른 스레드에서 동시에 보내므로 캐시 적중을 기록하지 않음
+                        take.extra["chunked"] = True
+                    elif last_transcription_cached():
+                        take.extra["cached"] = True
+                        log_to_console(get_msg("transcript_cache_hit"))
+
+                # API 호출 시간 측정 종료 및 레이턴시 계산
+                take.mark("response")
+                api_end_time = time.time()
+                api_latency = (api_end_time - api_start_time) * 1000  # 초 단위를 밀리초 단위로 변환
+                take.extra["api_ms"] = round(api_latency, 1)
+                # 이 스레드에서 보낸 전체 파일 요청만 집계 (캐시 적중은 요청이 없고,
+                # 스트리밍/분할 구간은 다른 스레드에서 보내므로 0)
+                attempts, hedged = get_request_policy().last_call_stats()
+                if attempts:
+                    take.extra.update(attempts=attempts, hedged=bool(hedged))
+                    if attempts > 1:
+                        log_to_console(get_msg("transcription_retried", attempts - 1 - int(hedged), int(hedged)))
+
+                # 텍스트 처리
+                if text:
+                    # 원본 텍스트 로깅 (이전과 동일)
+                    log_to_console("====== " + get_msg("recognition_result") + " ======")
+                    log_to_console(get_msg("api_response_time", api_latency))
+                    log_to_console(get_msg("recognized_text", text))
+                    log_to_console(get_msg("text_length", len(text)))
+                    log_to_console("=========================")
+                    logging.info(f"[인식결과] 원본 텍스트: {text}")
+
+                    # 음성 명령("개행", "엔터" 등), 언어별 치환, 앞뒤 공백/마침표 정리를 한 번에 처리
+                    language = take.extra.get("language") or api_params.get("language")
+                    processed = get_text_postprocessor().process(text, language)
+                    if processed.commands:
+                        log_to_console(get_msg("voice_commands_applied", processed.commands))
+                    if processed.replacements:
+                        log_to_console(get_msg("text_replacements_applied", processed.replacements))
+                    if processed.text != text:
+                        log_to_console(get_msg("text_cleaned", processed.text))
+                        logging.info(f"[텍스트 정리] 완료. 최종 텍스트: {processed.text}")
+                    text = processed.text
+                    take.mark("postprocess_done")
 
-                except Exception as e:
-                    logging.error(f"Whisper API 오류: {str(e)}")
-                    log_to_console(get_msg("recognition_error", str(e)))
+                else:
+                    log_to_console(get_msg("no_text_recognized"))
 
-                    # API 키 오류인지 확인
-                    error_msg = str(e).lower()
-                    if "api key" in error_msg or "apikey" in error_msg or "authentication" in error_msg or "인증" in error_msg:
-                        error_message = get_msg("api_key_invalid_long")
-                        log_to_console(error_message)
+            except DeadlineExceeded as e:
+                logging.error(f"Whisper API 기한 초과: {str(e)}")
+                log_to_console(get_msg("transcription_deadline", deadline_seconds))
+                take.extra["outcome"] = "deadline"
 
-                        # 바로 API 키 설정 창 표시 (메인 스레드에서 실행)
-                        if root:
-                            def show_error_and_settings():
-                                messagebox.showerror(get_msg("api_key_error"), error_message)
-                                show_api_key_dialog(required=True)
+            except Exception as e:
+                logging.error(f"Whisper API 오류: {str(e)}")
+                log_to_console(get_msg("recognition_error", str(e)))
+                take.extra.update(outcome="error", error=type(e).__name__)
 
-                            root.after(100, show_error_and_settings)
+                # API 키 오류인지 확인
+                error_msg = str(e).lower()
+                if "api key" in error_msg or "apikey" in error_msg or "authentication" in error_msg or "인증" in error_msg:
+                    error_message = get_msg("api_key_invalid_long")
+                    log_to_console(error_message)
 
-            else:
-                log_to_console(get_msg("openai_api_not_set"))
-                # API 키가 설정되지 않은 경우 즉시 API 키 설정 창 표시
-                if not api_key and root:
-                    root.after(100, lambda: show_api_key_dialog(required=True))
+                    # 바로 API 키 설정 창 표시 (메인 스레드에서 실행)
+                    if root:
+                        def show_error_and_settings():
+                            messagebox.showerror(get_msg("api_key_error"), error_message)
+                            show_api_key_dialog(required=True)
 
-        except Exception as e:
-            logging.error(f"오디오 처리 오류: {str(e)}")
-            log_to_console(get_msg("audio_processing_error", str(e)))
+                        root.after(100, show_error_and_settings)
 
-    except Exception as e:
-        logging.error(f"녹음 종료 오류: {str(e)}")
-        log_to_console(get_msg("recording_stop_error", str(e)))
+        else:
+            log_to_console(get_msg("openai_api_not_set"))
+            # API 키가 설정되지 않은 경우 즉시 API 키 설정 창 표시
+            if not api_key and root:
+                root.after(100, lambda: show_api_key_dialog(required=True))
 
-    finally:
-        # 상태 초기화
-        recording = False
-        audio_data = []
-        stream = None
+    except Exception as e:
+        logging.error(f"오디오 처리 오류: {str(e)}")
+        log_to_console(get_msg("audio_processing_error", str(e)))
+        take.extra.update(outcome="error", error=type(e).__name__)
+        take.abort()
+
+    return text
+
+# 녹음 결과 붙여넣기 (붙여넣기 스레드에서 녹음 순서대로 실행)
+def deliver_take(take):
+    """정리된 텍스트를 현재 창에 넣습니다 (입력 방식을 순서대로 시도)"""
+    text = take.text
+    if not text:
+        return
+    logging.info(f"녹음 #{take.id} 붙여넣기 (처리 후 순서 대기 {take.hold_ms or 0:.0f}ms)")
+    try:
+        log_to_console(get_msg("attempting_paste"))
+        injection = get_text_injector().inject(text)
+        for name, error in injection.errors:
+            log_to_console(get_msg("paste_error" if name == "paste" else "direct_input_error", str(error)))
+        take.extra["injection"] = injection.strategy
+
+        if injection.strategy == "paste":
+            log_to_console(get_msg("paste_complete"))
+            if restore_clipboard:
+                log_to_console(get_msg("clipboard_restore_scheduled"))
+        elif injection.strategy is not None:
+            log_to_console(get_msg("direct_input_complete"))
+        logging.info(f"텍스트 입력: {injection.strategy} ({len(text)}자, {injection.ms:.1f}ms)")
+
+        if injection.strategy is None:
+            take.extra["outcome"] = "paste_failed"
+            # 모두 실패하면 직접 붙여넣을 수 있도록 클립보드에 남김
+            clipboard_success = False
+            if pyperclip:
+                try:
+                    # 붙여넣기 실패 뒤 예약된 복원이 남겨 둔 텍스트를 이전 내용으로 덮어쓰지 않도록 취소
+                    get_text_injector().cancel_restore()
+                    pyperclip.copy(text)
+                    clipboard_success = True
+                except Exception as clip_e:
+                    logging.error(f"클립보드 복사 오류: {str(clip_e)}")
+                    log_to_console(get_msg("copy_error", str(clip_e)))
+            if clipboard_success:
+                log_to_console(get_msg("clipboard_success"))
+            else:
+                log_to_console(get_msg("all_input_failed"))
+                log_to_console(get_msg("manual_copy"))
+                log_to_console(text)
+        take.mark("paste_done")
+    except Exception as e:
+        logging.error(f"붙여넣기 처리 오류: {str(e)}")
+        log_to_console(get_msg("paste_error", str(e)))
 
 def extract_readme_files():
     """README 파일을 실행 파일이 있는 디렉토리에 추출합니다."""